@@ -6,6 +6,7 @@ candidate solutions, then selects the best candidate via test pass rate.
 
 from pm_core.bench.runner import (
     Backend,
+    ConnectionPool,
     GenerationResult,
     RequestStats,
     Runner,
@@ -32,6 +33,7 @@ from pm_core.bench.executor import execute_stdin_stdout
 
 __all__ = [
     "Backend",
+    "ConnectionPool",
     "Exercise",
     "GenerationResult",
     "RequestStats",
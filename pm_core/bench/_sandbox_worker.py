@@ -0,0 +1,203 @@
+"""Fork server for :mod:`pm_core.bench.sandbox`.
+
+Run as a script (not imported) so candidate processes start from a bare
+interpreter that has not loaded pm.  Reads one JSON request per line on
+the original stdin and writes one JSON reply per line on the original
+stdout; fds 0-2 are then pointed at /dev/null and reused by each case.
+
+Each request forks a child that gets the case input as stdin, stdout and
+stderr redirected to scratch files, resource limits, and its own process
+group, then runs the candidate's (pre-compiled) code as ``__main__``.
+The fork server waits for it with a wall-clock deadline and kills the
+whole group on timeout.
+"""
+
+import builtins
+import json
+import math
+import os
+import resource
+import select
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+_MB = 1024 * 1024
+
+# path -> (mtime_ns, code object or the SyntaxError raised compiling it)
+_compiled: dict = {}
+
+# The request/reply pipe fds; closed in every child.
+_protocol_fds: list = []
+
+
+def _compile(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _compiled.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, "rb") as f:
+        source = f.read()
+    try:
+        code = compile(source, path, "exec", dont_inherit=True)
+    except (SyntaxError, ValueError) as exc:
+        code = exc
+    _compiled[path] = (mtime, code)
+    return code
+
+
+def _exit_status(exc):
+    """Map a SystemExit to an exit status the way the interpreter does."""
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code & 0xFF
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_child(path, code, in_path, out_path, err_path, timeout, memory_mb):
+    os.setsid()
+    for fd in _protocol_fds:
+        os.close(fd)
+    cpu = int(math.ceil(timeout)) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if memory_mb:
+        limit = memory_mb * _MB
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+    for fd, (name, flags) in enumerate((
+        (in_path, os.O_RDONLY),
+        (out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+        (err_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+    )):
+        opened = os.open(name, flags, 0o600)
+        os.dup2(opened, fd)
+        os.close(opened)
+    sys.stdin = sys.__stdin__ = open(0, "r", closefd=False)
+    sys.stdout = sys.__stdout__ = open(1, "w", closefd=False)
+    sys.stderr = sys.__stderr__ = open(2, "w", closefd=False)
+    sys.argv = [path]
+    sys.path[0] = os.path.dirname(os.path.abspath(path))
+
+    if isinstance(code, BaseException):
+        traceback.print_exception(type(code), code, None)
+        sys.stderr.flush()
+        os._exit(1)
+
+    status = 0
+    try:
+        exec(code, {"__name__": "__main__", "__file__": path,
+                    "__builtins__": builtins})
+    except SystemExit as exc:
+        status = _exit_status(exc)
+    except BaseException:
+        exc_type, exc, tb = sys.exc_info()
+        traceback.print_exception(exc_type, exc, tb.tb_next)
+        status = 1
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            status = status or 1
+    os._exit(status)
+
+
+def _wait(pid, timeout):
+    """Wait for *pid* up to *timeout* seconds; return (status, timed_out)."""
+    deadline = time.monotonic() + timeout
+    pidfd = None
+    if hasattr(os, "pidfd_open"):
+        try:
+            pidfd = os.pidfd_open(pid)
+        except OSError:
+            pidfd = None
+    try:
+        delay = 0.0005
+        while True:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                return status, False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if pidfd is not None:
+                select.select([pidfd], [], [], remaining)
+            else:
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 0.05)
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+    _, status = os.waitpid(pid, 0)
+    return status, True
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", "replace")
+
+
+def _handle(req, scratch):
+    path = req["path"]
+    in_path = os.path.join(scratch, "stdin")
+    out_path = os.path.join(scratch, "stdout")
+    err_path = os.path.join(scratch, "stderr")
+    with open(in_path, "wb") as f:
+        f.write(req.get("stdin", "").encode())
+    code = _compile(path)
+    timeout = float(req.get("timeout", 30))
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _run_child(path, code, in_path, out_path, err_path, timeout,
+                       req.get("memory_mb"))
+        finally:
+            os._exit(1)
+
+    status, timed_out = _wait(pid, timeout)
+    if os.WIFSIGNALED(status):
+        returncode = -os.WTERMSIG(status)
+    else:
+        returncode = os.WEXITSTATUS(status)
+    return {
+        "returncode": returncode,
+        "timed_out": timed_out,
+        "stdout": "" if timed_out else _read(out_path),
+        "stderr": "" if timed_out else _read(err_path),
+    }
+
+
+def main():
+    requests = os.fdopen(os.dup(0), "r")
+    replies = os.fdopen(os.dup(1), "w")
+    _protocol_fds.extend([requests.fileno(), replies.fileno()])
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1):
+        os.dup2(devnull, fd)
+    scratch = tempfile.mkdtemp(prefix="pm-bench-sandbox-")
+    try:
+        for line in requests:
+            try:
+                reply = _handle(json.loads(line), scratch)
+            except Exception as exc:
+                reply = {"error": f"{type(exc).__name__}: {exc}"}
+            replies.write(json.dumps(reply) + "\n")
+            replies.flush()
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,3 +15,78 @@ def extract_code(text: str | None) -> str:
                 lines = lines[:i]
                 break
     return "\n".join(lines)
+
+
+class CodeBlockWatcher:
+    """Detect, while a response streams in, when its leading code block closes.
+
+    Only a response whose first non-blank line opens a ``` fence is
+    watched.  The block is complete once a later line consists of just ```
+    outside any multi-line string literal opened inside the block (an odd
+    number of triple quotes so far), so code that embeds fenced markdown in
+    a docstring or Java text block is not cut short.
+    :func:`extract_code` then returns the same code from :attr:`text` as
+    from the full response, unless the model writes further bare fences
+    after the block.  Feed content deltas to :meth:`feed`; once it returns
+    True, :attr:`text` holds the response up to and including the closing
+    fence, and anything after it can be discarded.
+    """
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._size = 0          # chars already split into complete lines
+        self._pending = ""      # trailing partial line
+        self._fenced: bool | None = None  # None until the first non-blank line
+        self._end: int | None = None
+        # Open multi-line literals inside the block, as parity bits
+        self._quotes = {'"""': False, "'''": False}
+
+    @property
+    def closed(self) -> bool:
+        return self._end is not None
+
+    @property
+    def received(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._parts)
+
+    @property
+    def text(self) -> str:
+        """The response, cut after the closing fence once there is one."""
+        full = self.received
+        return full if self._end is None else full[:self._end]
+
+    def feed(self, delta: str) -> bool:
+        """Append *delta*; return True once the leading code block is closed."""
+        self._parts.append(delta)
+        if self._end is not None:
+            return True
+        if self._fenced is False:
+            return False
+        buf = self._pending + delta
+        start = 0
+        while True:
+            nl = buf.find("\n", start)
+            if nl < 0:
+                break
+            line = buf[start:nl]
+            if self._fenced is None:
+                if line.strip():
+                    self._fenced = line.lstrip().startswith("```")
+                    if not self._fenced:
+                        return False
+            elif line.strip() == "```" and not any(self._quotes.values()):
+                self._end = self._size + nl + 1
+                return True
+            else:
+                self._track_literals(line)
+            start = nl + 1
+        self._size += start
+        self._pending = buf[start:]
+        return False
+
+    def _track_literals(self, line: str) -> None:
+        """Flip the open/closed state of multi-line literals in *line*."""
+        for quote in self._quotes:
+            if line.count(quote) % 2:
+                self._quotes[quote] = not self._quotes[quote]
@@ -0,0 +1,140 @@
+"""Persistent store of single-pass baselines.
+
+The baseline for an exercise is one temperature-0 candidate from the
+default prompt, so it depends only on the model, the exercise and the
+prompt — not on the tournament's ``HyperParams``.  Every run used to
+regenerate it anyway, so a hyperparameter sweep paid for the same
+baselines again on each point.  :class:`BaselineStore` keeps them under
+``~/.cache/pm-bench/baselines``, keyed by
+
+    (model, exercise id, prompt fingerprint)
+
+where the fingerprint (:func:`~pm_core.bench.solve.prompt_fingerprint`)
+hashes the exact request, so editing the prompt template or the exercise
+invalidates old entries automatically.  Scoring the reused baseline goes
+through the score cache like any other candidate.
+
+:meth:`BaselineStore.invalidate` (``pm bench baselines --clear``, or
+``pm bench run --refresh-baselines`` for one run) drops stored baselines
+explicitly, e.g. after changing server-side sampling settings.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from pm_core.bench.exercises import Exercise
+from pm_core.bench.score_cache import exercise_id
+from pm_core.bench.solve import PROMPT_VARIANTS, prompt_fingerprint
+
+# generate_candidates(num_candidates=1) uses the first variant at 0.0.
+BASELINE_VARIANT = next(iter(PROMPT_VARIANTS))
+BASELINE_TEMPERATURE = 0.0
+
+
+@dataclass
+class StoredBaseline:
+    """A baseline candidate and what it cost to generate."""
+
+    code: str
+    tokens: int
+    prompt_variant: str = BASELINE_VARIANT
+    temperature: float = BASELINE_TEMPERATURE
+
+
+def _model_dir_name(model: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", model)
+
+
+class BaselineStore:
+    """On-disk baselines shared by every run of a model.
+
+    Args:
+        root: Store directory (default ``~/.cache/pm-bench/baselines``).
+    """
+
+    def __init__(self, root: Path | None = None):
+        if root is None:
+            from pm_core.paths import bench_cache_dir
+            root = bench_cache_dir() / "baselines"
+        self.root = root
+
+    def _path(self, model: str, exercise: Exercise) -> Path:
+        ex_id = exercise_id(exercise)
+        fingerprint = prompt_fingerprint(
+            exercise, BASELINE_VARIANT, BASELINE_TEMPERATURE)
+        key = hashlib.sha256(f"{model}\0{ex_id}\0{fingerprint}".encode()).hexdigest()
+        return self.root / _model_dir_name(model) / f"{key}.json"
+
+    def get(self, model: str, exercise: Exercise) -> StoredBaseline | None:
+        """The stored baseline for *exercise* under *model*, or None."""
+        try:
+            data = json.loads(self._path(model, exercise).read_text())
+            return StoredBaseline(
+                code=data["code"],
+                tokens=int(data["tokens"]),
+                prompt_variant=data.get("prompt_variant", BASELINE_VARIANT),
+                temperature=data.get("temperature", BASELINE_TEMPERATURE),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, model: str, exercise: Exercise, baseline: StoredBaseline) -> None:
+        """Store *baseline* for *exercise* under *model*."""
+        path = self._path(model, exercise)
+        data = {
+            "model": model,
+            "exercise": exercise_id(exercise),
+            "code": baseline.code,
+            "tokens": baseline.tokens,
+            "prompt_variant": baseline.prompt_variant,
+            "temperature": baseline.temperature,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def counts(self, model: str | None = None) -> dict[str, int]:
+        """Number of stored baselines per model directory."""
+        if not self.root.is_dir():
+            return {}
+        dirs = ([self.root / _model_dir_name(model)] if model is not None
+                else sorted(d for d in self.root.iterdir() if d.is_dir()))
+        counts = {d.name: sum(1 for _ in d.glob("*.json")) for d in dirs
+                  if d.is_dir()}
+        return {name: n for name, n in counts.items() if n}
+
+    def invalidate(self, model: str | None = None,
+                   exercise: Exercise | None = None) -> int:
+        """Drop stored baselines; return how many were removed.
+
+        With no arguments everything goes; *model* limits it to one model,
+        and *exercise* (which requires *model*) to a single entry.
+        """
+        if exercise is not None:
+            if model is None:
+                raise ValueError("invalidating an exercise requires a model")
+            try:
+                self._path(model, exercise).unlink()
+                return 1
+            except FileNotFoundError:
+                return 0
+        dirs = ([self.root / _model_dir_name(model)] if model is not None
+                else [d for d in self.root.glob("*") if d.is_dir()])
+        removed = 0
+        for d in dirs:
+            removed += sum(1 for _ in d.glob("*.json"))
+            shutil.rmtree(d, ignore_errors=True)
+        return removed
@@ -0,0 +1,167 @@
+"""JSONL checkpoints for resumable benchmark runs.
+
+A long run (hours of BigCodeBench) used to keep every result in memory
+until the end, so a crash, OOM or server restart lost all of it.  A
+:class:`Checkpoint` appends one JSON line per event as the run goes:
+
+- ``{"type": "run", "params": {...}}`` — first line; the run parameters a
+  resumed run must match.
+- ``{"type": "stage", "exercise": id, "stage": name, "data": {...}}`` —
+  LLM output an exercise has already paid for (generated tests, tournament
+  candidates, baseline candidate), so a resumed run does not regenerate it.
+- ``{"type": "result", "exercise": id, "result": {...}}`` — a finished
+  exercise.
+- ``{"type": "done"}`` — the run got through every exercise.
+
+Every line is flushed and fsynced when written.  On resume, a torn last
+line from a crash is dropped and the file is compacted.  A checkpoint of
+an unfinished run is only replaced when the caller asks to start fresh,
+so forgetting ``--resume`` cannot throw away hours of results; one whose
+run finished is simply started over, so repeating a run needs no flag.
+Exercises whose result has an error are not treated as complete and run
+again, reusing any stages they had finished.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pm_core.bench.score_cache import exercise_id
+
+if TYPE_CHECKING:
+    from pm_core.bench.exercises import Exercise
+
+
+class CheckpointMismatch(ValueError):
+    """The checkpoint on disk was written by a run with other parameters."""
+
+
+class CheckpointExists(ValueError):
+    """An unfinished run's checkpoint exists and neither resume nor fresh was given."""
+
+
+def default_checkpoint_path(params: dict) -> Path:
+    """Checkpoint file for a run with *params* in the bench cache dir."""
+    from pm_core.paths import bench_cache_dir
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+    model = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(params.get("model", "run")))
+    return bench_cache_dir() / "checkpoints" / f"{model}-{digest}.jsonl"
+
+
+class Checkpoint:
+    """Append-only record of a benchmark run.  Thread-safe.
+
+    Args:
+        path: The JSONL file.
+        params: Parameters identifying the run (model, source, filters...).
+        resume: Load an existing file at *path* instead of starting over.
+            Raises :class:`CheckpointMismatch` if it was written with
+            different *params*.
+        fresh: Start over even if *path* holds an unfinished run.
+            Without *resume* or *fresh*, an existing file with results or
+            stages but no :meth:`finish` mark raises
+            :class:`CheckpointExists`.
+    """
+
+    def __init__(self, path: Path, params: dict, *, resume: bool = False,
+                 fresh: bool = False):
+        self.path = path
+        self.params = params
+        self.tokens_reused = 0
+        self._results: dict[str, dict] = {}
+        self._stages: dict[tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+        lines: list[dict] = []
+        if not resume and not fresh and path.exists():
+            entries = self._load(path)
+            if len(entries) > 1 and entries[-1].get("type") != "done":
+                raise CheckpointExists(
+                    f"Checkpoint {path} holds an unfinished run "
+                    f"({len(entries) - 1} entries); pass --resume to "
+                    "continue it or --fresh to start over."
+                )
+        if resume and path.exists():
+            # A resumed run is unfinished again until it calls finish().
+            lines = [e for e in self._load(path) if e.get("type") != "done"]
+            if lines and lines[0].get("params") != params:
+                raise CheckpointMismatch(
+                    f"Checkpoint {path} was written by a run with different "
+                    "parameters; rerun without --resume to start over."
+                )
+        if not lines:
+            lines = [{"type": "run", "params": params}]
+        for entry in lines[1:]:
+            self._apply(entry)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text("".join(json.dumps(e) + "\n" for e in lines))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _load(path: Path) -> list[dict]:
+        entries = []
+        for line in path.read_text().splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn write from a crash
+            if isinstance(entry, dict):
+                entries.append(entry)
+        if not entries or entries[0].get("type") != "run":
+            return []
+        return entries
+
+    def _apply(self, entry: dict) -> None:
+        kind = entry.get("type")
+        if kind == "result":
+            self._results[entry["exercise"]] = entry["result"]
+        elif kind == "stage":
+            self._stages[(entry["exercise"], entry["stage"])] = entry["data"]
+
+    def _append(self, entry: dict) -> None:
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            self._apply(entry)
+            with open(self.path, "a") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def finish(self) -> None:
+        """Mark the run as having gone through every exercise."""
+        self._append({"type": "done"})
+
+    def completed(self) -> dict[str, dict]:
+        """Result dicts of exercises that finished without error, by id."""
+        with self._lock:
+            return {k: r for k, r in self._results.items() if r.get("error") is None}
+
+    def save_result(self, exercise: Exercise, result: dict) -> None:
+        """Record a finished exercise's result dict."""
+        self._append({"type": "result", "exercise": exercise_id(exercise),
+                      "result": result})
+
+    def get_stage(self, exercise: Exercise, stage: str) -> Any | None:
+        """Saved data for *stage* of *exercise*, or None.
+
+        A ``"tokens"`` entry in the data is counted in :attr:`tokens_reused`.
+        """
+        with self._lock:
+            data = self._stages.get((exercise_id(exercise), stage))
+            if isinstance(data, dict):
+                self.tokens_reused += int(data.get("tokens", 0))
+        return data
+
+    def save_stage(self, exercise: Exercise, stage: str, data: Any) -> None:
+        """Record the output of *stage* for *exercise*."""
+        self._append({"type": "stage", "exercise": exercise_id(exercise),
+                      "stage": stage, "data": data})
@@ -0,0 +1,227 @@
+"""Compact on-disk index over cached exercise datasets.
+
+LiveCodeBench, EvalPlus and BigCodeBench are cached as one large JSON or
+JSONL file per dataset.  Decoding the whole file — every problem's test
+payload included — only to run a five-exercise slice dominated startup.
+:class:`DatasetIndex` keeps a small SQLite table next to the cache with one
+row per record:
+
+    (file, byte offset, byte length, slug, language, difficulty)
+
+Loaders query it with their filters and decode only the matching records,
+sliced straight out of a memory map of the dataset file.
+
+The index is built by ``pm bench exercises`` after downloading, or lazily
+by the first load after a dataset file appears or changes: it records each
+file's size and mtime and is rebuilt when either differs.  Bump
+``version`` (per loader) whenever the keyer's output changes.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sqlite3
+import tempfile
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+INDEX_FILENAME = "index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE meta (version TEXT NOT NULL);
+CREATE TABLE files (name TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER);
+CREATE TABLE records (
+    file TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    key TEXT UNIQUE,
+    slug TEXT NOT NULL,
+    language TEXT NOT NULL,
+    difficulty TEXT
+);
+CREATE INDEX records_slug ON records (slug);
+"""
+
+
+@dataclass
+class IndexEntry:
+    """What the index stores about one dataset record.
+
+    Records with the same non-None *key* are indexed once (first wins).
+    """
+    slug: str
+    language: str = "python"
+    difficulty: str | None = None
+    key: str | None = None
+
+
+# Maps a decoded record to its index entry, or None to leave it out.
+Keyer = Callable[[dict], "IndexEntry | None"]
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    try:
+        st = path.stat()
+    except OSError:
+        return (-1, -1)
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _jsonl_spans(data: bytes) -> Iterator[tuple[int, int]]:
+    """(offset, length) of each non-blank line of JSONL *data*."""
+    offset = 0
+    for line in data.splitlines(keepends=True):
+        if line.strip():
+            yield offset, len(line)
+        offset += len(line)
+
+
+def _array_spans(data: bytes) -> Iterator[tuple[int, int]]:
+    """(offset, length) of each element of a top-level JSON array.
+
+    Decoding as latin-1 maps every byte to one character, so character
+    positions from the decoder are byte offsets into the UTF-8 file.
+    """
+    text = data.decode("latin-1")
+    decoder = json.JSONDecoder()
+    pos = text.index("[") + 1
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text) or text[pos] == "]":
+            return
+        _, end = decoder.raw_decode(text, pos)
+        yield pos, end - pos
+        pos = end
+
+
+class DatasetIndex:
+    """SQLite index over one loader's cached dataset files.
+
+    Args:
+        path: Where the index lives (usually ``<cache>/index.sqlite``).
+        files: The dataset files, JSONL or a top-level JSON array.
+               Missing files are indexed as empty.
+        keyer: Builds each record's :class:`IndexEntry`.
+        version: Invalidates the index when the keyer changes.
+    """
+
+    def __init__(self, path: Path, files: Sequence[Path], keyer: Keyer,
+                 *, version: str = "1"):
+        self.path = path
+        self.files = list(files)
+        self.keyer = keyer
+        self.version = version
+
+    def _current(self) -> bool:
+        if not self.path.is_file():
+            return False
+        try:
+            with closing(sqlite3.connect(self.path)) as db:
+                (version,) = db.execute("SELECT version FROM meta").fetchone()
+                stamps = {name: (size, mtime) for name, size, mtime
+                          in db.execute("SELECT name, size, mtime_ns FROM files")}
+        except (sqlite3.DatabaseError, TypeError):
+            return False
+        return version == self.version and stamps == {
+            f.name: _stamp(f) for f in self.files}
+
+    def ensure(self) -> None:
+        """Build the index unless it matches the dataset files."""
+        if not self._current():
+            self.build()
+
+    def build(self) -> int:
+        """(Re)build the index from the dataset files; returns its size."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        os.close(fd)
+        count = 0
+        try:
+            with closing(sqlite3.connect(tmp)) as db:
+                db.executescript(_SCHEMA)
+                db.execute("INSERT INTO meta VALUES (?)", (self.version,))
+                for f in self.files:
+                    stamp = _stamp(f)
+                    db.execute("INSERT INTO files VALUES (?, ?, ?)", (f.name, *stamp))
+                    if stamp[0] > 0:
+                        count += self._index_file(db, f)
+                db.commit()
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return count
+
+    def _index_file(self, db: sqlite3.Connection, path: Path) -> int:
+        data = path.read_bytes()
+        spans = (_array_spans(data) if data.lstrip().startswith(b"[")
+                 else _jsonl_spans(data))
+        count = 0
+        for offset, length in spans:
+            try:
+                record = json.loads(data[offset:offset + length])
+            except json.JSONDecodeError:
+                continue
+            entry = self.keyer(record) if isinstance(record, dict) else None
+            if entry is None:
+                continue
+            cur = db.execute(
+                "INSERT OR IGNORE INTO records VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path.name, offset, length, entry.key, entry.slug,
+                 entry.language, entry.difficulty))
+            count += cur.rowcount
+        return count
+
+    def query(
+        self,
+        *,
+        files: Sequence[str] | None = None,
+        slugs: Sequence[str] | None = None,
+        languages: Sequence[str] | None = None,
+        difficulty: str | None = None,
+    ) -> list[dict]:
+        """Decoded records matching every given filter, in file order.
+
+        Args:
+            files: Only records from these dataset file names.
+            slugs: Records whose slug contains any of these substrings
+                   (case-insensitive).
+            languages: Records in one of these languages.
+            difficulty: Records of exactly this difficulty.
+        """
+        self.ensure()
+        where, args = [], []
+        for column, values in (("file", files), ("language", languages)):
+            if values:
+                where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                args.extend(values)
+        if slugs:
+            match = " OR ".join(["instr(lower(slug), ?) > 0"] * len(slugs))
+            where.append(f"({match})")
+            args.extend(s.lower() for s in slugs)
+        if difficulty:
+            where.append("difficulty = ?")
+            args.append(difficulty.lower())
+        sql = "SELECT file, offset, length FROM records"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with closing(sqlite3.connect(self.path)) as db:
+            rows = db.execute(sql + " ORDER BY rowid", args).fetchall()
+
+        records: list[dict] = []
+        by_file: dict[str, list[tuple[int, int]]] = {}
+        for name, offset, length in rows:
+            by_file.setdefault(name, []).append((offset, length))
+        for f in self.files:
+            spans = by_file.get(f.name)
+            if not spans:
+                continue
+            with open(f, "rb") as fh, \
+                    mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                records.extend(json.loads(mm[o:o + n]) for o, n in spans)
+        return records
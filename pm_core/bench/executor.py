@@ -1,6 +1,7 @@
 """Test execution and candidate scoring.
 
-Runs test suites against candidate solutions in isolated temporary directories.
+Runs test suites against candidate solutions in isolated workspaces
+(hardlinked scaffolds; reusable build dirs for compiled languages).
 Supports 6 polyglot languages with appropriate build/test commands.
 
 Also provides stdin/stdout execution for competitive programming exercises
@@ -11,8 +12,9 @@ to expected output.
 from __future__ import annotations
 
 import json
+import os
 import re
-import shutil
+import signal
 import subprocess
 import sys
 import tempfile
@@ -20,6 +22,14 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from pm_core.bench.exercises import Exercise
+from pm_core.bench.sandbox import (
+    SandboxError,
+    SandboxPool,
+    default_pool,
+    sandbox_supported,
+)
+from pm_core.bench.score_cache import ScoreCache
+from pm_core.bench.workspace import WorkspacePool, default_workspaces
 
 # Per-language configuration: which file to write the solution into,
 # and the command to run tests.
@@ -53,7 +63,7 @@ _LANG_CONFIG: dict[str, dict] = {
     "java": {
         "solution_file": lambda _slug: None,  # determined dynamically
         "test_file": lambda _slug: None,
-        "test_cmd": ["./gradlew", "test"],
+        "test_cmd": ["./gradlew", "test", "--build-cache"],
     },
 }
 
@@ -68,6 +78,9 @@ class ScoreResult:
     raw_output: str = ""
     error: str | None = None
     timed_out: bool = False
+    # Stdin/stdout cases that timed out or could not be run
+    cases_incomplete: int = 0
+    cached: bool = False  # served from a ScoreCache instead of a fresh run
 
 
 def _resolve_solution_path(work_dir: Path, exercise: Exercise, config: dict) -> Path | None:
@@ -98,8 +111,10 @@ def execute_tests(
     test_code: str | None = None,
     *,
     timeout: int = 60,
+    workspaces: WorkspacePool | None = None,
+    score_cache: ScoreCache | None = None,
 ) -> ScoreResult:
-    """Run tests against a candidate solution in an isolated temp directory.
+    """Run tests against a candidate solution in an isolated workspace.
 
     .. warning::
         Candidate code runs **unsandboxed** via ``subprocess.run`` — no
@@ -113,53 +128,57 @@ def execute_tests(
         test_code: Custom test code (e.g. generated tests). If None, uses
                    reference tests from the exercise directory.
         timeout: Maximum seconds for the test run.
+        workspaces: Where to materialize the scaffold.  Defaults to the
+                    shared pool, which keeps build state for compiled
+                    languages between runs (see :mod:`pm_core.bench.workspace`).
+        score_cache: If given, return a previously stored result for the
+                     same exercise, code and tests instead of running them.
     """
+    if score_cache is not None:
+        return score_cache.get_or_run(
+            ScoreCache.key("tests", exercise, candidate_code, test_code,
+                           timeout=timeout),
+            lambda: execute_tests(exercise, candidate_code, test_code,
+                                  timeout=timeout, workspaces=workspaces),
+        )
+
     lang = exercise.language
     config = _LANG_CONFIG.get(lang)
     if config is None:
         return ScoreResult(error=f"Unsupported language: {lang}")
 
-    with tempfile.TemporaryDirectory(prefix=f"pm-bench-{lang}-") as tmp:
-        work_dir = Path(tmp)
-
-        # Copy the exercise scaffold
-        shutil.copytree(exercise.path, work_dir, dirs_exist_ok=True)
+    # Resolve target files against the scaffold so error cases never
+    # lease a workspace.
+    solution_path = _resolve_solution_path(exercise.path, exercise, config)
+    if solution_path is None:
+        return ScoreResult(error="Cannot determine solution file path")
+    solution_rel = solution_path.relative_to(exercise.path)
+
+    test_rel = None
+    if test_code is not None:
+        test_rel = config["test_file"](exercise.slug)
+        if test_rel is None and exercise.reference_tests:
+            # For languages where test_file is not configured (Go, Rust, Java),
+            # overwrite the first reference test file from the exercise scaffold.
+            test_rel = next(iter(exercise.reference_tests))
+        if test_rel is None:
+            return ScoreResult(
+                error="Cannot determine test file path for custom test code"
+            )
 
-        # Write the candidate solution
-        solution_path = _resolve_solution_path(work_dir, exercise, config)
-        if solution_path is None:
-            return ScoreResult(error="Cannot determine solution file path")
+    pool = workspaces or default_workspaces()
+    with pool.lease(exercise) as ws:
+        ws.write(solution_rel, candidate_code)
+        if test_rel is not None:
+            ws.write(test_rel, test_code)
 
-        solution_path.parent.mkdir(parents=True, exist_ok=True)
-        solution_path.write_text(candidate_code)
-
-        # Optionally override test code
-        if test_code is not None:
-            test_file = config["test_file"](exercise.slug)
-            if test_file is not None:
-                (work_dir / test_file).write_text(test_code)
-            elif exercise.reference_tests:
-                # For languages where test_file is not configured (Go, Rust, Java),
-                # overwrite the first reference test file from the exercise scaffold.
-                first_test = next(iter(exercise.reference_tests))
-                (work_dir / first_test).write_text(test_code)
-            else:
-                return ScoreResult(
-                    error="Cannot determine test file path for custom test code"
-                )
-
-        # Run tests
         try:
-            proc = subprocess.run(
-                config["test_cmd"],
-                cwd=work_dir,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
-            output = proc.stdout + proc.stderr
-            return _parse_test_output(output, proc.returncode)
+            returncode, output = _run_test_cmd(
+                config["test_cmd"], ws.path, ws.env, timeout)
+            return _parse_test_output(output, returncode)
         except subprocess.TimeoutExpired:
+            # A build killed mid-write can leave stale objects behind.
+            ws.discard()
             return ScoreResult(
                 raw_output="Test execution timed out",
                 error="timeout",
@@ -171,6 +190,34 @@ def execute_tests(
             return ScoreResult(error=f"Execution error: {exc}")
 
 
+def _run_test_cmd(cmd: list[str], cwd: Path, env: dict[str, str],
+                  timeout: int) -> tuple[int, str]:
+    """Run *cmd* in its own process group; kill the whole group on timeout.
+
+    Build tools fork compilers and test binaries, and those must not keep
+    writing into a workspace that has already been handed to the next run.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env={**os.environ, **env} if env else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        proc.communicate()
+        raise
+    return proc.returncode, stdout + stderr
+
+
 def _parse_test_output(output: str, returncode: int) -> ScoreResult:
     """Parse test runner output to extract pass/fail counts."""
     result = ScoreResult(raw_output=output)
@@ -268,6 +315,8 @@ def execute_stdin_stdout(
     candidate_code: str,
     *,
     timeout: int = 30,
+    sandbox: SandboxPool | None = None,
+    score_cache: ScoreCache | None = None,
 ) -> ScoreResult:
     """Run a candidate program against stdin/stdout test cases.
 
@@ -278,11 +327,28 @@ def execute_stdin_stdout(
     Each test case pipes *input* to the program's stdin and compares
     stdout to *output*.  Score = matching / total.
 
+    Every case runs in its own process.  Where fork is available the
+    process is forked from a pre-started worker in *sandbox* (default: the
+    shared :func:`~pm_core.bench.sandbox.default_pool`) instead of paying
+    interpreter startup per case; otherwise a fresh ``sys.executable``
+    is spawned.
+
     Args:
         exercise: Exercise with stdin/stdout test cases in reference_tests.
         candidate_code: The candidate's Python source code.
         timeout: Per-test-case timeout in seconds.
+        sandbox: Worker pool to run cases in.
+        score_cache: If given, return a previously stored result for the
+                     same exercise and code instead of running the cases.
     """
+    if score_cache is not None:
+        return score_cache.get_or_run(
+            ScoreCache.key("stdin", exercise, candidate_code, timeout=timeout,
+                           limits={"memory_mb": getattr(sandbox, "memory_mb", None)}),
+            lambda: execute_stdin_stdout(exercise, candidate_code,
+                                         timeout=timeout, sandbox=sandbox),
+        )
+
     tests_json = exercise.reference_tests.get("_stdin_stdout_tests.json", "")
     if not tests_json:
         return ScoreResult(error="No stdin/stdout test cases found")
@@ -300,6 +366,9 @@ def execute_stdin_stdout(
     outputs: list[str] = []
     first_stderr = ""
 
+    if sandbox is None and sandbox_supported():
+        sandbox = default_pool()
+
     with tempfile.TemporaryDirectory(prefix="pm-bench-stdin-") as tmp:
         solution_path = Path(tmp) / "solution.py"
         solution_path.write_text(candidate_code)
@@ -309,17 +378,24 @@ def execute_stdin_stdout(
             expected = case.get("output", "")
 
             try:
-                proc = subprocess.run(
-                    [sys.executable, str(solution_path)],
-                    input=test_input,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                )
+                if sandbox is not None:
+                    proc = sandbox.run(solution_path, test_input,
+                                       timeout=timeout)
+                    if proc.timed_out:
+                        outputs.append("[TIMEOUT]")
+                        continue
+                else:
+                    proc = subprocess.run(
+                        [sys.executable, str(solution_path)],
+                        input=test_input,
+                        capture_output=True,
+                        text=True,
+                        timeout=timeout,
+                    )
             except subprocess.TimeoutExpired:
                 outputs.append("[TIMEOUT]")
                 continue
-            except OSError as exc:
+            except (OSError, SandboxError) as exc:
                 outputs.append(f"[ERROR: {exc}]")
                 continue
 
@@ -359,4 +435,6 @@ def execute_stdin_stdout(
         raw_output=raw,
         error=error,
         timed_out=all(o == "[TIMEOUT]" for o in outputs),
+        cases_incomplete=sum(
+            1 for o in outputs if o == "[TIMEOUT]" or o.startswith("[ERROR")),
     )
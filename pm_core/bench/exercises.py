@@ -201,12 +201,18 @@ def load_exercises(
     *,
     language: str | None = None,
     slug: str | None = None,
+    languages: list[str] | None = None,
+    slugs: list[str] | None = None,
 ) -> list[Exercise]:
     """Load exercises from the local cache.
 
+    Filters are applied before an exercise directory is read.
+
     Args:
         language: Filter to a single language (e.g. "python").
         slug: Filter to exercises whose slug contains this substring.
+        languages: Filter to any of these languages.
+        slugs: Filter to exercises whose slug contains any of these.
 
     Raises:
         FileNotFoundError: If the exercise cache doesn't exist yet.
@@ -217,10 +223,12 @@ def load_exercises(
             "Exercise cache not found. Run `pm bench exercises` to download."
         )
 
-    languages = [language] if language else list(LANGUAGES)
+    if language:
+        languages = [language]
+    slugs = [s.lower() for s in ([slug] if slug else slugs or [])]
     exercises: list[Exercise] = []
 
-    for lang in languages:
+    for lang in languages or LANGUAGES:
         practice_dir = repo / lang / "exercises" / "practice"
         if not practice_dir.is_dir():
             continue
@@ -228,7 +236,7 @@ def load_exercises(
         for exercise_dir in sorted(practice_dir.iterdir()):
             if not exercise_dir.is_dir() or exercise_dir.name.startswith("."):
                 continue
-            if slug and slug.lower() not in exercise_dir.name.lower():
+            if slugs and not any(s in exercise_dir.name.lower() for s in slugs):
                 continue
 
             ex = _parse_exercise(exercise_dir, lang)
@@ -19,6 +19,7 @@ import urllib.error
 import urllib.request
 from pathlib import Path
 
+from pm_core.bench.dataset_index import INDEX_FILENAME, DatasetIndex, IndexEntry
 from pm_core.bench.exercises import Exercise
 from pm_core.paths import bench_cache_dir
 
@@ -35,6 +36,11 @@ def _cache_dir() -> Path:
     return bench_cache_dir() / "bigcodebench"
 
 
+def _cache_file(suffix: str) -> Path:
+    """Return the cached dataset file for the "full" or "hard" subset."""
+    return _cache_dir() / f"bigcodebench_{suffix}_{_SPLIT}.json"
+
+
 def _fetch_rows(dataset: str, split: str, *, quiet: bool = False) -> list[dict]:
     """Fetch all rows from a HuggingFace dataset via the datasets-server API."""
     rows: list[dict] = []
@@ -85,7 +91,7 @@ def download_dataset(*, hard: bool = False, quiet: bool = False) -> Path:
     cache.mkdir(parents=True, exist_ok=True)
 
     suffix = "hard" if hard else "full"
-    cache_file = cache / f"bigcodebench_{suffix}_{_SPLIT}.json"
+    cache_file = _cache_file(suffix)
 
     if cache_file.is_file():
         if not quiet:
@@ -104,6 +110,7 @@ def download_dataset(*, hard: bool = False, quiet: bool = False) -> Path:
 
     # Create scaffold directories with test files
     _create_scaffolds(rows, cache)
+    _index().ensure()
 
     return cache_file
 
@@ -124,6 +131,18 @@ def _create_scaffolds(tasks: list[dict], cache: Path) -> None:
         (scaffold / test_filename).write_text(task["test"])
 
 
+def _index_entry(task: dict) -> IndexEntry | None:
+    task_id = task.get("task_id")
+    if not task_id:
+        return None
+    return IndexEntry(slug=f"bcb-{task_id.rsplit('/', 1)[-1]}")
+
+
+def _index() -> DatasetIndex:
+    return DatasetIndex(_cache_dir() / INDEX_FILENAME,
+                        [_cache_file("full"), _cache_file("hard")], _index_entry)
+
+
 def _parse_task(task: dict, mode: str, scaffolds_dir: Path) -> Exercise:
     """Convert a BigCodeBench task dict to an Exercise."""
     task_id = task["task_id"]  # e.g. "BigCodeBench/13"
@@ -171,19 +190,24 @@ def load_bigcodebench_exercises(
     hard_only: bool = False,
     mode: str = "instruct",
     slug: str | None = None,
+    slugs: list[str] | None = None,
 ) -> list[Exercise]:
     """Load BigCodeBench exercises from cache.
 
+    Filters are applied through the dataset index, so only matching tasks
+    are decoded.
+
     Args:
         hard_only: Use only the 148-problem hard subset.
         mode: "instruct" (NL descriptions) or "complete" (docstring-based).
         slug: Filter by slug substring.
+        slugs: Filter to tasks whose slug contains any of these.
 
     Raises:
         FileNotFoundError: If the dataset cache doesn't exist.
     """
     suffix = "hard" if hard_only else "full"
-    cache_file = _cache_dir() / f"bigcodebench_{suffix}_{_SPLIT}.json"
+    cache_file = _cache_file(suffix)
 
     if not cache_file.is_file():
         hard_flag = " --hard" if hard_only else ""
@@ -192,13 +216,10 @@ def load_bigcodebench_exercises(
             f"Run `pm bench exercises --source bigcodebench{hard_flag}` to download."
         )
 
-    tasks = json.loads(cache_file.read_text())
+    tasks = _index().query(files=[cache_file.name], slugs=[slug] if slug else slugs)
     scaffolds_dir = _cache_dir() / "scaffolds"
     exercises = [_parse_task(t, mode, scaffolds_dir) for t in tasks]
 
-    if slug:
-        exercises = [e for e in exercises if slug.lower() in e.slug.lower()]
-
     exercises.sort(key=lambda e: _slug_sort_key(e.slug))
     return exercises
 
@@ -224,8 +245,7 @@ def extract_libs(task: dict) -> list[str]:
 
 def get_all_required_libs(*, hard_only: bool = False) -> set[str]:
     """Return the set of all libraries required across all cached tasks."""
-    suffix = "hard" if hard_only else "full"
-    cache_file = _cache_dir() / f"bigcodebench_{suffix}_{_SPLIT}.json"
+    cache_file = _cache_file("hard" if hard_only else "full")
 
     if not cache_file.is_file():
         return set()
@@ -24,6 +24,7 @@ import urllib.error
 import urllib.request
 from pathlib import Path
 
+from pm_core.bench.dataset_index import INDEX_FILENAME, DatasetIndex, IndexEntry
 from pm_core.bench.exercises import Exercise
 from pm_core.paths import bench_cache_dir
 
@@ -83,6 +84,7 @@ def sync_evalplus(quiet: bool = False) -> Path:
 
     # Regenerate exercise dirs from JSONL (idempotent).
     _build_exercise_dirs(quiet=quiet)
+    _index().ensure()
 
     return cache
 
@@ -121,32 +123,51 @@ def _fetch_all_rows(hf_dataset: str, expected_rows: int) -> list[dict]:
 # JSONL parsing → Exercise objects
 # ---------------------------------------------------------------------------
 
-def load_evalplus_exercises(*, slug: str | None = None) -> list[Exercise]:
+def _index_entry(record: dict) -> IndexEntry | None:
+    task_id = record.get("task_id")
+    if task_id is None or not record.get("prompt") or not record.get("test"):
+        return None
+    return IndexEntry(slug=_task_id_to_slug(str(task_id)))
+
+
+def _index() -> DatasetIndex:
+    cache = _evalplus_dir()
+    return DatasetIndex(
+        cache / INDEX_FILENAME,
+        [cache / ds_info["cache_file"] for ds_info in _DATASETS.values()],
+        _index_entry,
+    )
+
+
+def load_evalplus_exercises(
+    *,
+    slug: str | None = None,
+    slugs: list[str] | None = None,
+) -> list[Exercise]:
     """Load EvalPlus exercises from the local cache.
 
+    Filters are applied through the dataset index, so only matching
+    records are decoded.
+
+    Args:
+        slug: Filter to exercises whose slug contains this substring.
+        slugs: Filter to exercises whose slug contains any of these.
+
     Raises:
         FileNotFoundError: If the exercise cache doesn't exist yet.
     """
     cache = _evalplus_dir()
-    exercises: list[Exercise] = []
-
     for ds_info in _DATASETS.values():
-        jsonl_path = cache / ds_info["cache_file"]
-        if not jsonl_path.is_file():
+        if not (cache / ds_info["cache_file"]).is_file():
             raise FileNotFoundError(
                 "EvalPlus cache not found. "
                 "Run `pm bench exercises --source evalplus` to download."
             )
-        for line in jsonl_path.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            record = json.loads(line)
-            ex = _parse_evalplus_record(record)
-            if ex is None:
-                continue
-            if slug and slug.lower() not in ex.slug.lower():
-                continue
+
+    exercises: list[Exercise] = []
+    for record in _index().query(slugs=[slug] if slug else slugs):
+        ex = _parse_evalplus_record(record)
+        if ex is not None:
             exercises.append(ex)
 
     exercises.sort(key=lambda e: (e.language, e.slug))
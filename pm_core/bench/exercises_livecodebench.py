@@ -17,6 +17,7 @@ import urllib.request
 import zlib
 from pathlib import Path
 
+from pm_core.bench.dataset_index import INDEX_FILENAME, DatasetIndex, IndexEntry
 from pm_core.bench.exercises import Exercise
 from pm_core.paths import bench_cache_dir
 
@@ -71,6 +72,7 @@ def sync_exercises(quiet: bool = False) -> Path:
                 f"Failed to download {url}: {exc}"
             ) from exc
 
+    _index().ensure()
     return cache
 
 
@@ -129,18 +131,41 @@ def _normalize_difficulty(raw: str) -> str:
     return mapping.get(d, "medium")
 
 
+def _problem_slug(row: dict) -> str:
+    """Slug for a JSONL row, derived from its title."""
+    question_id = row.get("question_id", "")
+    title = row.get("question_title", question_id)
+    slug = title.strip().lower().replace(" ", "-")
+    # Remove non-alphanumeric chars except hyphens
+    slug = "".join(c for c in slug if c.isalnum() or c == "-")
+    return slug.strip("-") or question_id
+
+
+def _index_entry(row: dict) -> IndexEntry | None:
+    """Index a row by slug and difficulty, deduplicated by question_id."""
+    question_content = row.get("question_content", "")
+    if not question_content or not question_content.strip():
+        return None
+    return IndexEntry(
+        slug=_problem_slug(row),
+        difficulty=_normalize_difficulty(row.get("difficulty", "medium")),
+        key=row.get("question_id") or None,
+    )
+
+
+def _index() -> DatasetIndex:
+    cache = _cache_dir()
+    return DatasetIndex(cache / INDEX_FILENAME, [cache / f for f in _JSONL_FILES],
+                        _index_entry)
+
+
 def _parse_problem(row: dict) -> Exercise | None:
     """Parse a single JSONL row into an Exercise object."""
     question_content = row.get("question_content", "")
     if not question_content or not question_content.strip():
         return None
 
-    question_id = row.get("question_id", "")
-    title = row.get("question_title", question_id)
-    slug = title.strip().lower().replace(" ", "-")
-    # Remove non-alphanumeric chars except hyphens
-    slug = "".join(c for c in slug if c.isalnum() or c == "-")
-    slug = slug.strip("-") or question_id
+    slug = _problem_slug(row)
 
     # Starter code — competitive programming problems often have empty starter
     starter = row.get("starter_code", "")
@@ -191,11 +216,16 @@ def _parse_problem(row: dict) -> Exercise | None:
 def load_exercises(
     *,
     difficulty: str | None = None,
+    slugs: list[str] | None = None,
 ) -> list[Exercise]:
     """Load LiveCodeBench exercises from the local cache.
 
+    Filters are applied through the dataset index, so only matching
+    problems (and their test cases) are decoded.
+
     Args:
         difficulty: Filter to easy/medium/hard.
+        slugs: Filter to problems whose slug contains any of these.
 
     Raises:
         FileNotFoundError: If the cache doesn't exist yet.
@@ -208,38 +238,9 @@ def load_exercises(
         )
 
     exercises: list[Exercise] = []
-    seen_ids: set[str] = set()
-
-    for filename in _JSONL_FILES:
-        path = cache / filename
-        if not path.is_file():
-            continue
-
-        for line in path.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                row = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            # Deduplicate by question_id
-            qid = row.get("question_id", "")
-            if qid and qid in seen_ids:
-                continue
-            if qid:
-                seen_ids.add(qid)
-
-            ex = _parse_problem(row)
-            if ex is None:
-                continue
-
-            # Apply difficulty filter
-            if difficulty and ex.difficulty != difficulty.lower():
-                continue
-
+    for row in _index().query(slugs=slugs, difficulty=difficulty):
+        ex = _parse_problem(row)
+        if ex is not None:
             exercises.append(ex)
 
     exercises.sort(key=lambda e: e.slug)
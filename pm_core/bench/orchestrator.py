@@ -10,17 +10,33 @@ tests only) and collects cost metrics.
 
 from __future__ import annotations
 
+import functools
 import json
+import threading
 import time
-from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, field
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 
+from pm_core.bench.baseline_store import BaselineStore, StoredBaseline
+from pm_core.bench.checkpoint import Checkpoint
 from pm_core.bench.exercises import Exercise, load_exercises
 from pm_core.bench.executor import ScoreResult, execute_stdin_stdout, execute_tests
-from pm_core.bench.runner import Runner
-from pm_core.bench.solve import Candidate, HyperParams, generate_candidates
+from pm_core.bench.runner import (
+    DEFAULT_MAX_IN_FLIGHT,
+    GenerationResult,
+    RequestStats,
+    Runner,
+)
+from pm_core.bench.scheduler import BenchScheduler, SchedulerStats
+from pm_core.bench.score_cache import ScoreCache, exercise_id
+from pm_core.bench.solve import (
+    Candidate,
+    HyperParams,
+    generate_candidates,
+    iter_candidates,
+)
 from pm_core.bench.test_gen import generate_tests
 
 
@@ -45,11 +61,57 @@ class ExerciseResult:
     # Cost — separated so pr-018 can analyze tournament overhead independently
     tournament_tokens: int = 0
     baseline_tokens: int = 0
-    tokens_used: int = 0  # total (tournament + baseline)
+    tokens_used: int = 0  # spent by this run (tournament + generated baseline)
     wall_clock_seconds: float = 0.0
 
+    # Scoring work avoided: results served by the score cache, and
+    # candidates identical to an earlier one in the same tournament.
+    score_cache_hits: int = 0
+    duplicate_candidates: int = 0
+
+    # Baseline taken from the BaselineStore instead of generated;
+    # baseline_tokens is then what it originally cost, and is left out
+    # of tokens_used.
+    baseline_reused: bool = False
+
+    # Early stop (HyperParams.early_stop): candidates never scored because
+    # one reached the threshold first, and the estimated generation tokens
+    # and seconds that saved versus scoring every candidate.
+    early_stopped: bool = False
+    candidates_skipped: int = 0
+    early_stop_tokens_saved: int = 0
+    early_stop_seconds_saved: float = 0.0
+
     error: str | None = None
 
+    def to_dict(self) -> dict:
+        return {
+            "language": self.language,
+            "slug": self.slug,
+            "tournament_score": self.tournament_score,
+            "tournament_best_gen_score": self.tournament_best_gen_score,
+            "baseline_score": self.baseline_score,
+            "num_candidates": self.num_candidates,
+            "generated_test_code": self.generated_test_code,
+            "tournament_tokens": self.tournament_tokens,
+            "baseline_tokens": self.baseline_tokens,
+            "tokens_used": self.tokens_used,
+            "wall_clock_seconds": self.wall_clock_seconds,
+            "score_cache_hits": self.score_cache_hits,
+            "duplicate_candidates": self.duplicate_candidates,
+            "baseline_reused": self.baseline_reused,
+            "early_stopped": self.early_stopped,
+            "candidates_skipped": self.candidates_skipped,
+            "early_stop_tokens_saved": self.early_stop_tokens_saved,
+            "early_stop_seconds_saved": self.early_stop_seconds_saved,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> ExerciseResult:
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in d.items() if k in known})
+
 
 @dataclass
 class BenchmarkRun:
@@ -63,6 +125,15 @@ class BenchmarkRun:
     results: list[ExerciseResult] = field(default_factory=list)
     total_tokens: int = 0
     total_wall_clock_seconds: float = 0.0
+    # Streaming: completion-token budget left unused by stopping at the
+    # closing code fence (an upper bound on tokens saved), and mean seconds
+    # to the first streamed token.
+    total_budget_unused: int = 0
+    mean_time_to_first_token: float | None = None
+    # Exercises whose results were loaded from a checkpoint (--resume).
+    resumed_exercises: int = 0
+    # Shared test-execution budget: queue waits and concurrency.
+    test_stats: SchedulerStats | None = None
 
     @property
     def tournament_aggregate(self) -> float:
@@ -78,6 +149,35 @@ class BenchmarkRun:
             return 0.0
         return sum(r.baseline_score for r in scored) / len(scored)
 
+    @property
+    def score_cache_hits(self) -> int:
+        return sum(r.score_cache_hits for r in self.results)
+
+    @property
+    def duplicate_candidates(self) -> int:
+        return sum(r.duplicate_candidates for r in self.results)
+
+    @property
+    def baselines_reused(self) -> int:
+        return sum(1 for r in self.results if r.baseline_reused)
+
+    @property
+    def baseline_tokens_saved(self) -> int:
+        """Tokens not spent because stored baselines were reused."""
+        return sum(r.baseline_tokens for r in self.results if r.baseline_reused)
+
+    @property
+    def early_stopped(self) -> int:
+        return sum(1 for r in self.results if r.early_stopped)
+
+    @property
+    def early_stop_tokens_saved(self) -> int:
+        return sum(r.early_stop_tokens_saved for r in self.results)
+
+    @property
+    def early_stop_seconds_saved(self) -> float:
+        return sum(r.early_stop_seconds_saved for r in self.results)
+
     @property
     def num_exercises(self) -> int:
         return len(self.results)
@@ -92,14 +192,7 @@ class BenchmarkRun:
         return self.total_tokens / len(self.results)
 
     def to_dict(self) -> dict:
-        hyper_dict = None
-        if self.hyper:
-            hyper_dict = {
-                "variant": self.hyper.variant,
-                "temperature": self.hyper.temperature,
-                "chain": self.hyper.chain,
-                "test_subset_size": self.hyper.test_subset_size,
-            }
+        hyper_dict = _hyper_to_dict(self.hyper)
         return {
             "schema_version": 3,
             "source": self.source,
@@ -111,29 +204,200 @@ class BenchmarkRun:
             "baseline_aggregate": self.baseline_aggregate,
             "total_tokens": self.total_tokens,
             "total_wall_clock_seconds": self.total_wall_clock_seconds,
+            "total_budget_unused": self.total_budget_unused,
+            "mean_time_to_first_token": self.mean_time_to_first_token,
+            "score_cache_hits": self.score_cache_hits,
+            "duplicate_candidates": self.duplicate_candidates,
             "tokens_per_exercise": self.tokens_per_exercise(),
             "num_exercises": self.num_exercises,
             "num_errors": self.num_errors,
-            "results": [
-                {
-                    "language": r.language,
-                    "slug": r.slug,
-                    "tournament_score": r.tournament_score,
-                    "tournament_best_gen_score": r.tournament_best_gen_score,
-                    "baseline_score": r.baseline_score,
-                    "num_candidates": r.num_candidates,
-                    "generated_test_code": r.generated_test_code,
-                    "tournament_tokens": r.tournament_tokens,
-                    "baseline_tokens": r.baseline_tokens,
-                    "tokens_used": r.tokens_used,
-                    "wall_clock_seconds": r.wall_clock_seconds,
-                    "error": r.error,
-                }
-                for r in self.results
-            ],
+            "baselines_reused": self.baselines_reused,
+            "baseline_tokens_saved": self.baseline_tokens_saved,
+            "resumed_exercises": self.resumed_exercises,
+            "early_stopped": self.early_stopped,
+            "early_stop_tokens_saved": self.early_stop_tokens_saved,
+            "early_stop_seconds_saved": self.early_stop_seconds_saved,
+            "test_scheduling": (
+                self.test_stats.to_dict(self.total_wall_clock_seconds)
+                if self.test_stats is not None else None),
+            "results": [r.to_dict() for r in self.results],
         }
 
 
+def _hyper_to_dict(hyper: HyperParams | None) -> dict | None:
+    if hyper is None:
+        return None
+    return {
+        "variant": hyper.variant,
+        "temperature": hyper.temperature,
+        "chain": hyper.chain,
+        "test_subset_size": hyper.test_subset_size,
+        "early_stop": hyper.early_stop,
+    }
+
+
+def _candidate_tokens(cand: Candidate) -> int:
+    gen = cand.generation_result
+    return gen.stats.total_tokens if gen is not None and gen.stats else 0
+
+
+def _restored_generation(tokens: int, **kwargs) -> GenerationResult:
+    """Stand-in for a checkpointed generation, carrying its token cost."""
+    return GenerationResult(stats=RequestStats(total_tokens=tokens), **kwargs)
+
+
+def _score_candidates(
+    scheduler: BenchScheduler,
+    fn: Callable[..., ScoreResult],
+    exercise: Exercise,
+    candidates: list[Candidate],
+    *extra: str,
+) -> tuple[list[ScoreResult], int]:
+    """Score each candidate, running identical code only once.
+
+    Returns the per-candidate results (in order) and how many candidates
+    were duplicates of an earlier one.
+    """
+    unique = list(dict.fromkeys(cand.code for cand in candidates))
+    results = dict(zip(unique, scheduler.map_tests(
+        fn, [(exercise, code, *extra) for code in unique],
+    )))
+    return [results[cand.code] for cand in candidates], len(candidates) - len(unique)
+
+
+@dataclass
+class _EarlyStopOutcome:
+    """What :func:`_score_until` scored and what stopping early saved."""
+
+    scored: list[tuple[Candidate, ScoreResult]]
+    generated: list[Candidate]  # every generation yielded, including cut-off ones
+    duplicates: int = 0
+    stopped: bool = False
+    tokens_saved: int = 0
+    seconds_saved: float = 0.0
+
+
+def _early_stop_savings(
+    generated: list[Candidate], num_candidates: int, gen_seconds: float,
+) -> tuple[int, float]:
+    """Estimate the generation tokens and seconds an early stop saved.
+
+    A stream cut off after *n* completion tokens is projected to the
+    larger of the finished candidates' mean length and *2n* — it is
+    assumed to be at most half done, since the winner usually finishes
+    first and so says little about the stragglers.  Its duration is
+    extrapolated at its own token rate.  A request never started is
+    projected at the mean of the others.  Seconds saved is the longest
+    projected request beyond the generation time actually taken.
+    """
+    finished = [c.generation_result.stats for c in generated
+                if not c.generation_result.stats.cancelled]
+    if not finished:
+        return 0, 0.0
+    mean_completion = sum(s.completion_tokens for s in finished) / len(finished)
+    mean_seconds = sum(s.wall_clock_seconds for s in finished) / len(finished)
+
+    projected: list[tuple[float, float]] = []  # (total tokens, seconds)
+    tokens = longest = 0.0
+    for cand in generated:
+        stats = cand.generation_result.stats
+        if not stats.cancelled:
+            projected.append((stats.total_tokens, stats.wall_clock_seconds))
+            continue
+        completion = max(mean_completion, 2 * stats.completion_tokens)
+        tokens += completion - stats.completion_tokens
+        seconds = (stats.wall_clock_seconds * completion / stats.completion_tokens
+                   if stats.completion_tokens else mean_seconds)
+        projected.append((stats.prompt_tokens + completion, seconds))
+        longest = max(longest, seconds)
+
+    unstarted = num_candidates - len(generated)
+    if unstarted > 0:
+        tokens += unstarted * sum(t for t, _ in projected) / len(projected)
+        longest = max(longest, sum(s for _, s in projected) / len(projected))
+    return round(tokens), max(longest - gen_seconds, 0.0)
+
+
+def _score_until(
+    scheduler: BenchScheduler,
+    fn: Callable[..., ScoreResult],
+    exercise: Exercise,
+    stream: Callable[[threading.Event], Iterator[Candidate]],
+    num_candidates: int,
+    threshold: float,
+    *extra: str,
+) -> _EarlyStopOutcome:
+    """Score candidates as they are generated, stopping at *threshold*.
+
+    *stream* is called with a cancel event and yields candidates in the
+    order they finish; each is queued for scoring on arrival (identical
+    code only once).  The first score of at least *threshold* sets the
+    event, which cuts off the remaining generations, and test runs still
+    queued are dropped.  Test runs already executing are allowed to
+    finish and count toward the pick.
+    """
+    cancel = threading.Event()
+    futures: dict[str, Future[ScoreResult]] = {}
+    order: list[tuple[Candidate, Future[ScoreResult]]] = []
+    generated: list[Candidate] = []
+    duplicates = 0
+    lock = threading.Lock()
+
+    def _stop() -> None:
+        # Runs on the test worker that finished the winning score, before
+        # it can pick up the next queued run.
+        with lock:
+            cancel.set()
+            for fut in futures.values():
+                fut.cancel()
+
+    def _reached(fut: Future[ScoreResult]) -> bool:
+        return (not fut.cancelled() and fut.exception() is None
+                and fut.result().score >= threshold)
+
+    def _on_scored(fut: Future[ScoreResult]) -> None:
+        if _reached(fut):
+            _stop()
+
+    gen_start = time.monotonic()
+    for cand in stream(cancel):
+        generated.append(cand)
+        with lock:
+            if cand.generation_result.stats.cancelled or cancel.is_set():
+                continue
+            fut = futures.get(cand.code)
+            is_new = fut is None
+            if fut is None:
+                fut = futures[cand.code] = scheduler.submit_test(
+                    fn, exercise, cand.code, *extra)
+            else:
+                duplicates += 1
+            order.append((cand, fut))
+        if is_new:
+            fut.add_done_callback(_on_scored)
+    gen_seconds = time.monotonic() - gen_start
+
+    # Generation may finish before scoring does: keep watching for the
+    # threshold so test runs still queued can be dropped.
+    pending = set(futures.values())
+    while pending and not cancel.is_set():
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        if any(_reached(fut) for fut in done):
+            _stop()
+    if cancel.is_set():
+        _stop()
+
+    outcome = _EarlyStopOutcome(scored=[], generated=generated,
+                                duplicates=duplicates)
+    outcome.scored = [(cand, fut.result()) for cand, fut in order
+                      if not fut.cancelled()]
+    outcome.stopped = cancel.is_set()
+    if outcome.stopped:
+        outcome.tokens_saved, outcome.seconds_saved = _early_stop_savings(
+            generated, num_candidates, gen_seconds)
+    return outcome
+
+
 def run_exercise_tournament(
     exercise: Exercise,
     runner: Runner,
@@ -141,6 +405,10 @@ def run_exercise_tournament(
     num_candidates: int,
     *,
     hyper: HyperParams | None = None,
+    scheduler: BenchScheduler | None = None,
+    score_cache: ScoreCache | None = None,
+    checkpoint: Checkpoint | None = None,
+    baseline_store: BaselineStore | None = None,
     progress_callback: Callable[[str], None] | None = None,
 ) -> ExerciseResult:
     """Run the full tournament pipeline on a single exercise.
@@ -153,6 +421,23 @@ def run_exercise_tournament(
     5. Score the best candidate against reference tests → tournament score
 
     Also runs a single-pass baseline (N=1, reference tests only) for comparison.
+
+    Test executions go through *scheduler*'s shared test budget; without
+    one, a scheduler private to this call is used.  Identical candidates
+    are scored once, and with a *score_cache* any (code, tests) pair
+    already scored — in this run or a previous one — is not run again.
+
+    With a *checkpoint*, LLM output saved by an earlier attempt at this
+    exercise (generated tests, candidates, baseline) is reused instead of
+    regenerated, and newly generated output is saved as it arrives.
+
+    With a *baseline_store*, the baseline — which does not depend on
+    *hyper* — is taken from earlier runs of *model* when available and
+    stored otherwise.
+
+    With ``hyper.early_stop`` set, candidates are scored as they stream in
+    and generation and scoring stop once one reaches that score on the
+    generated tests (on the stdin/stdout tests for LiveCodeBench).
     """
     result = ExerciseResult(
         language=exercise.language,
@@ -174,31 +459,127 @@ def run_exercise_tournament(
         return total
 
     is_stdin = exercise.source == "livecodebench"
+    run_stdin: Callable[..., ScoreResult] = execute_stdin_stdout
+    run_tests: Callable[..., ScoreResult] = execute_tests
+    if score_cache is not None:
+        run_stdin = functools.partial(run_stdin, score_cache=score_cache)
+        run_tests = functools.partial(run_tests, score_cache=score_cache)
+    scores: list[ScoreResult] = []
+
+    def _tests_stage(**kwargs) -> tuple[str, list]:
+        saved = checkpoint.get_stage(exercise, "tests") if checkpoint else None
+        if saved is not None:
+            return saved["test_code"], [_restored_generation(saved["tokens"])]
+        test_code, gen_results = generate_tests(exercise, runner, model, **kwargs)
+        if checkpoint is not None:
+            checkpoint.save_stage(exercise, "tests", {
+                "test_code": test_code, "tokens": _sum_tokens(gen_results)})
+        return test_code, gen_results
+
+    def _restore_candidates(saved: dict) -> list[Candidate]:
+        return [
+            Candidate(
+                code=c["code"], temperature=c["temperature"],
+                prompt_variant=c["prompt_variant"], model=c["model"],
+                generation_result=_restored_generation(
+                    c["tokens"], model=c["model"],
+                    temperature=c["temperature"]),
+            )
+            for c in saved["candidates"]
+        ]
+
+    def _save_candidates(stage: str, cands: list[Candidate]) -> None:
+        if checkpoint is None:
+            return
+        checkpoint.save_stage(exercise, stage, {
+            "tokens": sum(_candidate_tokens(c) for c in cands),
+            "candidates": [
+                {"code": c.code, "temperature": c.temperature,
+                 "prompt_variant": c.prompt_variant, "model": c.model,
+                 "tokens": _candidate_tokens(c)}
+                for c in cands
+            ],
+        })
+
+    def _candidates_stage(stage: str, **kwargs) -> list[Candidate]:
+        saved = checkpoint.get_stage(exercise, stage) if checkpoint else None
+        if saved is not None:
+            return _restore_candidates(saved)
+        cands = generate_candidates(exercise, runner, model, **kwargs)
+        _save_candidates(stage, cands)
+        return cands
+
+    def _candidate_stream(cancel: threading.Event, **kwargs) -> Iterator[Candidate]:
+        saved = checkpoint.get_stage(exercise, "candidates") if checkpoint else None
+        if saved is not None:
+            yield from _restore_candidates(saved)
+            return
+        cands = []
+        for cand in iter_candidates(exercise, runner, model, cancel=cancel,
+                                    **kwargs):
+            cands.append(cand)
+            yield cand
+        # Only finished generations are worth replaying on resume.
+        _save_candidates("candidates", [
+            c for c in cands if not c.generation_result.stats.cancelled])
+
+    def _tournament_candidates(
+        fn: Callable[..., ScoreResult], *extra: str, **kwargs,
+    ) -> tuple[list[Candidate], list[tuple[Candidate, ScoreResult]]]:
+        """Generate and score the tournament; returns (generated, scored)."""
+        if hyper is None or hyper.early_stop is None:
+            candidates = _candidates_stage(
+                "candidates", num_candidates=num_candidates, hyper=hyper,
+                **kwargs)
+            if progress_callback:
+                progress_callback("scoring candidates")
+            cand_results, result.duplicate_candidates = _score_candidates(
+                scheduler, fn, exercise, candidates, *extra)
+            return candidates, list(zip(candidates, cand_results))
+        outcome = _score_until(
+            scheduler, fn, exercise,
+            functools.partial(_candidate_stream, num_candidates=num_candidates,
+                              hyper=hyper, **kwargs),
+            num_candidates, hyper.early_stop, *extra)
+        result.duplicate_candidates = outcome.duplicates
+        result.early_stopped = outcome.stopped
+        result.candidates_skipped = num_candidates - len(outcome.scored)
+        result.early_stop_tokens_saved = outcome.tokens_saved
+        result.early_stop_seconds_saved = outcome.seconds_saved
+        return outcome.generated, outcome.scored
+
+    def _baseline_stage() -> list[Candidate]:
+        stored = baseline_store.get(model, exercise) if baseline_store else None
+        if stored is not None:
+            result.baseline_reused = True
+            return [Candidate(
+                code=stored.code, temperature=stored.temperature,
+                prompt_variant=stored.prompt_variant, model=model,
+                generation_result=_restored_generation(
+                    stored.tokens, model=model, temperature=stored.temperature),
+            )]
+        cands = _candidates_stage("baseline", num_candidates=1)
+        if baseline_store is not None:
+            baseline_store.put(model, exercise, StoredBaseline(
+                code=cands[0].code, tokens=_candidate_tokens(cands[0]),
+                prompt_variant=cands[0].prompt_variant,
+                temperature=cands[0].temperature,
+            ))
+        return cands
+
+    own_scheduler = scheduler is None
+    if scheduler is None:
+        scheduler = BenchScheduler(runner)
 
     try:
         if is_stdin:
             # Stdin/stdout path: no test generation, score directly
-            # Step 1: Generate N candidate solutions
+            # Steps 1-2: Generate N candidate solutions and score each
+            # against the stdin/stdout tests (parallel)
             if progress_callback:
                 progress_callback(f"generating {num_candidates} candidates")
-            candidates = generate_candidates(
-                exercise, runner, model,
-                num_candidates=num_candidates,
-                hyper=hyper,
-            )
-
-            # Step 2: Score each candidate against stdin/stdout tests (parallel)
-            if progress_callback:
-                progress_callback("scoring candidates (stdin/stdout)")
-            with ThreadPoolExecutor() as pool:
-                futures = [
-                    pool.submit(execute_stdin_stdout, exercise, cand.code)
-                    for cand in candidates
-                ]
-                scored: list[tuple[Candidate, ScoreResult]] = [
-                    (cand, f.result())
-                    for cand, f in zip(candidates, futures)
-                ]
+            candidates, scored = _tournament_candidates(run_stdin)
+            scores.extend(r for _, r in scored)
 
             # Step 3: Pick the best candidate
             best_candidate, best_result = max(scored, key=lambda x: x[1].score)
@@ -210,12 +591,11 @@ def run_exercise_tournament(
             # Baseline: single pass
             if progress_callback:
                 progress_callback("running baseline")
-            baseline_candidates = generate_candidates(
-                exercise, runner, model, num_candidates=1
-            )
-            baseline_result = execute_stdin_stdout(
-                exercise, baseline_candidates[0].code
+            baseline_candidates = _baseline_stage()
+            baseline_result = scheduler.run_test(
+                run_stdin, exercise, baseline_candidates[0].code
             )
+            scores.append(baseline_result)
             result.baseline_score = baseline_result.score
             result.baseline_tokens = _sum_tokens(baseline_candidates)
         else:
@@ -223,34 +603,19 @@ def run_exercise_tournament(
             # Step 1: Generate tests from description
             if progress_callback:
                 progress_callback("generating tests")
-            gen_test_code, test_results = generate_tests(
-                exercise, runner, model, num_variants=3,
+            gen_test_code, test_results = _tests_stage(
+                num_variants=3,
                 chain=hyper.chain if hyper else False,
             )
             result.generated_test_code = gen_test_code
 
-            # Step 2: Generate N candidate solutions
+            # Steps 2-3: Generate N candidate solutions and score each
+            # against the generated tests (parallel)
             if progress_callback:
                 progress_callback(f"generating {num_candidates} candidates")
-            candidates = generate_candidates(
-                exercise, runner, model,
-                num_candidates=num_candidates,
-                tests=gen_test_code,
-                hyper=hyper,
-            )
-
-            # Step 3: Score each candidate against generated tests (parallel)
-            if progress_callback:
-                progress_callback("scoring candidates")
-            with ThreadPoolExecutor() as pool:
-                futures = [
-                    pool.submit(execute_tests, exercise, cand.code, gen_test_code)
-                    for cand in candidates
-                ]
-                scored = [
-                    (cand, f.result())
-                    for cand, f in zip(candidates, futures)
-                ]
+            candidates, scored = _tournament_candidates(
+                run_tests, gen_test_code, tests=gen_test_code)
+            scores.extend(r for _, r in scored)
 
             # Step 4: Pick the best candidate
             best_candidate, best_gen_result = max(scored, key=lambda x: x[1].score)
@@ -259,7 +624,10 @@ def run_exercise_tournament(
             # Step 5: Score best candidate against reference tests
             if progress_callback:
                 progress_callback("scoring against reference")
-            ref_result = execute_tests(exercise, best_candidate.code)
+            ref_result = scheduler.run_test(
+                run_tests, exercise, best_candidate.code
+            )
+            scores.append(ref_result)
             result.tournament_score = ref_result.score
 
             result.tournament_tokens = _sum_tokens(test_results) + _sum_tokens(candidates)
@@ -267,10 +635,11 @@ def run_exercise_tournament(
             # Baseline: single pass, scored against reference tests
             if progress_callback:
                 progress_callback("running baseline")
-            baseline_candidates = generate_candidates(
-                exercise, runner, model, num_candidates=1
+            baseline_candidates = _baseline_stage()
+            baseline_result = scheduler.run_test(
+                run_tests, exercise, baseline_candidates[0].code
             )
-            baseline_result = execute_tests(exercise, baseline_candidates[0].code)
+            scores.append(baseline_result)
             result.baseline_score = baseline_result.score
             result.baseline_tokens = _sum_tokens(baseline_candidates)
 
@@ -278,13 +647,47 @@ def run_exercise_tournament(
         result.error = f"Backend connection error: {exc}"
     except (OSError, ValueError, RuntimeError) as exc:
         result.error = str(exc)
+    finally:
+        if own_scheduler:
+            scheduler.close()
 
+    # Duplicates share one result object; count each cache hit once.
+    result.score_cache_hits = sum(
+        1 for r in {id(r): r for r in scores}.values() if r.cached)
     result.wall_clock_seconds = time.monotonic() - start
-    result.tokens_used = result.tournament_tokens + result.baseline_tokens
+    result.tokens_used = result.tournament_tokens
+    if not result.baseline_reused:
+        result.tokens_used += result.baseline_tokens
 
     return result
 
 
+def run_params(
+    model: str,
+    num_candidates: int,
+    *,
+    source: str = "polyglot",
+    languages: list[str] | None = None,
+    slugs: list[str] | None = None,
+    difficulty: str | None = None,
+    hyper: HyperParams | None = None,
+    hard: bool = False,
+    mode: str = "instruct",
+) -> dict:
+    """Parameters that identify a run for checkpoint/resume purposes."""
+    return {
+        "model": model,
+        "num_candidates": num_candidates,
+        "source": source,
+        "languages": sorted(languages) if languages else None,
+        "slugs": list(slugs) if slugs else None,
+        "difficulty": difficulty,
+        "hard": hard,
+        "mode": mode,
+        "hyperparams": _hyper_to_dict(hyper),
+    }
+
+
 def run_benchmark(
     model: str,
     num_candidates: int = 8,
@@ -297,6 +700,15 @@ def run_benchmark(
     parallel: int = 1,
     hard: bool = False,
     mode: str = "instruct",
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    max_test_workers: int | None = None,
+    stop_after_code: bool = False,
+    use_score_cache: bool = True,
+    checkpoint_path: Path | None = None,
+    resume: bool = False,
+    fresh: bool = False,
+    baseline_store: BaselineStore | None = None,
+    refresh_baselines: bool = False,
     progress_callback: Callable[[str], None] | None = None,
 ) -> BenchmarkRun:
     """Run the full benchmark across all matching exercises.
@@ -308,12 +720,46 @@ def run_benchmark(
         languages: Filter to these languages (default: all).
         slugs: Filter to these exercise slugs.
         difficulty: Filter by difficulty (livecodebench only): easy/medium/hard.
-        parallel: Number of exercises to run concurrently (default: 1).
+        parallel: Number of exercises in the pipeline at once (default: 1).
+            Actual load is set by the two budgets below, which are shared
+            by all exercises.
         hard: BigCodeBench: use the 148-problem hard subset.
         mode: BigCodeBench: prompt mode ("instruct" or "complete").
+        max_in_flight: Max concurrent LLM requests over the runner's
+            keep-alive connection pool.
+        max_test_workers: Max concurrent test executions (default: CPU
+            count).
+        stop_after_code: Stream each generation and stop it once its
+            leading code block closes, instead of paying for the prose
+            after it.
+        use_score_cache: Reuse scores of identical (code, tests) pairs
+            from this and earlier runs (see :mod:`pm_core.bench.score_cache`).
+        checkpoint_path: Append each finished exercise (and its generated
+            tests and candidates) to this JSONL file as the run goes.
+        resume: Continue the run recorded at *checkpoint_path*: finished
+            exercises are not rerun, and saved LLM output is reused.
+        fresh: Overwrite a *checkpoint_path* that holds an unfinished run.
+            Without *resume* or *fresh* such a file raises
+            :class:`~pm_core.bench.checkpoint.CheckpointExists`; one from a
+            finished run is started over.
+        baseline_store: Reuse baselines of *model* from earlier runs (and
+            store new ones), so sweeps over *hyper* pay for each baseline
+            once.
+        refresh_baselines: Drop the stored baselines of this run's
+            exercises first, so they are regenerated.
         progress_callback: Called with status message updates.
     """
-    runner = Runner.create()
+    params = run_params(model, num_candidates, source=source,
+                        languages=languages, slugs=slugs,
+                        difficulty=difficulty, hyper=hyper, hard=hard,
+                        mode=mode)
+    if resume and checkpoint_path is None:
+        raise ValueError("resume requires a checkpoint_path")
+    if resume and fresh:
+        raise ValueError("resume and fresh are mutually exclusive")
+
+    runner = Runner.create(max_in_flight=max_in_flight,
+                           stop_after_code=stop_after_code)
 
     # Validate model exists
     available = runner.list_models()
@@ -330,7 +776,7 @@ def run_benchmark(
         )
 
         try:
-            exercises = load_lcb(difficulty=difficulty)
+            exercises = load_lcb(difficulty=difficulty, slugs=slugs)
         except FileNotFoundError:
             raise FileNotFoundError(
                 "LiveCodeBench cache not found. "
@@ -340,7 +786,7 @@ def run_benchmark(
         from pm_core.bench.exercises_evalplus import load_evalplus_exercises
 
         try:
-            exercises = load_evalplus_exercises()
+            exercises = load_evalplus_exercises(slugs=slugs)
         except FileNotFoundError:
             raise FileNotFoundError(
                 "EvalPlus cache not found. "
@@ -350,7 +796,8 @@ def run_benchmark(
         from pm_core.bench.exercises_bigcodebench import load_bigcodebench_exercises
 
         try:
-            exercises = load_bigcodebench_exercises(hard_only=hard, mode=mode)
+            exercises = load_bigcodebench_exercises(hard_only=hard, mode=mode,
+                                                    slugs=slugs)
         except FileNotFoundError:
             raise FileNotFoundError(
                 "BigCodeBench cache not found. "
@@ -358,13 +805,15 @@ def run_benchmark(
             ) from None
     else:
         try:
-            exercises = load_exercises()
+            exercises = load_exercises(languages=languages, slugs=slugs)
         except FileNotFoundError:
             raise FileNotFoundError(
                 "Exercise cache not found. "
                 "Run `pm bench exercises` first to download."
             ) from None
 
+    # The loaders filter too, before reading any exercise; this covers
+    # filters a source cannot apply itself (e.g. languages outside polyglot).
     if languages:
         lang_set = set(languages)
         exercises = [e for e in exercises if e.language in lang_set]
@@ -388,6 +837,11 @@ def run_benchmark(
         )
 
     langs_used = sorted(set(e.language for e in exercises))
+    checkpoint = (Checkpoint(checkpoint_path, params, resume=resume, fresh=fresh)
+                  if checkpoint_path is not None else None)
+    if baseline_store is not None and refresh_baselines:
+        for exercise in exercises:
+            baseline_store.invalidate(model, exercise)
 
     run = BenchmarkRun(
         model=model,
@@ -399,6 +853,9 @@ def run_benchmark(
 
     bench_start = time.monotonic()
     total = len(exercises)
+    scheduler = BenchScheduler(runner, max_test_workers=max_test_workers)
+    score_cache = ScoreCache() if use_score_cache else None
+    completed = checkpoint.completed() if checkpoint is not None else {}
 
     def _run_one(i: int, exercise: Exercise) -> ExerciseResult:
         def _progress(msg: str, _ex=exercise, _i=i):
@@ -407,12 +864,23 @@ def run_benchmark(
                     f"[{_i + 1}/{total}] {_ex.language}/{_ex.slug}: {msg}"
                 )
 
+        saved = completed.get(exercise_id(exercise))
+        if saved is not None:
+            _progress("done (from checkpoint)")
+            return ExerciseResult.from_dict(saved)
+
         _progress("starting")
         ex_result = run_exercise_tournament(
             exercise, runner, model, num_candidates,
             hyper=hyper,
+            scheduler=scheduler,
+            score_cache=score_cache,
+            checkpoint=checkpoint,
+            baseline_store=baseline_store,
             progress_callback=_progress,
         )
+        if checkpoint is not None:
+            checkpoint.save_result(exercise, ex_result.to_dict())
 
         # Print intermediate result
         if progress_callback:
@@ -428,23 +896,39 @@ def run_benchmark(
 
         return ex_result
 
-    if parallel > 1:
-        # Run exercises in parallel — vLLM continuous batching handles
-        # concurrent requests, so this improves GPU utilization even
-        # when individual exercises use chain mode (sequential generation).
-        with ThreadPoolExecutor(max_workers=parallel) as pool:
-            futures = [
-                pool.submit(_run_one, i, ex)
-                for i, ex in enumerate(exercises)
-            ]
-            for future in futures:
-                run.results.append(future.result())
-    else:
-        for i, exercise in enumerate(exercises):
-            run.results.append(_run_one(i, exercise))
-
-    run.total_tokens = runner.metrics.total_tokens
+    try:
+        if parallel > 1:
+            # Run exercises in parallel — vLLM continuous batching handles
+            # concurrent requests, so this improves GPU utilization even
+            # when individual exercises use chain mode (sequential generation).
+            with ThreadPoolExecutor(max_workers=parallel) as pool:
+                futures = [
+                    pool.submit(_run_one, i, ex)
+                    for i, ex in enumerate(exercises)
+                ]
+                for future in futures:
+                    run.results.append(future.result())
+        else:
+            for i, exercise in enumerate(exercises):
+                run.results.append(_run_one(i, exercise))
+    finally:
+        scheduler.close()
+        runner.close()
+    if checkpoint is not None:
+        checkpoint.finish()
+
+    # Tokens spent by earlier attempts count toward the run's cost.
+    resumed = [r for ex, r in zip(exercises, run.results)
+               if exercise_id(ex) in completed]
+    run.resumed_exercises = len(resumed)
+    run.total_tokens = runner.metrics.total_tokens + sum(
+        r.tokens_used for r in resumed)
+    if checkpoint is not None:
+        run.total_tokens += checkpoint.tokens_reused
+    run.total_budget_unused = runner.metrics.total_budget_unused
+    run.mean_time_to_first_token = runner.metrics.mean_time_to_first_token
     run.total_wall_clock_seconds = time.monotonic() - bench_start
+    run.test_stats = scheduler.stats
 
     return run
 
@@ -498,6 +982,31 @@ def format_results_table(run: BenchmarkRun) -> str:
     lines.append(f"Total tokens: {run.total_tokens:,}")
     lines.append(f"Total time:   {run.total_wall_clock_seconds:.1f}s")
     lines.append(f"Tokens/exercise: {run.tokens_per_exercise():,.0f}")
+    if run.total_budget_unused:
+        lines.append("Token budget not used (stopped at code fence): "
+                     f"{run.total_budget_unused:,}")
+    if run.mean_time_to_first_token is not None:
+        lines.append(f"Mean TTFT:    {run.mean_time_to_first_token:.2f}s")
+    if run.baselines_reused:
+        lines.append(f"Baselines reused: {run.baselines_reused} exercises, "
+                     f"{run.baseline_tokens_saved:,} tokens saved")
+    if run.resumed_exercises:
+        lines.append(f"Resumed from checkpoint: {run.resumed_exercises} exercises")
+    if run.early_stopped:
+        lines.append(
+            f"Early stop: {run.early_stopped} exercises, "
+            f"~{run.early_stop_tokens_saved:,} tokens and "
+            f"~{run.early_stop_seconds_saved:.1f}s saved vs exhaustive")
+    stats = run.test_stats
+    if stats is not None and stats.tests_run:
+        lines.append(
+            f"Test runs: {stats.tests_run:,}, peak {stats.peak_concurrent_tests}/"
+            f"{stats.max_test_workers} concurrent, mean queue wait "
+            f"{stats.mean_queue_seconds:.2f}s, overlap "
+            f"{stats.overlap(run.total_wall_clock_seconds):.1f}x")
+    if run.score_cache_hits or run.duplicate_candidates:
+        lines.append(f"Scoring runs skipped: {run.score_cache_hits:,} cache hits, "
+                     f"{run.duplicate_candidates:,} duplicate candidates")
 
     return "\n".join(lines)
 
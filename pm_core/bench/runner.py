@@ -11,6 +11,9 @@ uses a single HTTP client with backend-specific server management.
 """
 
 import asyncio
+import contextlib
+import http.client
+import io
 import json
 import os
 import platform
@@ -18,10 +21,13 @@ import threading
 import time
 import urllib.error
 import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
-from urllib.parse import urljoin
+from typing import Any, Iterator
+from urllib.parse import urljoin, urlsplit
+
+from pm_core.bench._utils import CodeBlockWatcher
 
 
 class Backend(Enum):
@@ -46,11 +52,24 @@ _PLATFORM_BACKENDS: dict[str, list[Backend]] = {
 
 @dataclass
 class RequestStats:
-    """Token counts and timing for a single completion request."""
+    """Token counts and timing for a single completion request.
+
+    The streaming fields are only set for ``stream=True`` requests:
+    *time_to_first_token* is seconds until the first generated delta, and
+    for a request cut short by ``stop_after_code`` *budget_unused* is the
+    part of its completion-token budget it never generated.  That is an
+    upper bound on the tokens the cut saved, not an estimate of them.
+    *cancelled* marks a request abandoned through its ``cancel`` event;
+    its counts cover only what was generated before that.
+    """
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
     wall_clock_seconds: float = 0.0
+    time_to_first_token: float | None = None
+    stopped_early: bool = False
+    budget_unused: int = 0
+    cancelled: bool = False
 
 
 @dataclass
@@ -77,15 +96,204 @@ class CostMetrics:
     total_tokens: int = 0
     total_wall_clock_seconds: float = 0.0
     num_requests: int = 0
+    num_streamed: int = 0
+    num_stopped_early: int = 0
+    total_budget_unused: int = 0
+    total_time_to_first_token: float = 0.0
+    num_cancelled: int = 0
     _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
+    @property
+    def mean_time_to_first_token(self) -> float | None:
+        if not self.num_streamed:
+            return None
+        return self.total_time_to_first_token / self.num_streamed
+
     def record(self, result: GenerationResult) -> None:
+        stats = result.stats
         with self._lock:
-            self.total_prompt_tokens += result.stats.prompt_tokens
-            self.total_completion_tokens += result.stats.completion_tokens
-            self.total_tokens += result.stats.total_tokens
-            self.total_wall_clock_seconds += result.stats.wall_clock_seconds
+            self.total_prompt_tokens += stats.prompt_tokens
+            self.total_completion_tokens += stats.completion_tokens
+            self.total_tokens += stats.total_tokens
+            self.total_wall_clock_seconds += stats.wall_clock_seconds
             self.num_requests += 1
+            if stats.time_to_first_token is not None:
+                self.num_streamed += 1
+                self.total_time_to_first_token += stats.time_to_first_token
+            if stats.stopped_early:
+                self.num_stopped_early += 1
+                self.total_budget_unused += stats.budget_unused
+            if stats.cancelled:
+                self.num_cancelled += 1
+
+
+# Default cap on concurrent requests a Runner's pool sends to the server.
+DEFAULT_MAX_IN_FLIGHT = 16
+
+# Errors that mean a kept-alive connection was closed by the server while
+# idle; the request is retried once on a fresh connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class ConnectionPool:
+    """Persistent keep-alive HTTP connections to one inference server.
+
+    Idle ``http.client`` connections are reused across requests instead of
+    opening a new TCP connection per call, and at most *max_in_flight*
+    requests are outstanding at once.  Batched requests run on one
+    long-lived executor of the same size, shared by every caller, so worker
+    threads are not re-created per batch.
+
+    Thread-safe; one pool is shared by every thread using a ``Runner``.
+    """
+
+    def __init__(self, base_url: str, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be >= 1, got {max_in_flight}")
+        parts = urlsplit(base_url)
+        self.base_url = base_url.rstrip("/")
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self.connections_opened = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_in_flight,
+                    thread_name_prefix="pm-bench-http",
+                )
+            return self._executor
+
+    def _connect(self, timeout: float) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        with self._lock:
+            self.connections_opened += 1
+        return cls(self._host, self._port, timeout=timeout)
+
+    def _checkout(self, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            return self._connect(timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            try:
+                conn.sock.settimeout(timeout)
+            except OSError:
+                conn.close()
+                return self._connect(timeout), False
+        return conn, True
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def request(self, method: str, path: str, body: bytes | None = None,
+                headers: dict[str, str] | None = None,
+                timeout: float = 1200.0) -> bytes:
+        """Send a request and return the response body.
+
+        *path* is relative to the pool's base URL.  Raises
+        ``urllib.error.HTTPError`` for 4xx/5xx responses, matching the
+        ``urllib`` code path.
+        """
+        url_path = f"{self._prefix}/{path.lstrip('/')}"
+        hdrs = {"Connection": "keep-alive", **(headers or {})}
+        with self._slots:
+            conn, reused = self._checkout(timeout)
+            try:
+                try:
+                    resp = self._send(conn, method, url_path, body, hdrs)
+                except _STALE_CONNECTION_ERRORS:
+                    conn.close()
+                    if not reused:
+                        raise
+                    conn = self._connect(timeout)
+                    resp = self._send(conn, method, url_path, body, hdrs)
+                data = resp.read()
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(conn)
+
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(
+                f"{self.base_url}/{path.lstrip('/')}", resp.status, resp.reason,
+                resp.headers, io.BytesIO(data),
+            )
+        return data
+
+    @contextlib.contextmanager
+    def stream(self, method: str, path: str, body: bytes | None = None,
+               headers: dict[str, str] | None = None,
+               timeout: float = 1200.0) -> Iterator[http.client.HTTPResponse]:
+        """Send a request and yield the unread response for incremental reads.
+
+        The connection goes back to the pool only if the caller read the
+        response to the end; leaving early (e.g. cancelling a streamed
+        completion) closes it, which also tells the server to stop.
+        """
+        url_path = f"{self._prefix}/{path.lstrip('/')}"
+        hdrs = {"Connection": "keep-alive", **(headers or {})}
+        with self._slots:
+            conn, reused = self._checkout(timeout)
+            try:
+                try:
+                    resp = self._send(conn, method, url_path, body, hdrs)
+                except _STALE_CONNECTION_ERRORS:
+                    conn.close()
+                    if not reused:
+                        raise
+                    conn = self._connect(timeout)
+                    resp = self._send(conn, method, url_path, body, hdrs)
+                if resp.status >= 400:
+                    data = resp.read()
+                    raise urllib.error.HTTPError(
+                        f"{self.base_url}/{path.lstrip('/')}", resp.status,
+                        resp.reason, resp.headers, io.BytesIO(data),
+                    )
+                yield resp
+            except BaseException:
+                conn.close()
+                raise
+            if resp.isclosed() and not resp.will_close:
+                self._checkin(conn)
+            else:
+                conn.close()
+
+    @staticmethod
+    def _send(conn: http.client.HTTPConnection, method: str, path: str,
+              body: bytes | None, headers: dict[str, str]
+              ) -> http.client.HTTPResponse:
+        conn.request(method, path, body=body, headers=headers)
+        return conn.getresponse()
+
+    def close(self) -> None:
+        """Close idle connections and shut down the batch executor."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            executor, self._executor = self._executor, None
+        for conn in idle:
+            conn.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
 
 
 def detect_backend() -> Backend | None:
@@ -155,6 +363,10 @@ def chat_completion(
     max_tokens: int = 16384,
     timeout: float = 1200.0,
     extra_body: dict[str, Any] | None = None,
+    pool: ConnectionPool | None = None,
+    stream: bool = False,
+    stop_after_code: bool = False,
+    cancel: threading.Event | None = None,
 ) -> GenerationResult:
     """Send a single chat completion request.
 
@@ -163,7 +375,26 @@ def chat_completion(
     *extra_body* is merged into the request payload, allowing callers to
     pass backend-specific parameters (e.g. ``chat_template_kwargs``,
     ``max_completion_tokens``).
+
+    When *pool* is given the request goes over one of its keep-alive
+    connections; otherwise a one-off ``urllib`` request is made.
+
+    With *stream* the response is read as server-sent events and
+    time-to-first-token is recorded.  *stop_after_code* implies *stream*
+    and cancels the request as soon as the response's leading fenced code
+    block closes (see :class:`CodeBlockWatcher`); ``content`` then ends at
+    the closing fence and ``finish_reason`` is ``"code_block"``.
+
+    Once *cancel* is set the request is abandoned: a request that has not
+    been sent yet returns an empty result right away, and a streamed one
+    stops reading at the next event with the text received so far.  Both
+    have ``stats.cancelled`` set and ``finish_reason`` ``"cancelled"``.
+    Non-streamed requests already in flight run to completion.
     """
+    if cancel is not None and cancel.is_set():
+        return GenerationResult(model=model, temperature=temperature,
+                                stats=RequestStats(cancelled=True),
+                                finish_reason="cancelled")
     url = urljoin(base_url + "/", "v1/chat/completions")
     payload: dict[str, Any] = {
         "model": model,
@@ -173,17 +404,39 @@ def chat_completion(
     }
     if extra_body:
         payload.update(extra_body)
+    stream = stream or stop_after_code
+    if stream:
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
     data = json.dumps(payload).encode()
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
+    headers = {"Content-Type": "application/json"}
 
     t0 = time.monotonic()
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        body = json.loads(resp.read())
+    if stream:
+        if pool is not None:
+            opened = pool.stream("POST", "v1/chat/completions", data, headers,
+                                 timeout=timeout)
+        else:
+            req = urllib.request.Request(url, data=data, headers=headers,
+                                         method="POST")
+            opened = urllib.request.urlopen(req, timeout=timeout)
+        with opened as resp:
+            result = _read_stream(resp, t0, model, temperature,
+                                  stop_after_code=stop_after_code,
+                                  cancel=cancel)
+        if result.stats.stopped_early:
+            budget = payload.get("max_completion_tokens", max_tokens)
+            result.stats.budget_unused = max(
+                budget - result.stats.completion_tokens, 0)
+        return result
+    if pool is not None:
+        body = json.loads(pool.request(
+            "POST", "v1/chat/completions", data, headers, timeout=timeout,
+        ))
+    else:
+        req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            body = json.loads(resp.read())
     elapsed = time.monotonic() - t0
 
     choice = body.get("choices", [{}])[0]
@@ -203,6 +456,92 @@ def chat_completion(
     )
 
 
+def _iter_sse(resp) -> Iterator[dict[str, Any]]:
+    """Yield the JSON payload of each ``data:`` event until ``[DONE]``."""
+    while True:
+        line = resp.readline()
+        if not line:
+            return
+        line = line.strip()
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            resp.read()  # consume the end of the body so the connection is reusable
+            return
+        if data:
+            yield json.loads(data)
+
+
+def _read_stream(resp, t0: float, model: str, temperature: float, *,
+                 stop_after_code: bool,
+                 cancel: threading.Event | None = None) -> GenerationResult:
+    """Assemble a GenerationResult from an SSE chat completion stream.
+
+    Token counts come from the server's ``usage`` event.  Without one
+    (the stream was cut short, or the server does not send it) completion
+    tokens are counted as one per delta event, which is how llama.cpp,
+    vLLM and SGLang stream.
+    Reading stops early when *cancel* is set.
+    """
+    watcher = CodeBlockWatcher()
+    resolved_model = model
+    usage: dict[str, Any] = {}
+    finish_reason = ""
+    ttft: float | None = None
+    deltas = 0
+    stopped = False
+    cancelled = False
+
+    for event in _iter_sse(resp):
+        if cancel is not None and cancel.is_set():
+            cancelled = True
+            break
+        resolved_model = event.get("model") or resolved_model
+        if event.get("usage"):
+            usage = event["usage"]
+        for choice in event.get("choices") or []:
+            delta = choice.get("delta") or {}
+            text = delta.get("content") or ""
+            if text or delta.get("reasoning_content"):
+                deltas += 1
+                if ttft is None:
+                    ttft = time.monotonic() - t0
+            if choice.get("finish_reason"):
+                finish_reason = choice["finish_reason"]
+            if text and watcher.feed(text) and stop_after_code:
+                stopped = True
+        if stopped:
+            break
+    elapsed = time.monotonic() - t0
+
+    # The server's count is authoritative.  A stream cut short (stop after
+    # the code block, or cancel) ends before the final usage event, as do
+    # servers that ignore include_usage; only then fall back to counting
+    # one token per delta event.
+    completion = usage.get("completion_tokens", deltas)
+    prompt = usage.get("prompt_tokens", 0)
+    if cancelled:
+        finish_reason = "cancelled"
+    elif stopped:
+        finish_reason = "code_block"
+    return GenerationResult(
+        content=watcher.text if stopped else watcher.received,
+        model=resolved_model,
+        temperature=temperature,
+        stats=RequestStats(
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            total_tokens=prompt + completion,
+            wall_clock_seconds=elapsed,
+            time_to_first_token=ttft,
+            stopped_early=stopped,
+            cancelled=cancelled,
+        ),
+        finish_reason=finish_reason,
+    )
+
+
 def generate_multiple(
     base_url: str,
     *,
@@ -212,13 +551,16 @@ def generate_multiple(
     max_tokens: int = 16384,
     timeout: float = 1200.0,
     extra_body: dict[str, Any] | None = None,
+    pool: ConnectionPool | None = None,
+    stream: bool = False,
+    stop_after_code: bool = False,
 ) -> list[GenerationResult]:
     """Generate multiple completions in parallel with different temperatures.
 
     Thin wrapper over :func:`batch_complete` — broadcasts the same messages
     across the given temperatures.
 
-    Note: Calls asyncio.run() internally — cannot be used from within an
+    Note: Without a pool this calls asyncio.run() internally — cannot be used from within an
     existing event loop (e.g. a Textual TUI). Use from synchronous code only.
     """
     return batch_complete(
@@ -228,6 +570,9 @@ def generate_multiple(
         max_tokens=max_tokens,
         timeout=timeout,
         extra_body=extra_body,
+        pool=pool,
+        stream=stream,
+        stop_after_code=stop_after_code,
     )
 
 
@@ -239,14 +584,39 @@ def batch_complete(
     max_tokens: int = 16384,
     timeout: float = 1200.0,
     extra_body: dict[str, Any] | None = None,
+    pool: ConnectionPool | None = None,
+    stream: bool = False,
+    stop_after_code: bool = False,
 ) -> list[GenerationResult]:
     """Run multiple completions in parallel with different messages and temperatures.
 
-    Each request is a (messages, temperature) tuple.
+    Each request is a (messages, temperature) tuple.  With a *pool*, the
+    requests are submitted straight to the pool's shared executor, so every
+    concurrent caller draws on the same in-flight budget and no per-call
+    event loop or threads are created.
 
-    Note: Calls asyncio.run() internally — cannot be used from within an
-    existing event loop (e.g. a Textual TUI). Use from synchronous code only.
+    Note: Without a pool this calls asyncio.run() internally — it cannot be
+    used from within an existing event loop (e.g. a Textual TUI). Use from
+    synchronous code only.
     """
+    if pool is not None:
+        futures = [
+            pool.executor.submit(
+                chat_completion,
+                base_url,
+                model=model,
+                messages=msgs,
+                temperature=temp,
+                max_tokens=max_tokens,
+                timeout=timeout,
+                extra_body=extra_body,
+                pool=pool,
+                stream=stream,
+                stop_after_code=stop_after_code,
+            )
+            for msgs, temp in requests
+        ]
+        return [f.result() for f in futures]
     return asyncio.run(_batch_complete_async(
         base_url,
         model=model,
@@ -254,6 +624,8 @@ def batch_complete(
         max_tokens=max_tokens,
         timeout=timeout,
         extra_body=extra_body,
+        stream=stream,
+        stop_after_code=stop_after_code,
     ))
 
 
@@ -265,6 +637,8 @@ async def _batch_complete_async(
     max_tokens: int,
     timeout: float,
     extra_body: dict[str, Any] | None = None,
+    stream: bool = False,
+    stop_after_code: bool = False,
 ) -> list[GenerationResult]:
     """Async implementation of batch completion."""
     loop = asyncio.get_running_loop()
@@ -279,6 +653,8 @@ async def _batch_complete_async(
                 max_tokens=max_tokens,
                 timeout=timeout,
                 extra_body=extra_body,
+                stream=stream,
+                stop_after_code=stop_after_code,
             ),
         )
         for msgs, temp in requests
@@ -286,6 +662,65 @@ async def _batch_complete_async(
     return list(await asyncio.gather(*tasks))
 
 
+def iter_complete(
+    base_url: str,
+    *,
+    model: str,
+    requests: list[tuple[list[dict[str, str]], float]],
+    max_tokens: int = 16384,
+    timeout: float = 1200.0,
+    extra_body: dict[str, Any] | None = None,
+    pool: ConnectionPool | None = None,
+    stream: bool = False,
+    stop_after_code: bool = False,
+    cancel: threading.Event | None = None,
+) -> Iterator[tuple[int, GenerationResult]]:
+    """Run completions like :func:`batch_complete`, yielding as each finishes.
+
+    Yields ``(index, result)`` pairs in completion order, where *index* is
+    the request's position in *requests*.  When *cancel* is set, requests
+    still waiting for a slot are dropped (they are never yielded) and the
+    streamed ones in flight return early, marked ``stats.cancelled``.
+    Closing the iterator also drops the waiting requests.
+    """
+    executor = pool.executor if pool is not None else ThreadPoolExecutor(
+        max_workers=max(len(requests), 1), thread_name_prefix="pm-bench-iter")
+    futures = {
+        executor.submit(
+            chat_completion,
+            base_url,
+            model=model,
+            messages=msgs,
+            temperature=temp,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            extra_body=extra_body,
+            pool=pool,
+            stream=stream,
+            stop_after_code=stop_after_code,
+            cancel=cancel,
+        ): i
+        for i, (msgs, temp) in enumerate(requests)
+    }
+    pending = set(futures)
+    try:
+        while pending:
+            # Poll so a cancel set elsewhere frees queued slots promptly.
+            done, pending = wait(pending, return_when=FIRST_COMPLETED,
+                                 timeout=0.05 if cancel is not None else None)
+            if cancel is not None and cancel.is_set():
+                for f in pending:
+                    f.cancel()
+            for f in done:
+                if not f.cancelled():
+                    yield futures[f], f.result()
+    finally:
+        for f in futures:
+            f.cancel()
+        if pool is None:
+            executor.shutdown(wait=False)
+
+
 @dataclass
 class Runner:
     """High-level runner that wraps backend detection and server communication.
@@ -296,10 +731,18 @@ class Runner:
         result = runner.complete(model="...", messages=[...])
         results = runner.generate(model="...", messages=[...],
                                   temperatures=[0.0, 0.5, 1.0])
+
+    Runners made by :meth:`create` own a :class:`ConnectionPool`; a runner
+    constructed directly without one makes a fresh request per call.
+
+    *stop_after_code* is the default for each call's ``stop_after_code``.
+    It is off, so responses are generated in full unless asked otherwise.
     """
     backend: Backend
     base_url: str
     metrics: CostMetrics = field(default_factory=CostMetrics)
+    pool: ConnectionPool | None = field(default=None, repr=False)
+    stop_after_code: bool = False
 
     @classmethod
     def create(
@@ -307,16 +750,24 @@ class Runner:
         backend: Backend | None = None,
         *,
         base_url: str | None = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        stop_after_code: bool = False,
     ) -> "Runner":
         """Create a runner, auto-detecting backend if not specified.
 
         Args:
             backend: Explicit backend choice. Auto-detected if None.
             base_url: Explicit server URL. Overrides backend default if given.
+            max_in_flight: Max concurrent requests sent to the server.
+            stop_after_code: Stream every request and stop each one once
+                its leading code block closes (see :func:`chat_completion`).
         """
         if base_url is not None:
             b = backend or detect_backend() or Backend.LLAMA_CPP
-            return cls(backend=b, base_url=base_url.rstrip("/"))
+            url = base_url.rstrip("/")
+            return cls(backend=b, base_url=url,
+                       pool=ConnectionPool(url, max_in_flight),
+                       stop_after_code=stop_after_code)
         if backend is None:
             backend = detect_backend()
             if backend is None:
@@ -326,7 +777,14 @@ class Runner:
                     "is running, or set PM_BENCH_URL."
                 )
         url = _get_server_url(backend)
-        return cls(backend=backend, base_url=url)
+        return cls(backend=backend, base_url=url,
+                   pool=ConnectionPool(url, max_in_flight),
+                   stop_after_code=stop_after_code)
+
+    def close(self) -> None:
+        """Release pooled connections and worker threads."""
+        if self.pool is not None:
+            self.pool.close()
 
     def health_check(self) -> bool:
         """Check if the backend server is healthy."""
@@ -336,6 +794,9 @@ class Runner:
         """List models available on the backend."""
         return list_models(self.base_url)
 
+    def _stop_after_code(self, override: bool | None) -> bool:
+        return self.stop_after_code if override is None else override
+
     def complete(
         self,
         *,
@@ -345,6 +806,9 @@ class Runner:
         max_tokens: int = 16384,
         timeout: float = 1200.0,
         extra_body: dict[str, Any] | None = None,
+        stream: bool = False,
+        stop_after_code: bool | None = None,
+        cancel: threading.Event | None = None,
     ) -> GenerationResult:
         """Run a single chat completion."""
         result = chat_completion(
@@ -355,6 +819,10 @@ class Runner:
             max_tokens=max_tokens,
             timeout=timeout,
             extra_body=extra_body,
+            pool=self.pool,
+            stream=stream,
+            stop_after_code=self._stop_after_code(stop_after_code),
+            cancel=cancel,
         )
         self.metrics.record(result)
         return result
@@ -368,6 +836,8 @@ class Runner:
         max_tokens: int = 16384,
         timeout: float = 1200.0,
         extra_body: dict[str, Any] | None = None,
+        stream: bool = False,
+        stop_after_code: bool | None = None,
     ) -> list[GenerationResult]:
         """Generate multiple completions in parallel with different temperatures."""
         results = generate_multiple(
@@ -378,6 +848,9 @@ class Runner:
             max_tokens=max_tokens,
             timeout=timeout,
             extra_body=extra_body,
+            pool=self.pool,
+            stream=stream,
+            stop_after_code=self._stop_after_code(stop_after_code),
         )
         for r in results:
             self.metrics.record(r)
@@ -391,6 +864,8 @@ class Runner:
         max_tokens: int = 16384,
         timeout: float = 1200.0,
         extra_body: dict[str, Any] | None = None,
+        stream: bool = False,
+        stop_after_code: bool | None = None,
     ) -> list[GenerationResult]:
         """Run multiple completions in parallel with different messages/temperatures."""
         results = batch_complete(
@@ -400,8 +875,41 @@ class Runner:
             max_tokens=max_tokens,
             timeout=timeout,
             extra_body=extra_body,
+            pool=self.pool,
+            stream=stream,
+            stop_after_code=self._stop_after_code(stop_after_code),
         )
         for r in results:
             self.metrics.record(r)
         return results
 
+    def complete_iter(
+        self,
+        *,
+        model: str,
+        requests: list[tuple[list[dict[str, str]], float]],
+        max_tokens: int = 16384,
+        timeout: float = 1200.0,
+        extra_body: dict[str, Any] | None = None,
+        stream: bool = False,
+        stop_after_code: bool | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Iterator[tuple[int, GenerationResult]]:
+        """Like :meth:`complete_batch`, yielding ``(index, result)`` as each finishes.
+
+        See :func:`iter_complete` for how *cancel* is handled.
+        """
+        for i, result in iter_complete(
+            self.base_url,
+            model=model,
+            requests=requests,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            extra_body=extra_body,
+            pool=self.pool,
+            stream=stream,
+            stop_after_code=self._stop_after_code(stop_after_code),
+            cancel=cancel,
+        ):
+            self.metrics.record(result)
+            yield i, result
@@ -0,0 +1,214 @@
+"""Pre-forked Python workers for stdin/stdout scoring.
+
+Scoring a LiveCodeBench candidate used to start a fresh ``sys.executable``
+for every test case — 30 cases x 8 candidates is 240 interpreter startups
+per exercise.  A :class:`SandboxPool` instead keeps a few long-lived fork
+servers (``_sandbox_worker.py``); each case is a ``fork()`` of an already
+initialised interpreter, which costs about a millisecond.
+
+Isolation is unchanged in kind: every case still runs in its own process
+(forked child, own process group), so a crash, ``sys.exit`` or runaway
+loop only affects that case.  Each child gets ``RLIMIT_CPU`` just above
+the case timeout, no core dumps and an optional ``RLIMIT_AS`` cap; the
+fork server enforces the wall-clock timeout and kills the child's whole
+process group when it expires.
+
+POSIX only — use :func:`sandbox_supported` and fall back to one
+subprocess per case elsewhere.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+_WORKER_SCRIPT = Path(__file__).with_name("_sandbox_worker.py")
+
+
+def sandbox_supported() -> bool:
+    """Whether fork-based workers are available on this platform."""
+    return os.name == "posix" and hasattr(os, "fork")
+
+
+@dataclass
+class CaseResult:
+    """Outcome of running a program on one stdin input."""
+
+    stdout: str = ""
+    stderr: str = ""
+    returncode: int = 0
+    timed_out: bool = False
+
+
+class SandboxError(RuntimeError):
+    """The fork server failed or died while running a case."""
+
+
+class _ForkServer:
+    """One fork-server process and its request/reply pipes."""
+
+    def __init__(self) -> None:
+        self.proc = subprocess.Popen(
+            [sys.executable, str(_WORKER_SCRIPT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def call(self, request: dict) -> dict:
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        try:
+            self.proc.stdin.write(json.dumps(request) + "\n")
+            self.proc.stdin.flush()
+            line = self.proc.stdout.readline()
+        except (BrokenPipeError, OSError) as exc:
+            raise SandboxError(f"fork server died: {exc}") from exc
+        if not line:
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+            raise SandboxError("fork server exited")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise SandboxError(reply["error"])
+        return reply
+
+    def close(self) -> None:
+        if self.proc.stdin is not None:
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        if self.proc.stdout is not None:
+            self.proc.stdout.close()
+
+
+class SandboxPool:
+    """A bounded set of fork servers shared by scoring threads.
+
+    Servers start lazily, up to *size*; a thread that finds none idle
+    waits for one.  A server that dies is replaced and the case retried
+    once.  Thread-safe.
+
+    Args:
+        size: Max fork servers (concurrent cases).  Defaults to CPU count.
+        memory_mb: Optional address-space limit for each case.
+    """
+
+    def __init__(self, size: int | None = None, *, memory_mb: int | None = None):
+        if size is not None and size < 1:
+            raise ValueError(f"size must be >= 1, got {size}")
+        self.size = size or os.cpu_count() or 4
+        self.memory_mb = memory_mb
+        self._idle: queue.LifoQueue[_ForkServer] = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self) -> _ForkServer:
+        with self._lock:
+            if self._closed:
+                raise SandboxError("sandbox pool is closed")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                if self._started < self.size:
+                    self._started += 1
+                    start = True
+                else:
+                    start = False
+        if start:
+            try:
+                return _ForkServer()
+            except BaseException:
+                with self._lock:
+                    self._started -= 1
+                raise
+        return self._idle.get()
+
+    def _release(self, server: _ForkServer) -> None:
+        if server.alive() and not self._closed:
+            self._idle.put(server)
+            return
+        server.close()
+        with self._lock:
+            self._started -= 1
+
+    def run(self, path: str | Path, stdin: str, *, timeout: float) -> CaseResult:
+        """Run the Python program at *path* with *stdin* as its input."""
+        request = {
+            "path": str(path),
+            "stdin": stdin,
+            "timeout": timeout,
+            "memory_mb": self.memory_mb,
+        }
+        for attempt in range(2):
+            server = self._acquire()
+            try:
+                reply = server.call(request)
+            except SandboxError:
+                died = not server.alive()
+                self._release(server)
+                if died and attempt == 0:
+                    continue
+                raise
+            self._release(server)
+            return CaseResult(
+                stdout=reply["stdout"],
+                stderr=reply["stderr"],
+                returncode=reply["returncode"],
+                timed_out=reply["timed_out"],
+            )
+        raise SandboxError("unreachable")  # pragma: no cover
+
+    def close(self) -> None:
+        """Stop all idle fork servers; busy ones stop when released."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            server.close()
+            with self._lock:
+                self._started -= 1
+
+    def __enter__(self) -> SandboxPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+_default_pool: SandboxPool | None = None
+_default_lock = threading.Lock()
+
+
+def default_pool() -> SandboxPool:
+    """The process-wide pool used by ``execute_stdin_stdout``."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = SandboxPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
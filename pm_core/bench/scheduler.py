@@ -0,0 +1,137 @@
+"""Benchmark-wide concurrency budgets.
+
+A benchmark run has two scarce resources: the inference server (GPU) and
+the local CPUs that compile and run candidate tests.  Running exercises in
+parallel used to multiply both — each exercise fanned out its own LLM
+batch and its own unbounded test thread pool — so the real load was
+uncontrolled.
+
+``BenchScheduler`` holds one budget for each, shared by every exercise:
+
+- **LLM requests** are capped by the runner's :class:`ConnectionPool`
+  (``max_in_flight``); every ``Runner`` call from any exercise draws on it.
+- **Test executions** (``execute_tests`` / ``execute_stdin_stdout``) run on
+  one executor with ``max_test_workers`` threads, defaulting to the CPU
+  count.
+
+Exercise-level parallelism then only decides how many exercises are in the
+pipeline at once; it no longer changes how hard the server or CPUs are hit.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from pm_core.bench.runner import Runner
+
+T = TypeVar("T")
+
+
+def default_test_workers() -> int:
+    """Number of concurrent test executions when none is given."""
+    return os.cpu_count() or 4
+
+
+@dataclass
+class SchedulerStats:
+    """Test-execution counters collected by a :class:`BenchScheduler`."""
+    max_test_workers: int = 0
+    tests_run: int = 0
+    peak_concurrent_tests: int = 0
+    total_test_seconds: float = 0.0
+    total_queue_seconds: float = 0.0
+
+    @property
+    def mean_queue_seconds(self) -> float:
+        """Mean wait between submitting a test and a worker starting it."""
+        return self.total_queue_seconds / self.tests_run if self.tests_run else 0.0
+
+    def overlap(self, wall_clock_seconds: float) -> float:
+        """Mean number of tests running at once over *wall_clock_seconds*."""
+        if wall_clock_seconds <= 0:
+            return 0.0
+        return self.total_test_seconds / wall_clock_seconds
+
+    def to_dict(self, wall_clock_seconds: float) -> dict:
+        return {
+            "max_test_workers": self.max_test_workers,
+            "tests_run": self.tests_run,
+            "peak_concurrent_tests": self.peak_concurrent_tests,
+            "total_test_seconds": self.total_test_seconds,
+            "total_queue_seconds": self.total_queue_seconds,
+            "mean_queue_seconds": self.mean_queue_seconds,
+            "overlap": self.overlap(wall_clock_seconds),
+        }
+
+
+class BenchScheduler:
+    """Shared LLM and test-execution budgets for one benchmark run.
+
+    Thread-safe; use as a context manager or call :meth:`close`.
+    """
+
+    def __init__(self, runner: Runner, *, max_test_workers: int | None = None):
+        if max_test_workers is not None and max_test_workers < 1:
+            raise ValueError(
+                f"max_test_workers must be >= 1, got {max_test_workers}")
+        self.runner = runner
+        self.max_test_workers = max_test_workers or default_test_workers()
+        self.stats = SchedulerStats(max_test_workers=self.max_test_workers)
+        self._active = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_test_workers,
+            thread_name_prefix="pm-bench-test",
+        )
+
+    @property
+    def max_in_flight(self) -> int | None:
+        """LLM request budget, or None when the runner has no pool."""
+        pool = getattr(self.runner, "pool", None)
+        return pool.max_in_flight if pool is not None else None
+
+    def submit_test(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+        """Queue a test execution against the shared test budget."""
+        queued = time.monotonic()
+        return self._executor.submit(self._timed, queued, fn, args, kwargs)
+
+    def run_test(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a test execution within the budget and wait for its result."""
+        return self.submit_test(fn, *args, **kwargs).result()
+
+    def map_tests(self, fn: Callable[..., T],
+                  arg_lists: Iterable[tuple[Any, ...]]) -> list[T]:
+        """Run ``fn(*args)`` for each tuple concurrently; results in order."""
+        futures = [self.submit_test(fn, *args) for args in arg_lists]
+        return [f.result() for f in futures]
+
+    def _timed(self, queued: float, fn: Callable[..., T],
+               args: tuple[Any, ...], kwargs: dict[str, Any]) -> T:
+        start = time.monotonic()
+        with self._lock:
+            self._active += 1
+            self.stats.peak_concurrent_tests = max(
+                self.stats.peak_concurrent_tests, self._active)
+            self.stats.total_queue_seconds += start - queued
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self.stats.tests_run += 1
+                self.stats.total_test_seconds += time.monotonic() - start
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> BenchScheduler:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
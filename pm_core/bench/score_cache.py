@@ -0,0 +1,188 @@
+"""Content-addressed cache of candidate scores.
+
+Scoring is deterministic in its inputs: the same candidate code run against
+the same tests for the same exercise gives the same result.  Tournaments
+still produce many identical candidates (low temperatures, short
+exercises), and the temperature-0 baseline is regenerated and re-scored on
+every run of a model.  :class:`ScoreCache` keys each result by
+
+    (exercise id, language, hash(candidate code), hash(test code),
+     timeout, limits, SCORER_VERSION)
+
+and short-circuits ``execute_tests`` / ``execute_stdin_stdout`` on a hit.
+Results live in memory for the run and as one small JSON file per key
+under ``~/.cache/pm-bench/scores`` across runs.  Concurrent requests for
+the same key run the scorer once and share its result.
+
+Results that depend on the machine rather than the code — timeouts
+(including a single timed-out or crashed stdin case), sandbox crashes
+and missing test runners — are never cached.
+
+Bump :data:`SCORER_VERSION` whenever scoring semantics change (test
+commands, output parsing, sandbox limits) to invalidate old entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pm_core.bench.exercises import Exercise
+    from pm_core.bench.executor import ScoreResult
+
+SCORER_VERSION = "1"
+
+# Errors that say something about this machine, not the candidate, as
+# set by execute_tests ("timeout", "Test runner not found: ...", "Execution
+# error: ...") and execute_stdin_stdout ("timeout", "execution_error").
+_UNCACHEABLE_ERRORS = ("timeout", "execution_error", "Test runner not found",
+                       "Execution error")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def exercise_id(exercise: Exercise) -> str:
+    """Stable identifier for *exercise* across runs and machines."""
+    return f"{exercise.source}/{exercise.language}/{exercise.slug}"
+
+
+def cacheable(result: ScoreResult) -> bool:
+    """Whether *result* depends only on the code and tests it scored."""
+    if result.timed_out or result.cases_incomplete:
+        return False
+    return not (result.error and result.error.startswith(_UNCACHEABLE_ERRORS))
+
+
+@dataclass
+class ScoreCacheStats:
+    """Counters for one :class:`ScoreCache`."""
+    hits: int = 0
+    misses: int = 0
+
+
+class ScoreCache:
+    """Thread-safe score cache shared by every scoring thread of a run.
+
+    Args:
+        root: Directory for the on-disk entries.  Defaults to
+              ``~/.cache/pm-bench/scores``; pass ``persist=False`` to keep
+              results for this process only.
+    """
+
+    def __init__(self, root: Path | None = None, *, persist: bool = True):
+        if root is None and persist:
+            from pm_core.paths import bench_cache_dir
+            root = bench_cache_dir() / "scores"
+        self.root = root if persist else None
+        self.stats = ScoreCacheStats()
+        self._memory: dict[str, ScoreResult] = {}
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, exercise: Exercise, candidate_code: str,
+            test_code: str | None = None, *, timeout: float | None = None,
+            limits: dict | None = None) -> str:
+        """Cache key for scoring *candidate_code* on *exercise*.
+
+        *kind* names the scorer (``"tests"`` or ``"stdin"``).  Without
+        explicit *test_code* the exercise's reference tests are hashed.
+        *timeout* and *limits* (e.g. the sandbox memory cap) are part of
+        the key: a result under one budget says nothing about another.
+        """
+        if test_code is None:
+            test_code = json.dumps(exercise.reference_tests, sort_keys=True)
+        parts = [
+            SCORER_VERSION, kind, exercise_id(exercise), exercise.language,
+            _sha256(candidate_code), _sha256(test_code), repr(timeout),
+            json.dumps(limits or {}, sort_keys=True),
+        ]
+        return _sha256("\0".join(parts))
+
+    def _path(self, key: str) -> Path:
+        assert self.root is not None
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> ScoreResult | None:
+        """The cached result for *key*, or None."""
+        from pm_core.bench.executor import ScoreResult
+
+        with self._lock:
+            cached = self._memory.get(key)
+        if cached is not None or self.root is None:
+            return cached
+        try:
+            data = json.loads(self._path(key).read_text())
+            cached = ScoreResult(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+        with self._lock:
+            self._memory[key] = cached
+        return cached
+
+    def put(self, key: str, result: ScoreResult) -> None:
+        """Store *result* under *key* if it is cacheable."""
+        if not cacheable(result):
+            return
+        result = replace(result, cached=False)
+        with self._lock:
+            self._memory[key] = result
+        if self.root is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(asdict(result), f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def get_or_run(self, key: str, run: Callable[[], ScoreResult]) -> ScoreResult:
+        """Return the cached result for *key*, running *run* on a miss.
+
+        A hit is returned with ``cached=True``.  Concurrent misses on the
+        same key wait for the first caller's run instead of repeating it.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            with self._lock:
+                self.stats.hits += 1
+            return replace(cached, cached=True)
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+                self.stats.misses += 1
+            else:
+                owner = False
+                self.stats.hits += 1
+        if not owner:
+            return replace(pending.result(), cached=True)
+
+        try:
+            result = run()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set_exception(exc)
+            raise
+        self.put(key, result)
+        with self._lock:
+            self._inflight.pop(key, None)
+        pending.set_result(result)
+        return result
@@ -6,6 +6,10 @@ diversity. Each candidate is a complete implementation file.
 
 from __future__ import annotations
 
+import hashlib
+import json
+import threading
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Any
 
@@ -50,6 +54,9 @@ class HyperParams:
     temperature: float | None = None
     chain: bool = False
     test_subset_size: int | None = None
+    # Stop generating and scoring candidates once one scores at least
+    # this on the generated tests (1.0 = only on a perfect score).
+    early_stop: float | None = None
 
     def validate(self) -> None:
         """Raise ``ValueError`` on invalid combinations."""
@@ -66,6 +73,10 @@ class HyperParams:
             raise ValueError(
                 f"test_subset_size must be >= 1, got {self.test_subset_size}"
             )
+        if self.early_stop is not None and not 0.0 < self.early_stop <= 1.0:
+            raise ValueError(
+                f"early_stop must be in (0.0, 1.0], got {self.early_stop}"
+            )
 
 
 def _build_chain_context(prior_solutions: list[str]) -> str:
@@ -117,21 +128,31 @@ def _build_prompt(exercise: Exercise, variant: str, tests: str = "") -> str:
     return "\n".join(parts)
 
 
-def generate_candidates(
-    exercise: Exercise,
-    runner: Runner,
-    model: str,
-    *,
-    num_candidates: int = 8,
-    temperatures: list[float] | None = None,
-    tests: str = "",
-    hyper: HyperParams | None = None,
-) -> list[Candidate]:
-    """Generate N candidate solutions for an exercise.
+def prompt_fingerprint(exercise: Exercise, variant: str, temperature: float,
+                       tests: str = "") -> str:
+    """Hash of everything sent for one candidate request.
 
-    Distributes candidates across temperature values and prompt variants
-    for diversity.  When *hyper* is provided, its overrides take precedence.
+    Changes whenever the prompt template, the exercise text or the request
+    parameters change, so it serves as the prompt version for stored
+    generations.
     """
+    payload = {
+        "prompt": _build_prompt(exercise, variant, tests=tests),
+        "temperature": temperature,
+        "extra_body": _SOLVE_EXTRA_BODY,
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _plan_requests(
+    exercise: Exercise,
+    num_candidates: int,
+    temperatures: list[float] | None,
+    tests: str,
+    hyper: HyperParams | None,
+) -> tuple[list[tuple[str, float]], list[tuple[list[dict[str, str]], float]]]:
+    """Per-candidate (variant, temperature) specs and their chat requests."""
     if temperatures is None:
         if hyper and hyper.temperature is not None:
             temperatures = [hyper.temperature] * num_candidates
@@ -153,7 +174,6 @@ def generate_candidates(
                 for _ in range(num_candidates)
             ]
 
-    # Build per-candidate specs
     request_specs: list[tuple[str, float]] = []  # (variant, temperature)
     requests: list[tuple[list[dict[str, str]], float]] = []
     for i in range(num_candidates):
@@ -165,31 +185,63 @@ def generate_candidates(
         prompt = _build_prompt(exercise, variant, tests=candidate_tests)
         request_specs.append((variant, temp))
         requests.append(([{"role": "user", "content": prompt}], temp))
+    return request_specs, requests
+
+
+def _iter_chain(
+    runner: Runner,
+    model: str,
+    request_specs: list[tuple[str, float]],
+    requests: list[tuple[list[dict[str, str]], float]],
+    cancel: threading.Event | None = None,
+) -> Iterator[Candidate]:
+    """Generate sequentially, each candidate seeing the prior solutions."""
+    prior_solutions: list[str] = []
+    for (variant, temp), (msgs, _) in zip(request_specs, requests):
+        if cancel is not None and cancel.is_set():
+            return
+        if prior_solutions:
+            chain_suffix = _build_chain_context(prior_solutions)
+            msgs = [{"role": "user", "content": msgs[0]["content"] + chain_suffix}]
+        result = runner.complete(model=model, messages=msgs, temperature=temp,
+                                 extra_body=_SOLVE_EXTRA_BODY,
+                                 stream=cancel is not None, cancel=cancel)
+        code = extract_code(result.content)
+        prior_solutions.append(code)
+        yield Candidate(
+            code=code,
+            temperature=temp,
+            prompt_variant=variant,
+            model=model,
+            generation_result=result,
+        )
+
+
+def generate_candidates(
+    exercise: Exercise,
+    runner: Runner,
+    model: str,
+    *,
+    num_candidates: int = 8,
+    temperatures: list[float] | None = None,
+    tests: str = "",
+    hyper: HyperParams | None = None,
+) -> list[Candidate]:
+    """Generate N candidate solutions for an exercise.
+
+    Distributes candidates across temperature values and prompt variants
+    for diversity.  When *hyper* is provided, its overrides take precedence.
+    """
+    request_specs, requests = _plan_requests(
+        exercise, num_candidates, temperatures, tests, hyper)
 
     # Chain mode: generate sequentially, each candidate sees prior solutions
     if hyper and hyper.chain:
-        candidates: list[Candidate] = []
-        prior_solutions: list[str] = []
-        for (variant, temp), (msgs, _) in zip(request_specs, requests):
-            if prior_solutions:
-                chain_suffix = _build_chain_context(prior_solutions)
-                msgs = [{"role": "user", "content": msgs[0]["content"] + chain_suffix}]
-            result = runner.complete(model=model, messages=msgs, temperature=temp,
-                                       extra_body=_SOLVE_EXTRA_BODY)
-            code = extract_code(result.content)
-            prior_solutions.append(code)
-            candidates.append(Candidate(
-                code=code,
-                temperature=temp,
-                prompt_variant=variant,
-                model=model,
-                generation_result=result,
-            ))
-        return candidates
+        return list(_iter_chain(runner, model, request_specs, requests))
 
     # Default: parallel batch generation
     gen_results = runner.complete_batch(model=model, requests=requests,
-                                           extra_body=_SOLVE_EXTRA_BODY)
+                                        extra_body=_SOLVE_EXTRA_BODY)
 
     candidates = []
     for (variant, temp), result in zip(request_specs, gen_results):
@@ -203,3 +255,43 @@ def generate_candidates(
         ))
 
     return candidates
+
+
+def iter_candidates(
+    exercise: Exercise,
+    runner: Runner,
+    model: str,
+    *,
+    num_candidates: int = 8,
+    temperatures: list[float] | None = None,
+    tests: str = "",
+    hyper: HyperParams | None = None,
+    cancel: threading.Event | None = None,
+) -> Iterator[Candidate]:
+    """Yield the candidates of :func:`generate_candidates` as each finishes.
+
+    Candidates arrive in completion order, so callers can start scoring
+    before the slowest generation is done.  Setting *cancel* stops the
+    remaining generations: ones not yet started are never yielded, and
+    ones cut off mid-stream are yielded with
+    ``generation_result.stats.cancelled`` set (their tokens were spent).
+    """
+    request_specs, requests = _plan_requests(
+        exercise, num_candidates, temperatures, tests, hyper)
+
+    if hyper and hyper.chain:
+        yield from _iter_chain(runner, model, request_specs, requests, cancel)
+        return
+
+    for i, result in runner.complete_iter(model=model, requests=requests,
+                                          extra_body=_SOLVE_EXTRA_BODY,
+                                          stream=cancel is not None,
+                                          cancel=cancel):
+        variant, temp = request_specs[i]
+        yield Candidate(
+            code=extract_code(result.content),
+            temperature=temp,
+            prompt_variant=variant,
+            model=model,
+            generation_result=result,
+        )
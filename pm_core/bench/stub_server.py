@@ -0,0 +1,279 @@
+"""Stub OpenAI-compatible inference server for bench tests.
+
+A small in-process HTTP/1.1 server that answers ``/v1/models`` and
+``/v1/chat/completions`` with canned responses, so the bench runner's
+network path (connection pooling, concurrency limits, error handling) can
+be exercised without a real llama.cpp / vLLM backend.
+
+The server keeps connections alive and records what the client did:
+``connections`` counts accepted TCP connections, ``requests`` counts
+completion requests received, and ``max_concurrent`` is the largest number of
+requests it was handling at the same moment.
+
+``"stream": true`` requests get server-sent events with one delta per
+whitespace-delimited token of the reply.  ``tokens_streamed`` counts the
+deltas actually written and ``cancelled`` the streams the client hung up
+on, so early-stop behaviour can be asserted.  ``reply`` may also be a
+function of the request payload, to answer requests differently.
+
+Typical use::
+
+    with StubInferenceServer(reply="hello") as server:
+        runner = Runner.create(base_url=server.url)
+        runner.complete(model="stub", messages=[...])
+        assert server.connections == 1
+"""
+
+import json
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # second one waits on the client's delayed ACK.
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stub._on_connect(self.connection)
+
+    def finish(self) -> None:
+        self.server.stub._on_disconnect(self.connection)
+        super().finish()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def _send_json(self, status: int, obj: Any) -> None:
+        body = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        stub = self.server.stub
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"data": [{"id": m} for m in stub.models]})
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send_json(404, {"error": "not found"})
+            return
+        stub._enter()
+        try:
+            if stub.delay:
+                time.sleep(stub.delay)
+            status = stub._next_status()
+            if status >= 400:
+                self._send_json(status, {"error": "stub failure"})
+                return
+            if payload.get("stream"):
+                self._send_stream(payload)
+            else:
+                self._send_json(200, stub.completion(payload))
+        finally:
+            stub._leave()
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send_event(self, obj: Any) -> None:
+        self._write_chunk(b"data: " + json.dumps(obj).encode() + b"\n\n")
+
+    def _send_stream(self, payload: dict[str, Any]) -> None:
+        stub = self.server.stub
+        model = payload.get("model", stub.models[0])
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        tokens = stub.reply_tokens(payload)
+        try:
+            for tok in tokens:
+                if stub.token_delay:
+                    time.sleep(stub.token_delay)
+                self._send_event({
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": tok},
+                                 "finish_reason": None}],
+                })
+                stub._on_token()
+            self._send_event({
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            })
+            if (payload.get("stream_options") or {}).get("include_usage"):
+                usage = stub.completion(payload)["usage"]
+                self._send_event({"model": model, "choices": [], "usage": usage})
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            stub._on_cancel()
+            self.close_connection = True
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    stub: "StubInferenceServer"
+
+
+class StubInferenceServer:
+    """In-process OpenAI-compatible server on an ephemeral localhost port.
+
+    Args:
+        reply: Assistant message content returned for every completion,
+            or a function mapping the request payload to it.
+        models: Model IDs listed by ``/v1/models``.
+        delay: Seconds each completion request sleeps before replying,
+            useful for observing client-side concurrency.
+        token_delay: Seconds between streamed deltas.
+    """
+
+    def __init__(self, reply: str | Callable[[dict[str, Any]], str] = "ok", *, models: list[str] | None = None,
+                 delay: float = 0.0, token_delay: float = 0.0):
+        self.reply = reply
+        self.models = models or ["stub"]
+        self.delay = delay
+        self.token_delay = token_delay
+        self.connections = 0
+        self.requests = 0
+        self.max_concurrent = 0
+        self.tokens_streamed = 0
+        self.cancelled = 0
+        self._active = 0
+        self._statuses: list[int] = []
+        self._sockets: set[socket.socket] = set()
+        self._lock = threading.Lock()
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("stub server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, status: int = 500, count: int = 1) -> None:
+        """Answer the next *count* completion requests with *status*."""
+        with self._lock:
+            self._statuses.extend([status] * count)
+
+    def drop_connections(self) -> None:
+        """Close every open client connection, as an idle timeout would."""
+        with self._lock:
+            sockets = list(self._sockets)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def reply_for(self, payload: dict[str, Any] | None = None) -> str:
+        """The assistant content for a request with *payload*."""
+        if callable(self.reply):
+            return self.reply(payload or {})
+        return self.reply
+
+    def reply_tokens(self, payload: dict[str, Any] | None = None) -> list[str]:
+        """Split the reply into stream deltas, keeping all whitespace."""
+        return re.findall(r"\s*\S+|\s+$", self.reply_for(payload))
+
+    def completion(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Build the response body for a chat completion request."""
+        prompt_tokens = sum(
+            len(str(m.get("content", "")).split())
+            for m in payload.get("messages", [])
+        )
+        reply = self.reply_for(payload)
+        completion_tokens = len(self.reply_tokens(payload))
+        return {
+            "id": f"stub-{self.requests}",
+            "object": "chat.completion",
+            "model": payload.get("model", self.models[0]),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def start(self) -> "StubInferenceServer":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.stub = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="pm-bench-stub",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "StubInferenceServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # -- bookkeeping, called from handler threads --------------------------
+
+    def _on_connect(self, sock: socket.socket) -> None:
+        with self._lock:
+            self.connections += 1
+            self._sockets.add(sock)
+
+    def _on_disconnect(self, sock: socket.socket) -> None:
+        with self._lock:
+            self._sockets.discard(sock)
+
+    def _on_token(self) -> None:
+        with self._lock:
+            self.tokens_streamed += 1
+
+    def _on_cancel(self) -> None:
+        with self._lock:
+            self.cancelled += 1
+
+    def _next_status(self) -> int:
+        with self._lock:
+            return self._statuses.pop(0) if self._statuses else 200
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._active += 1
+            self.requests += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+
+    def _leave(self) -> None:
+        with self._lock:
+            self._active -= 1
@@ -0,0 +1,443 @@
+"""Scaffold materialization and persistent build workspaces for scoring.
+
+``execute_tests`` used to ``copytree`` the exercise scaffold into a fresh
+temp dir for every candidate, so compiled languages rebuilt everything —
+CMake configure, Catch's test main, the Gradle project, the crate — each
+time.  This module avoids both costs:
+
+- **Linked scaffolds.**  :func:`materialize` clones scaffold files
+  copy-on-write where the filesystem supports reflinks, and otherwise
+  hardlinks the ones that are already read-only, so a candidate cannot
+  edit the cached scaffold through the link; writable files are copied.
+  Files a run overwrites (the solution and test file) are always replaced
+  with a new inode via :meth:`Workspace.write`.  Small manifests that
+  build tools may rewrite in place (``Cargo.lock``, ``go.sum``...) are
+  copied rather than linked.
+
+- **Persistent build slots.**  For Go, Rust, C++ and Java the workspace is
+  a leased, reusable directory under ``~/.cache/pm-bench/workspaces``, one
+  set of slots per exercise, holding a private copy of the scaffold.
+  Build output (``build/``, Cargo's target dir, Gradle's caches) survives
+  between candidates, so each run only recompiles what the new solution
+  touched.  On lease, the source tree is reset against the manifest
+  recorded before the previous run: files it created are removed, and
+  files it changed or deleted are restored from the scaffold as fresh
+  copies (new mtime, so make/cargo notice).  A slot is wiped if the
+  scaffold changes or a run times out mid-build.
+
+Per-language tool caches (Go build cache, ccache when installed) are
+shared across all exercises via :meth:`WorkspacePool.env`; those tools
+bound their own caches.  Gradle needs no override: ``--build-cache``
+already shares task outputs through the user's ``~/.gradle``.  Cargo's
+target dir stays per slot rather than shared, because cargo holds an
+exclusive lock on it for a whole build and a shared one would serialize
+concurrent scoring.  Slots unused for
+:data:`DEFAULT_MAX_AGE_DAYS` are evicted when the default pool is created,
+and ``pm bench clean`` evicts by age or total size on demand.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
+
+from pm_core.bench.exercises import Exercise
+
+# Languages whose build state is worth keeping between candidates.
+PERSISTENT_LANGUAGES = frozenset({"go", "rust", "cpp", "java"})
+
+# Build output in a scaffold is never linked: tools rewrite it in place.
+_SKIP_TOP_LEVEL = frozenset({"build", "target", ".gradle"})
+_SKIP_ANYWHERE = frozenset({"__pycache__", ".pytest_cache"})
+
+# Manifests and lockfiles that build tools may rewrite in place.
+_COPY_NAMES = frozenset({
+    "Cargo.lock", "Cargo.toml", "go.mod", "go.sum", "package.json",
+    "package-lock.json", "CMakeLists.txt", "build.gradle", "settings.gradle",
+    "build.gradle.kts", "settings.gradle.kts",
+})
+
+_STATE_FILE = "state.json"
+_LOCK_FILE = ".lock"
+
+# Slots unused for this long are evicted when the default pool is created.
+DEFAULT_MAX_AGE_DAYS = 14
+
+# linux/fs.h FICLONE: share the source's extents, copy-on-write.
+_FICLONE = 0x40049409
+_WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """Clone *src* to *dst* copy-on-write; False if unsupported here."""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(dst)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def _place(src: str, dst: str, link: bool) -> None:
+    if os.path.basename(src) not in _COPY_NAMES and _reflink(src, dst):
+        return
+    # A hardlink shares the scaffold's inode, so only files that are
+    # already read-only are linked; changing a link's mode would change
+    # the scaffold's too.
+    if (link and os.path.basename(src) not in _COPY_NAMES
+            and not os.stat(src).st_mode & _WRITE_BITS):
+        try:
+            os.link(src, dst)
+        except OSError:
+            pass
+        else:
+            return
+    shutil.copy2(src, dst)
+
+
+def _walk(root: str) -> Iterator[tuple[str, list[str], list[str]]]:
+    """``os.walk`` over a source tree, pruning build output.
+
+    Yields ``(rel_dir, dirnames, entries)`` where *entries* are files and
+    symlinks (including symlinked directories, which are not descended).
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel = os.path.relpath(dirpath, root)
+        skip = _SKIP_ANYWHERE | (_SKIP_TOP_LEVEL if rel == "." else frozenset())
+        links = [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]
+        dirnames[:] = [d for d in dirnames if d not in skip and d not in links]
+        yield rel, dirnames, filenames + links
+
+
+def _join(rel_dir: str, name: str) -> str:
+    return name if rel_dir == "." else os.path.join(rel_dir, name)
+
+
+def materialize(src: Path, dst: Path, *, link: bool = True) -> None:
+    """Recreate the scaffold tree *src* at *dst*.
+
+    Files are reflinked where possible.  Otherwise, with *link* read-only
+    files are hardlinked and the rest copied; without it (persistent
+    slots, whose files live on across runs) every file is copied.
+    """
+    src_s = str(src)
+    for rel, _dirnames, entries in _walk(src_s):
+        out_dir = dst if rel == "." else dst / rel
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for name in entries:
+            s = os.path.join(src_s, _join(rel, name))
+            if os.path.islink(s):
+                os.symlink(os.readlink(s), out_dir / name)
+            else:
+                _place(s, str(out_dir / name), link)
+
+
+def _manifest(root: Path) -> dict[str, list[int]]:
+    """``rel -> [inode, size, mtime_ns]`` for every source file under *root*."""
+    root_s = str(root)
+    out = {}
+    for rel, _dirnames, entries in _walk(root_s):
+        for name in entries:
+            path = _join(rel, name)
+            try:
+                st = os.lstat(os.path.join(root_s, path))
+            except OSError:
+                continue
+            out[path] = [st.st_ino, st.st_size, st.st_mtime_ns]
+    return out
+
+
+def scaffold_fingerprint(src: Path) -> str:
+    """Hash of the scaffold's file names, sizes and mtimes."""
+    h = hashlib.sha1()
+    for dirpath, dirnames, filenames in os.walk(src):
+        dirnames.sort()
+        for name in sorted(filenames):
+            p = os.path.join(dirpath, name)
+            try:
+                st = os.lstat(p)
+            except OSError:
+                continue
+            h.update(f"{os.path.relpath(p, src)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+class Workspace:
+    """A materialized scaffold a single test run may modify."""
+
+    def __init__(self, path: Path, scaffold: Path, env: dict[str, str]):
+        self.path = path
+        self.scaffold = scaffold
+        self.env = env
+        self.discarded = False
+        self.reused = False
+        self.fingerprint: str | None = None
+        self.manifest: dict[str, list[int]] = {}
+
+    def write(self, rel: str | Path, text: str) -> Path:
+        """Write *text* to *rel* as a new file, never through a hardlink."""
+        target = self.path / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.unlink(missing_ok=True)
+        target.write_text(text)
+        return target
+
+    def discard(self) -> None:
+        """Throw away this workspace's build state when released."""
+        self.discarded = True
+
+    def _reset(self, manifest: dict[str, list[int]]) -> None:
+        """Return the source tree to the scaffold as recorded in *manifest*.
+
+        Anything a run created is removed; anything it changed or deleted
+        is restored from the scaffold as a fresh copy.
+        """
+        root = str(self.path)
+        seen = set()
+        for rel, dirnames, entries in _walk(root):
+            for d in list(dirnames):
+                if not (self.scaffold / _join(rel, d)).is_dir():
+                    shutil.rmtree(os.path.join(root, _join(rel, d)))
+                    dirnames.remove(d)
+            for name in entries:
+                path = _join(rel, name)
+                seen.add(path)
+                st = os.lstat(os.path.join(root, path))
+                if manifest.get(path) != [st.st_ino, st.st_size, st.st_mtime_ns]:
+                    self._restore(path)
+        for path in manifest.keys() - seen:
+            self._restore(path)
+
+    def _restore(self, rel: str) -> None:
+        target = self.path / rel
+        if target.is_dir() and not target.is_symlink():
+            shutil.rmtree(target)
+        target.unlink(missing_ok=True)
+        original = self.scaffold / rel
+        if original.is_symlink():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.symlink(os.readlink(original), target)
+        elif original.is_file():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(original, target)
+
+
+@dataclass
+class PruneResult:
+    """What :meth:`WorkspacePool.prune` removed."""
+    slots_removed: int = 0
+    bytes_freed: int = 0
+
+
+def _disk_usage(path: Path) -> int:
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            with contextlib.suppress(OSError):
+                total += os.lstat(os.path.join(dirpath, name)).st_blocks * 512
+    return total
+
+
+class WorkspacePool:
+    """Leases workspaces for ``execute_tests`` runs.
+
+    Thread- and process-safe: persistent slots are claimed with an
+    exclusive ``flock``; a run that finds every slot of an exercise busy
+    gets a new one, so the number of slots tracks peak concurrency.
+    """
+
+    def __init__(self, root: Path | None = None):
+        if root is None:
+            from pm_core.paths import bench_cache_dir
+            root = bench_cache_dir() / "workspaces"
+        self.root = root
+
+    def env(self, language: str, slot: Path | None = None) -> dict[str, str]:
+        """Environment overrides pointing build tools at persistent caches."""
+        caches = self.root / ".caches"
+        if language == "go":
+            (caches / "go-build").mkdir(parents=True, exist_ok=True)
+            return {"GOCACHE": str(caches / "go-build")}
+        if language == "rust" and slot is not None:
+            # Per slot: cargo locks its target dir for the whole build.
+            return {"CARGO_TARGET_DIR": str(slot / "target")}
+        if language == "cpp" and shutil.which("ccache"):
+            (caches / "ccache").mkdir(parents=True, exist_ok=True)
+            return {
+                "CMAKE_C_COMPILER_LAUNCHER": "ccache",
+                "CMAKE_CXX_COMPILER_LAUNCHER": "ccache",
+                "CCACHE_DIR": str(caches / "ccache"),
+            }
+        return {}
+
+    @contextlib.contextmanager
+    def lease(self, exercise: Exercise) -> Iterator[Workspace]:
+        """Yield a workspace holding *exercise*'s scaffold."""
+        if exercise.language in PERSISTENT_LANGUAGES and fcntl is not None:
+            with self._persistent(exercise) as ws:
+                yield ws
+            return
+        with tempfile.TemporaryDirectory(
+            prefix=f"pm-bench-{exercise.language}-"
+        ) as tmp:
+            work = Path(tmp)
+            materialize(exercise.path, work)
+            yield Workspace(work, exercise.path, self.env(exercise.language))
+
+    def _slot_base(self, exercise: Exercise) -> Path:
+        scaffold = str(Path(exercise.path).resolve())
+        digest = hashlib.sha1(scaffold.encode()).hexdigest()[:12]
+        return self.root / exercise.language / f"{exercise.slug}-{digest}"
+
+    @contextlib.contextmanager
+    def _persistent(self, exercise: Exercise) -> Iterator[Workspace]:
+        base = self._slot_base(exercise)
+        index = 0
+        while True:
+            slot = base / f"slot-{index}"
+            slot.mkdir(parents=True, exist_ok=True)
+            lock = open(slot / _LOCK_FILE, "a+")
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                lock.close()
+                index += 1
+        try:
+            ws = self._prepare(exercise, slot)
+            try:
+                yield ws
+            except BaseException:
+                ws.discard()
+                raise
+            finally:
+                self._finish(slot, ws)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+            lock.close()
+
+    def _prepare(self, exercise: Exercise, slot: Path) -> Workspace:
+        work = slot / "work"
+        fingerprint = scaffold_fingerprint(exercise.path)
+        try:
+            state = json.loads((slot / _STATE_FILE).read_text())
+        except (OSError, ValueError):
+            state = {}
+        ws = Workspace(work, exercise.path, self.env(exercise.language, slot))
+        ws.reused = (state.get("fingerprint") == fingerprint and work.is_dir()
+                     and "files" in state)
+        if ws.reused:
+            ws._reset(state["files"])
+        else:
+            self._wipe(slot)
+            materialize(exercise.path, work, link=False)
+        # Recorded before the run so a crash mid-run still wipes the slot.
+        (slot / _STATE_FILE).write_text(json.dumps({"fingerprint": None}))
+        ws.fingerprint = fingerprint
+        ws.manifest = _manifest(work)
+        return ws
+
+    def _finish(self, slot: Path, ws: Workspace) -> None:
+        if ws.discarded:
+            self._wipe(slot)
+            return
+        # The state file's mtime doubles as the slot's last use for prune().
+        (slot / _STATE_FILE).write_text(json.dumps({
+            "fingerprint": ws.fingerprint,
+            "files": ws.manifest,
+        }))
+
+    def prune(self, *, max_age_days: float | None = None,
+              max_bytes: int | None = None) -> PruneResult:
+        """Evict persistent slots, skipping any currently leased.
+
+        Removes slots unused for more than *max_age_days*, then the least
+        recently used ones until the slots fit in *max_bytes*.
+        """
+        result = PruneResult()
+        if fcntl is None or not self.root.is_dir():
+            return result
+        slots = []
+        for slot in self.root.glob("*/*/slot-*"):
+            try:
+                last_use = (slot / _STATE_FILE).stat().st_mtime
+            except OSError:
+                last_use = slot.stat().st_mtime
+            slots.append((last_use, slot))
+        slots.sort()
+        sizes = {slot: _disk_usage(slot) for _, slot in slots}
+        total = sum(sizes.values())
+        cutoff = (time.time() - max_age_days * 86400
+                  if max_age_days is not None else None)
+        for last_use, slot in slots:
+            expired = cutoff is not None and last_use < cutoff
+            oversize = max_bytes is not None and total > max_bytes
+            if not (expired or oversize):
+                continue
+            if self._remove_slot(slot):
+                result.slots_removed += 1
+                result.bytes_freed += sizes[slot]
+                total -= sizes[slot]
+        return result
+
+    def clear(self) -> PruneResult:
+        """Remove every idle slot and the shared tool caches."""
+        result = self.prune(max_bytes=0)
+        caches = self.root / ".caches"
+        if caches.is_dir():
+            result.bytes_freed += _disk_usage(caches)
+            shutil.rmtree(caches, ignore_errors=True)
+        return result
+
+    @staticmethod
+    def _remove_slot(slot: Path) -> bool:
+        try:
+            lock = open(slot / _LOCK_FILE, "a+")
+        except OSError:
+            return False
+        with lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False  # leased right now
+            shutil.rmtree(slot, ignore_errors=True)
+        with contextlib.suppress(OSError):
+            slot.parent.rmdir()  # last slot of its exercise
+        return True
+
+    @staticmethod
+    def _wipe(slot: Path) -> None:
+        (slot / _STATE_FILE).unlink(missing_ok=True)
+        for name in ("work", "target"):
+            shutil.rmtree(slot / name, ignore_errors=True)
+
+
+_default_pool: WorkspacePool | None = None
+
+
+def default_workspaces() -> WorkspacePool:
+    """The process-wide pool used by ``execute_tests``."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = WorkspacePool()
+        _default_pool.prune(max_age_days=DEFAULT_MAX_AGE_DAYS)
+    return _default_pool
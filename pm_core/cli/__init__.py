@@ -259,10 +259,15 @@ def which_cmd():
 _BOOLEAN_SETTINGS = {"hide-assist", "hide-merged", "beginner-mode", "auto-cleanup",
                      "qa-verify-pass"}
 _INT_SETTINGS = {"min-pane-width", "mobile-width-threshold",
-                 "qa-max-scenarios", "qa-verify-retries",
-                 "qa-verdict-reminder-timeout"}
+                 "qa-max-scenarios", "qa-host-max-scenarios", "qa-verify-retries",
+                 "qa-concretize-parallel", "qa-max-memory-pressure",
+                 "qa-max-cpu-pressure",
+                 "qa-verdict-reminder-timeout", "qa-container-pool",
+                 "git-mirror-interval"}
 _ENUM_SETTINGS = {"spec-mode": {"auto", "review", "prompt"},
-                  "container-runtime": {"docker", "podman"}}
+                  "container-runtime": {"docker", "podman"},
+                  "workdir-provider": {"auto", "clone", "reflink"},
+                  "container-deps-image": {"auto", "wait", "off"}}
 _SETTING_DEFAULTS = {
     "hide-assist": "off",
     "hide-merged": "off",
@@ -272,9 +277,17 @@ _SETTING_DEFAULTS = {
     "min-pane-width": "100",
     "mobile-width-threshold": "110",
     "qa-max-scenarios": "(unset)",
+    "qa-host-max-scenarios": "0",
+    "qa-concretize-parallel": "8",
+    "qa-max-memory-pressure": "10",
+    "qa-max-cpu-pressure": "0",
     "qa-verify-retries": "(unset)",
     "qa-verdict-reminder-timeout": "(unset)",
+    "qa-container-pool": "0",
+    "git-mirror-interval": "30",
     "spec-mode": "prompt",
+    "workdir-provider": "auto",
+    "container-deps-image": "auto",
 }
 _LIST_ALIASES = {"list", "ls", "l"}
 
@@ -322,14 +335,43 @@ def set_cmd(setting, value):
 
       qa-max-scenarios     Max QA scenarios to run (0 = unlimited, default 0)
 
+      qa-host-max-scenarios  Max QA scenarios running at once across all PRs on this
+                             host; queued scenarios are admitted by dependency
+                             priority and wait time (0 = no host limit, default 0)
+
+      qa-concretize-parallel  QA scenario refiners run at once (0 = unlimited,
+                              default 8)
+
+      qa-max-memory-pressure  Hold queued QA scenarios while host memory pressure
+                              (PSI some avg10, %) is above this (0 = off, default 10)
+
+      qa-max-cpu-pressure  Hold queued QA scenarios while host CPU pressure
+                           (PSI some avg10, %) is above this (0 = off, default 0)
+
       qa-verify-retries    Max verification retries before marking NEEDS_WORK (default 3)
 
       qa-verdict-reminder-timeout  Seconds of pane silence before sending a verdict-format
                                    reminder to a scenario agent (0 or unset = disabled)
 
+      qa-container-pool    Warm containers kept ready for container-mode QA scenarios
+                           (0 = no pool, default 0)
+
+      git-mirror-interval  Seconds the push proxy serves container fetches from its
+                           shared upstream mirror before refreshing it
+                           (0 = fetch upstream directly, default 30)
+
       qa-verify-pass       Enable/disable PASS verdict verification (on/off, default on)
 
       spec-mode            Spec generation mode: auto, review, or prompt (default: prompt)
+
+      workdir-provider     How QA scenario and PR workdirs are copied from a local repo:
+                           auto, clone, or reflink (default: auto — reflink where the
+                           filesystem supports it, otherwise git clone --local)
+
+      container-deps-image  Per-repo image with the project's dependencies installed,
+                            rebuilt when a lockfile changes: auto (build in the
+                            background, use the base image meanwhile), wait (build
+                            before the first container), or off (default: auto)
     """
     if setting in _LIST_ALIASES:
         _list_settings()
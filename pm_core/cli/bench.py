@@ -148,19 +148,47 @@ def bench_exercises(language, source, difficulty, hard, mode):
               help="Generate sequentially; each candidate sees prior solutions")
 @click.option("--test-subsets", type=int, default=None,
               help="Each candidate gets a random sample of N test functions")
+@click.option("--early-stop", type=click.FloatRange(0.0, 1.0, min_open=True),
+              default=None,
+              help="Stop generating and scoring candidates once one scores "
+                   "at least this on the generated tests (e.g. 1.0)")
 @click.option("-j", "--parallel", type=click.IntRange(min=1), default=1,
               help="Number of exercises to run concurrently (default: 1)")
 @click.option("--hard", is_flag=True, default=False,
               help="BigCodeBench: use the 148-problem hard subset")
 @click.option("--mode", type=click.Choice(["complete", "instruct"]),
               default="instruct", help="BigCodeBench: prompt mode")
+@click.option("--max-in-flight", type=click.IntRange(min=1), default=16,
+              help="Max concurrent LLM requests to the server (default: 16)")
+@click.option("--max-test-workers", type=click.IntRange(min=1), default=None,
+              help="Max concurrent test executions (default: CPU count)")
+@click.option("--stop-after-code", is_flag=True, default=False,
+              help="Stream generations and cut each one off once its leading "
+                   "code block closes")
+@click.option("--no-score-cache", is_flag=True, default=False,
+              help="Re-run every candidate instead of reusing cached scores")
+@click.option("--checkpoint", "checkpoint_path", default=None,
+              help="JSONL file recording progress (default: one per run "
+                   "configuration under ~/.cache/pm-bench/checkpoints)")
+@click.option("--resume", is_flag=True, default=False,
+              help="Continue an interrupted run from its checkpoint")
+@click.option("--fresh", is_flag=True, default=False,
+              help="Start over, discarding an unfinished run's checkpoint")
+@click.option("--no-baseline-store", is_flag=True, default=False,
+              help="Generate baselines fresh and do not store them")
+@click.option("--refresh-baselines", is_flag=True, default=False,
+              help="Regenerate this run's stored baselines")
 def bench_run(model, candidates, languages, exercise_filter, output_path,
               source, difficulty, variant, temperature, chain, test_subsets,
-              parallel, hard, mode):
+              early_stop, parallel, hard, mode, max_in_flight, max_test_workers,
+              stop_after_code, no_score_cache, checkpoint_path, resume, fresh, no_baseline_store,
+              refresh_baselines):
     """Run benchmark with tournament selection.
 
     MODEL is the model name as reported by the backend's /v1/models endpoint.
     """
+    from pm_core.bench.baseline_store import BaselineStore
+    from pm_core.bench.checkpoint import CheckpointExists
     from pm_core.bench.orchestrator import (
         format_results_table,
         run_benchmark,
@@ -168,14 +196,19 @@ def bench_run(model, candidates, languages, exercise_filter, output_path,
     )
     from pm_core.bench.solve import HyperParams
 
+    if resume and fresh:
+        raise click.UsageError("--resume and --fresh are mutually exclusive")
+
     # Build and validate hyperparams
     hyper = None
-    if any(v is not None for v in (variant, temperature, test_subsets)) or chain:
+    if any(v is not None
+           for v in (variant, temperature, test_subsets, early_stop)) or chain:
         hyper = HyperParams(
             variant=variant,
             temperature=temperature,
             chain=chain,
             test_subset_size=test_subsets,
+            early_stop=early_stop,
         )
         hyper.validate()
 
@@ -188,6 +221,8 @@ def bench_run(model, candidates, languages, exercise_filter, output_path,
             parts.append("chain=on")
         if test_subsets:
             parts.append(f"test_subsets={test_subsets}")
+        if early_stop is not None:
+            parts.append(f"early_stop={early_stop}")
         click.echo(f"Hyperparams: {', '.join(parts)}")
 
     if source == "bigcodebench":
@@ -200,19 +235,46 @@ def bench_run(model, candidates, languages, exercise_filter, output_path,
     def on_progress(msg):
         print(f"  {msg}", flush=True)
 
-    run = run_benchmark(
-        model,
-        num_candidates=candidates,
-        source=source,
-        languages=list(languages) if languages else None,
-        slugs=[exercise_filter] if exercise_filter else None,
-        difficulty=difficulty,
-        hyper=hyper,
-        parallel=parallel,
-        hard=hard,
-        mode=mode,
-        progress_callback=on_progress,
-    )
+    if checkpoint_path is None:
+        from pm_core.bench.checkpoint import default_checkpoint_path
+        from pm_core.bench.orchestrator import run_params
+        checkpoint = default_checkpoint_path(run_params(
+            model, candidates, source=source,
+            languages=list(languages) if languages else None,
+            slugs=[exercise_filter] if exercise_filter else None,
+            difficulty=difficulty, hyper=hyper, hard=hard, mode=mode,
+        ))
+    else:
+        checkpoint = Path(checkpoint_path)
+    if resume and not checkpoint.exists():
+        raise click.ClickException(f"No checkpoint to resume at {checkpoint}")
+    click.echo(f"Checkpoint: {checkpoint}")
+
+    try:
+        run = run_benchmark(
+            model,
+            num_candidates=candidates,
+            source=source,
+            languages=list(languages) if languages else None,
+            slugs=[exercise_filter] if exercise_filter else None,
+            difficulty=difficulty,
+            hyper=hyper,
+            parallel=parallel,
+            hard=hard,
+            mode=mode,
+            max_in_flight=max_in_flight,
+            max_test_workers=max_test_workers,
+            stop_after_code=stop_after_code,
+            use_score_cache=not no_score_cache,
+            checkpoint_path=checkpoint,
+            resume=resume,
+            fresh=fresh,
+            baseline_store=None if no_baseline_store else BaselineStore(),
+            refresh_baselines=refresh_baselines,
+            progress_callback=on_progress,
+        )
+    except CheckpointExists as exc:
+        raise click.ClickException(str(exc)) from None
 
     click.echo("")
     click.echo(format_results_table(run))
@@ -221,3 +283,53 @@ def bench_run(model, candidates, languages, exercise_filter, output_path,
         out = Path(output_path)
         save_results_json(run, out)
         click.echo(f"\nResults saved to {out}")
+
+
+@bench.command("baselines")
+@click.option("--model", default=None, help="Limit to one model")
+@click.option("--clear", is_flag=True, default=False,
+              help="Delete the stored baselines")
+def bench_baselines(model, clear):
+    """Show or clear stored single-pass baselines."""
+    from pm_core.bench.baseline_store import BaselineStore
+
+    store = BaselineStore()
+    if clear:
+        removed = store.invalidate(model)
+        click.echo(f"Removed {removed} stored baseline(s)")
+        return
+    counts = store.counts(model)
+    if not counts:
+        click.echo("No stored baselines")
+        return
+    for name, n in sorted(counts.items()):
+        click.echo(f"  {name}: {n}")
+
+
+@bench.command("clean")
+@click.option("--older-than", "older_than", type=click.FloatRange(min=0),
+              default=None, help="Evict build workspaces unused for this many days")
+@click.option("--max-size", "max_size_gb", type=click.FloatRange(min=0),
+              default=None, help="Evict least recently used workspaces down to this many GB")
+@click.option("--all", "clean_all", is_flag=True, default=False,
+              help="Remove every idle workspace and the shared build caches")
+def bench_clean(older_than, max_size_gb, clean_all):
+    """Evict persistent build workspaces kept between candidates.
+
+    Without options, removes workspaces unused for the default age.
+    Workspaces leased by a running benchmark are never removed.
+    """
+    from pm_core.bench.workspace import DEFAULT_MAX_AGE_DAYS, WorkspacePool
+
+    pool = WorkspacePool()
+    if clean_all:
+        result = pool.clear()
+    else:
+        if older_than is None and max_size_gb is None:
+            older_than = DEFAULT_MAX_AGE_DAYS
+        result = pool.prune(
+            max_age_days=older_than,
+            max_bytes=None if max_size_gb is None else int(max_size_gb * 1e9),
+        )
+    click.echo(f"Removed {result.slots_removed} workspace(s), "
+               f"freed {result.bytes_freed / 1e6:.1f} MB")
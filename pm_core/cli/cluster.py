@@ -28,48 +28,27 @@ def _run_clustering(
     threshold: float = 0.15,
     max_commits: int = 500,
     verbose: bool = True,
+    spill=None,
 ) -> tuple[list, list, dict]:
     """Extract chunks, partition, cluster, and return (clusters, chunks, chunk_map).
 
+    Partitions are clustered one at a time; when *spill* (an
+    ``EdgeSpill``) is given, each partition's edges are appended to it.
     When *verbose* is True, prints per-partition progress lines.
     """
-    from pm_core.cluster import extract_chunks, compute_edges, agglomerative_cluster, pre_partition
-    from pm_core.cluster.cluster_graph import Cluster
+    from pm_core.cluster import extract_chunks
+    from pm_core.cluster.stream import cluster_partitions
 
     click.echo(f"Extracting chunks from {repo_root} ...")
     chunks = extract_chunks(repo_root)
     click.echo(f"  {len(chunks)} chunks extracted")
 
     click.echo("Pre-partitioning ...")
-    partitions = pre_partition(chunks)
-    click.echo(f"  {len(partitions)} partitions: {', '.join(partitions.keys())}")
-
-    clusters = []
-    cluster_id = 0
-    for part_name, part_chunks in partitions.items():
-        file_count = sum(1 for c in part_chunks if c.kind in ("function", "class", "file"))
-        if file_count <= 3:
-            cluster_id += 1
-            clusters.append(Cluster(
-                id=str(cluster_id),
-                chunk_ids={c.id for c in part_chunks if c.kind in ("function", "class", "file")},
-                name=part_name,
-            ))
-            if verbose:
-                click.echo(f"  [{part_name}] {file_count} chunks → 1 cluster (small partition)")
-            continue
-
-        if verbose:
-            click.echo(f"  [{part_name}] computing edges for {len(part_chunks)} chunks ...")
-        part_edges = compute_edges(part_chunks, weights=weights, repo_root=repo_root, max_commits=max_commits)
-        part_clusters = agglomerative_cluster(part_chunks, part_edges, threshold=threshold)
-        for c in part_clusters:
-            cluster_id += 1
-            c.id = str(cluster_id)
-            c.name = f"{part_name}: {c.name}" if c.name else part_name
-        clusters.extend(part_clusters)
-        if verbose:
-            click.echo(f"  [{part_name}] {len(part_edges)} edges → {len(part_clusters)} clusters")
+    clusters = cluster_partitions(
+        chunks, weights=weights, threshold=threshold, repo_root=repo_root,
+        max_commits=max_commits, spill=spill,
+        log=click.echo if verbose else None,
+    )
 
     click.echo(f"  {len(clusters)} clusters found")
 
@@ -77,6 +56,69 @@ def _run_clustering(
     return clusters, chunks, chunk_map
 
 
+def _run_incremental_clustering(
+    repo_root: Path,
+    weights: dict[str, float],
+    threshold: float = 0.15,
+    max_commits: int = 500,
+    incremental: bool = False,
+) -> tuple[list, list, dict]:
+    """Cluster *repo_root*, reusing the cached snapshot when *incremental*.
+
+    Writes a snapshot for the next ``--incremental`` run when this run is
+    incremental, and otherwise only refreshes one that already exists, so
+    plain runs of a repo never clustered incrementally write none.  Falls
+    back to a full run when there is no cached snapshot for the same
+    parameters.
+    """
+    from pm_core.cluster.chunks import list_source_files
+    from pm_core.cluster.incremental import (
+        ClusterSnapshot, cache_path, file_hashes, load_snapshot,
+        make_params, recluster, save_snapshot,
+    )
+    from pm_core.cluster.stream import EdgeSpill
+
+    params = make_params(weights, threshold, max_commits)
+    path = cache_path(repo_root)
+    keep_snapshot = incremental or path.exists()
+
+    previous = load_snapshot(path) if incremental else None
+    if previous is not None and previous.params != params:
+        click.echo("Cached clustering used different parameters; running a full pass.")
+        previous = None
+    elif incremental and previous is None:
+        click.echo("No cached clustering found; running a full pass.")
+
+    if previous is not None:
+        click.echo(f"Re-clustering {repo_root} incrementally ...")
+        snapshot, diff = recluster(repo_root, previous)
+        if not diff.changed_files:
+            click.echo("  No files changed since the last run")
+        else:
+            click.echo(f"  {len(diff.changed_files)} files changed")
+            for line in diff.summary_lines() or ["no chunks changed cluster"]:
+                click.echo(f"  {line}")
+        save_snapshot(path, snapshot)
+        chunk_map = {c.id: c for c in snapshot.chunks}
+        return snapshot.clusters, snapshot.chunks, chunk_map
+
+    if not keep_snapshot:
+        return _run_clustering(repo_root, weights=weights, threshold=threshold,
+                               max_commits=max_commits)
+
+    with EdgeSpill() as spill:
+        clusters, chunks, chunk_map = _run_clustering(
+            repo_root, weights=weights, threshold=threshold,
+            max_commits=max_commits, spill=spill,
+        )
+        save_snapshot(path, ClusterSnapshot(
+            params=params,
+            file_hashes=file_hashes(repo_root, list_source_files(repo_root)),
+            chunks=chunks, edges=spill, clusters=clusters,
+        ))
+    return clusters, chunks, chunk_map
+
+
 @cli.group()
 def cluster():
     """Analyze codebase structure and discover feature clusters."""
@@ -90,7 +132,10 @@ def cluster():
               help="Metric weights: structural=0.2,semantic=0.3,cochange=0.2,callgraph=0.3")
 @click.option("--output", "output_fmt", default="text", type=click.Choice(["plan", "json", "text"]),
               help="Output format")
-def cluster_auto(threshold, max_commits, weights, output_fmt):
+@click.option("--incremental", is_flag=True, default=False,
+              help="Re-cluster only around files changed since the last "
+                   "run (keeps a snapshot in ~/.pm/cluster-cache)")
+def cluster_auto(threshold, max_commits, weights, output_fmt, incremental):
     """Discover feature clusters automatically."""
     from pm_core.cluster import clusters_to_plan_markdown, clusters_to_json, clusters_to_text
 
@@ -105,8 +150,9 @@ def cluster_auto(threshold, max_commits, weights, output_fmt):
             k, v = pair.split("=")
             w[k.strip()] = float(v.strip())
 
-    clusters, chunks, chunk_map = _run_clustering(
+    clusters, chunks, chunk_map = _run_incremental_clustering(
         repo_root, weights=w, threshold=threshold, max_commits=max_commits,
+        incremental=incremental,
     )
 
     if output_fmt == "text":
@@ -108,6 +108,38 @@ def container_build_base(tag: str | None):
         raise SystemExit(1)
 
 
+@container_group.command("build-deps")
+@click.option("--path", "repo", default=None, type=click.Path(file_okay=False),
+              help="Repository to build for (default: this project)")
+def container_build_deps(repo: str | None):
+    """Build this repository's dependency image now.
+
+    The image layers the project's requirements*.txt / pyproject.toml and
+    package-lock.json dependencies on top of the base image.  Containers on
+    the default image use it automatically; building it ahead of time saves
+    the first QA run from starting without it.
+    """
+    from pathlib import Path
+    from pm_core import repo_image, store
+    from pm_core.container import DEFAULT_IMAGE, build_image, image_exists
+
+    if repo is None:
+        root = state_root()
+        repo = root.parent if store.is_internal_pm_dir(root) else root
+    repo = Path(repo)
+    if not repo_image.detect_recipes(repo):
+        click.echo(f"No dependency manifests found in {repo}.")
+        return
+    if not image_exists(DEFAULT_IMAGE):
+        click.echo(f"Building base image {DEFAULT_IMAGE}...")
+        build_image(tag=DEFAULT_IMAGE, quiet=True)
+    tag = repo_image.ensure_image(repo, DEFAULT_IMAGE, wait=True)
+    if tag is None:
+        click.echo("Dependency image build failed (see pm log).", err=True)
+        raise SystemExit(1)
+    click.echo(f"Dependency image: {tag}")
+
+
 @container_group.command("build")
 @click.option("--tag", default=None, help="Image tag (default: pm-project-<name>:latest)")
 @click.option("--base", default=None, help="Base image (default: pm-dev:latest)")
@@ -266,11 +298,86 @@ on top.
 """
 
 
+@container_group.command("stats")
+@click.option("--watch", "-w", is_flag=True, help="Refresh until interrupted")
+@click.option("--interval", default=2.0, show_default=True,
+              help="Seconds between samples")
+def container_stats(watch: bool, interval: float):
+    """Show host pressure and live usage of pm containers.
+
+    Host pressure is the kernel's PSI (share of time tasks stalled on
+    CPU, memory or I/O); queued QA scenarios wait while it is above the
+    qa-max-memory-pressure / qa-max-cpu-pressure limits.  Per-container
+    memory and CPU come from each container's cgroup.
+    """
+    import time
+    from pm_core.resource_monitor import ResourceMonitor
+
+    monitor = ResourceMonitor()
+    # CPU percentages need two samples.
+    monitor.containers()
+    try:
+        while True:
+            time.sleep(interval)
+            if watch:
+                click.clear()
+            click.echo(_render_stats(monitor))
+            if not watch:
+                return
+    except KeyboardInterrupt:
+        pass
+
+
+def _render_stats(monitor) -> str:
+    from pm_core.resource_monitor import (
+        admission_blocked, format_bytes, pressure_limits,
+    )
+
+    limits = pressure_limits()
+    lines = []
+    pressure = monitor.host_pressure()
+    if pressure:
+        lines.append("Host pressure (some avg10 / avg60):")
+        for resource, psi in pressure.items():
+            some = psi.get("some", {})
+            line = (f"  {resource:<8} {some.get('avg10', 0):5.1f}% / "
+                    f"{some.get('avg60', 0):5.1f}%")
+            if resource in limits:
+                line += f"   limit {limits[resource]}%"
+            lines.append(line)
+    else:
+        lines.append("Host pressure: not available (kernel without PSI)")
+    mem = monitor.host_memory()
+    if mem:
+        lines.append(f"Host memory: {format_bytes(mem[0])} available "
+                     f"of {format_bytes(mem[1])}")
+    held = admission_blocked(monitor, limits)
+    lines.append("QA admission: " + (f"held ({', '.join(held)})" if held
+                                     else "open"))
+
+    usages = monitor.containers()
+    lines.append("")
+    if not usages:
+        lines.append("No running pm containers.")
+        return "\n".join(lines)
+    width = max(len("CONTAINER"), *(len(u.name) for u in usages))
+    lines.append(f"{'CONTAINER':<{width}}  {'MEMORY':>10}  {'LIMIT':>10}  {'CPU':>7}")
+    for u in usages:
+        cpu = "-" if u.cpu_percent is None else f"{u.cpu_percent:.1f}%"
+        lines.append(f"{u.name:<{width}}  {format_bytes(u.memory):>10}  "
+                     f"{format_bytes(u.memory_max):>10}  {cpu:>7}")
+    total_mem = sum(u.memory or 0 for u in usages)
+    total_cpu = sum(u.cpu_percent or 0 for u in usages)
+    lines.append(f"{'total':<{width}}  {format_bytes(total_mem):>10}  "
+                 f"{'':>10}  {total_cpu:>6.1f}%")
+    return "\n".join(lines)
+
+
 @container_group.command("cleanup")
 @click.option("--pr", "pr_id", default=None, help="Filter by PR ID")
 def container_cleanup(pr_id: str | None):
     """Remove stale pm containers."""
-    from pm_core.container import _run_runtime, remove_container, CONTAINER_PREFIX
+    from pm_core.container import _run_runtime, remove_containers, CONTAINER_PREFIX
 
     result = _run_runtime(
         "ps", "-a", "--filter", f"name={CONTAINER_PREFIX}",
@@ -286,7 +393,7 @@ def container_cleanup(pr_id: str | None):
         click.echo("No pm containers found.")
         return
 
-    removed = 0
+    names = []
     for line in lines:
         parts = line.split("\t", 1)
         name = parts[0].strip()
@@ -294,7 +401,7 @@ def container_cleanup(pr_id: str | None):
         if pr_id and pr_id not in name:
             continue
         click.echo(f"  Removing: {name} ({status})")
-        remove_container(name)
-        removed += 1
+        names.append(name)
 
-    click.echo(f"Removed {removed} container(s).")
+    removed = remove_containers(names)
+    click.echo(f"Removed {len(removed)} container(s).")
@@ -14,7 +14,7 @@ from pathlib import Path
 
 import click
 
-from pm_core import store, git_ops
+from pm_core import store, git_ops, workdir_provider
 from pm_core.paths import configure_logger
 from pm_core import tmux as tmux_mod
 from pm_core import pane_layout
@@ -781,8 +781,22 @@ def _clone_workdir(data: dict, pr_entry: dict, root: Path) -> str | None:
         shutil.rmtree(tmp_path)
 
     click.echo(f"Workdir missing — cloning for {pr_id}...")
+    provider = None
+    if clone_source == str(repo_dir):
+        provider = workdir_provider.select_provider(repo_dir, project_dir)
     try:
-        git_ops.clone(clone_source, tmp_path, branch=base_branch)
+        if provider is not None and provider.name != "clone":
+            # A reflink copy of the local repo writes no file data; the
+            # plain clone below remains the fallback.
+            try:
+                provider.create(repo_dir, tmp_path, branch=base_branch)
+            except Exception:
+                _log.warning("%s copy failed for PR %s; cloning instead",
+                             provider.name, pr_id, exc_info=True)
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                git_ops.clone(clone_source, tmp_path, branch=base_branch)
+        else:
+            git_ops.clone(clone_source, tmp_path, branch=base_branch)
     except Exception as exc:
         _log.warning("Failed to clone for PR %s: %s", pr_id, exc)
         click.echo(f"Failed to clone: {exc}", err=True)
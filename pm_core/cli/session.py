@@ -602,9 +602,11 @@ def session_kill(start_dir):
     session_tag = session_name.removeprefix("pm-")
     if session_tag:
         from pm_core.container import cleanup_session_containers
+        from pm_core.container_pool import remove_session_slots
         from pm_core.push_proxy import stop_session_proxies
         n_containers = cleanup_session_containers(session_tag)
         n_proxies = stop_session_proxies(session_tag)
+        remove_session_slots(session_tag)
         if n_containers or n_proxies:
             _log.info("Session kill cleanup: %d container(s), %d proxy(ies)",
                       n_containers, n_proxies)
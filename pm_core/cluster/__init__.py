@@ -1,6 +1,6 @@
 """Code clustering module — discover feature groups from codebase structure."""
 
-from pm_core.cluster.chunks import Chunk, extract_chunks
+from pm_core.cluster.chunks import Chunk, extract_chunks, register_extractor
 from pm_core.cluster.metrics import compute_edges
 from pm_core.cluster.cluster_graph import Cluster, agglomerative_cluster
 from pm_core.cluster.partition import pre_partition, classify_file
@@ -9,6 +9,7 @@ from pm_core.cluster.output import clusters_to_plan_markdown, clusters_to_json,
 __all__ = [
     "Chunk",
     "extract_chunks",
+    "register_extractor",
     "compute_edges",
     "Cluster",
     "agglomerative_cluster",
@@ -3,11 +3,110 @@
 import ast
 import re
 import subprocess
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Set
 from dataclasses import dataclass, field
 from pathlib import Path
 
 
-@dataclass
+class TokenTable:
+    """Process-wide string <-> int interning for chunk tokens."""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def intern(self, token: str) -> int:
+        i = self.ids.get(token)
+        if i is None:
+            i = self.ids[token] = len(self.strings)
+            self.strings.append(sys.intern(token))
+        return i
+
+    def lookup(self, token: str) -> int | None:
+        return self.ids.get(token)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+TOKENS = TokenTable()
+
+
+class TokenSet(Set):
+    """Immutable token set stored as a sorted ``array('I')`` of interned IDs.
+
+    Costs 4 bytes per token instead of a hash-set slot plus a string object
+    per chunk, while still behaving like a ``set[str]`` for callers.
+    """
+
+    __slots__ = ("ids",)
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        intern = TOKENS.intern
+        self.ids = array('I', sorted({intern(t) for t in tokens}))
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return cls(it)
+
+    def __contains__(self, token) -> bool:
+        i = TOKENS.lookup(token) if isinstance(token, str) else None
+        if i is None:
+            return False
+        ids = self.ids
+        k = bisect_left(ids, i)
+        return k < len(ids) and ids[k] == i
+
+    def __iter__(self):
+        strings = TOKENS.strings
+        return (strings[i] for i in self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __hash__(self):
+        return self._hash()
+
+    def __repr__(self) -> str:
+        return f"TokenSet({sorted(self)!r})"
+
+
+class TokenUnion(Set):
+    """Lazy union of other token sets, held by reference rather than copied."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: Iterable[Set] = ()):
+        self.parts = list(parts)
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return TokenSet(it)
+
+    def token_ids(self) -> set[int]:
+        out: set[int] = set()
+        for p in self.parts:
+            out.update(p.ids if isinstance(p, TokenSet) else map(TOKENS.intern, p))
+        return out
+
+    def __contains__(self, token) -> bool:
+        return any(token in p for p in self.parts)
+
+    def __iter__(self):
+        strings = TOKENS.strings
+        return (strings[i] for i in sorted(self.token_ids()))
+
+    def __len__(self) -> int:
+        return len(self.token_ids())
+
+    def __repr__(self) -> str:
+        return f"TokenUnion({len(self.parts)} parts)"
+
+
+@dataclass(slots=True)
 class Chunk:
     id: str                        # "src/auth.py::LoginHandler" or "src/auth.py"
     kind: str                      # "function" | "class" | "file" | "directory"
@@ -15,11 +114,20 @@ class Chunk:
     name: str
     start_line: int | None = None
     end_line: int | None = None
-    tokens: set[str] = field(default_factory=set)
-    imports: set[str] = field(default_factory=set)
-    calls: set[str] = field(default_factory=set)
+    tokens: Set[str] = field(default_factory=TokenSet)
+    imports: frozenset[str] = frozenset()
+    calls: frozenset[str] = frozenset()
     children: list[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        # Store tokens compactly and share import/call strings across chunks.
+        if not isinstance(self.tokens, (TokenSet, TokenUnion)):
+            self.tokens = TokenSet(self.tokens)
+        if not isinstance(self.imports, frozenset):
+            self.imports = frozenset(map(sys.intern, self.imports))
+        if not isinstance(self.calls, frozenset):
+            self.calls = frozenset(map(sys.intern, self.calls))
+
 
 _TOKEN_RE = re.compile(r'[a-zA-Z_]\w{2,}')
 _MAX_FILE_SIZE = 500 * 1024  # 500KB
@@ -78,6 +186,9 @@ def _extract_python_chunks(rel_path: str, full_path: Path) -> list[Chunk]:
             for alias in node.names:
                 file_imports.add(alias.name)
 
+    # One frozenset shared by every chunk in the file
+    shared_imports = frozenset(map(sys.intern, file_imports))
+
     # Extract top-level functions and classes
     for node in ast.iter_child_nodes(tree):
         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
@@ -99,7 +210,7 @@ def _extract_python_chunks(rel_path: str, full_path: Path) -> list[Chunk]:
             chunk = Chunk(
                 id=chunk_id, kind=kind, path=Path(rel_path), name=node.name,
                 start_line=node.lineno, end_line=end_line,
-                tokens=tokens, imports=file_imports.copy(), calls=calls,
+                tokens=tokens, imports=shared_imports, calls=calls,
             )
             chunks.append(chunk)
             children.append(chunk_id)
@@ -115,7 +226,7 @@ def _extract_python_chunks(rel_path: str, full_path: Path) -> list[Chunk]:
 
     file_chunk = Chunk(
         id=rel_path, kind="file", path=Path(rel_path), name=Path(rel_path).name,
-        tokens=file_tokens, imports=file_imports, calls=file_calls,
+        tokens=file_tokens, imports=shared_imports, calls=file_calls,
         children=children,
     )
     chunks.insert(0, file_chunk)
@@ -145,6 +256,42 @@ def _extract_generic_chunk(rel_path: str, full_path: Path) -> list[Chunk]:
     )]
 
 
+Extractor = Callable[[str, Path], list[Chunk]]
+
+# File extension -> extractor.  Populated by register_extractor(); the
+# built-in brace-language extractors register from cluster.languages.
+_EXTRACTORS: dict[str, Extractor] = {}
+
+
+def register_extractor(extensions: Iterable[str], extractor: Extractor) -> None:
+    """Use *extractor* for files ending in any of *extensions*.
+
+    An extractor takes ``(rel_path, full_path)`` and returns the file's
+    chunks, file chunk first.
+    """
+    for ext in extensions:
+        _EXTRACTORS[ext.lower()] = extractor
+
+
+def get_extractor(rel_path: str) -> Extractor:
+    """Extractor for *rel_path*, falling back to plain tokenization."""
+    if not _builtin_loaded:
+        _load_builtin_extractors()
+    return _EXTRACTORS.get(Path(rel_path).suffix.lower(), _extract_generic_chunk)
+
+
+_builtin_loaded = False
+
+
+def _load_builtin_extractors() -> None:
+    global _builtin_loaded
+    _builtin_loaded = True
+    custom = dict(_EXTRACTORS)
+    register_extractor([".py"], _extract_python_chunks)
+    import pm_core.cluster.languages  # noqa: F401 — registers on import
+    _EXTRACTORS.update(custom)  # explicit registrations win
+
+
 def _matches_patterns(path: str, patterns: list[str] | None) -> bool:
     """Check if path matches any of the glob-style patterns."""
     if patterns is None:
@@ -153,6 +300,52 @@ def _matches_patterns(path: str, patterns: list[str] | None) -> bool:
     return any(fnmatch(path, p) for p in patterns)
 
 
+def extract_file_chunks(repo_root: Path, rel_path: str) -> list[Chunk]:
+    """Extract the chunks for a single tracked file.
+
+    Returns an empty list for missing, oversized, or binary files.
+    """
+    full_path = repo_root / rel_path
+    if not full_path.is_file():
+        return []
+    if full_path.stat().st_size > _MAX_FILE_SIZE:
+        return []
+    if _is_binary(full_path):
+        return []
+
+    return get_extractor(rel_path)(rel_path, full_path)
+
+
+def build_directory_chunks(chunks: list[Chunk]) -> list[Chunk]:
+    """Create directory-level chunks from the file chunks in *chunks*.
+
+    A directory's tokens are a :class:`TokenUnion` over its files' token
+    sets, so no per-directory copy is made.
+    """
+    dir_children: dict[str, list[str]] = {}
+    dir_tokens: dict[str, list[Set[str]]] = {}
+    for c in chunks:
+        if c.kind != "file":
+            continue
+        dir_path = str(c.path.parent)
+        if dir_path == '.':
+            continue
+        dir_children.setdefault(dir_path, []).append(c.id)
+        dir_tokens.setdefault(dir_path, []).append(c.tokens)
+
+    return [
+        Chunk(
+            id=dir_path + "/",
+            kind="directory",
+            path=Path(dir_path),
+            name=Path(dir_path).name,
+            tokens=TokenUnion(dir_tokens[dir_path]),
+            children=child_files,
+        )
+        for dir_path, child_files in dir_children.items()
+    ]
+
+
 def extract_chunks(repo_root: Path,
                    include: list[str] | None = None,
                    exclude: list[str] | None = None) -> list[Chunk]:
@@ -166,54 +359,22 @@ def extract_chunks(repo_root: Path,
     Returns:
         List of Chunk objects representing code units.
     """
-    files = _git_ls_files(repo_root)
     chunks: list[Chunk] = []
-    dir_children: dict[str, list[str]] = {}
+    for rel_path in list_source_files(repo_root, include, exclude):
+        chunks.extend(extract_file_chunks(repo_root, rel_path))
+    chunks.extend(build_directory_chunks(chunks))
+    return chunks
 
-    for rel_path in files:
+
+def list_source_files(repo_root: Path,
+                      include: list[str] | None = None,
+                      exclude: list[str] | None = None) -> list[str]:
+    """Tracked files under *repo_root* after include/exclude filtering."""
+    files = []
+    for rel_path in _git_ls_files(repo_root):
         if include and not _matches_patterns(rel_path, include):
             continue
         if exclude and _matches_patterns(rel_path, exclude):
             continue
-
-        full_path = repo_root / rel_path
-        if not full_path.is_file():
-            continue
-        if full_path.stat().st_size > _MAX_FILE_SIZE:
-            continue
-        if _is_binary(full_path):
-            continue
-
-        if rel_path.endswith('.py'):
-            file_chunks = _extract_python_chunks(rel_path, full_path)
-        else:
-            file_chunks = _extract_generic_chunk(rel_path, full_path)
-
-        chunks.extend(file_chunks)
-
-        # Track directory membership
-        dir_path = str(Path(rel_path).parent)
-        if dir_path == '.':
-            dir_path = ''
-        if dir_path not in dir_children:
-            dir_children[dir_path] = []
-        dir_children[dir_path].append(rel_path)
-
-    # Create directory-level chunks
-    for dir_path, child_files in dir_children.items():
-        if not dir_path:
-            continue
-        dir_tokens: set[str] = set()
-        for c in chunks:
-            if c.kind == "file" and str(c.path.parent) == dir_path:
-                dir_tokens.update(c.tokens)
-        chunks.append(Chunk(
-            id=dir_path + "/",
-            kind="directory",
-            path=Path(dir_path),
-            name=Path(dir_path).name,
-            tokens=dir_tokens,
-            children=child_files,
-        ))
-
-    return chunks
+        files.append(rel_path)
+    return files
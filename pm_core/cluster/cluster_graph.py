@@ -134,6 +134,16 @@ def agglomerative_cluster(chunks: list[Chunk],
             pair = tuple(sorted((e.a, e.b)))
             edge_weights[pair] = e.weight
 
+    # Sparse inter-cluster linkage: root -> {neighbor root: summed edge
+    # weight}.  Average linkage is sum / (|A| * |B|), and merging A and B
+    # into C is the Lance–Williams update sum(C, X) = sum(A, X) + sum(B, X),
+    # so each merge only touches the two clusters' neighbors.
+    links: dict[str, dict[str, float]] = {cid: {} for cid in active_ids}
+    for (a, b), w in edge_weights.items():
+        if a != b:
+            links[a][b] = w
+            links[b][a] = w
+
     # Max-heap (negate for heapq)
     heap: list[tuple[float, str, str]] = []
     for (a, b), w in edge_weights.items():
@@ -154,7 +164,8 @@ def agglomerative_cluster(chunks: list[Chunk],
             continue  # Already in same cluster
 
         # Verify weight is still current (average-linkage)
-        actual_w = _average_linkage(members[ra], members[rb], edge_weights)
+        actual_w = (links[ra].get(rb, 0.0)
+                    / (len(members[ra]) * len(members[rb])))
         if actual_w < threshold:
             continue
         # If actual weight differs significantly from heap weight, re-push
@@ -164,18 +175,24 @@ def agglomerative_cluster(chunks: list[Chunk],
 
         # Merge
         new_root = uf.union(ra, rb)
+        old_root = rb if new_root == ra else ra
         merged = members[ra] | members[rb]
-        if new_root == ra:
-            del members[rb]
-        else:
-            del members[ra]
+        del members[old_root]
         members[new_root] = merged
 
-        # Push edges to other clusters
-        for other_root, other_members in members.items():
-            if other_root == new_root:
+        merged_links = links[new_root]
+        for other, total in links.pop(old_root).items():
+            other_links = links[other]
+            del other_links[old_root]
+            if other == new_root:
                 continue
-            avg = _average_linkage(merged, other_members, edge_weights)
+            combined = merged_links.get(other, 0.0) + total
+            merged_links[other] = combined
+            other_links[new_root] = combined
+
+        # Push edges to neighboring clusters
+        for other_root, total in merged_links.items():
+            avg = total / (len(merged) * len(members[other_root]))
             if avg >= threshold:
                 heapq.heappush(heap, (-avg, new_root, other_root))
 
@@ -194,17 +211,3 @@ def agglomerative_cluster(chunks: list[Chunk],
     clusters.sort(key=lambda c: -len(c.chunk_ids))
     return clusters
 
-
-def _average_linkage(group_a: set[str], group_b: set[str],
-                     edge_weights: dict[tuple[str, str], float]) -> float:
-    """Average pairwise edge weight between two groups."""
-    total = 0.0
-    count = 0
-    for a in group_a:
-        for b in group_b:
-            pair = tuple(sorted((a, b)))
-            total += edge_weights.get(pair, 0.0)
-            count += 1
-    if count == 0:
-        return 0.0
-    return total / count
@@ -0,0 +1,382 @@
+"""Incremental re-clustering from a cached previous run.
+
+A full ``pm cluster auto`` run stores a :class:`ClusterSnapshot` (file
+hashes, chunks, edges, and cluster assignment).  :func:`recluster` then
+re-extracts only the files whose content changed, recomputes only the
+edges touching their chunks, and re-runs agglomerative clustering on the
+neighbourhood of those chunks — the previous clusters they belonged to or
+now link to — while every other cluster is kept as-is.
+
+Like a full run, edges only exist within a pre-partition.  A changed
+import can merge top-level directories into one partition (or split
+them), so unchanged chunks that land in a different partition than
+before have their edges recomputed too, together with the changed ones.
+
+The result is an approximation of a full run: stopwords and co-change
+counts for untouched pairs come from the cache.  Re-run without
+``--incremental`` to rebuild from scratch.
+"""
+
+import hashlib
+import json
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pm_core.cluster.chunks import (
+    Chunk,
+    build_directory_chunks,
+    extract_file_chunks,
+    list_source_files,
+)
+from pm_core.cluster.cluster_graph import Cluster, Edge, agglomerative_cluster
+from pm_core.cluster.metrics import compute_edges
+from pm_core.cluster.partition import pre_partition
+from pm_core.cluster.stream import SMALL_PARTITION
+
+CACHE_VERSION = 1
+
+_CLUSTERED_KINDS = ("function", "class", "file")
+
+
+@dataclass
+class ClusterSnapshot:
+    params: dict
+    file_hashes: dict[str, str]
+    chunks: list[Chunk]
+    edges: Iterable[Edge]          # a list, or an EdgeSpill from a full run
+    clusters: list[Cluster]
+
+
+@dataclass
+class ClusterDiff:
+    """Chunk moves between two clusterings.
+
+    Each move is ``(chunk_id, old_cluster_id, new_cluster_id)``; an old or
+    new cluster ID of None means the chunk was added or removed.
+    """
+    changed_files: list[str] = field(default_factory=list)
+    moves: list[tuple[str, str | None, str | None]] = field(default_factory=list)
+
+    def summary_lines(self) -> list[str]:
+        """Human-readable lines, e.g. '3 chunks moved from cluster 4 to 7'."""
+        counts: dict[tuple[str | None, str | None], int] = defaultdict(int)
+        for _, old, new in self.moves:
+            counts[(old, new)] += 1
+        lines = []
+        order = sorted(counts.items(), key=lambda kv: (
+            -kv[1], kv[0][0] is None, kv[0][1] is None, str(kv[0])))
+        for (old, new), n in order:
+            noun = "chunk" if n == 1 else "chunks"
+            if old is None:
+                lines.append(f"{n} {noun} added to cluster {new}")
+            elif new is None:
+                lines.append(f"{n} {noun} removed from cluster {old}")
+            else:
+                lines.append(f"{n} {noun} moved from cluster {old} to {new}")
+        return lines
+
+
+# ---------------------------------------------------------------------------
+# Snapshot persistence
+# ---------------------------------------------------------------------------
+
+def cache_path(repo_root: Path) -> Path:
+    """Snapshot file for *repo_root* in the cluster cache directory."""
+    from pm_core.paths import cluster_cache_dir
+    key = hashlib.sha1(str(Path(repo_root).resolve()).encode()).hexdigest()[:16]
+    return cluster_cache_dir() / f"{key}.json"
+
+
+def make_params(weights: dict[str, float], threshold: float,
+                max_commits: int) -> dict:
+    """Parameters that must match for a snapshot to be reused."""
+    return {
+        "version": CACHE_VERSION,
+        "weights": dict(sorted(weights.items())),
+        "threshold": threshold,
+        "max_commits": max_commits,
+    }
+
+
+def file_hashes(repo_root: Path, files: list[str]) -> dict[str, str]:
+    """Content hash for each of *files* (missing files are skipped)."""
+    hashes = {}
+    for rel_path in files:
+        try:
+            data = (repo_root / rel_path).read_bytes()
+        except OSError:
+            continue
+        hashes[rel_path] = hashlib.sha1(data).hexdigest()
+    return hashes
+
+
+def _chunk_to_dict(c: Chunk) -> dict:
+    return {
+        "id": c.id, "kind": c.kind, "path": str(c.path), "name": c.name,
+        "start_line": c.start_line, "end_line": c.end_line,
+        "tokens": sorted(c.tokens), "imports": sorted(c.imports),
+        "calls": sorted(c.calls), "children": list(c.children),
+    }
+
+
+def _chunk_from_dict(d: dict) -> Chunk:
+    return Chunk(
+        id=d["id"], kind=d["kind"], path=Path(d["path"]), name=d["name"],
+        start_line=d.get("start_line"), end_line=d.get("end_line"),
+        tokens=set(d.get("tokens", ())), imports=set(d.get("imports", ())),
+        calls=set(d.get("calls", ())), children=list(d.get("children", ())),
+    )
+
+
+def _write_column(f, values: Iterable, fmt=str, batch: int = 4096) -> None:
+    """Write *values* to *f* as a JSON array, *batch* items at a time."""
+    f.write("[")
+    buf: list[str] = []
+    first = True
+    for v in values:
+        buf.append(fmt(v))
+        if len(buf) >= batch:
+            f.write(("" if first else ", ") + ", ".join(buf))
+            first = False
+            buf.clear()
+    if buf:
+        f.write(("" if first else ", ") + ", ".join(buf))
+    f.write("]")
+
+
+def save_snapshot(path: Path, snapshot: ClusterSnapshot) -> None:
+    """Write *snapshot* to *path* atomically.
+
+    Edges are stored as parallel columns of chunk indices and weights (the
+    per-metric breakdown is not kept), which keeps large snapshots quick to
+    load.  Directory chunks are rebuilt on load rather than stored.
+
+    The file is written incrementally: each edge column is streamed from
+    ``snapshot.edges`` (one pass per column, so it must be re-iterable —
+    a list or an ``EdgeSpill``), and edges from a spill are never all in
+    memory at once.
+    """
+    file_chunks = [c for c in snapshot.chunks if c.kind != "directory"]
+    index = {c.id: i for i, c in enumerate(file_chunks)}
+
+    def _kept():
+        return (e for e in snapshot.edges if e.a in index and e.b in index)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        f.write('{"params": ')
+        json.dump(snapshot.params, f)
+        f.write(', "file_hashes": ')
+        json.dump(snapshot.file_hashes, f)
+        f.write(', "clusters": ')
+        json.dump([{"id": c.id, "name": c.name, "chunk_ids": sorted(c.chunk_ids)}
+                   for c in snapshot.clusters], f)
+        f.write(', "chunks": ')
+        _write_column(f, (_chunk_to_dict(c) for c in file_chunks),
+                      fmt=json.dumps, batch=256)
+        f.write(', "edges": {"a": ')
+        _write_column(f, (index[e.a] for e in _kept()))
+        f.write(', "b": ')
+        _write_column(f, (index[e.b] for e in _kept()))
+        f.write(', "w": ')
+        _write_column(f, (e.weight for e in _kept()), fmt=float.__repr__)
+        f.write("}}")
+    tmp.replace(path)
+
+
+def load_snapshot(path: Path) -> ClusterSnapshot | None:
+    """Load a snapshot, or None if it is missing, corrupt, or outdated."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    try:
+        if data["params"].get("version") != CACHE_VERSION:
+            return None
+        chunks = [_chunk_from_dict(d) for d in data["chunks"]]
+        ids = [c.id for c in chunks]
+        cols = data["edges"]
+        return ClusterSnapshot(
+            params=data["params"],
+            file_hashes=data["file_hashes"],
+            chunks=chunks + build_directory_chunks(chunks),
+            edges=[Edge(a=ids[a], b=ids[b], weight=w)
+                   for a, b, w in zip(cols["a"], cols["b"], cols["w"])],
+            clusters=[Cluster(id=c["id"], chunk_ids=set(c["chunk_ids"]),
+                              name=c.get("name", ""))
+                      for c in data["clusters"]],
+        )
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Incremental re-clustering
+# ---------------------------------------------------------------------------
+
+def _assignment(clusters: list[Cluster]) -> dict[str, str]:
+    return {cid: cl.id for cl in clusters for cid in cl.chunk_ids}
+
+
+def diff_clusterings(old: list[Cluster], new: list[Cluster],
+                     changed_files: list[str] | None = None) -> ClusterDiff:
+    """Compare two clusterings chunk-by-chunk."""
+    before = _assignment(old)
+    after = _assignment(new)
+    moves = []
+    for cid in sorted(before.keys() | after.keys()):
+        o, n = before.get(cid), after.get(cid)
+        if o != n:
+            moves.append((cid, o, n))
+    return ClusterDiff(changed_files=list(changed_files or []), moves=moves)
+
+
+def _match_ids(local: list[Cluster], candidates: dict[str, set[str]],
+               next_id: int, claimed: set[str]) -> int:
+    """Give each of *local* the ID of the previous cluster it overlaps most.
+
+    Matching is greedy by overlap size; IDs already in *claimed* are skipped
+    and newly used ones are added to it.  Clusters with no unclaimed match
+    get fresh IDs starting from *next_id*.  Returns the next unused ID.
+    """
+    overlaps = []
+    for i, cl in enumerate(local):
+        for old_id, old_members in candidates.items():
+            n = len(cl.chunk_ids & old_members)
+            if n:
+                overlaps.append((-n, old_id, i))
+    overlaps.sort()
+    assigned: set[int] = set()
+    for _, old_id, i in overlaps:
+        if old_id in claimed or i in assigned:
+            continue
+        local[i].id = old_id
+        claimed.add(old_id)
+        assigned.add(i)
+    for i, cl in enumerate(local):
+        if i not in assigned:
+            cl.id = str(next_id)
+            next_id += 1
+    return next_id
+
+
+def recluster(repo_root: Path, previous: ClusterSnapshot,
+              ) -> tuple[ClusterSnapshot, ClusterDiff]:
+    """Update *previous* for the files that changed since it was taken.
+
+    Edges are recomputed for changed chunks and for unchanged ones whose
+    pre-partition changed (their old edges were scored against a
+    different set of chunks).  Returns the new snapshot and the diff
+    against the previous clusters.
+    """
+    params = previous.params
+    weights = params["weights"]
+    threshold = params["threshold"]
+
+    files = list_source_files(repo_root)
+    hashes = file_hashes(repo_root, files)
+    dirty_files = {f for f, h in hashes.items()
+                   if previous.file_hashes.get(f) != h}
+    dirty_files |= previous.file_hashes.keys() - hashes.keys()
+    if not dirty_files:
+        return previous, ClusterDiff()
+
+    kept = [c for c in previous.chunks
+            if c.kind != "directory" and str(c.path) not in dirty_files]
+    fresh = [c for f in sorted(dirty_files & hashes.keys())
+             for c in extract_file_chunks(repo_root, f)]
+    file_chunks = kept + fresh
+    chunks = file_chunks + build_directory_chunks(file_chunks)
+
+    dirty_ids = {c.id for c in fresh if c.kind in _CLUSTERED_KINDS}
+    touched = dirty_ids | {c.id for c in previous.chunks
+                           if str(c.path) in dirty_files}
+
+    # Chunks outside a previous partition with edges of its own, or now
+    # in a different one, were never scored against their new neighbours.
+    partitions = pre_partition(chunks)
+    prev_partition = {}
+    for part_name, part_chunks in pre_partition(previous.chunks).items():
+        ids = {c.id for c in part_chunks if c.kind in _CLUSTERED_KINDS}
+        if len(ids) > SMALL_PARTITION:
+            prev_partition.update(dict.fromkeys(ids, part_name))
+    moved_ids = {c.id for part_name, part_chunks in partitions.items()
+                 for c in part_chunks
+                 if c.kind in _CLUSTERED_KINDS
+                 and prev_partition.get(c.id) != part_name} - dirty_ids
+    rescored = dirty_ids | moved_ids
+
+    edges = [e for e in previous.edges
+             if e.a not in touched and e.b not in touched
+             and e.a not in moved_ids and e.b not in moved_ids]
+
+    prev_assign = _assignment(previous.clusters)
+    prev_members = {cl.id: cl.chunk_ids for cl in previous.clusters}
+    prev_names = {cl.id: cl.name for cl in previous.clusters}
+    next_id = max((int(i) for i in prev_members if i.isdigit()), default=0) + 1
+
+    clusters: list[Cluster] = []
+    claimed: set[str] = set()
+    for part_name, part_chunks in partitions.items():
+        ids = {c.id for c in part_chunks if c.kind in _CLUSTERED_KINDS}
+        prev_ids = {prev_assign[cid] for cid in ids if cid in prev_assign}
+
+        if len(ids) <= SMALL_PARTITION:
+            local = [Cluster(id="", chunk_ids=ids, name=part_name)]
+            next_id = _match_ids(
+                local, {i: prev_members[i] for i in prev_ids}, next_id, claimed)
+            clusters.extend(local)
+            continue
+
+        part_dirty = ids & rescored
+        dirty_edges = []
+        if part_dirty:
+            dirty_edges = compute_edges(
+                part_chunks, weights=weights, repo_root=repo_root,
+                max_commits=params["max_commits"], only=part_dirty)
+            edges.extend(dirty_edges)
+
+        # Previous clusters that must be rebuilt: those that lost or gained
+        # chunks, that no longer fit this partition, or that a rescored
+        # chunk now links to strongly enough to merge with.
+        affected_prev = {
+            i for i in prev_ids
+            if prev_members[i] & touched or not prev_members[i] <= ids
+        }
+        for e in dirty_edges:
+            if e.weight >= threshold:
+                for cid in (e.a, e.b):
+                    if cid in prev_assign:
+                        affected_prev.add(prev_assign[cid])
+        affected_prev &= prev_ids
+
+        for i in sorted(prev_ids - affected_prev):
+            claimed.add(i)
+            clusters.append(Cluster(id=i, chunk_ids=set(prev_members[i]),
+                                    name=prev_names[i]))
+
+        region = part_dirty | {cid for i in affected_prev
+                               for cid in prev_members[i] if cid in ids}
+        if not region:
+            continue
+        region_chunks = [c for c in part_chunks if c.id in region]
+        region_edges = [e for e in edges if e.a in region and e.b in region]
+        local = agglomerative_cluster(region_chunks, region_edges,
+                                      threshold=threshold)
+        for cl in local:
+            cl.name = f"{part_name}: {cl.name}" if cl.name else part_name
+        next_id = _match_ids(
+            local, {i: prev_members[i] for i in affected_prev}, next_id,
+            claimed)
+        clusters.extend(local)
+
+    clusters.sort(key=lambda c: -len(c.chunk_ids))
+    snapshot = ClusterSnapshot(
+        params=params, file_hashes=hashes, chunks=chunks,
+        edges=edges, clusters=clusters,
+    )
+    return snapshot, diff_clusterings(previous.clusters, clusters,
+                                      sorted(dirty_files))
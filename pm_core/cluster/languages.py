@@ -0,0 +1,435 @@
+"""Dependency-free structural extractors for brace-delimited languages.
+
+Each extractor is a small lexer rather than a parser:
+
+1. One regex pass blanks out comments and string literals (keeping their
+   length and newlines), so braces and identifiers inside them are ignored
+   and line numbers survive.
+2. Declaration regexes find top-level functions and types; only matches at
+   brace depth 0 are kept, and each body runs to its matching ``}`` (or to
+   ``;`` for body-less declarations).  Languages whose functions only live
+   in classes (Java) also match methods at depth 1 of each class body.
+3. Calls are ``name(`` occurrences that are not themselves declarations;
+   imports come from per-language import regexes.
+
+Everything is a handful of regex scans over the file, which keeps the cost
+per MB of source roughly constant.  Known blind spots: JS regex literals
+containing braces, and other nested declarations (e.g. functions inside
+Rust ``mod`` blocks), which stay part of their enclosing chunk.
+"""
+
+import re
+from bisect import bisect_right
+from pathlib import Path
+
+from pm_core.cluster.chunks import (
+    _TOKEN_RE,
+    Chunk,
+    register_extractor,
+)
+
+
+class BraceLanguage:
+    """Declarative description of one brace-delimited language."""
+
+    def __init__(self, name: str, extensions: tuple[str, ...],
+                 strings: str, functions: list[str], classes: list[str],
+                 imports: list[str], keywords: set[str],
+                 methods: list[str] | None = None):
+        self.name = name
+        self.extensions = extensions
+        # Comments, then language-specific strings; group "c" = comment
+        self.lexer = re.compile(
+            r'(?P<c>//[^\n]*|/\*.*?\*/)|' + strings, re.S)
+        self.functions = [re.compile(p, re.M) for p in functions]
+        self.classes = [re.compile(p, re.M) for p in classes]
+        # Member declarations directly inside a class body
+        self.methods = [re.compile(p, re.M) for p in methods or []]
+        self.imports = [re.compile(p, re.M) for p in imports]
+        self.keywords = keywords
+
+
+_CALL_RE = re.compile(r'([A-Za-z_$][\w$]*)\s*(?:::\s*<[^;{}()]*?>\s*|<[\w\s,.?\[\]]*>\s*)?\(')
+_PREV_WORD_RE = re.compile(r'([\w$]+)\s*$')
+_SCOPE_RE = re.compile(r'[{}();]')
+_PAREN_RE = re.compile(r'[()]')
+_QUOTED_RE = re.compile(r'["\'`]([^"\'`\n]+)["\'`]')
+
+# Words that may directly precede a call without making it a declaration.
+_CALL_PREFIXES = {
+    "return", "new", "await", "yield", "throw", "else", "case", "in", "of",
+    "typeof", "void", "delete", "go", "defer", "do", "not", "and", "or",
+    "instanceof", "assert", "move", "async",
+}
+
+# Words that only ever precede a function's own name.
+_DECL_KEYWORDS = {"fn", "func", "function"}
+
+# Words that may precede a call but are never its return type (Java's
+# ``void`` is one, JavaScript's ``void`` operator rarely meets a call).
+_NOT_TYPES = (_CALL_PREFIXES - {"void"}) | {
+    "if", "for", "while", "switch", "catch", "match", "break", "default",
+}
+
+_GO_RECEIVER_RE = re.compile(r'\bfunc\s*\([^()]*\)$')
+# Generic or array type ending right before the name: ``List<T>``, ``int[]``
+_TYPE_SUFFIX_RE = re.compile(r'(?:[\w$]\s*<[\w\s,.?\[\]<>]*>|[\w$](?:\s*\[\])+)$')
+_MODIFIERS_RE = re.compile(
+    r'(?:(?:export|default|public|protected|private|static|abstract|override|'
+    r'readonly|async)\s*)*')
+_THROWS_RE = re.compile(r'throws\b')
+# TypeScript return annotation running straight into the body: ``: Promise<T> {``
+_RETURN_TYPE_RE = re.compile(r':(?!:)[\w$\s.,|&<>\[\]]*\{')
+
+_COMMON_KEYWORDS = {
+    "if", "for", "while", "switch", "catch", "return", "sizeof", "match",
+    "function", "func", "fn", "super", "this", "typeof", "with",
+}
+
+
+def _blank(m: re.Match) -> str:
+    s = m.group(0)
+    return re.sub(r'[^\n]', ' ', s)
+
+
+def _blank_strings(m: re.Match) -> str:
+    """Blank a string literal's contents but keep its delimiters' width."""
+    s = m.group(0)
+    if m.group("c") is not None:
+        return _blank(m)
+    return s[0] + re.sub(r'[^\n]', ' ', s[1:-1]) + s[-1] if len(s) >= 2 else s
+
+
+class _Source:
+    """Lexed views of one file."""
+
+    def __init__(self, lang: BraceLanguage, text: str):
+        self.lang = lang
+        self.text = text
+        # Comments removed, strings kept — for import scanning
+        self.no_comments = lang.lexer.sub(
+            lambda m: _blank(m) if m.group("c") is not None else m.group(0), text)
+        # Comments and string contents removed — for structure and tokens
+        self.code = lang.lexer.sub(_blank_strings, text)
+        self.newlines = [m.start() for m in re.finditer('\n', text)]
+
+    def line_of(self, pos: int) -> int:
+        return bisect_right(self.newlines, pos - 1) + 1
+
+    def body_end(self, start: int) -> int:
+        """End offset of the declaration starting at *start*.
+
+        Runs to the ``}`` matching the first ``{`` outside parentheses, or
+        to a ``;`` outside parentheses if that comes first.
+        """
+        code = self.code
+        parens = 0
+        depth = 0
+        for m in _SCOPE_RE.finditer(code, start):
+            ch = m.group(0)
+            if depth == 0:
+                if ch == '(':
+                    parens += 1
+                elif ch == ')':
+                    parens = max(parens - 1, 0)
+                elif parens == 0 and ch == ';':
+                    return m.end()
+                elif parens == 0 and ch == '{':
+                    depth = 1
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    return m.end()
+        return len(code)
+
+    def calls(self, start: int, end: int) -> set[str]:
+        code = self.code
+        keywords = self.lang.keywords
+        out: set[str] = set()
+        for m in _CALL_RE.finditer(code, start, end):
+            name = m.group(1)
+            if name in keywords:
+                continue
+            if self._is_declaration(m.start(), m.end() - 1):
+                continue
+            out.add(name)
+        return out
+
+    def _is_declaration(self, name_start: int, paren: int) -> bool:
+        """Whether ``name(`` at *name_start* declares rather than calls.
+
+        Declaring keywords (``fn run(``, ``func (r R) run(``) always do.
+        Otherwise a type token must sit directly before the name (``void
+        run(``, ``List<T> run(``, ``int[] run(``) and the closing
+        parenthesis must be followed by a body, ``throws`` or ``;``.  A
+        name with nothing but modifiers before it (``async run(x) {``) is
+        a method when a body, or a ``: Type {`` return annotation, follows.
+        """
+        code = self.code
+        line_start = code.rfind('\n', 0, name_start) + 1
+        before = code[line_start:name_start].rstrip()
+        prev = _PREV_WORD_RE.search(before)
+        word = prev.group(1) if prev else None
+        if word in _DECL_KEYWORDS or _GO_RECEIVER_RE.search(before):
+            return True
+        typed = (word is not None and word not in _NOT_TYPES) or bool(
+            _TYPE_SUFFIX_RE.search(before))
+        if not typed and not _MODIFIERS_RE.fullmatch(before.strip()):
+            return False
+        depth = 0
+        for m in _PAREN_RE.finditer(code, paren, paren + 4096):
+            depth += 1 if m.group(0) == '(' else -1
+            if depth == 0:
+                after = code[m.end():m.end() + 120].lstrip(' \t')
+                if typed:
+                    return after.startswith(('{', ';')) or bool(
+                        _THROWS_RE.match(after))
+                return after.startswith('{') or bool(_RETURN_TYPE_RE.match(after))
+        return False
+
+    def imports(self) -> set[str]:
+        out: set[str] = set()
+        for pat in self.lang.imports:
+            for m in pat.finditer(self.no_comments):
+                for group in m.groups():
+                    if not group:
+                        continue
+                    quoted = _QUOTED_RE.findall(group)
+                    for spec in quoted or [group]:
+                        out.update(_split_import(spec))
+        return out
+
+    def declarations(self) -> list[tuple[int, str, str]]:
+        """Top-level ``(offset, kind, name)`` declarations in file order."""
+        found = []
+        for kind, patterns in (("function", self.lang.functions),
+                               ("class", self.lang.classes)):
+            for pat in patterns:
+                for m in pat.finditer(self.code):
+                    name = ".".join(g for g in m.groups() if g)
+                    found.append((m.start(), kind, name))
+        return self._at_depth(sorted(found), 0, 0)
+
+    def members(self, start: int, end: int) -> list[tuple[int, str]]:
+        """``(offset, name)`` methods declared directly in the class body
+        spanning *start*..*end*."""
+        found = [(m.start(), m.group(1)) for pat in self.lang.methods
+                 for m in pat.finditer(self.code, start, end)
+                 if self._is_declaration(m.start(1), m.end() - 1)]
+        return self._at_depth(sorted(found), start, 1)
+
+    def _at_depth(self, found: list, start: int, depth: int) -> list:
+        """Keep the sorted *found* entries sitting at brace *depth* from *start*."""
+        code = self.code
+        kept = []
+        level = 0
+        last = start
+        for item in found:
+            pos = item[0]
+            level += code.count('{', last, pos) - code.count('}', last, pos)
+            last = pos
+            if level == depth or (depth == 0 and level < 0):
+                kept.append(item)
+        return kept
+
+
+def _split_import(spec: str) -> set[str]:
+    """Normalize an import spec into module path plus its leaf names."""
+    spec = spec.strip().strip('"\'`')
+    if not spec:
+        return set()
+    out = set()
+    # Rust `a::b::{c, d as e}` groups
+    if "{" in spec:
+        base, _, rest = spec.partition("{")
+        base = base.rstrip(":").strip()
+        if base:
+            out.add(base)
+        for part in rest.rstrip("}").split(","):
+            leaf = part.split(" as ")[0].strip().split("::")[-1]
+            if leaf and leaf not in ("self", "*"):
+                out.add(leaf)
+        return out
+    out.add(spec.split(" as ")[0].strip())
+    leaf = re.split(r'[./:]+', spec.split(" as ")[0].strip())[-1]
+    if leaf and leaf != "*":
+        out.add(leaf)
+    return out
+
+
+def extract_brace_chunks(lang: BraceLanguage, rel_path: str,
+                         text: str) -> list[Chunk]:
+    """Split *text* into file/function/class chunks for *lang*."""
+    src = _Source(lang, text)
+    file_imports = frozenset(src.imports())
+    chunks: list[Chunk] = []
+    children: list[str] = []
+    seen: set[str] = set()
+    file_calls: set[str] = set()
+    covered_end = 0
+
+    def add(kind: str, name: str, pos: int, end: int,
+            spans: list[tuple[int, int]]) -> None:
+        chunk_id = f"{rel_path}::{name}"
+        if chunk_id in seen:
+            chunk_id = f"{chunk_id}@{src.line_of(pos)}"
+        seen.add(chunk_id)
+        calls: set[str] = set()
+        tokens: list[str] = []
+        for a, b in spans:
+            calls |= src.calls(a, b)
+            tokens += _TOKEN_RE.findall(src.code, a, b)
+        calls.discard(name.rsplit(".", 1)[-1])
+        chunks.append(Chunk(
+            id=chunk_id, kind=kind, path=Path(rel_path), name=name,
+            start_line=src.line_of(pos), end_line=src.line_of(max(end - 1, pos)),
+            tokens=tokens, imports=file_imports, calls=calls,
+        ))
+        children.append(chunk_id)
+        file_calls.update(calls)
+
+    for pos, kind, name in src.declarations():
+        if pos < covered_end:
+            continue  # nested in a previous declaration's body
+        end = src.body_end(pos)
+        covered_end = end
+        members = src.members(pos, end) if kind == "class" else []
+        # The class keeps its header and fields; each method is its own chunk
+        spans = []
+        methods = []
+        cursor = pos
+        for mpos, mname in members:
+            if mpos < cursor:
+                continue
+            mend = src.body_end(mpos)
+            spans.append((cursor, mpos))
+            methods.append((mpos, mend, mname))
+            cursor = mend
+        spans.append((cursor, end))
+        add(kind, name, pos, end, spans)
+        for mpos, mend, mname in methods:
+            add("function", f"{name}.{mname}", mpos, mend, [(mpos, mend)])
+
+    chunks.insert(0, Chunk(
+        id=rel_path, kind="file", path=Path(rel_path), name=Path(rel_path).name,
+        tokens=_TOKEN_RE.findall(src.code), imports=file_imports,
+        calls=file_calls, children=children,
+    ))
+    return chunks
+
+
+# ---------------------------------------------------------------------------
+# Language definitions
+# ---------------------------------------------------------------------------
+
+_C_STRING = r'"(?:\\.|[^"\\\n])*"'
+_CHAR = r"'(?:\\u\{[0-9a-fA-F]+\}|\\.|[^\\'\n])'"
+
+_IDENT_JS = r'[A-Za-z_$][\w$]*'
+
+JAVASCRIPT = BraceLanguage(
+    name="javascript",
+    extensions=(".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".mts", ".cts"),
+    strings=r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`',
+    functions=[
+        rf'^[ \t]*(?:export\s+)?(?:default\s+)?(?:declare\s+)?(?:async\s+)?'
+        rf'function\b\s*\*?\s*({_IDENT_JS})',
+        rf'^[ \t]*(?:export\s+)?(?:const|let|var)\s+({_IDENT_JS})\s*'
+        rf'(?::[^=;]+)?=\s*(?:async\s+)?(?:function\b|'
+        rf'(?:<[^>]*>\s*)?\([^)]*\)\s*(?::[^=;{{]+)?=>|{_IDENT_JS}\s*=>)',
+    ],
+    classes=[
+        rf'^[ \t]*(?:export\s+)?(?:default\s+)?(?:declare\s+)?(?:abstract\s+)?'
+        rf'(?:class|interface|enum)\s+({_IDENT_JS})',
+    ],
+    imports=[
+        r'^[ \t]*import\s+(?:type\s+)?(?:[^;]*?\s+from\s+)?(["\'][^"\']+["\'])',
+        r'^[ \t]*export\s+[^;]*?\s+from\s+(["\'][^"\']+["\'])',
+        r'\brequire\(\s*(["\'][^"\']+["\'])\s*\)',
+        r'\bimport\(\s*(["\'][^"\']+["\'])\s*\)',
+    ],
+    keywords=_COMMON_KEYWORDS | {"constructor", "import", "require", "async"},
+)
+
+GO = BraceLanguage(
+    name="go",
+    extensions=(".go",),
+    strings=rf'{_C_STRING}|`[^`]*`|{_CHAR}',
+    functions=[
+        r'^func\s+(?:\(\s*\w*\s*\*?\s*(\w+)(?:\[[^\]]*\])?\s*\)\s*)?(\w+)',
+    ],
+    classes=[
+        r'^type\s+(\w+)\s*(?:\[[^\]]*\]\s*)?(?:struct|interface)\b',
+    ],
+    imports=[
+        r'^import\s+(?:\w+\s+|\.\s+|_\s+)?("[^"]+")',
+        r'^import\s*\(([^)]*)\)',
+    ],
+    keywords=_COMMON_KEYWORDS | {"make", "len", "cap", "append", "new",
+                                 "panic", "recover", "range", "select"},
+)
+
+_RUST_VIS = r'(?:pub(?:\([^)]*\))?\s+)?'
+
+RUST = BraceLanguage(
+    name="rust",
+    extensions=(".rs",),
+    strings=rf'r(?P<hashes>#*)".*?"(?P=hashes)|b?{_C_STRING}|b?{_CHAR}',
+    functions=[
+        rf'^[ \t]*{_RUST_VIS}(?:default\s+)?(?:const\s+)?(?:async\s+)?(?:unsafe\s+)?'
+        r'(?:extern\s+"[^"]*"\s+)?fn\s+(\w+)',
+    ],
+    classes=[
+        rf'^[ \t]*{_RUST_VIS}(?:struct|enum|trait|union)\s+(\w+)',
+        r'^[ \t]*(?:unsafe\s+)?impl(?:\s*<[^{]*?>)?\s+(?:[\w:]+(?:<[^{]*?>)?\s+for\s+)?(\w+)',
+    ],
+    imports=[
+        rf'^[ \t]*{_RUST_VIS}use\s+([^;]+);',
+        r'^[ \t]*extern\s+crate\s+(\w+)',
+        rf'^[ \t]*{_RUST_VIS}mod\s+(\w+)\s*;',
+    ],
+    keywords=_COMMON_KEYWORDS | {"loop", "Some", "Ok", "Err", "Box", "Vec"},
+)
+
+_JAVA_MODS = (r'(?:(?:public|protected|private|abstract|final|static|sealed|'
+              r'non-sealed|strictfp)\s+)*')
+
+JAVA = BraceLanguage(
+    name="java",
+    extensions=(".java",),
+    strings=rf'"""(?:\\.|[^\\])*?"""|{_C_STRING}|{_CHAR}',
+    functions=[],
+    classes=[
+        rf'^[ \t]*{_JAVA_MODS}(?:class|interface|enum|record|@interface)\s+(\w+)',
+    ],
+    # Methods and constructors: annotations, modifiers, type parameters and
+    # an optional return type before ``name(``
+    methods=[
+        rf'^[ \t]*(?:@\w+(?:\([^)]*\))?\s+)*{_JAVA_MODS}'
+        r'(?:(?:synchronized|native|default)\s+)*(?:<[^;{}()]*?>\s+)?'
+        r'(?:[\w.]+(?:\s*<[^;{}()]*?>)?(?:\s*\[\])*\s+)?(\w+)\s*\(',
+    ],
+    imports=[
+        r'^[ \t]*import\s+(?:static\s+)?([\w.]+(?:\.\*)?)\s*;',
+    ],
+    keywords=_COMMON_KEYWORDS | {"synchronized", "try"},
+)
+
+LANGUAGES = (JAVASCRIPT, GO, RUST, JAVA)
+
+
+def _make_extractor(lang: BraceLanguage):
+    def extract(rel_path: str, full_path: Path) -> list[Chunk]:
+        try:
+            text = full_path.read_text(errors='replace')
+        except OSError:
+            return []
+        return extract_brace_chunks(lang, rel_path, text)
+    extract.__name__ = f"extract_{lang.name}_chunks"
+    return extract
+
+
+for _lang in LANGUAGES:
+    register_extractor(_lang.extensions, _make_extractor(_lang))
@@ -1,10 +1,12 @@
 """Four similarity metrics for code chunk clustering."""
 
 import subprocess
+from array import array
 from collections import defaultdict
+from collections.abc import Set
 from pathlib import Path
 
-from pm_core.cluster.chunks import Chunk
+from pm_core.cluster.chunks import TOKENS, Chunk, TokenSet, TokenUnion
 
 
 # ---------------------------------------------------------------------------
@@ -33,28 +35,45 @@ def structural_proximity(a: Chunk, b: Chunk) -> float:
 
 def _build_stopwords(chunks: list[Chunk], threshold: float = 0.4) -> set[str]:
     """Tokens appearing in >threshold fraction of chunks are stopwords."""
+    strings = TOKENS.strings
+    return {strings[i] for i in _build_stopword_ids(chunks, threshold)}
+
+
+def _build_stopword_ids(chunks: list[Chunk],
+                        threshold: float = 0.4) -> set[int]:
+    """Interned-ID form of :func:`_build_stopwords`."""
     n = len(chunks)
     if n == 0:
         return set()
-    counts: dict[str, int] = defaultdict(int)
+    counts: dict[int, int] = defaultdict(int)
     for c in chunks:
-        for t in c.tokens:
+        for t in _token_ids(c):
             counts[t] += 1
     cutoff = threshold * n
     return {t for t, cnt in counts.items() if cnt > cutoff}
 
 
+def _token_ids(c: Chunk):
+    tokens = c.tokens
+    if isinstance(tokens, TokenSet):
+        return tokens.ids
+    if isinstance(tokens, TokenUnion):
+        return tokens.token_ids()
+    return [TOKENS.intern(t) for t in tokens]
+
+
 def semantic_similarity(a: Chunk, b: Chunk, stopwords: set[str]) -> float:
     """Jaccard similarity on token sets after removing stopwords."""
-    ta = a.tokens - stopwords
-    tb = b.tokens - stopwords
+    return _jaccard(set(a.tokens) - stopwords, set(b.tokens) - stopwords)
+
+
+def _jaccard(ta: Set, tb: Set) -> float:
     if not ta and not tb:
         return 0.0
-    intersection = ta & tb
-    union = ta | tb
+    union = len(ta | tb)
     if not union:
         return 0.0
-    return len(intersection) / len(union)
+    return len(ta & tb) / union
 
 
 # ---------------------------------------------------------------------------
@@ -112,10 +131,23 @@ def cochange_score(a: Chunk, b: Chunk, matrix: dict[tuple[str, str], int],
 # 4. Call-graph proximity
 # ---------------------------------------------------------------------------
 
-def build_call_graph(chunks: list[Chunk]) -> dict[str, set[str]]:
+# Call names that resolve globally to more than this many chunks (``get``,
+# ``run``, ``__init__`` ...) carry no locality signal and blow up the graph.
+_MAX_CALL_TARGETS = 8
+
+# Calls further apart than this are treated as unrelated.
+_MAX_CALL_DEPTH = 5
+
+
+def build_call_graph(chunks: list[Chunk],
+                     max_targets: int = _MAX_CALL_TARGETS
+                     ) -> dict[str, set[str]]:
     """Build directed adjacency list from chunk call targets.
 
     Resolves calls to chunk IDs by matching call names against chunk names.
+    File-local definitions win; otherwise the name is resolved globally,
+    unless it matches more than *max_targets* chunks, in which case the call
+    is considered ambiguous and dropped.
     """
     # Build name -> chunk IDs index
     name_to_ids: dict[str, list[str]] = defaultdict(list)
@@ -142,6 +174,8 @@ def build_call_graph(chunks: list[Chunk]) -> dict[str, set[str]]:
                 continue
             # Try global resolution
             targets = name_to_ids.get(call_name, [])
+            if len(targets) > max_targets:
+                continue
             for tid in targets:
                 if tid != chunk.id:
                     adjacency[chunk.id].add(tid)
@@ -149,47 +183,162 @@ def build_call_graph(chunks: list[Chunk]) -> dict[str, set[str]]:
     return dict(adjacency)
 
 
-def _bfs_distances(start: str, adjacency: dict[str, set[str]],
-                   max_depth: int = 5) -> dict[str, int]:
-    """BFS from start, returning shortest distances up to max_depth."""
-    distances: dict[str, int] = {}
-    frontier = [start]
-    depth = 0
-    visited = {start}
-    while frontier and depth < max_depth:
-        depth += 1
-        next_frontier = []
-        for node in frontier:
-            for neighbor in adjacency.get(node, ()):
-                if neighbor not in visited:
-                    visited.add(neighbor)
+class CallGraph:
+    """Compact CSR (compressed sparse row) form of a call adjacency list.
+
+    Chunk IDs are mapped to dense ints; forward and reverse edges are stored
+    as ``array('i')`` offset/target pairs so that a graph with millions of
+    edges costs a few bytes per edge instead of a Python set entry.
+    Distances are computed on demand with a level-synchronous BFS, and the
+    most recent source's results are cached so that callers iterating pairs
+    grouped by source pay for one traversal per source.
+    """
+
+    def __init__(self, adjacency: dict[str, set[str]],
+                 max_depth: int = _MAX_CALL_DEPTH):
+        self.max_depth = max_depth
+        ids: list[str] = []
+        index: dict[str, int] = {}
+
+        def _intern(cid: str) -> int:
+            i = index.get(cid)
+            if i is None:
+                i = index[cid] = len(ids)
+                ids.append(cid)
+            return i
+
+        edges: list[tuple[int, int]] = []
+        for src, dsts in adjacency.items():
+            s = _intern(src)
+            for dst in dsts:
+                edges.append((s, _intern(dst)))
+
+        self.ids = ids
+        self.index = index
+        self.offsets, self.targets = self._csr(len(ids), edges)
+        self.rev_offsets, self.rev_targets = self._csr(
+            len(ids), [(d, s) for s, d in edges])
+        self._cached_src: int | None = None
+        self._cached_fwd: dict[int, int] = {}
+        self._cached_rev: dict[int, int] = {}
+
+    @staticmethod
+    def _csr(n: int, edges: list[tuple[int, int]]) -> tuple[array, array]:
+        offsets = array('i', bytes(4 * (n + 1)))
+        for s, _ in edges:
+            offsets[s + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        targets = array('i', bytes(4 * len(edges)))
+        fill = array('i', offsets[:n])
+        for s, d in edges:
+            targets[fill[s]] = d
+            fill[s] += 1
+        return offsets, targets
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def _bfs(self, start: int, offsets: array, targets: array) -> dict[int, int]:
+        """Frontier-at-a-time BFS from *start*, up to ``max_depth`` hops."""
+        distances: dict[int, int] = {}
+        frontier = [start]
+        depth = 0
+        while frontier and depth < self.max_depth:
+            depth += 1
+            next_frontier: list[int] = []
+            for node in frontier:
+                for neighbor in targets[offsets[node]:offsets[node + 1]]:
+                    if neighbor == start or neighbor in distances:
+                        continue
                     distances[neighbor] = depth
                     next_frontier.append(neighbor)
-        frontier = next_frontier
-    return distances
+            frontier = next_frontier
+        return distances
+
+    def distances_from(self, src: str) -> dict[str, int]:
+        """Shortest forward call distance from *src* to every reachable chunk."""
+        i = self.index.get(src)
+        if i is None:
+            return {}
+        ids = self.ids
+        return {ids[j]: d for j, d in
+                self._bfs(i, self.offsets, self.targets).items()}
+
+    def call_distances(self, cid: str) -> dict[str, int]:
+        """Shortest call distance from *cid* to every chunk within
+        ``max_depth``, following calls in either direction."""
+        i = self.index.get(cid)
+        if i is None:
+            return {}
+        near = self._bfs(i, self.offsets, self.targets)
+        for j, d in self._bfs(i, self.rev_offsets, self.rev_targets).items():
+            if d < near.get(j, d + 1):
+                near[j] = d
+        ids = self.ids
+        return {ids[j]: d for j, d in near.items()}
+
+    def reachable_pairs(self):
+        """Yield ``(src, dst)`` chunk IDs for every pair within ``max_depth``."""
+        ids = self.ids
+        offsets, targets = self.offsets, self.targets
+        for i in range(len(ids)):
+            if offsets[i] == offsets[i + 1]:
+                continue
+            src = ids[i]
+            for j in self._bfs(i, offsets, targets):
+                yield src, ids[j]
+
+    def distance(self, a_id: str, b_id: str) -> int | None:
+        """Shortest call distance between two chunks in either direction."""
+        a = self.index.get(a_id)
+        b = self.index.get(b_id)
+        if a is None or b is None:
+            return None
+        if a != self._cached_src:
+            self._cached_src = a
+            self._cached_fwd = self._bfs(a, self.offsets, self.targets)
+            self._cached_rev = self._bfs(a, self.rev_offsets, self.rev_targets)
+        d = self._cached_fwd.get(b)
+        d2 = self._cached_rev.get(b)
+        if d is None:
+            return d2
+        if d2 is None:
+            return d
+        return min(d, d2)
 
 
 def compute_call_distances(chunks: list[Chunk],
                            adjacency: dict[str, set[str]]
                            ) -> dict[tuple[str, str], int]:
-    """Compute BFS shortest-path distances between all reachable chunk pairs."""
+    """Compute BFS shortest-path distances between all reachable chunk pairs.
+
+    Materializes every pair, so memory grows with the number of reachable
+    pairs; ``compute_edges`` uses :class:`CallGraph` lookups instead.
+    """
+    graph = CallGraph(adjacency)
     distances: dict[tuple[str, str], int] = {}
     # Only BFS from chunks with outgoing calls
     sources = {c.id for c in chunks if c.calls}
     for src in sources:
-        if src not in adjacency:
-            continue
-        dists = _bfs_distances(src, adjacency)
-        for target, dist in dists.items():
-            pair = (src, target)
-            if pair not in distances or dist < distances[pair]:
-                distances[pair] = dist
+        for target, dist in graph.distances_from(src).items():
+            distances[(src, target)] = dist
     return distances
 
 
 def call_graph_score(a_id: str, b_id: str,
-                     distances: dict[tuple[str, str], int]) -> float:
+                     distances: "dict[tuple[str, str], int] | CallGraph"
+                     ) -> float:
     """Score based on call-graph distance. Direct call → 0.5, unreachable → 0.0."""
+    if isinstance(distances, CallGraph):
+        min_d = distances.distance(a_id, b_id)
+        if min_d is None:
+            return 0.0
+        return 1.0 / (1 + min_d)
     d = distances.get((a_id, b_id))
     d2 = distances.get((b_id, a_id))
     if d is None and d2 is None:
@@ -206,7 +355,8 @@ def compute_edges(chunks: list[Chunk],
                   weights: dict[str, float] | None = None,
                   repo_root: Path | None = None,
                   max_commits: int = 500,
-                  min_weight: float = 0.05) -> list:
+                  min_weight: float = 0.05,
+                  only: set[str] | None = None) -> list:
     """Compute weighted edges between chunks.
 
     Args:
@@ -215,6 +365,8 @@ def compute_edges(chunks: list[Chunk],
         repo_root: Repository root for git operations. If None, co-change is skipped.
         max_commits: Max commits to scan for co-change.
         min_weight: Minimum combined weight to keep an edge.
+        only: If given, only score pairs with at least one endpoint in this
+            set of chunk IDs (used for incremental re-clustering).
 
     Returns:
         List of Edge objects.
@@ -228,8 +380,12 @@ def compute_edges(chunks: list[Chunk],
     # Filter to function/class/file chunks for pairwise comparison (skip directories)
     scored_chunks = [c for c in chunks if c.kind in ("function", "class", "file")]
 
-    # Pre-compute stopwords
-    stopwords = _build_stopwords(scored_chunks)
+    # Pre-compute stopwords and each chunk's filtered token IDs
+    stopwords = _build_stopword_ids(scored_chunks)
+    filtered: dict[str, frozenset[int]] = {
+        c.id: frozenset(_token_ids(c)).difference(stopwords)
+        for c in scored_chunks
+    }
 
     # Pre-compute co-change matrix
     cochange_matrix: dict[tuple[str, str], int] = {}
@@ -239,16 +395,15 @@ def compute_edges(chunks: list[Chunk],
         if cochange_matrix:
             max_cochange = max(cochange_matrix.values())
 
-    # Pre-compute call graph
-    call_distances: dict[tuple[str, str], int] = {}
+    # Pre-compute call graph (distances are searched per source chunk)
+    call_graph: CallGraph | None = None
     if weights.get("callgraph", 0) > 0:
-        adjacency = build_call_graph(chunks)
-        call_distances = compute_call_distances(chunks, adjacency)
+        call_graph = CallGraph(build_call_graph(chunks))
 
     # Build inverted index for token overlap
-    token_to_chunks: dict[str, set[str]] = defaultdict(set)
+    token_to_chunks: dict[int, set[str]] = defaultdict(set)
     for c in scored_chunks:
-        for t in (c.tokens - stopwords):
+        for t in filtered[c.id]:
             token_to_chunks[t].add(c.id)
 
     # Build directory adjacency index
@@ -256,69 +411,82 @@ def compute_edges(chunks: list[Chunk],
     for c in scored_chunks:
         dir_to_chunks[str(c.path.parent)].add(c.id)
 
-    # Collect candidate pairs
-    candidate_pairs: set[tuple[str, str]] = set()
-
-    # Pairs sharing tokens
-    for chunk_ids in token_to_chunks.values():
-        ids = list(chunk_ids)
-        for i in range(len(ids)):
-            for j in range(i + 1, len(ids)):
-                candidate_pairs.add(tuple(sorted((ids[i], ids[j]))))
-
-    # Pairs in same or adjacent directory
+    # Directories whose chunks are paired: the same directory and any
+    # ancestor or descendant.
     dirs = list(dir_to_chunks.keys())
+    related_dirs: dict[str, list[str]] = {d: [d] for d in dirs}
     for i, d1 in enumerate(dirs):
-        for c1 in dir_to_chunks[d1]:
-            for c2 in dir_to_chunks[d1]:
-                if c1 < c2:
-                    candidate_pairs.add((c1, c2))
-        # Adjacent = parent/child
-        for j in range(i + 1, len(dirs)):
-            d2 = dirs[j]
-            if d1.startswith(d2 + '/') or d2.startswith(d1 + '/') or d1 == d2:
-                for c1 in dir_to_chunks[d1]:
-                    for c2 in dir_to_chunks[d2]:
-                        if c1 != c2:
-                            candidate_pairs.add(tuple(sorted((c1, c2))))
-
-    # Pairs connected by call graph
-    for (a_id, b_id) in call_distances:
-        pair = tuple(sorted((a_id, b_id)))
-        candidate_pairs.add(pair)
-
-    # Compute edges
+        for d2 in dirs[i + 1:]:
+            if d1.startswith(d2 + '/') or d2.startswith(d1 + '/'):
+                related_dirs[d1].append(d2)
+                related_dirs[d2].append(d1)
+
+    def _neighbors(cid: str) -> tuple[set[str], dict[str, int]]:
+        """Candidate partners of *cid* and its call distances to them."""
+        near: set[str] = set()
+        tokens = filtered.get(cid)
+        if tokens is not None:
+            for t in tokens:
+                near.update(token_to_chunks[t])
+            chunk = chunk_map[cid]
+            for d in related_dirs.get(str(chunk.path.parent), ()):
+                near.update(dir_to_chunks[d])
+        distances = call_graph.call_distances(cid) if call_graph else {}
+        near.update(distances)
+        near.discard(cid)
+        return near, distances
+
+    # Score pairs one source chunk at a time, as its partners are found,
+    # so memory is bounded by one chunk's neighbourhood rather than by
+    # every candidate pair.  Each unordered pair (a, b) with a < b is
+    # scored from a; with *only*, sources are just the listed chunks and
+    # a pair with both ends listed is scored from its smaller end.
+    if only is not None:
+        sources = sorted(cid for cid in only if cid in chunk_map)
+    else:
+        sources = sorted(set(filtered).union(call_graph.ids if call_graph else ()))
     edges = []
-    for a_id, b_id in candidate_pairs:
-        a = chunk_map.get(a_id)
-        b = chunk_map.get(b_id)
-        if not a or not b:
-            continue
+    for src in sources:
+        near, distances = _neighbors(src)
+        for other in sorted(near):
+            if only is None or other in only:
+                if other < src:
+                    continue
+                a_id, b_id = src, other
+            else:
+                a_id, b_id = (src, other) if src < other else (other, src)
+            a = chunk_map.get(a_id)
+            b = chunk_map.get(b_id)
+            if not a or not b:
+                continue
 
-        breakdown: dict[str, float] = {}
-        total = 0.0
+            breakdown: dict[str, float] = {}
+            total = 0.0
 
-        if weights.get("structural", 0) > 0:
-            s = structural_proximity(a, b)
-            breakdown["structural"] = s
-            total += weights["structural"] * s
+            if weights.get("structural", 0) > 0:
+                s = structural_proximity(a, b)
+                breakdown["structural"] = s
+                total += weights["structural"] * s
 
-        if weights.get("semantic", 0) > 0:
-            s = semantic_similarity(a, b, stopwords)
-            breakdown["semantic"] = s
-            total += weights["semantic"] * s
+            if weights.get("semantic", 0) > 0:
+                s = _jaccard(filtered[a_id], filtered[b_id])
+                breakdown["semantic"] = s
+                total += weights["semantic"] * s
 
-        if weights.get("cochange", 0) > 0:
-            s = cochange_score(a, b, cochange_matrix, max_cochange)
-            breakdown["cochange"] = s
-            total += weights["cochange"] * s
+            if weights.get("cochange", 0) > 0:
+                s = cochange_score(a, b, cochange_matrix, max_cochange)
+                breakdown["cochange"] = s
+                total += weights["cochange"] * s
 
-        if weights.get("callgraph", 0) > 0:
-            s = call_graph_score(a_id, b_id, call_distances)
-            breakdown["callgraph"] = s
-            total += weights["callgraph"] * s
+            if call_graph is not None:
+                d = distances.get(other)
+                s = 0.0 if d is None else 1.0 / (1 + d)
+                breakdown["callgraph"] = s
+                total += weights["callgraph"] * s
 
-        if total >= min_weight:
-            edges.append(Edge(a=a_id, b=b_id, weight=total, breakdown=breakdown))
+            if total >= min_weight:
+                edges.append(Edge(a=a_id, b=b_id, weight=total, breakdown=breakdown))
 
+    if only is not None:
+        edges.sort(key=lambda e: (e.a, e.b))
     return edges
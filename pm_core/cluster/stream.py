@@ -0,0 +1,141 @@
+"""Streaming, memory-bounded clustering pipeline.
+
+Partitions from :func:`pre_partition` are processed one at a time: edges
+for a partition are computed, spilled to an :class:`EdgeSpill` on disk,
+clustered, and dropped before the next partition starts.  Peak memory is
+therefore bounded by the largest partition rather than the whole repo.
+"""
+
+import tempfile
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from pm_core.cluster.chunks import Chunk
+from pm_core.cluster.cluster_graph import Cluster, Edge, agglomerative_cluster
+from pm_core.cluster.metrics import compute_edges
+from pm_core.cluster.partition import pre_partition
+
+_CLUSTERED_KINDS = ("function", "class", "file")
+
+# Partitions with at most this many clusterable chunks become one cluster.
+SMALL_PARTITION = 3
+
+
+class EdgeSpill:
+    """Append-only on-disk edge store.
+
+    Each :meth:`write` appends one batch as three binary columns — chunk
+    index ``a``, chunk index ``b`` (``array('I')``) and weight
+    (``array('d')``) — to an anonymous temp file.  Iterating re-reads the
+    batches one at a time, yielding :class:`Edge` objects without the
+    per-metric breakdown.
+    """
+
+    def __init__(self, directory: Path | None = None):
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._ids: list[str] = []
+        self._index: dict[str, int] = {}
+        self._batches: list[tuple[int, int]] = []  # (offset, count)
+        self._count = 0
+
+    def _intern(self, cid: str) -> int:
+        i = self._index.get(cid)
+        if i is None:
+            i = self._index[cid] = len(self._ids)
+            self._ids.append(cid)
+        return i
+
+    def write(self, edges: Iterable[Edge]) -> None:
+        a, b, w = array('I'), array('I'), array('d')
+        for e in edges:
+            a.append(self._intern(e.a))
+            b.append(self._intern(e.b))
+            w.append(e.weight)
+        if not w:
+            return
+        self._file.seek(0, 2)
+        self._batches.append((self._file.tell(), len(w)))
+        a.tofile(self._file)
+        b.tofile(self._file)
+        w.tofile(self._file)
+        self._count += len(w)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Edge]:
+        ids = self._ids
+        for offset, n in self._batches:
+            self._file.seek(offset)
+            a, b, w = array('I'), array('I'), array('d')
+            a.fromfile(self._file, n)
+            b.fromfile(self._file, n)
+            w.fromfile(self._file, n)
+            for i in range(n):
+                yield Edge(a=ids[a[i]], b=ids[b[i]], weight=w[i])
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def cluster_partitions(chunks: list[Chunk],
+                       weights: dict[str, float] | None = None,
+                       threshold: float = 0.15,
+                       repo_root: Path | None = None,
+                       max_commits: int = 500,
+                       spill: EdgeSpill | None = None,
+                       log: Callable[[str], None] | None = None,
+                       ) -> list[Cluster]:
+    """Cluster *chunks* one pre-partition at a time.
+
+    Args:
+        chunks: All code chunks.
+        weights: Metric weights passed to :func:`compute_edges`.
+        threshold: Merge threshold for :func:`agglomerative_cluster`.
+        repo_root: Repository root for co-change analysis.
+        max_commits: Max commits to scan for co-change.
+        spill: If given, every partition's edges are appended to it.
+        log: Optional callback for per-partition progress lines.
+
+    Returns:
+        Clusters numbered from 1, named ``"<partition>: <name>"``.
+    """
+    partitions = pre_partition(chunks)
+    if log:
+        log(f"  {len(partitions)} partitions: {', '.join(partitions.keys())}")
+
+    clusters: list[Cluster] = []
+    for part_name in list(partitions):
+        part_chunks = partitions.pop(part_name)
+        ids = {c.id for c in part_chunks if c.kind in _CLUSTERED_KINDS}
+        if len(ids) <= SMALL_PARTITION:
+            clusters.append(Cluster(id=str(len(clusters) + 1), chunk_ids=ids,
+                                    name=part_name))
+            if log:
+                log(f"  [{part_name}] {len(ids)} chunks → 1 cluster (small partition)")
+            continue
+
+        if log:
+            log(f"  [{part_name}] computing edges for {len(part_chunks)} chunks ...")
+        part_edges = compute_edges(part_chunks, weights=weights,
+                                   repo_root=repo_root, max_commits=max_commits)
+        if spill is not None:
+            spill.write(part_edges)
+        part_clusters = agglomerative_cluster(part_chunks, part_edges,
+                                              threshold=threshold)
+        n_edges = len(part_edges)
+        del part_edges
+        for c in part_clusters:
+            c.id = str(len(clusters) + 1)
+            c.name = f"{part_name}: {c.name}" if c.name else part_name
+            clusters.append(c)
+        if log:
+            log(f"  [{part_name}] {n_edges} edges → {len(part_clusters)} clusters")
+    return clusters
@@ -45,9 +45,10 @@ import subprocess
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
+from pm_core import repo_image
 from pm_core.paths import configure_logger
 
 _log = configure_logger("pm.container")
@@ -338,6 +339,23 @@ def load_container_config() -> ContainerConfig:
     )
 
 
+def config_for_repo(config: ContainerConfig,
+                    repo: Path | None) -> ContainerConfig:
+    """*config* with the default image swapped for *repo*'s dependency image.
+
+    For callers that start containers before *repo*'s checkout is in
+    their workdir (the warm pool), where :func:`create_container` would
+    find no manifests.  Unchanged when *repo* is None, a custom image is
+    configured, or the dependency image is not built yet.
+    """
+    if repo is None or config.image != DEFAULT_IMAGE:
+        return config
+    image = repo_image.image_for(Path(repo), config.image)
+    if image == config.image:
+        return config
+    return replace(config, image=image)
+
+
 def is_container_mode_enabled() -> bool:
     """Check if container isolation is enabled for Claude sessions."""
     from pm_core.paths import get_global_setting
@@ -478,33 +496,40 @@ def _build_git_setup_script(
             '    done\n'
             '    args_json="$args_json]"\n'
             '    escaped_cmd=$(printf \'%s\' "$CMD" | sed \'s/"/\\\\"/g\')\n'
+            # "stream" asks for git's output as it is produced, so fetch/push
+            # progress shows up live; a proxy predating streaming ignores it
+            # and sends the one final line, which the client also handles.
             + ('    escaped_workdir=$(printf \'%s\' "$HOST_WORKDIR" | sed \'s/\\\\/\\\\\\\\/g; s/"/\\\\"/g\')\n'
-               '    request=\'{"cmd": "\'$escaped_cmd\'", "args": \'$args_json\', "workdir": "\'$escaped_workdir\'"}\'\n'
+               '    request=\'{"cmd": "\'$escaped_cmd\'", "args": \'$args_json\', "workdir": "\'$escaped_workdir\'", "stream": true}\'\n'
                if _escaped_host_workdir else
-               '    request=\'{"cmd": "\'$escaped_cmd\'", "args": \'$args_json\'}\'\n')
+               '    request=\'{"cmd": "\'$escaped_cmd\'", "args": \'$args_json\', "stream": true}\'\n')
             + '    if ! command -v python3 >/dev/null 2>&1; then\n'
             '      echo "pm: python3 required for git proxy client" >&2\n'
             '      exit 1\n'
             '    fi\n'
-            '    response=$(python3 -c "\n'
+            '    python3 -c "\n'
             "import socket, sys, json\n"
             "s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)\n"
             "try:\n"
             "    s.connect('$SOCKET')\n"
             "except Exception as e:\n"
-            f"    print(json.dumps({{'exit_code': 1, 'stdout': '', 'stderr': f'git-proxy: cannot connect: {{e}}\\\\n'}}))\n"
-            "    sys.exit(0)\n"
+            "    sys.stderr.write(f'git-proxy: cannot connect: {e}\\\\n')\n"
+            "    sys.exit(1)\n"
             "s.sendall((sys.argv[1] + '\\\\n').encode())\n"
-            "data = b''\n"
-            "while True:\n"
-            "    chunk = s.recv(4096)\n"
-            "    if not chunk:\n"
-            "        break\n"
-            "    data += chunk\n"
+            "rc = 1\n"
+            "for line in s.makefile('rb'):\n"
+            "    r = json.loads(line)\n"
+            "    if 'exit_code' in r:\n"
+            "        sys.stdout.write(r.get('stdout', ''))\n"
+            "        sys.stderr.write(r.get('stderr', ''))\n"
+            "        rc = r['exit_code']\n"
+            "    else:\n"
+            "        (sys.stdout if r.get('stream') == 'stdout' else sys.stderr).write(r.get('data', ''))\n"
+            "    sys.stdout.flush()\n"
+            "    sys.stderr.flush()\n"
             "s.close()\n"
-            "print(data.decode())\n"
-            '" "$request" 2>&1)\n'
-            '    printf \'%s\' "$response" | python3 -c "import sys,json; r=json.load(sys.stdin); sys.stdout.write(r.get(\'stdout\',\'\')); sys.stderr.write(r.get(\'stderr\',\'\')); sys.exit(r.get(\'exit_code\',1))"\n'
+            "sys.exit(rc)\n"
+            '" "$request"\n'
             '    exit $?\n'
             '    ;;\n'
             'esac\n'
@@ -595,6 +620,8 @@ def create_container(
       - Passes through Claude-related env vars
       - Applies resource limits from config
       - Starts a host-side push proxy for branch-scoped git push access
+      - On the default image, uses the workdir's dependency image
+        (:mod:`pm_core.repo_image`) when one is built
 
     Args:
         name: Container name (must be unique).
@@ -655,6 +682,12 @@ def create_container(
             f"'pm container build-base' for the base image."
         )
 
+    # On the default image, prefer the repo's derived image with its
+    # dependencies already installed (see pm_core.repo_image).
+    image = config.image
+    if config.image == DEFAULT_IMAGE:
+        image = repo_image.image_for(workdir, config.image)
+
     runtime = _get_runtime()
     cmd = [
         "run", "-d",
@@ -880,7 +913,7 @@ def create_container(
     setup_parts.append(f"touch {_READY_SENTINEL}")
     setup_parts.append("exec sleep infinity")
     setup = "; ".join(setup_parts)
-    cmd.extend([config.image, "bash", "-c", setup])
+    cmd.extend([image, "bash", "-c", setup])
 
     result = _run_runtime(*cmd, timeout=60)
     container_id = result.stdout.strip()
@@ -1010,6 +1043,7 @@ def remove_container(name: str) -> None:
     import time
     from pm_core.push_proxy import stop_push_proxy
     _log.info("remove_container: name=%s", name)
+    _cleanup_queue.discard(name)
     stop_push_proxy(name)
     _run_runtime("rm", "-f", name, check=False, timeout=30)
     # Wait for the container to be fully gone.  When another rm is already in
@@ -1024,6 +1058,156 @@ def remove_container(name: str) -> None:
     _log.warning("remove_container: %s still present after 10 s", name)
 
 
+# Names per ``rm -f`` invocation, and how many such invocations run at once.
+_RM_BATCH = 32
+_RM_WORKERS = 4
+
+
+def _stop_proxies(names: list[str]) -> None:
+    """Stop the push proxies of *names* in parallel."""
+    from pm_core.push_proxy import stop_push_proxy
+    with ThreadPoolExecutor(max_workers=min(len(names), 8),
+                            thread_name_prefix="proxy-stop") as ex:
+        futures = [(n, ex.submit(stop_push_proxy, n)) for n in names]
+        for name, fut in futures:
+            try:
+                fut.result()
+            except Exception:
+                _log.warning("stop_push_proxy(%s) failed", name, exc_info=True)
+
+
+def _existing_containers(names) -> set[str]:
+    """Return those of *names* that still exist, in one ``ps`` call."""
+    names = set(names)
+    prefix = os.path.commonprefix(sorted(names))
+    flt = ("--filter", f"name={prefix}") if prefix else ()
+    result = _run_runtime("ps", "-a", *flt, "--format", "{{.Names}}",
+                          check=False, timeout=10)
+    if result.returncode != 0:
+        return set()
+    return {line.strip() for line in result.stdout.splitlines()} & names
+
+
+def remove_containers(names) -> list[str]:
+    """Force-remove several containers and their push proxies at once.
+
+    The bulk form of :func:`remove_container`: proxies are stopped in
+    parallel, containers are removed with one ``rm -f`` per ``_RM_BATCH``
+    names (up to ``_RM_WORKERS`` batches at a time), and the call waits
+    until they have disappeared.  Returns the names that are gone.
+    """
+    names = list(dict.fromkeys(n for n in names if n))
+    if not names:
+        return []
+    _log.info("remove_containers: %d container(s)", len(names))
+    _stop_proxies(names)
+
+    def rm(batch: list[str]) -> None:
+        try:
+            _run_runtime("rm", "-f", *batch, check=False,
+                         timeout=30 + len(batch))
+        except subprocess.TimeoutExpired:
+            _log.warning("remove_containers: rm of %d container(s) timed out",
+                         len(batch))
+
+    batches = [names[i:i + _RM_BATCH] for i in range(0, len(names), _RM_BATCH)]
+    if len(batches) == 1:
+        rm(batches[0])
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(batches), _RM_WORKERS),
+                                thread_name_prefix="container-rm") as ex:
+            list(ex.map(rm, batches))
+
+    # Same wait as remove_container, but one listing covers every name.
+    remaining = _existing_containers(names)
+    deadline = time.monotonic() + 10
+    while remaining and time.monotonic() < deadline:
+        time.sleep(0.1)
+        remaining = _existing_containers(remaining)
+    if remaining:
+        _log.warning("remove_containers: %s still present after 10 s",
+                     ", ".join(sorted(remaining)))
+    return [n for n in names if n not in remaining]
+
+
+class _CleanupQueue:
+    """Removes queued containers on a background thread.
+
+    Names queued while a removal is running are collected and removed
+    together by the next :func:`remove_containers` call.  The worker is a
+    daemon thread.  An atexit hook waits for queued work, so a CLI
+    process does not exit with removals still pending.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending: list[str] = []
+        self._inflight: set[str] = set()
+        self._thread: threading.Thread | None = None
+        self._atexit = False
+
+    def add(self, names) -> None:
+        with self._cond:
+            for name in names:
+                if name and name not in self._pending:
+                    self._pending.append(name)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="container-cleanup", daemon=True)
+                self._thread.start()
+                if not self._atexit:
+                    import atexit
+                    atexit.register(self.wait, 60)
+                    self._atexit = True
+            self._cond.notify_all()
+
+    def discard(self, name: str) -> None:
+        """Unqueue *name*, or wait for its removal if it is under way."""
+        with self._cond:
+            if name in self._pending:
+                self._pending.remove(name)
+            self._cond.wait_for(lambda: name not in self._inflight)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._inflight, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                names, self._pending = self._pending, []
+                self._inflight.update(names)
+            try:
+                remove_containers(names)
+            except Exception:
+                _log.warning("background removal of %d container(s) failed",
+                             len(names), exc_info=True)
+            finally:
+                with self._cond:
+                    self._inflight.difference_update(names)
+                    self._cond.notify_all()
+
+
+_cleanup_queue = _CleanupQueue()
+
+
+def remove_containers_async(names) -> None:
+    """Queue containers for removal in the background and return at once.
+
+    For callers that do not reuse the names; :func:`remove_container`
+    (and so container creation) first waits out any queued removal of
+    the same name.
+    """
+    _cleanup_queue.add(names)
+
+
+def wait_for_cleanup(timeout: float | None = None) -> bool:
+    """Block until queued removals finish; False if *timeout* ran out."""
+    return _cleanup_queue.wait(timeout)
+
+
 # ---------------------------------------------------------------------------
 # Shared wrapping: create container + return wrapped command
 # ---------------------------------------------------------------------------
@@ -1153,15 +1337,47 @@ def create_qa_container(
     )
 
 
+def _list_containers(prefixes: list[str]) -> list[str]:
+    """Names of all containers matching any of *prefixes*, without repeats."""
+    names: list[str] = []
+    seen: set[str] = set()
+    for prefix in prefixes:
+        result = _run_runtime(
+            "ps", "-a", "--filter", f"name={prefix}",
+            "--format", "{{.Names}}",
+            check=False, timeout=30,
+        )
+        if result.returncode != 0:
+            continue
+        for line in result.stdout.strip().splitlines():
+            cname = line.strip()
+            if cname and cname not in seen:
+                seen.add(cname)
+                names.append(cname)
+    return names
+
+
+def _remove_listed(names: list[str], wait: bool) -> list[str]:
+    """Remove *names* now, or queue them when *wait* is False."""
+    if not names:
+        return []
+    if not wait:
+        remove_containers_async(names)
+        return names
+    return remove_containers(names)
+
+
 def cleanup_qa_containers(pr_id: str, loop_id: str,
                           exclude: set[str] | None = None,
-                          session_tag: str | None = None) -> int:
+                          session_tag: str | None = None,
+                          wait: bool = True) -> int:
     """Remove all containers for a given QA loop.
 
     *exclude* is an optional set of container names to skip (e.g. the
-    interactive Scenario 0 container that should stay alive).
+    interactive Scenario 0 container that should stay alive).  With
+    *wait* False the containers are queued for background removal.
 
-    Returns the number of containers removed.
+    Returns the number of containers removed (or queued).
     """
     # Search for both session-tagged and legacy container names
     prefixes = []
@@ -1169,66 +1385,28 @@ def cleanup_qa_containers(pr_id: str, loop_id: str,
         prefixes.append(f"{CONTAINER_PREFIX}{session_tag}-qa-{pr_id}-{loop_id}-")
     prefixes.append(f"{CONTAINER_PREFIX}qa-{pr_id}-{loop_id}-")
 
-    count = 0
-    for prefix in prefixes:
-        result = _run_runtime(
-            "ps", "-a", "--filter", f"name={prefix}",
-            "--format", "{{.Names}}",
-            check=False, timeout=30,
-        )
-        if result.returncode != 0:
-            continue
-
-        for line in result.stdout.strip().splitlines():
-            cname = line.strip()
-            if cname and cname not in (exclude or set()):
-                remove_container(cname)
-                count += 1
-
+    names = [c for c in _list_containers(prefixes) if c not in (exclude or set())]
+    count = len(_remove_listed(names, wait))
     if count:
         _log.info("Cleaned up %d container(s) for %s/%s", count, pr_id, loop_id)
     return count
 
 
 def cleanup_pr_containers(pr_id: str,
-                          session_tag: str | None = None) -> list[str]:
+                          session_tag: str | None = None,
+                          wait: bool = True) -> list[str]:
     """Remove every QA container for a PR across all loop ids.
 
     Matches both legacy (``pm-qa-{pr_id}-``) and session-tagged
     (``pm-{session_tag}-qa-{pr_id}-``) name prefixes. Returns the list of
-    container names removed.
+    container names removed, or queued for removal when *wait* is False.
     """
     prefixes = []
     if session_tag:
         prefixes.append(f"{CONTAINER_PREFIX}{session_tag}-qa-{pr_id}-")
     prefixes.append(f"{CONTAINER_PREFIX}qa-{pr_id}-")
 
-    candidates: list[str] = []
-    seen: set[str] = set()
-    for prefix in prefixes:
-        result = _run_runtime(
-            "ps", "-a", "--filter", f"name={prefix}",
-            "--format", "{{.Names}}",
-            check=False, timeout=30,
-        )
-        if result.returncode != 0:
-            continue
-        for line in result.stdout.strip().splitlines():
-            cname = line.strip()
-            if cname and cname not in seen:
-                seen.add(cname)
-                candidates.append(cname)
-
-    removed: list[str] = []
-    if candidates:
-        with ThreadPoolExecutor(max_workers=min(len(candidates), 8)) as ex:
-            futures = [(c, ex.submit(remove_container, c)) for c in candidates]
-            for cname, fut in futures:
-                try:
-                    fut.result()
-                    removed.append(cname)
-                except Exception as e:  # pragma: no cover - best effort
-                    _log.warning("remove_container(%s) failed: %s", cname, e)
+    removed = _remove_listed(_list_containers(prefixes), wait)
     if removed:
         _log.info("Cleaned up %d container(s) for %s", len(removed), pr_id)
     return removed
@@ -1258,83 +1436,43 @@ def cleanup_orphaned_qa_containers(session: str, pr_id: str,
     except Exception:
         return 0
 
-    count = 0
-    for prefix in prefixes:
-        result = _run_runtime(
-            "ps", "-a", "--filter", f"name={prefix}",
-            "--format", "{{.Names}}",
-            check=False, timeout=30,
-        )
-        if result.returncode != 0:
+    orphans: list[str] = []
+    for cname in _list_containers(prefixes):
+        # Container name: pm[-{session_tag}]-qa-{pr_id}-{loop_id}-s{N}
+        # Window name:    qa-{display_id}-s{N}
+        # Extract the -s{N} suffix to check against windows.
+        parts = cname.split("-s")
+        if len(parts) < 2:
             continue
-
-        for line in result.stdout.strip().splitlines():
-            cname = line.strip()
-            if not cname:
-                continue
-            # Container name: pm[-{session_tag}]-qa-{pr_id}-{loop_id}-s{N}
-            # Window name:    qa-{display_id}-s{N}
-            # Extract the -s{N} suffix to check against windows.
-            parts = cname.split("-s")
-            if len(parts) < 2:
-                continue
-            suffix = f"-s{parts[-1]}"
-            # Check if ANY window ending with this suffix exists
-            has_window = any(w.endswith(suffix) and w.startswith("qa-")
-                             for w in live_windows)
-            if not has_window:
-                remove_container(cname)
-                count += 1
-
+        suffix = f"-s{parts[-1]}"
+        # Check if ANY window ending with this suffix exists
+        has_window = any(w.endswith(suffix) and w.startswith("qa-")
+                         for w in live_windows)
+        if not has_window:
+            orphans.append(cname)
+
+    count = len(remove_containers(orphans))
     if count:
         _log.info("Cleaned up %d orphaned QA container(s) for %s",
                   count, pr_id)
     return count
 
 
-def cleanup_session_containers(session_tag: str) -> int:
+def cleanup_session_containers(session_tag: str, wait: bool = True) -> int:
     """Remove all containers belonging to a session.
 
     Filters by ``pm-{session_tag}-`` which matches every container whose
     name was generated with this session tag embedded.
 
-    Returns the number of containers removed.
+    Returns the number of containers removed (queued, if not *wait*).
     """
     prefix = f"{CONTAINER_PREFIX}{session_tag}-"
-    result = _run_runtime(
-        "ps", "-a", "--filter", f"name={prefix}",
-        "--format", "{{.Names}}",
-        check=False, timeout=30,
-    )
-    if result.returncode != 0:
-        return 0
-
-    count = 0
-    for line in result.stdout.strip().splitlines():
-        cname = line.strip()
-        if cname:
-            remove_container(cname)
-            count += 1
-
+    count = len(_remove_listed(_list_containers([prefix]), wait))
     if count:
         _log.info("Cleaned up %d container(s) for session %s", count, session_tag)
     return count
 
 
-def cleanup_all_containers() -> int:
-    """Remove all pm containers. Returns count removed."""
-    result = _run_runtime(
-        "ps", "-a", "--filter", f"name={CONTAINER_PREFIX}",
-        "--format", "{{.Names}}",
-        check=False, timeout=30,
-    )
-    if result.returncode != 0:
-        return 0
-
-    count = 0
-    for line in result.stdout.strip().splitlines():
-        cname = line.strip()
-        if cname:
-            remove_container(cname)
-            count += 1
-    return count
+def cleanup_all_containers(wait: bool = True) -> int:
+    """Remove all pm containers. Returns count removed (or queued)."""
+    return len(_remove_listed(_list_containers([CONTAINER_PREFIX]), wait))
@@ -0,0 +1,445 @@
+"""Warm pool of pre-started QA scenario containers.
+
+Every container-mode QA scenario used to pay for a cold
+:func:`container.create_container` before its Claude could start: the
+``run -d`` itself, bind-mount setup, the setup script and readiness poll,
+the ``~/.pm`` chown and ``.claude.json`` copy.  A :class:`ContainerPool`
+does all of that ahead of time for *N* generic containers per
+``(image, session)``, each mounting empty host directories:
+
+    <pool root>/<name>/repo      -> /workspace
+    <pool root>/<name>/scratch   -> /scratch
+    /tmp/pm-push-proxy-<name>/   -> /run/pm-push-proxy
+    ~/.pm/sessions/<tag>/captures -> /pm-session-captures
+
+The QA loop resolves the image from the project repo first
+(:func:`container.config_for_repo`): a pooled container's workdir is still
+empty when it starts, so :func:`container.create_container` could not
+pick the repo's dependency image from it.
+
+Handing one to a scenario is two cheap steps around the scenario clone:
+
+  1. :meth:`ContainerPool.acquire` renames the slot's ``repo``/``scratch``
+     directories to the scenario's paths.  Bind mounts follow a renamed
+     directory, so whatever is cloned there appears at /workspace.
+  2. :meth:`ContainerPool.attach` renames the container to the scenario's
+     :func:`container.qa_container_name` (existing cleanup finds it by that
+     name), moves the socket directory to that name's per-container proxy
+     path and starts the proxy there, installs the git wrapper, and points
+     /pm-captures at the PR's captures directory.
+
+Pooled containers therefore use per-container push proxies rather than
+the shared per-PR proxy: the socket directory is mounted when the
+container starts, before the PR is known.
+
+Used containers are destroyed — by the QA loop's usual cleanup or by
+:meth:`ContainerPool.release` — and the pool refills in the background.
+``release(lease, recycle=True)`` empties the directories and returns the
+container to the pool instead.
+
+The pool size is the ``qa-container-pool`` setting (0, the default,
+disables pooling).
+"""
+
+import os
+import secrets
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from pm_core import container as container_mod
+from pm_core.container import ContainerConfig
+from pm_core.paths import configure_logger
+
+_log = configure_logger("pm.container_pool")
+
+# Where the session's captures root is mounted; /pm-captures becomes a
+# symlink to the PR's subdirectory once the container is attached.
+_CONTAINER_SESSION_CAPTURES = "/pm-session-captures"
+
+
+def pool_size() -> int:
+    """Read qa-container-pool from global settings (default 0: disabled)."""
+    from pm_core.paths import get_global_setting_value
+    val = get_global_setting_value("qa-container-pool", "")
+    try:
+        return max(0, int(val))
+    except ValueError:
+        return 0
+
+
+def _pool_root() -> Path:
+    # Under ~/.pm/workdirs/qa so slot directories can be renamed into
+    # scenario workdirs (create_qa_workdir) without crossing filesystems.
+    return Path.home() / ".pm" / "workdirs" / "qa" / ".pool"
+
+
+def _sock_dir(name: str) -> Path:
+    """The per-container push proxy directory for *name* (see push_proxy)."""
+    from pm_core.push_proxy import _SOCKET_DIR_PREFIX
+    return Path(tempfile.gettempdir()) / f"{_SOCKET_DIR_PREFIX}{name}"
+
+
+def _replace_dir(src: Path, dst: Path) -> None:
+    """Rename *src* to *dst*, removing whatever is at *dst* first."""
+    if dst.is_symlink() or dst.is_file():
+        dst.unlink()
+    elif dst.exists():
+        shutil.rmtree(dst)
+    os.rename(src, dst)
+
+
+def _empty_dir(path: Path) -> None:
+    for child in path.iterdir():
+        if child.is_dir() and not child.is_symlink():
+            shutil.rmtree(child, ignore_errors=True)
+        else:
+            child.unlink(missing_ok=True)
+
+
+@dataclass
+class PoolLease:
+    """A pooled container and the host directories mounted into it.
+
+    *name*, *repo* and *scratch* track renames: after :meth:`ContainerPool.acquire`
+    the directories are the scenario's, after :meth:`ContainerPool.attach`
+    the name is the scenario's.
+    """
+    name: str
+    repo: Path
+    scratch: Path
+    sock_dir: Path
+
+
+class ContainerPool:
+    """Pre-started generic containers for one image and session.
+
+    Args:
+        config: Container configuration every pooled container is created with.
+        session_tag: Session the containers belong to (named
+            ``pm-{tag}-pool-*`` so session cleanup removes them).
+        size: How many idle containers to keep warm.
+        root: Host directory for slot workdirs.  Scenario workdirs must be
+            on the same filesystem.
+    """
+
+    def __init__(self, config: ContainerConfig, session_tag: str | None = None,
+                 size: int = 2, root: Path | None = None):
+        self.config = config
+        self.session_tag = session_tag
+        self.size = size
+        self.root = root or _pool_root()
+        self._idle: list[PoolLease] = []
+        self._starting = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    # -- filling ------------------------------------------------------------
+
+    @property
+    def idle(self) -> int:
+        """Number of warm containers ready to acquire."""
+        with self._lock:
+            return len(self._idle)
+
+    def fill(self, wait: bool = False) -> None:
+        """Start containers in the background until *size* are idle or starting.
+
+        With *wait*, block until every start (including earlier ones) is done.
+        """
+        with self._lock:
+            missing = 0 if self._closed else (
+                self.size - len(self._idle) - self._starting)
+            self._starting += max(0, missing)
+            self._threads = [t for t in self._threads if t.is_alive()]
+            for _ in range(missing):
+                t = threading.Thread(target=self._start_one, daemon=True,
+                                     name="container-pool-fill")
+                self._threads.append(t)
+                t.start()
+            threads = list(self._threads)
+        if wait:
+            for t in threads:
+                t.join()
+
+    def _captures_root(self) -> Path | None:
+        if not self.session_tag:
+            return None
+        from pm_core.paths import sessions_dir
+        root = sessions_dir() / self.session_tag / "captures"
+        root.mkdir(parents=True, exist_ok=True)
+        return root
+
+    def _start_one(self) -> None:
+        from pm_core.push_proxy import _CONTAINER_SOCKET_DIR
+        name = container_mod._make_container_name(
+            f"pool-{secrets.token_hex(4)}", self.session_tag)
+        slot = self.root / name
+        lease = PoolLease(name=name, repo=slot / "repo",
+                          scratch=slot / "scratch", sock_dir=_sock_dir(name))
+        try:
+            lease.repo.mkdir(parents=True)
+            lease.scratch.mkdir()
+            lease.sock_dir.mkdir(parents=True, exist_ok=True)
+            mounts = {lease.scratch: container_mod._CONTAINER_SCRATCH,
+                      lease.sock_dir: _CONTAINER_SOCKET_DIR}
+            captures = self._captures_root()
+            if captures is not None:
+                mounts[captures] = _CONTAINER_SESSION_CAPTURES
+            container_mod.create_container(
+                name=name, config=self.config, workdir=lease.repo,
+                extra_rw_mounts=mounts,
+            )
+        except Exception:
+            _log.warning("Failed to start pooled container %s", name,
+                         exc_info=True)
+            self._destroy(lease)
+            with self._lock:
+                self._starting -= 1
+            return
+        with self._lock:
+            self._starting -= 1
+            if not self._closed:
+                self._idle.append(lease)
+                lease = None
+        if lease is not None:
+            self._destroy(lease)
+        else:
+            _log.info("Pooled container %s ready", name)
+
+    # -- handing out ------------------------------------------------------
+
+    def acquire(self, scenario_dir: Path) -> PoolLease | None:
+        """Take a warm container and move its directories into *scenario_dir*.
+
+        Afterwards ``scenario_dir/repo`` and ``scenario_dir/scratch`` are
+        empty directories mounted at /workspace and /scratch; anything
+        already at those paths is removed.  Returns None when no warm
+        container is available (or the directories cannot be moved), in
+        which case the caller creates a container the usual way.
+        Triggers a background refill either way.
+        """
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        return None
+                    lease = self._idle.pop(0)
+                if container_mod.container_is_running(lease.name):
+                    break
+                _log.warning("Pooled container %s is gone — discarding",
+                             lease.name)
+                self._destroy(lease)
+
+            slot = lease.repo.parent
+            scenario_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                _replace_dir(lease.repo, scenario_dir / "repo")
+            except OSError:
+                # Most likely EXDEV: the scenario workdir is on another
+                # filesystem, so a rename cannot carry the mount along.
+                _log.warning("Cannot move pooled workdir to %s — not using "
+                             "the pool", scenario_dir, exc_info=True)
+                with self._lock:
+                    self._idle.insert(0, lease)
+                return None
+            lease.repo = scenario_dir / "repo"
+            try:
+                _replace_dir(lease.scratch, scenario_dir / "scratch")
+            except OSError:
+                self._destroy(lease)
+                shutil.rmtree(slot, ignore_errors=True)
+                raise
+            lease.scratch = scenario_dir / "scratch"
+            try:
+                slot.rmdir()
+            except OSError:
+                pass
+            return lease
+        finally:
+            self.fill()
+
+    def attach(self, lease: PoolLease, name: str, *, workdir: Path,
+               allowed_push_branch: str | None = None,
+               pr_id: str | None = None) -> str:
+        """Turn an acquired container into the scenario container *name*.
+
+        *workdir* is the scenario clone (``lease.repo``), which the push
+        proxy serves.  Mirrors what :func:`container.create_qa_container`
+        would have set up.  On failure the container is removed and the
+        error re-raised.  Returns the container ID.
+        """
+        from pm_core.push_proxy import start_push_proxy
+        try:
+            container_mod.remove_container(name)
+            container_mod._run_runtime("rename", lease.name, name, timeout=10)
+            lease.name = name
+
+            if allowed_push_branch:
+                sock_dir = _sock_dir(name)
+                _replace_dir(lease.sock_dir, sock_dir)
+                lease.sock_dir = sock_dir
+                start_push_proxy(name, str(workdir), allowed_push_branch)
+                is_podman = "podman" in container_mod._get_runtime()
+                script = container_mod._build_git_setup_script(
+                    has_push_proxy=True, host_workdir=str(workdir),
+                    is_podman=is_podman)
+                container_mod._run_runtime("exec", name, "bash", "-c", script,
+                                           timeout=30)
+
+            if self.session_tag and pr_id:
+                from pm_core.paths import captures_dir, CONTAINER_CAPTURES_MOUNT
+                captures = captures_dir(pr_id, session_tag=self.session_tag)
+                if captures is not None:
+                    container_mod._run_runtime(
+                        "exec", "--user", "0", name, "ln", "-sfn",
+                        f"{_CONTAINER_SESSION_CAPTURES}/{captures.name}",
+                        CONTAINER_CAPTURES_MOUNT, timeout=10)
+
+            result = container_mod._run_runtime(
+                "inspect", "-f", "{{.Id}}", name, timeout=10)
+        except Exception:
+            _log.warning("Failed to attach pooled container as %s", name,
+                         exc_info=True)
+            self._destroy(lease)
+            raise
+        _log.info("Attached pooled container as %s", name)
+        return result.stdout.strip()
+
+    def release(self, lease: PoolLease, recycle: bool = False) -> None:
+        """Give back an attached container.
+
+        By default the container is destroyed (its workdir is left alone).
+        With *recycle* the scenario's repo and scratch directories are
+        emptied and the container rejoins the pool under a fresh name —
+        only sensible when nothing under them needs to be kept.
+        """
+        if not recycle or self._closed or not container_mod.container_is_running(lease.name):
+            self._destroy(lease, keep_dirs=True)
+            self.fill()
+            return
+        from pm_core.push_proxy import stop_push_proxy
+        from pm_core.paths import CONTAINER_CAPTURES_MOUNT
+        home = container_mod._CONTAINER_HOME
+        name = container_mod._make_container_name(
+            f"pool-{secrets.token_hex(4)}", self.session_tag)
+        slot = self.root / name
+        try:
+            stop_push_proxy(lease.name)
+            container_mod._run_runtime(
+                "exec", "--user", "0", lease.name, "rm", "-f",
+                CONTAINER_CAPTURES_MOUNT, f"{home}/.local/bin/git", timeout=10)
+            container_mod._run_runtime("rename", lease.name, name, timeout=10)
+            lease.name = name
+            slot.mkdir(parents=True)
+            for attr in ("repo", "scratch"):
+                path = getattr(lease, attr)
+                _empty_dir(path)
+                os.rename(path, slot / attr)
+                setattr(lease, attr, slot / attr)
+            sock_dir = _sock_dir(name)
+            lease.sock_dir.mkdir(parents=True, exist_ok=True)
+            _replace_dir(lease.sock_dir, sock_dir)
+            lease.sock_dir = sock_dir
+        except Exception:
+            _log.warning("Failed to recycle %s — destroying it", lease.name,
+                         exc_info=True)
+            self._destroy(lease)
+            self.fill()
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(lease)
+                lease = None
+        if lease is not None:
+            self._destroy(lease)
+
+    def close(self) -> None:
+        """Destroy every idle container and stop refilling."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        try:
+            container_mod.remove_containers([lease.name for lease in idle])
+        except Exception:
+            _log.debug("remove_containers failed", exc_info=True)
+        for lease in idle:
+            shutil.rmtree(lease.sock_dir, ignore_errors=True)
+            if lease.repo.is_relative_to(self.root):
+                shutil.rmtree(lease.repo.parent, ignore_errors=True)
+
+    def _destroy(self, lease: PoolLease, keep_dirs: bool = False) -> None:
+        try:
+            container_mod.remove_container(lease.name)
+        except Exception:
+            _log.debug("remove_container(%s) failed", lease.name, exc_info=True)
+        shutil.rmtree(lease.sock_dir, ignore_errors=True)
+        if not keep_dirs and lease.repo.is_relative_to(self.root):
+            shutil.rmtree(lease.repo.parent, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Per-session registry
+# ---------------------------------------------------------------------------
+
+_pools: dict[tuple[str, str | None], ContainerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(config: ContainerConfig,
+             session_tag: str | None = None) -> ContainerPool | None:
+    """Return the warm pool for ``(config.image, session_tag)``.
+
+    None when pooling is disabled.  A pool created with a different
+    configuration (limits, env, mounts) is drained and replaced; a size
+    change takes effect on the next refill.  So are the session's pools
+    on other images: once a repo's dependency image is built (see
+    :func:`container.config_for_repo`), containers warmed on the base
+    image would only wait for session cleanup.
+    """
+    size = pool_size()
+    key = (config.image, session_tag)
+    with _pools_lock:
+        stale = [_pools.pop(k) for k in list(_pools)
+                 if k[1] == session_tag and k != key]
+        pool = _pools.get(key)
+        if size == 0:
+            if pool is not None:
+                stale.append(_pools.pop(key))
+            pool = None
+        elif pool is None or pool.config != config:
+            if pool is not None:
+                stale.append(pool)
+            pool = _pools[key] = ContainerPool(config, session_tag, size=size)
+        else:
+            pool.size = size
+    for old in stale:
+        old.close()
+    return pool
+
+
+def remove_session_slots(session_tag: str) -> None:
+    """Remove slot and socket directories left by *session_tag*'s pools.
+
+    For ``pm session kill``, which runs outside the process that owns the
+    pools; the containers themselves go with the session's containers.
+    """
+    prefix = container_mod._make_container_name("pool-", session_tag)
+    root = _pool_root()
+    if root.is_dir():
+        for slot in root.glob(f"{prefix}*"):
+            shutil.rmtree(slot, ignore_errors=True)
+    for sock_dir in _sock_dir(prefix).parent.glob(f"{_sock_dir(prefix).name}*"):
+        shutil.rmtree(sock_dir, ignore_errors=True)
+
+
+def close_pools(session_tag: str | None = None) -> None:
+    """Drain the pools of *session_tag* (every pool when None)."""
+    with _pools_lock:
+        keys = [k for k in _pools if session_tag is None or k[1] == session_tag]
+        pools = [_pools.pop(k) for k in keys]
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,382 @@
+"""Fake container runtime for integration testing.
+
+Stands in for the ``docker``/``podman`` binary so container lifecycle code
+(``pm_core.container``, ``pm_core.container_pool``) can run end-to-end
+without a daemon.  Point ``container._get_runtime`` at ``bin/fake-runtime``
+and set ``PM_FAKE_RUNTIME_STATE`` to a JSON file; every invocation reads
+and rewrites that file under an exclusive lock, so concurrent callers see
+a consistent set of containers.
+
+The state file holds::
+
+    {"containers": {name: {"id", "pid", "image", "running", "mounts",
+                           "env", "command"}},
+     "images": {tag: {"id", "dockerfile"}},   # built (or seeded) images
+     "calls": [[arg, ...], ...],       # every invocation, in order
+     "next_id": int}
+
+Nothing is actually run: ``exec`` records the command and succeeds while
+the container is running, ``run`` sleeps ``PM_FAKE_RUNTIME_RUN_DELAY``
+seconds (default 0) to model cold-start cost, and ``rm`` sleeps
+``PM_FAKE_RUNTIME_RM_DELAY`` seconds per invocation to model the daemon
+round trip.  ``build`` records the Dockerfile under the tag after
+sleeping ``PM_FAKE_RUNTIME_BUILD_DELAY`` seconds.  All these sleeps happen
+outside the state lock.
+
+Images are lenient by default: any image "exists".  With
+``PM_FAKE_RUNTIME_STRICT_IMAGES=1`` only images in ``images`` do, and
+``run`` of any other image fails as it would without a registry.
+
+Supported subcommands: ``info``, ``image inspect``, ``images``, ``build``,
+``rmi``, ``run``, ``exec``, ``inspect``, ``rename``, ``rm``, ``stop``,
+``ps``, ``cp``.  ``inspect -f {{.State.Pid}}`` reports a made-up pid
+(:data:`_PID_BASE` plus a counter) so tests can lay out a synthetic
+``/proc/<pid>/cgroup`` for it.
+
+In tests, :meth:`FakeRuntime.installed` does the wiring and the instance
+reads back what happened.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+STATE_ENV = "PM_FAKE_RUNTIME_STATE"
+RUN_DELAY_ENV = "PM_FAKE_RUNTIME_RUN_DELAY"
+RM_DELAY_ENV = "PM_FAKE_RUNTIME_RM_DELAY"
+BUILD_DELAY_ENV = "PM_FAKE_RUNTIME_BUILD_DELAY"
+STRICT_IMAGES_ENV = "PM_FAKE_RUNTIME_STRICT_IMAGES"
+
+_PID_BASE = 40000
+
+# ``run``/``exec`` options that consume the following argument.
+_VALUE_OPTS = {
+    "--name", "-v", "--volume", "-e", "--env", "-w", "--workdir", "--memory",
+    "--cpus", "--user", "-u", "--security-opt", "--device", "--cap-add",
+    "--network", "--tmpfs", "--label",
+}
+
+
+def read_state(path: str | Path) -> dict:
+    """Return the fake runtime's state (empty when nothing has run yet)."""
+    try:
+        return json.loads(Path(path).read_text() or "{}")
+    except FileNotFoundError:
+        return {}
+
+
+@contextmanager
+def _locked_state(path: Path):
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        state = read_state(path)
+        state.setdefault("containers", {})
+        state.setdefault("images", {})
+        state.setdefault("calls", [])
+        state.setdefault("next_id", 1)
+        yield state
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(state, indent=1))
+        os.replace(tmp, path)
+
+
+def _parse_opts(args: list[str], value_opts: frozenset[str] = frozenset(),
+                ) -> tuple[dict[str, list[str]], list[str]]:
+    """Split leading options from positional arguments.
+
+    Options in ``_VALUE_OPTS`` or *value_opts* take the next argument.
+    """
+    opts: dict[str, list[str]] = {}
+    i = 0
+    while i < len(args) and args[i].startswith("-"):
+        arg = args[i]
+        if "=" in arg:
+            key, _, value = arg.partition("=")
+            opts.setdefault(key, []).append(value)
+        elif (arg in _VALUE_OPTS or arg in value_opts) and i + 1 < len(args):
+            opts.setdefault(arg, []).append(args[i + 1])
+            i += 1
+        else:
+            opts.setdefault(arg, []).append("")
+        i += 1
+    return opts, args[i:]
+
+
+def _strict_images() -> bool:
+    return os.environ.get(STRICT_IMAGES_ENV) == "1"
+
+
+def _image_id(state: dict, tag: str) -> str | None:
+    if tag in state["images"]:
+        return state["images"][tag]["id"]
+    if _strict_images():
+        return None
+    return "sha256:" + hashlib.sha256(tag.encode()).hexdigest()
+
+
+def _image(state: dict, args: list[str]) -> tuple[int, str, str]:
+    if args[:1] != ["inspect"]:
+        return 125, "", f"fake-runtime: unsupported image command {args[:1]}\n"
+    opts, tags = _parse_opts(args[1:], frozenset({"-f", "--format"}))
+    fmt = (opts.get("-f") or opts.get("--format") or [""])[0]
+    out = []
+    for tag in tags:
+        image_id = _image_id(state, tag)
+        if image_id is None:
+            return 1, "", f"no such image: {tag}\n"
+        out.append(image_id if ".Id" in fmt else json.dumps([{"Id": image_id}]))
+    return 0, "".join(line + "\n" for line in out), ""
+
+
+def _build(state: dict, args: list[str]) -> tuple[int, str, str]:
+    opts, rest = _parse_opts(args, frozenset({"-t", "--tag", "-f", "--file",
+                                              "--build-arg"}))
+    tags = opts.get("-t", []) + opts.get("--tag", [])
+    if len(rest) != 1 or not tags:
+        return 125, "", "build needs -t TAG and one context directory\n"
+    dockerfile = Path((opts.get("-f") or opts.get("--file")
+                       or [str(Path(rest[0]) / "Dockerfile")])[0])
+    try:
+        text = dockerfile.read_text()
+    except OSError as e:
+        return 1, "", f"cannot read Dockerfile: {e}\n"
+    base = next((line.split()[1] for line in text.splitlines()
+                 if line.startswith("FROM ")), "")
+    if _image_id(state, base) is None:
+        return 1, "", f"base image {base} not found\n"
+    image_id = "sha256:" + hashlib.sha256(text.encode()).hexdigest()
+    for tag in tags:
+        state["images"][tag] = {"id": image_id, "dockerfile": text}
+    return 0, image_id + "\n", ""
+
+
+def _images(state: dict, args: list[str]) -> tuple[int, str, str]:
+    return 0, "".join(t + "\n" for t in sorted(state["images"])), ""
+
+
+def _rmi(state: dict, args: list[str]) -> tuple[int, str, str]:
+    _, tags = _parse_opts(args)
+    rc, err = 0, []
+    for tag in tags:
+        if state["images"].pop(tag, None) is None:
+            rc = 1
+            err.append(f"no such image: {tag}")
+    return rc, "", "".join(e + "\n" for e in err)
+
+
+def _run(state: dict, args: list[str]) -> tuple[int, str, str]:
+    opts, rest = _parse_opts(args)
+    name = (opts.get("--name") or [""])[0]
+    if not rest:
+        return 125, "", "requires at least 1 argument\n"
+    if _image_id(state, rest[0]) is None:
+        return 125, "", f"Unable to find image '{rest[0]}' locally\n"
+    if name in state["containers"]:
+        return 125, "", f'the container name "{name}" is already in use\n'
+    cid = f"{state['next_id']:012x}" + "0" * 52
+    pid = _PID_BASE + state["next_id"]
+    state["next_id"] += 1
+    state["containers"][name or cid[:12]] = {
+        "id": cid,
+        "pid": pid,
+        "image": rest[0],
+        "running": "-d" in opts,
+        "mounts": opts.get("-v", []) + opts.get("--volume", []),
+        "env": opts.get("-e", []) + opts.get("--env", []),
+        "command": rest[1:],
+    }
+    return 0, cid + "\n", ""
+
+
+def _exec(state: dict, args: list[str]) -> tuple[int, str, str]:
+    _, rest = _parse_opts(args)
+    if not rest:
+        return 125, "", "requires at least 2 arguments\n"
+    c = state["containers"].get(rest[0])
+    if c is None:
+        return 125, "", f"no such container: {rest[0]}\n"
+    if not c["running"]:
+        return 126, "", f"container {rest[0]} is not running\n"
+    return 0, "", ""
+
+
+def _inspect(state: dict, args: list[str]) -> tuple[int, str, str]:
+    opts, names = _parse_opts(args, frozenset({"-f", "--format"}))
+    fmt = (opts.get("-f") or opts.get("--format") or [""])[0]
+    out = []
+    for name in names:
+        c = state["containers"].get(name)
+        if c is None:
+            return 1, "", f"no such object: {name}\n"
+        if ".State.Running" in fmt:
+            out.append("true" if c["running"] else "false")
+        elif ".State.Pid" in fmt:
+            out.append(str(c.get("pid", 0) if c["running"] else 0))
+        elif ".Id" in fmt:
+            out.append(c["id"])
+        else:
+            out.append(json.dumps({"Name": name, **c}))
+    return 0, "".join(line + "\n" for line in out), ""
+
+
+def _rename(state: dict, args: list[str]) -> tuple[int, str, str]:
+    if len(args) != 2:
+        return 125, "", "requires exactly 2 arguments\n"
+    old, new = args
+    if old not in state["containers"]:
+        return 1, "", f"no such container: {old}\n"
+    if new in state["containers"]:
+        return 1, "", f'the container name "{new}" is already in use\n'
+    state["containers"][new] = state["containers"].pop(old)
+    return 0, "", ""
+
+
+def _rm(state: dict, args: list[str]) -> tuple[int, str, str]:
+    opts, names = _parse_opts(args)
+    force = "-f" in opts or "--force" in opts
+    out, err, rc = [], [], 0
+    for name in names:
+        c = state["containers"].get(name)
+        if c is None:
+            if not force:
+                err.append(f"no such container: {name}")
+                rc = 1
+            continue
+        if c["running"] and not force:
+            err.append(f"container {name} is running")
+            rc = 1
+            continue
+        del state["containers"][name]
+        out.append(name)
+    return rc, "".join(n + "\n" for n in out), "".join(e + "\n" for e in err)
+
+
+def _stop(state: dict, args: list[str]) -> tuple[int, str, str]:
+    _, names = _parse_opts(args)
+    for name in names:
+        if name in state["containers"]:
+            state["containers"][name]["running"] = False
+    return 0, "".join(n + "\n" for n in names), ""
+
+
+def _ps(state: dict, args: list[str]) -> tuple[int, str, str]:
+    opts, _ = _parse_opts(args, frozenset({"--filter", "--format"}))
+    names = sorted(n for n, c in state["containers"].items()
+                   if "-a" in opts or c["running"])
+    for flt in opts.get("--filter", []):
+        if flt.startswith("name="):
+            names = [n for n in names if flt[5:] in n]
+    return 0, "".join(n + "\n" for n in names), ""
+
+
+def _cp(state: dict, args: list[str]) -> tuple[int, str, str]:
+    for arg in args:
+        name, sep, _ = arg.partition(":")
+        if sep and name not in state["containers"]:
+            return 1, "", f"no such container: {name}\n"
+    return 0, "", ""
+
+
+def run_fake_runtime(argv: list[str], state_path: str | Path) -> tuple[int, str, str]:
+    """Apply one runtime invocation to the state file.
+
+    Returns ``(exit_code, stdout, stderr)``.
+    """
+    path = Path(state_path)
+    delay_env = {"run": RUN_DELAY_ENV, "rm": RM_DELAY_ENV,
+                 "build": BUILD_DELAY_ENV}.get(argv[0] if argv else "")
+    if delay_env:
+        delay = float(os.environ.get(delay_env) or 0)
+        if delay:
+            time.sleep(delay)
+    with _locked_state(path) as state:
+        state["calls"].append(list(argv))
+        cmd, args = (argv[0], argv[1:]) if argv else ("", [])
+        if cmd in ("info", "--version"):
+            return 0, "fake-runtime\n", ""
+        handler = {
+            "run": _run, "exec": _exec, "inspect": _inspect,
+            "rename": _rename, "rm": _rm, "stop": _stop, "ps": _ps, "cp": _cp,
+            "image": _image, "build": _build, "images": _images, "rmi": _rmi,
+        }.get(cmd)
+        if handler is None:
+            return 125, "", f"fake-runtime: unsupported command {cmd!r}\n"
+        return handler(state, args)
+
+
+class FakeRuntime:
+    """Test handle on a fake runtime whose state lives at *state_path*."""
+
+    executable = Path(__file__).resolve().parent.parent / "bin" / "fake-runtime"
+
+    def __init__(self, state_path: str | Path, run_delay: float = 0.0,
+                 rm_delay: float = 0.0, build_delay: float = 0.0,
+                 strict_images: bool = False):
+        self.state_path = Path(state_path)
+        self.run_delay = run_delay
+        self.rm_delay = rm_delay
+        self.build_delay = build_delay
+        self.strict_images = strict_images
+
+    @property
+    def containers(self) -> dict[str, dict]:
+        return read_state(self.state_path).get("containers", {})
+
+    @property
+    def calls(self) -> list[list[str]]:
+        return read_state(self.state_path).get("calls", [])
+
+    @property
+    def images(self) -> dict[str, dict]:
+        return read_state(self.state_path).get("images", {})
+
+    def add_image(self, tag: str) -> None:
+        """Make *tag* exist, as if pulled or built outside the test."""
+        with _locked_state(self.state_path) as state:
+            state["images"][tag] = {
+                "id": "sha256:" + hashlib.sha256(tag.encode()).hexdigest(),
+                "dockerfile": ""}
+
+    def calls_to(self, command: str) -> list[list[str]]:
+        """Invocations of one subcommand (``run``, ``exec``, ...)."""
+        return [c for c in self.calls if c[:1] == [command]]
+
+    @contextmanager
+    def installed(self):
+        """Context manager: make this fake the configured container runtime."""
+        from unittest import mock
+        from pm_core import container
+        env = {STATE_ENV: str(self.state_path),
+               RUN_DELAY_ENV: str(self.run_delay),
+               RM_DELAY_ENV: str(self.rm_delay),
+               BUILD_DELAY_ENV: str(self.build_delay),
+               STRICT_IMAGES_ENV: "1" if self.strict_images else ""}
+        container._invalidate_image_exists_cache()
+        try:
+            with mock.patch.dict(os.environ, env), \
+                    mock.patch.object(container, "_get_runtime",
+                                      return_value=str(self.executable)):
+                yield self
+        finally:
+            container._invalidate_image_exists_cache()
+
+
+def main(argv: list[str] | None = None) -> int:
+    state_path = os.environ.get(STATE_ENV)
+    if not state_path:
+        sys.stderr.write(f"fake-runtime: {STATE_ENV} is not set\n")
+        return 125
+    rc, out, err = run_fake_runtime(
+        sys.argv[1:] if argv is None else argv, state_path)
+    sys.stdout.write(out)
+    sys.stderr.write(err)
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
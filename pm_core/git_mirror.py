@@ -0,0 +1,123 @@
+"""Shared host-side bare mirrors of upstream repositories.
+
+When a QA run starts, every scenario clone issues a near-identical
+``git fetch origin`` through the push proxy within seconds of the others.
+Rather than send each one to the upstream, the proxy keeps one bare mirror
+per upstream URL under ``~/.pm/git-mirrors/`` and serves fetches from it by
+rewriting the upstream URL to the mirror for that one git invocation
+(``-c url.<mirror>.insteadOf=<upstream>``).  The caller's remote name,
+tracking refs and FETCH_HEAD come out exactly as for a direct fetch.
+
+A mirror is refreshed from the upstream at most once per
+``git-mirror-interval`` seconds.  Refreshes run under an exclusive lock on
+``<mirror>.lock``, so concurrent fetches — from threads of one proxy or
+from other proxy processes — wait for the single in-flight refresh and
+then find the mirror fresh instead of each fetching upstream.  A push
+through the proxy marks the mirror stale so the next fetch sees it.
+
+Only branches and tags are mirrored; fetches of other refs go upstream.
+"""
+
+import fcntl
+import hashlib
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+from pm_core.paths import configure_logger, get_global_setting_value, git_mirror_dir
+
+_log = configure_logger("pm.git_mirror")
+
+DEFAULT_INTERVAL = 30
+_STAMP = "pm-refreshed"
+_REFSPECS = ("+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*")
+
+
+def mirror_interval() -> int:
+    """Seconds a mirror stays fresh (``git-mirror-interval``; 0 disables)."""
+    raw = get_global_setting_value("git-mirror-interval", "")
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_INTERVAL
+    except ValueError:
+        return DEFAULT_INTERVAL
+
+
+def is_upstream_url(url: str) -> bool:
+    """True for URLs that reach a remote host (scheme or scp-style syntax)."""
+    return "://" in url or ("@" in url and ":" in url.split("@", 1)[1])
+
+
+def mirror_path(url: str) -> Path:
+    digest = hashlib.sha1(url.encode()).hexdigest()[:16]
+    return git_mirror_dir() / f"{digest}.git"
+
+
+def _git(*args: str, timeout: int = 120) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], capture_output=True, text=True,
+                          timeout=timeout)
+
+
+def _create(path: Path, url: str) -> bool:
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    steps = [("init", "--bare", "-q", str(tmp)),
+             ("-C", str(tmp), "remote", "add", "origin", url),
+             ("-C", str(tmp), "config", "remote.origin.fetch", _REFSPECS[0]),
+             ("-C", str(tmp), "config", "--add", "remote.origin.fetch",
+              _REFSPECS[1])]
+    for step in steps:
+        if _git(*step, timeout=30).returncode != 0:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+    tmp.rename(path)
+    return True
+
+
+def refresh_mirror(url: str, max_age: float) -> Path | None:
+    """Return the mirror of *url*, fetching upstream if it is older than *max_age*.
+
+    Returns ``None`` if the mirror could not be created or refreshed; the
+    caller should then go to the upstream directly.
+    """
+    path = mirror_path(url)
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        stamp = path / _STAMP
+        try:
+            if time.time() - stamp.stat().st_mtime < max_age:
+                return path
+        except FileNotFoundError:
+            pass
+        if not (path / "HEAD").exists() and not _create(path, url):
+            _log.warning("git mirror: could not create mirror of %s", url)
+            return None
+        start = time.monotonic()
+        try:
+            result = _git("-C", str(path), "fetch", "--prune", "--quiet",
+                          "origin")
+        except subprocess.TimeoutExpired:
+            _log.warning("git mirror: refresh of %s timed out", url)
+            return None
+        if result.returncode != 0:
+            _log.warning("git mirror: refresh of %s failed: %s", url,
+                         result.stderr.strip())
+            return None
+        stamp.touch()
+        _log.info("git mirror: refreshed %s in %.2fs", url,
+                  time.monotonic() - start)
+        return path
+
+
+def invalidate_mirror(url: str) -> None:
+    """Make the next :func:`refresh_mirror` of *url* fetch upstream.
+
+    Waits for an in-flight refresh, which may have started before the
+    change that made the mirror stale.
+    """
+    path = mirror_path(url)
+    if not path.exists():
+        return
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        (path / _STAMP).unlink(missing_ok=True)
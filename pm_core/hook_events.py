@@ -12,10 +12,15 @@ with cwd=/workspace) and the reader (on the host) agree on the path.
 
 from __future__ import annotations
 
+import ctypes
 import json
+import os
+import selectors
+import struct
+import sys
 import time
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable
 
 from pm_core.paths import configure_logger
 
@@ -113,3 +118,169 @@ def wait_for_event(
         if time.monotonic() >= deadline:
             return None
         time.sleep(tick)
+
+
+# inotify(7) constants and the fixed part of ``struct inotify_event``.
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_Q_OVERFLOW = 0x4000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def _inotify_watch(directory: Path) -> int | None:
+    """Return an inotify fd watching *directory* for new files, or None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    wd = libc.inotify_add_watch(fd, os.fsencode(directory),
+                                _IN_CLOSE_WRITE | _IN_MOVED_TO)
+    if wd < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class HookWatcher:
+    """Block until hook event files change or another thread calls :meth:`wake`.
+
+    The readiness multiplexer behind event-driven verdict polling: one
+    selector waits on an inotify descriptor for the hooks directory (the
+    receiver's atomic rename shows up as ``IN_MOVED_TO``) and on a
+    self-pipe that :meth:`wake` writes to.  Where inotify is unavailable
+    the watcher falls back to comparing event-file mtimes every
+    ``tick`` seconds, which still costs only a ``stat`` per session.
+    """
+
+    def __init__(self, tick: float = 1.0):
+        self.tick = tick
+        hooks_dir().mkdir(parents=True, exist_ok=True)
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, "wake")
+        self._inotify = _inotify_watch(hooks_dir())
+        if self._inotify is not None:
+            self._selector.register(self._inotify, selectors.EVENT_READ,
+                                    "inotify")
+        self._mtimes: dict[str, float] = {}
+        self._overflowed = False
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def wake(self) -> None:
+        """Make a concurrent or the next :meth:`wait` return at once."""
+        try:
+            os.write(self._wake_w, b"x")
+        except (BlockingIOError, OSError, TypeError):
+            pass  # pipe full (a wakeup is already pending) or closed
+
+    def wait(self, session_ids: Iterable[str], timeout: float) -> set[str]:
+        """Wait up to *timeout* seconds for activity.
+
+        Returns the ids among *session_ids* whose event file was written
+        since the previous call.  An empty result means a timeout or a
+        :meth:`wake`.
+        """
+        watched = set(session_ids)
+        if self._inotify is None:
+            return self._poll_mtimes(watched, timeout)
+        deadline = time.monotonic() + timeout
+        while True:
+            changed: set[str] = set()
+            woken = False
+            for key, _ in self._selector.select(max(0.0, timeout)):
+                if key.data == "wake":
+                    self._drain(self._wake_r)
+                    woken = True
+                else:
+                    changed |= self._read_inotify()
+            if self._overflowed:
+                # Events were dropped; any session may have changed.
+                self._overflowed = False
+                changed = set(watched)
+            changed &= watched
+            # Other sessions' events and the receiver's temp files also
+            # wake the selector; keep waiting through those.
+            timeout = deadline - time.monotonic()
+            if changed or woken or timeout <= 0:
+                return changed
+
+    def _poll_mtimes(self, watched: set[str], timeout: float) -> set[str]:
+        remaining = timeout
+        while True:
+            changed = set()
+            for sid in watched:
+                try:
+                    mtime = event_path(sid).stat().st_mtime_ns
+                except OSError:
+                    mtime = 0
+                if self._mtimes.get(sid, 0) != mtime:
+                    self._mtimes[sid] = mtime
+                    changed.add(sid)
+            if changed or remaining <= 0:
+                return changed
+            step = min(self.tick, remaining)
+            if self._selector.select(step):
+                self._drain(self._wake_r)
+                return set()
+            remaining -= step
+
+    @staticmethod
+    def _drain(fd: int) -> bytes:
+        data = b""
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                return data
+            if not chunk:
+                return data
+            data += chunk
+
+    def _read_inotify(self) -> set[str]:
+        data = self._drain(self._inotify)
+        names: set[str] = set()
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            _, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            if mask & _IN_Q_OVERFLOW:
+                self._overflowed = True
+            name = data[offset:offset + length].rstrip(b"\0").decode(
+                errors="replace")
+            offset += length
+            if name.endswith(".json") and not name.startswith("."):
+                names.add(name[:-len(".json")])
+        return names
+
+    def close(self) -> None:
+        if getattr(self, "_wake_r", None) is None:
+            return
+        self._selector.close()
+        for fd in (self._wake_r, self._wake_w, self._inotify):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._wake_r = self._wake_w = self._inotify = None
+
+    def __del__(self) -> None:
+        self.close()
+
+    def __enter__(self) -> "HookWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
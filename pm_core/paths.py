@@ -59,6 +59,20 @@ def debug_dir() -> Path:
     return d
 
 
+def cluster_cache_dir() -> Path:
+    """Return the cluster snapshot cache directory (~/.pm/cluster-cache/)."""
+    d = pm_home() / "cluster-cache"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def git_mirror_dir() -> Path:
+    """Return the shared upstream mirror directory (~/.pm/git-mirrors/)."""
+    d = pm_home() / "git-mirrors"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
 def workdirs_base() -> Path:
     """Return the workdirs base directory (~/.pm/workdirs/)."""
     d = pm_home() / "workdirs"
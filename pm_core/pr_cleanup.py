@@ -33,12 +33,14 @@ def _candidate_window_names(display_id: str, session: str) -> list[str]:
     return base
 
 
-def cleanup_pr_resources(session: str | None, pr: dict) -> dict:
+def cleanup_pr_resources(session: str | None, pr: dict,
+                         wait: bool = True) -> dict:
     """Remove every live resource for *pr*.
 
     Kills tmux windows, removes QA containers (and their push-proxy sockets
-    via remove_container), and prunes the pane registry. Safe to call when
-    no resources exist. Returns a summary dict::
+    via remove_containers), and prunes the pane registry. With *wait* False
+    the containers are queued for background removal instead. Safe to call
+    when no resources exist. Returns a summary dict::
 
         {"windows": [...], "containers": [...], "registry_windows": [...],
          "sockets": [...]}
@@ -57,11 +59,11 @@ def cleanup_pr_resources(session: str | None, pr: dict) -> dict:
     session_tag = session.removeprefix("pm-") if session else None
     try:
         summary["containers"] = container_mod.cleanup_pr_containers(
-            pr_id, session_tag=session_tag)
+            pr_id, session_tag=session_tag, wait=wait)
     except Exception as e:  # pragma: no cover
         _log.warning("cleanup_pr_containers failed: %s", e)
 
-    # Best-effort socket cleanup for any container we found (remove_container
+    # Best-effort socket cleanup for any container we found (remove_containers
     # already calls stop_push_proxy, but cover the case where a socket lingers
     # without its container).
     for cname in summary["containers"]:
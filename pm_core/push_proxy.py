@@ -11,6 +11,14 @@ The proxy:
   3. For local-path origins (``git clone --local`` clones), handles push
      via ``git fetch`` from the target side to avoid ``denyCurrentBranch``
   4. Streams back exit code, stdout, and stderr transparently
+  5. Serves fetch/pull from a shared host-side mirror of the upstream
+     (see ``pm_core.git_mirror``) and runs identical in-flight ls-remote
+     requests once
+
+Connections are served concurrently from a bounded thread pool, so one slow
+fetch (or a client that connects and never sends) does not stall every other
+container sharing the proxy.  Pushes to the same branch still run one at a
+time.
 
 When multiple QA scenario containers share a proxy (same session + PR), each
 container's git wrapper includes its host-side clone path in the request as
@@ -23,17 +31,34 @@ Protocol (newline-delimited JSON over Unix socket):
              "workdir": "/host/path/to/clone"}
   Response: {"exit_code": 0, "stdout": "...", "stderr": "..."}
 
+A request with ``"stream": true`` gets git's output as it is produced, one
+frame per line, before the final response::
+
+  {"stream": "stdout|stderr", "data": "..."}
+  ...
+  {"exit_code": 0, "stdout": "", "stderr": ""}
+
+The final frame has the same shape as a buffered response and carries any
+output that was not streamed (e.g. a rejection message).  Clients can
+therefore handle both modes by treating every line with ``exit_code`` as the
+end of the reply.
+
 Legacy requests without ``cmd`` are treated as push (backward compat).
 ``"workdir"`` is optional; omitting it falls back to ``self.workdir``.
 """
 
+import codecs
 import json
 import os
+import re
 import socket
 import subprocess
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 
+from pm_core import git_mirror
 from pm_core.paths import configure_logger
 
 _log = configure_logger("pm.push_proxy")
@@ -42,6 +67,62 @@ _SOCKET_DIR_PREFIX = "pm-push-proxy-"
 _CONTAINER_SOCKET_DIR = "/run/pm-push-proxy"
 _CONTAINER_SOCKET_PATH = f"{_CONTAINER_SOCKET_DIR}/push.sock"
 
+# Connections handled at once per proxy; further clients queue in the
+# listen backlog and the pool's work queue rather than being refused.
+_MAX_CLIENTS = 16
+_LISTEN_BACKLOG = 64
+_GIT_TIMEOUT = 120
+
+# Pushes to the same branch are serialized across every proxy in the
+# process: concurrent pushes of one ref only race each other into
+# non-fast-forward rejections.
+_push_locks: dict[str, threading.Lock] = {}
+_push_locks_guard = threading.Lock()
+
+
+def _branch_push_lock(branch: str) -> threading.Lock:
+    with _push_locks_guard:
+        return _push_locks.setdefault(branch, threading.Lock())
+
+
+# Fetches and pulls into the same checkout are serialized too: two git
+# processes updating one repo's remote-tracking refs fail on each other's
+# ref locks ("cannot lock ref").
+_workdir_locks: dict[str, threading.Lock] = {}
+
+
+def _workdir_lock(workdir: str) -> threading.Lock:
+    with _push_locks_guard:
+        return _workdir_locks.setdefault(os.path.realpath(workdir),
+                                         threading.Lock())
+
+
+# Requests currently running, keyed by what makes their results identical.
+_inflight: dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _coalesced(key: tuple, run: Callable[[], dict]) -> dict:
+    """Return ``run()``, sharing one call among concurrent callers with *key*."""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+    try:
+        result = run()
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
 
 def _resolve_local_remote_url(workdir: str, remote: str = "origin") -> str | None:
     """If *remote* in *workdir* points to a local directory, return its path.
@@ -110,7 +191,7 @@ def resolve_real_origin(repo_path: str, remote: str = "origin") -> str | None:
 
 
 class PushProxy:
-    """A single-client push proxy daemon for one container.
+    """A concurrent push proxy daemon for one container (or shared set).
 
     Args:
         socket_path: Host path for the Unix socket.
@@ -125,6 +206,7 @@ class PushProxy:
         self.allowed_branch = allowed_branch
         self._server_socket: socket.socket | None = None
         self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
         self._stop = threading.Event()
 
     def start(self) -> None:
@@ -141,8 +223,12 @@ class PushProxy:
         self._server_socket.bind(self.socket_path)
         # Make socket world-writable so the container user can connect
         os.chmod(self.socket_path, 0o777)
-        self._server_socket.listen(1)
+        self._server_socket.listen(_LISTEN_BACKLOG)
         self._server_socket.settimeout(2.0)
+        self._executor = ThreadPoolExecutor(
+            max_workers=_MAX_CLIENTS,
+            thread_name_prefix=f"push-proxy-conn-{Path(self.socket_path).stem}",
+        )
 
         self._thread = threading.Thread(
             target=self._serve_loop, daemon=True,
@@ -162,6 +248,10 @@ class PushProxy:
                 pass
         if self._thread:
             self._thread.join(timeout=5)
+        if self._executor:
+            # In-flight git commands finish on their own (bounded by
+            # _GIT_TIMEOUT); queued connections are dropped.
+            self._executor.shutdown(wait=False, cancel_futures=True)
         try:
             os.unlink(self.socket_path)
         except FileNotFoundError:
@@ -169,7 +259,7 @@ class PushProxy:
         _log.info("Push proxy stopped: %s", self.socket_path)
 
     def _serve_loop(self) -> None:
-        """Accept connections and handle push requests."""
+        """Accept connections and hand each one to the worker pool."""
         while not self._stop.is_set():
             # If the socket file was removed externally (e.g. container
             # cleanup in tmux), exit the loop so the thread terminates.
@@ -185,12 +275,20 @@ class PushProxy:
                 break
 
             try:
-                self._handle_connection(conn)
-            except Exception:
-                _log.warning("Push proxy: error handling connection",
-                             exc_info=True)
-            finally:
+                self._executor.submit(self._serve_connection, conn)
+            except RuntimeError:
+                # Executor shut down by stop() between accept and submit.
                 conn.close()
+                break
+
+    def _serve_connection(self, conn: socket.socket) -> None:
+        try:
+            self._handle_connection(conn)
+        except Exception:
+            _log.warning("Push proxy: error handling connection",
+                         exc_info=True)
+        finally:
+            conn.close()
 
     def _handle_connection(self, conn: socket.socket) -> None:
         """Handle a single proxy request (push, fetch, pull, ls-remote)."""
@@ -232,19 +330,112 @@ class PushProxy:
         # fetch/pull instead of self.workdir (which is only correct for the
         # first scenario that started the proxy).
         caller_workdir: str | None = request.get("workdir") or None
+        emit = self._frame_writer(conn) if request.get("stream") else None
 
         # Dispatch based on cmd (default "push" for backward compat)
         cmd = request.get("cmd", "push")
         if cmd == "push":
-            response = self._execute_push(args, caller_workdir=caller_workdir)
+            response = self._execute_push(args, caller_workdir=caller_workdir,
+                                          emit=emit)
         elif cmd in ("fetch", "pull", "ls-remote"):
             response = self._execute_read_cmd(cmd, args,
-                                              caller_workdir=caller_workdir)
+                                              caller_workdir=caller_workdir,
+                                              emit=emit)
         else:
             response = {"exit_code": 1, "stdout": "",
                         "stderr": f"git-proxy: unknown command '{cmd}'\n"}
         conn.sendall((json.dumps(response) + "\n").encode())
 
+    @staticmethod
+    def _frame_writer(conn: socket.socket) -> Callable[[str, str], None]:
+        """Return ``emit(stream, data)`` sending output frames on *conn*.
+
+        stdout and stderr are pumped from separate threads, so writes are
+        serialized.  A client that went away stops receiving frames; the
+        git command itself is left to finish.
+        """
+        lock = threading.Lock()
+        gone = False
+
+        def emit(stream: str, data: str) -> None:
+            nonlocal gone
+            frame = json.dumps({"stream": stream, "data": data}) + "\n"
+            with lock:
+                if gone:
+                    return
+                try:
+                    conn.sendall(frame.encode())
+                except OSError:
+                    gone = True
+        return emit
+
+    @staticmethod
+    def _run_git(cmd: list[str], cwd: str | None, what: str,
+                 emit: Callable[[str, str], None] | None = None) -> dict:
+        """Run *cmd* and return a response dict.
+
+        Without *emit* the output is buffered into the response.  With it,
+        stdout and stderr are forwarded chunk by chunk as git produces them
+        and the response carries only the exit code.
+        """
+        if emit is None:
+            try:
+                result = subprocess.run(
+                    cmd, cwd=cwd, capture_output=True, text=True,
+                    timeout=_GIT_TIMEOUT,
+                )
+                return {
+                    "exit_code": result.returncode,
+                    "stdout": result.stdout,
+                    "stderr": result.stderr,
+                }
+            except subprocess.TimeoutExpired:
+                return {"exit_code": 1, "stdout": "",
+                        "stderr": f"git-proxy: {what} timed out after "
+                                  f"{_GIT_TIMEOUT}s\n"}
+            except Exception as exc:
+                return {"exit_code": 1, "stdout": "",
+                        "stderr": f"git-proxy: {what} failed: {exc}\n"}
+
+        try:
+            proc = subprocess.Popen(cmd, cwd=cwd, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+        except Exception as exc:
+            return {"exit_code": 1, "stdout": "",
+                    "stderr": f"git-proxy: {what} failed: {exc}\n"}
+
+        def pump(pipe, stream: str) -> None:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            fd = pipe.fileno()
+            while True:
+                chunk = os.read(fd, 65536)
+                text = decoder.decode(chunk, final=not chunk)
+                if text:
+                    emit(stream, text)
+                if not chunk:
+                    break
+            pipe.close()
+
+        pumps = [threading.Thread(target=pump, args=(pipe, name), daemon=True)
+                 for pipe, name in ((proc.stdout, "stdout"),
+                                    (proc.stderr, "stderr"))]
+        for t in pumps:
+            t.start()
+        try:
+            returncode = proc.wait(timeout=_GIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            for t in pumps:
+                t.join(timeout=5)
+            return {"exit_code": 1, "stdout": "",
+                    "stderr": f"git-proxy: {what} timed out after "
+                              f"{_GIT_TIMEOUT}s\n"}
+        for t in pumps:
+            t.join()
+        return {"exit_code": returncode, "stdout": "", "stderr": ""}
+
     @staticmethod
     def _check_dangerous_flags(args: list[str], cmd_name: str) -> dict | None:
         """Reject flags that could execute arbitrary programs on the host.
@@ -269,7 +460,8 @@ class PushProxy:
         return None
 
     def _execute_push(self, push_args: list[str],
-                      caller_workdir: str | None = None) -> dict:
+                      caller_workdir: str | None = None,
+                      emit: Callable[[str, str], None] | None = None) -> dict:
         """Validate the branch and execute git push on the host."""
         # Reject flags that could execute arbitrary programs on the host
         danger = self._check_dangerous_flags(push_args, "push")
@@ -324,10 +516,18 @@ class PushProxy:
                          remote, local_target)
             return {"exit_code": 1, "stdout": "", "stderr": msg}
 
-        return self._local_push(push_args, caller_workdir=workdir)
+        with _branch_push_lock(target_branch):
+            response = self._local_push(push_args, caller_workdir=workdir,
+                                        emit=emit)
+        if response["exit_code"] == 0:
+            url = self._upstream_url(push_args, workdir)
+            if url:
+                git_mirror.invalidate_mirror(url)
+        return response
 
     def _local_push(self, push_args: list[str],
-                    caller_workdir: str | None = None) -> dict:
+                    caller_workdir: str | None = None,
+                    emit: Callable[[str, str], None] | None = None) -> dict:
         """Execute the validated push from the caller's clone.
 
         Scenario clones have ``origin`` set to the real upstream URL,
@@ -339,24 +539,12 @@ class PushProxy:
         source = caller_workdir or self.workdir
         cmd = ["git", "-C", source, "push"] + push_args
         _log.info("Push proxy push: %s", cmd)
-        try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=120,
-            )
-            return {
-                "exit_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-            }
-        except subprocess.TimeoutExpired:
-            return {"exit_code": 1, "stdout": "",
-                    "stderr": "git-proxy: push timed out after 120s\n"}
-        except Exception as exc:
-            return {"exit_code": 1, "stdout": "",
-                    "stderr": f"git-proxy: push failed: {exc}\n"}
+        return self._run_git(cmd, None, "push", emit)
 
     def _execute_read_cmd(self, git_cmd: str, args: list[str],
-                          caller_workdir: str | None = None) -> dict:
+                          caller_workdir: str | None = None,
+                          emit: Callable[[str, str], None] | None = None,
+                          ) -> dict:
         """Execute a read-only git remote command (fetch, pull, ls-remote).
 
         These run from the caller's workdir with no branch restriction.
@@ -372,24 +560,64 @@ class PushProxy:
             return danger
 
         workdir = caller_workdir or self.workdir
-        cmd = ["git", git_cmd] + args
+        url = self._upstream_url(args, workdir)
+        if url and git_cmd == "ls-remote":
+            # Scenarios starting together ask the same question of the
+            # same upstream; answer them all from one run.
+            cmd = ["git", git_cmd] + args
+            _log.info("Git proxy executing read cmd: %s (in %s)", cmd, workdir)
+            return _coalesced(
+                (git_cmd, url, tuple(args)),
+                lambda: self._run_git(cmd, workdir, f"git {git_cmd}"))
+
+        config: list[str] = []
+        if url and self._mirror_can_serve(args):
+            interval = git_mirror.mirror_interval()
+            mirror = git_mirror.refresh_mirror(url, interval) if interval else None
+            if mirror:
+                config = ["-c", f"url.{mirror}.insteadOf={url}"]
+        cmd = ["git", *config, git_cmd] + args
         _log.info("Git proxy executing read cmd: %s (in %s)", cmd, workdir)
+        with _workdir_lock(workdir):
+            return self._run_git(cmd, workdir, f"git {git_cmd}", emit)
+
+    @staticmethod
+    def _upstream_url(args: list[str], workdir: str) -> str | None:
+        """URL of the remote *args* name, if it is a real upstream.
+
+        The remote is the first positional argument (default ``origin``),
+        either a configured remote name or a URL.  Returns ``None`` for
+        local-path remotes and anything that cannot be resolved.
+        """
+        remote = next((a for a in args if not a.startswith("-")), "origin")
+        if git_mirror.is_upstream_url(remote):
+            return remote
         try:
             result = subprocess.run(
-                cmd, cwd=workdir,
-                capture_output=True, text=True, timeout=120,
+                ["git", "remote", "get-url", remote],
+                cwd=workdir, capture_output=True, text=True, timeout=5,
             )
-            return {
-                "exit_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-            }
-        except subprocess.TimeoutExpired:
-            return {"exit_code": 1, "stdout": "",
-                    "stderr": f"git-proxy: git {git_cmd} timed out after 120s\n"}
-        except Exception as exc:
-            return {"exit_code": 1, "stdout": "",
-                    "stderr": f"git-proxy: {exc}\n"}
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+        url = result.stdout.strip() if result.returncode == 0 else ""
+        return url if git_mirror.is_upstream_url(url) else None
+
+    @staticmethod
+    def _mirror_can_serve(args: list[str]) -> bool:
+        """Whether every refspec in fetch/pull *args* is a branch or tag.
+
+        The mirror holds only ``refs/heads`` and ``refs/tags``; other refs
+        and bare object ids have to come from the upstream.
+        """
+        positional = [a for a in args if not a.startswith("-")]
+        for spec in positional[1:]:
+            src = spec.lstrip("+").split(":", 1)[0]
+            if src.startswith("refs/") and not src.startswith(
+                    ("refs/heads/", "refs/tags/")):
+                return False
+            if re.fullmatch(r"[0-9a-f]{7,40}", src):
+                return False
+        return True
 
     @staticmethod
     def _extract_remote_name(push_args: list[str]) -> str:
@@ -25,7 +25,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable
 
-from pm_core import qa_instructions
+from pm_core import qa_instructions, qa_scheduler, resource_monitor
 from pm_core.paths import configure_logger
 from pm_core.spec_gen import get_spec as _get_qa_spec
 from pm_core.loop_shared import (
@@ -51,6 +51,7 @@ _VERDICT_GRACE_PERIOD = 30  # QA sessions take a while to run
 _PLANNER_TIMEOUT = 60 * 60  # seconds to wait for planner output
 _PLANNER_GRACE = 15  # seconds before accepting planner completion
 _DEFAULT_MAX_SCENARIOS = 0  # 0 = unlimited
+_DEFAULT_CONCRETIZE_PARALLEL = 8  # refiners running at once; 0 = unlimited
 _SCENARIO_MAX_RETRIES = 10  # max times to relaunch a dead scenario
 _SCENARIO_RETRY_BASE = 5  # base seconds for exponential backoff
 _DEFAULT_VERIFICATION_MAX_RETRIES = 3
@@ -66,6 +67,16 @@ def _get_max_scenarios() -> int:
         return _DEFAULT_MAX_SCENARIOS
 
 
+def _get_concretize_parallel() -> int:
+    """Read qa-concretize-parallel from global settings (default: 8)."""
+    from pm_core.paths import get_global_setting_value
+    val = get_global_setting_value("qa-concretize-parallel", "")
+    try:
+        return max(0, int(val))
+    except ValueError:
+        return _DEFAULT_CONCRETIZE_PARALLEL
+
+
 def _get_verification_max_retries() -> int:
     """Read qa-verify-retries from global settings (default: 3)."""
     from pm_core.paths import get_global_setting_value
@@ -146,6 +157,9 @@ class QAScenario:
     verifier_session_id: str | None = None
     verifier_transcript: str | None = None
     verifier_cwd: str | None = None
+    # Seconds from the start of launch preparation until the scenario's
+    # first prompt (the concretizer) was running in its window.
+    time_to_first_prompt: float | None = None
 
 
 @dataclass
@@ -243,17 +257,19 @@ def create_scenario_workdir(qa_workdir: Path, scenario_index: int,
     Everything for a single scenario lives under one directory::
 
         {qa_workdir}/s-{N}/
-            repo/       — ``git clone --local`` of the target repo
+            repo/       — checkout of the target repo
             scratch/    — empty dir for throwaway test projects
 
-    The clone checks out *branch* (the PR branch) so the scenario can
-    commit and push fixes directly.
+    The checkout is made by the provider :mod:`pm_core.workdir_provider`
+    selects for the filesystem (a reflink copy or ``git clone --local``)
+    and is on *branch* (the PR branch) so the scenario can commit and push
+    fixes directly.
 
     Falls back to a plain empty directory when *repo_root* is None (legacy).
 
     Returns ``(clone_path, scratch_path)``.
     """
-    from pm_core import git_ops
+    from pm_core import git_ops, workdir_provider
 
     scenario_dir = qa_workdir / f"s-{scenario_index}"
     scenario_dir.mkdir(parents=True, exist_ok=True)
@@ -268,19 +284,17 @@ def create_scenario_workdir(qa_workdir: Path, scenario_index: int,
 
     clone_path = scenario_dir / "repo"
 
-    # Clean up stale clone from a previous run
-    if clone_path.exists():
-        import shutil
-        shutil.rmtree(clone_path, ignore_errors=True)
+    # Clean up stale clone from a previous run, off the critical path.
+    # An empty directory is kept: it may be a pooled container's mounted
+    # workdir (see container_pool), and both providers fill an empty
+    # directory fine.
+    if clone_path.exists() and any(clone_path.iterdir()):
+        workdir_provider.discard_tree(clone_path)
 
-    # Create a local clone — fast (hardlinks objects) and standalone
-    # (proper .git directory, no worktree pointer issues).
-    clone_args = ["clone", "--local", str(repo_root), str(clone_path)]
-    if branch:
-        clone_args.extend(["--branch", branch])
-    git_ops.run_git(*clone_args)
+    provider = workdir_provider.select_provider(repo_root, scenario_dir)
+    provider.create(repo_root, clone_path, branch=branch)
 
-    # The clone got `origin = <repo_root>` from the local clone.  Swap it
+    # The checkout got `origin = <repo_root>` from the provider.  Swap it
     # to the *real* upstream so push/fetch/pull from inside the scenario
     # container target GitHub directly instead of hopping through the PR
     # workdir.  The host-side push proxy still mediates every remote op
@@ -495,6 +509,25 @@ def _run_qa_finalize_pane(state: "QALoopState", pr_data: dict,
     return extract_verdict_from_transcript(finalize_transcript, _FINALIZE_VERDICTS)
 
 
+def _write_json_if_changed(path: Path, data: dict) -> bool:
+    """Atomically write *data* to *path* unless the file already holds it.
+
+    The poll loop refreshes its state files every iteration; skipping
+    identical rewrites keeps an idle QA run from touching the disk.
+    Returns whether the file was written.
+    """
+    text = json.dumps(data, indent=2)
+    try:
+        if path.read_text() == text:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(text)
+    tmp_path.rename(path)
+    return True
+
+
 def _write_status_file(status_path: Path, pr_id: str,
                        scenarios: list[QAScenario],
                        scenario_verdicts: dict[int, str],
@@ -504,10 +537,16 @@ def _write_status_file(status_path: Path, pr_id: str,
                        queued_scenarios: set[int] | None = None,
                        verification_failures: dict[int, int] | None = None,
                        error: str = "",
-                       verdict_reasons: dict[int, str] | None = None) -> None:
-    """Atomically write the qa_status.json file."""
+                       verdict_reasons: dict[int, str] | None = None,
+                       queue_positions: dict[int, int] | None = None) -> None:
+    """Atomically write the qa_status.json file.
+
+    *queue_positions* maps queued scenarios to their place in the
+    host-wide QA queue (see qa_scheduler), shown next to "queued".
+    """
     _verifying = verifying_scenarios or set()
     _queued = queued_scenarios or set()
+    _positions = queue_positions or {}
     _verify_fails = verification_failures or {}
     _reasons = verdict_reasons or {}
     all_scenarios = []
@@ -539,15 +578,17 @@ def _write_status_file(status_path: Path, pr_id: str,
             "verdict_reason": _reasons.get(s.index, ""),
             "window_name": s.window_name or "",
         })
+        if s.time_to_first_prompt is not None:
+            all_scenarios[-1]["time_to_first_prompt"] = round(s.time_to_first_prompt, 2)
+        if s.index in _queued and s.index in _positions:
+            all_scenarios[-1]["queue_position"] = _positions[s.index]
     data = {
         "pr_id": pr_id,
         "scenarios": all_scenarios,
         "overall": overall,
         "error": error,
     }
-    tmp_path = status_path.with_suffix(".tmp")
-    tmp_path.write_text(json.dumps(data, indent=2))
-    tmp_path.rename(status_path)
+    _write_json_if_changed(status_path, data)
 
 
 # ---------------------------------------------------------------------------
@@ -651,9 +692,7 @@ def _write_resume_file(state: QALoopState, use_containers: bool,
     }
     path = _resume_file_path(state.qa_workdir)
     try:
-        tmp = path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(data, indent=2))
-        tmp.rename(path)
+        _write_json_if_changed(path, data)
     except OSError:
         _log.warning("Failed to write QA resume snapshot for %s",
                      state.pr_id, exc_info=True)
@@ -1475,6 +1514,67 @@ def _install_artifact_files(pm_root: Path, scenario: QAScenario,
     scenario.artifact_paths = new_paths
 
 
+def _run_concretization_stage(
+    state: QALoopState,
+    prepare: Callable[[QAScenario], tuple | None],
+    launch: Callable[..., None],
+    status_scenarios: list | None = None,
+) -> None:
+    """Prepare, refine and launch every scenario in ``state.scenarios``.
+
+    Each scenario is one pipeline: *prepare* (workdir, container and the
+    refiner's window) returns the arguments for *launch* (wait for that
+    refiner, then start the worker), or None if the scenario could not be
+    set up.  Pipelines run on a pool of ``qa-concretize-parallel``
+    threads, so at most that many refiners run at once, and each worker
+    starts as soon as its own refinement finishes, in whatever order they
+    finish.  The status file is refreshed as each refiner window appears
+    so the dashboard can navigate to it.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    scenarios = list(state.scenarios)
+    if not scenarios:
+        return
+    limit = _get_concretize_parallel() or len(scenarios)
+    status_lock = threading.Lock()
+
+    def _pipeline(scenario: QAScenario) -> bool:
+        entry = prepare(scenario)
+        if entry is None:
+            return False
+        if state.qa_workdir:
+            with status_lock:
+                _write_status_file(
+                    Path(state.qa_workdir) / "qa_status.json",
+                    state.pr_id,
+                    status_scenarios if status_scenarios is not None else scenarios,
+                    state.scenario_verdicts,
+                    scenario_0=state.scenario_0,
+                    verdict_reasons=state.scenario_verdict_reasons,
+                )
+        launch(*entry)
+        return True
+
+    started = time.monotonic()
+    done = 0
+    with ThreadPoolExecutor(max_workers=min(limit, len(scenarios)),
+                            thread_name_prefix="qa-concretize") as pool:
+        futures = {pool.submit(_pipeline, sc): sc for sc in scenarios}
+        for future in as_completed(futures):
+            scenario = futures[future]
+            done += 1
+            try:
+                launched = future.result()
+            except Exception:
+                _log.exception("Scenario %d pipeline crashed", scenario.index)
+                launched = False
+            _log.info("Scenario %d %s after %.1fs (%d/%d done)",
+                      scenario.index,
+                      "launched" if launched and scenario.pane_id else "not launched",
+                      time.monotonic() - started, done, len(scenarios))
+
+
 def _launch_scenarios_in_tmux(
     state: QALoopState,
     data: dict,
@@ -1487,23 +1587,21 @@ def _launch_scenarios_in_tmux(
 ) -> None:
     """Launch each scenario in its own tmux window (with worktree isolation).
 
-    Both phases run in parallel: workdir cloning, concretizer window creation,
-    and agent launch all happen concurrently across scenarios.  The scenario
-    agent pane is split as soon as its concretizer finishes.
+    Scenarios go through :func:`_run_concretization_stage`: workdir
+    cloning, concretizer window creation and agent launch run concurrently
+    across scenarios, and a scenario's agent pane is split as soon as its
+    own concretizer finishes.
     """
     from pm_core import tmux as tmux_mod
     _qa_resolution = _resolve_qa_model(pr_data, data, session_type="qa_scenario")
 
     branch = pr_data.get("branch", "")
 
-    # --- Phase 1: clone workdirs and create concretizer windows in parallel ---
-    # Each entry: (scenario, concretize_pane, scenario_cwd, clone_path, scratch_path, transcript)
-    pending: list[tuple] = []
-    pending_lock = threading.Lock()
-
-    def _prepare_scenario(scenario: QAScenario) -> None:
+    # --- Per scenario: clone the workdir and open the concretizer window ---
+    # Returns the arguments for _concretize_and_launch, or None.
+    def _prepare_scenario(scenario: QAScenario) -> tuple | None:
         if state.stop_requested:
-            return
+            return None
 
         try:
             clone_path, scratch_path = create_scenario_workdir(
@@ -1516,7 +1614,7 @@ def _launch_scenarios_in_tmux(
         except Exception:
             _log.warning("Failed to create workdir for scenario %d, skipping",
                          scenario.index)
-            return
+            return None
         scenario.worktree_path = str(clone_path)
 
         if repo_root:
@@ -1562,39 +1660,15 @@ def _launch_scenarios_in_tmux(
         if not concretize_pane:
             _log.warning("Failed to create window for scenario %d",
                          scenario.index)
-            return
+            return None
 
         # Set window_name now so the status dashboard can navigate to
         # the concretizer window during the concretization phase.
         scenario.window_name = win_name
-        with pending_lock:
-            pending.append((scenario, concretize_pane, scenario_cwd,
-                            clone_path, scratch_path, transcript, win_name,
-                            instruction_content))
-
-    prep_threads = [
-        threading.Thread(target=_prepare_scenario, args=(sc,), daemon=True,
-                         name=f"prepare-s{sc.index}")
-        for sc in state.scenarios
-    ]
-    for t in prep_threads:
-        t.start()
-    for t in prep_threads:
-        t.join()
-
-    # Write status with window names so the dashboard is navigable
-    # while concretizers run (before the polling loop starts).
-    if state.qa_workdir and pending:
-        _write_status_file(
-            Path(state.qa_workdir) / "qa_status.json",
-            state.pr_id,
-            _status_scenarios if _status_scenarios is not None else state.scenarios,
-            state.scenario_verdicts,
-            scenario_0=state.scenario_0,
-            verdict_reasons=state.scenario_verdict_reasons,
-        )
+        return (scenario, concretize_pane, scenario_cwd, clone_path,
+                scratch_path, transcript, win_name, instruction_content)
 
-    # --- Phase 2: poll concretizers in parallel, launch agent as each finishes ---
+    # --- Per scenario: wait for its concretizer, then launch the agent ---
     def _concretize_and_launch(
             scenario: QAScenario,
             concretize_pane: str,
@@ -1665,19 +1739,8 @@ def _launch_scenarios_in_tmux(
             _log.warning("Scenario %d (%s) window creation failed",
                          scenario.index, scenario.title)
 
-    threads = [
-        threading.Thread(
-            target=_concretize_and_launch,
-            args=entry,
-            daemon=True,
-            name=f"concretize-{entry[0].index}",
-        )
-        for entry in pending
-    ]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    _run_concretization_stage(state, _prepare_scenario, _concretize_and_launch,
+                              status_scenarios=_status_scenarios)
 
 
 def _launch_scenarios_in_containers(
@@ -1694,7 +1757,9 @@ def _launch_scenarios_in_containers(
 
     Each scenario gets:
       1. A local clone of the repo (standalone .git, no worktree pointers)
-      2. A detached container with the clone mounted at /workspace
+      2. A detached container with the clone mounted at /workspace —
+         taken from the warm :mod:`~pm_core.container_pool` when one is
+         ready, created cold otherwise
       3. A push proxy scoped to the PR branch
       4. A tmux window running ``docker exec -it <container> claude ...``
 
@@ -1704,6 +1769,7 @@ def _launch_scenarios_in_containers(
     """
     from pm_core import tmux as tmux_mod
     from pm_core import container as container_mod
+    from pm_core import container_pool
     _qa_resolution = _resolve_qa_model(pr_data, data, session_type="qa_scenario")
 
     config = container_mod.load_container_config()
@@ -1714,19 +1780,32 @@ def _launch_scenarios_in_containers(
     # ``run_qa_sync`` from the same tmux session — reuse it so every
     # caller agrees on the path.
     _session_tag = state.session_tag
+    # Pooled containers start before the scenario clone fills their
+    # workdir, so their image is resolved from the repo up front.
+    pool = container_pool.get_pool(
+        container_mod.config_for_repo(config, repo_root), _session_tag)
 
     # In container mode, paths inside the container are fixed
     container_workdir = container_mod._CONTAINER_WORKDIR
     container_scratch = container_mod._CONTAINER_SCRATCH
 
-    # --- Phase 1: clone workdirs, create containers and windows in parallel ---
-    # Each entry: (scenario, concretize_pane, win_name, cname, transcript, clone_path, instruction_content)
-    pending: list[tuple] = []
-    pending_lock = threading.Lock()
-
-    def _prepare_scenario(scenario: QAScenario) -> None:
+    # --- Per scenario: clone, create the container, open the refiner window ---
+    # Returns the arguments for _concretize_and_launch, or None.
+    def _prepare_scenario(scenario: QAScenario) -> tuple | None:
         if state.stop_requested:
-            return
+            return None
+        started = time.monotonic()
+
+        # A warm container's mounted directories become the scenario's
+        # repo/ and scratch/; the clone below then fills them in place.
+        lease = None
+        if pool is not None:
+            try:
+                lease = pool.acquire(
+                    Path(state.qa_workdir) / f"s-{scenario.index}")
+            except Exception:
+                _log.warning("Container pool acquire failed for scenario %d",
+                             scenario.index, exc_info=True)
 
         try:
             clone_path, scratch_path = create_scenario_workdir(
@@ -1739,7 +1818,9 @@ def _launch_scenarios_in_containers(
         except Exception:
             _log.warning("Failed to create workdir for scenario %d, skipping",
                          scenario.index)
-            return
+            if lease is not None:
+                pool.release(lease)
+            return None
         scenario.worktree_path = str(clone_path)
 
         # Read instruction content from source before installing
@@ -1768,21 +1849,33 @@ def _launch_scenarios_in_containers(
             state.pr_id, state.loop_id, scenario.index,
             session_tag=_session_tag,
         )
+        if lease is not None:
+            try:
+                pool.attach(lease, cname, workdir=clone_path,
+                            allowed_push_branch=branch or None,
+                            pr_id=state.pr_id)
+                scenario.container_name = cname
+            except Exception:
+                _log.warning("Pooled container unusable for scenario %d — "
+                             "creating one", scenario.index)
+                pool.release(lease)
+                lease = None
         try:
-            container_mod.create_qa_container(
-                name=cname,
-                config=config,
-                workdir=clone_path,
-                scratch_path=scratch_path,
-                allowed_push_branch=branch or None,
-                session_tag=_session_tag,
-                pr_id=state.pr_id,
-            )
-            scenario.container_name = cname
+            if lease is None:
+                container_mod.create_qa_container(
+                    name=cname,
+                    config=config,
+                    workdir=clone_path,
+                    scratch_path=scratch_path,
+                    allowed_push_branch=branch or None,
+                    session_tag=_session_tag,
+                    pr_id=state.pr_id,
+                )
+                scenario.container_name = cname
         except Exception:
             _log.error("Failed to create container for scenario %d — aborting scenario",
                        scenario.index, exc_info=True)
-            return
+            return None
 
         win_name = _scenario_window_name(pr_data, scenario.index)
 
@@ -1803,38 +1896,19 @@ def _launch_scenarios_in_containers(
         if not concretize_pane:
             _log.warning("Failed to create window for scenario %d",
                          scenario.index)
-            return
+            return None
+        scenario.time_to_first_prompt = time.monotonic() - started
+        _log.info("Scenario %d first prompt after %.2fs (%s container)",
+                  scenario.index, scenario.time_to_first_prompt,
+                  "pooled" if lease is not None else "cold")
 
         # Set window_name now so the status dashboard can navigate to
         # the concretizer window during the concretization phase.
         scenario.window_name = win_name
-        with pending_lock:
-            pending.append((scenario, concretize_pane, win_name, cname, transcript,
-                            clone_path, instruction_content))
-
-    prep_threads = [
-        threading.Thread(target=_prepare_scenario, args=(sc,), daemon=True,
-                         name=f"prepare-s{sc.index}")
-        for sc in state.scenarios
-    ]
-    for t in prep_threads:
-        t.start()
-    for t in prep_threads:
-        t.join()
-
-    # Write status with window names so the dashboard is navigable
-    # while concretizers run (before the polling loop starts).
-    if state.qa_workdir and pending:
-        _write_status_file(
-            Path(state.qa_workdir) / "qa_status.json",
-            state.pr_id,
-            _status_scenarios if _status_scenarios is not None else state.scenarios,
-            state.scenario_verdicts,
-            scenario_0=state.scenario_0,
-            verdict_reasons=state.scenario_verdict_reasons,
-        )
+        return (scenario, concretize_pane, win_name, cname, transcript,
+                clone_path, instruction_content)
 
-    # --- Phase 2: poll concretizers in parallel, launch agent as each finishes ---
+    # --- Per scenario: wait for its concretizer, then launch the agent ---
     def _concretize_and_launch(
             scenario: QAScenario,
             concretize_pane: str,
@@ -1903,19 +1977,8 @@ def _launch_scenarios_in_containers(
             _log.warning("Scenario %d (%s) container/window creation failed",
                          scenario.index, scenario.title)
 
-    threads = [
-        threading.Thread(
-            target=_concretize_and_launch,
-            args=entry,
-            daemon=True,
-            name=f"concretize-{entry[0].index}",
-        )
-        for entry in pending
-    ]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    _run_concretization_stage(state, _prepare_scenario, _concretize_and_launch,
+                              status_scenarios=_status_scenarios)
 
 
 # ---------------------------------------------------------------------------
@@ -2103,6 +2166,25 @@ def _poll_tmux_verdicts(
     _queued_indices: set[int] = {s.index for s in _launch_queue}
 
     pending = {s.index for s in state.scenarios if s.window_name}
+
+    # With a host-wide budget, queued scenarios wait for a slot from the
+    # shared scheduler instead of only for this loop's cap.  Registering
+    # again is harmless after run_qa_sync and needed after a resume.
+    scheduler = qa_scheduler.get_scheduler()
+    queue_positions: dict[int, int] = {}
+    if scheduler is not None:
+        scheduler.enqueue(
+            state.loop_id, state.pr_id, sorted(_queued_indices),
+            running=sorted(pending),
+            priority=qa_scheduler.dependency_priority(
+                data.get("prs") or [], state.pr_id),
+            loop_cap=concurrency_cap,
+        )
+    # Queued scenarios also wait while host memory/CPU pressure is over
+    # the qa-max-*-pressure limits (see resource_monitor).
+    pressure_limits = resource_monitor.pressure_limits()
+    monitor = resource_monitor.ResourceMonitor()
+    pressure_held = False
     retry_counts: dict[int, int] = {}  # scenario_index -> retries used
     # Track how many verification failures each scenario has had
     verification_failures: dict[int, int] = {}
@@ -2119,6 +2201,14 @@ def _poll_tmux_verdicts(
     # without a session_id cannot be polled and are marked INPUT_REQUIRED.
     from pm_core import hook_events as _hook_events
     _last_scenario_hook_ts: dict[int, float] = {}
+    # The loop blocks on this between passes and wakes when a scenario's
+    # hook event file is written or a verification thread finishes, so an
+    # idle run re-reads nothing.  Pane deaths, the end of the grace period
+    # and stop requests are picked up on the _POLL_INTERVAL timeout.
+    watcher = _hook_events.HookWatcher()
+    # Scenarios whose hook event may not have been examined yet: all of
+    # them at first, then those the watcher reports and fresh (re)launches.
+    hook_dirty: set[int] = set(pending)
 
     # Scenarios that failed to create a window get INPUT_REQUIRED immediately
     # (but skip queued scenarios — they don't have windows yet by design)
@@ -2167,20 +2257,57 @@ def _poll_tmux_verdicts(
             passed, reason = False, "verification thread crashed"
         with verification_lock:
             verification_results[scenario.index] = (passed, reason)
+        watcher.wake()
             # NOTE: do NOT discard from ``verifying`` here — the main
             # loop must process the result first.  If we discard now
             # and ``pending`` is also empty the loop exits before it
             # sees the result (race condition).
 
-    def _launch_next_queued():
-        """Launch the next queued scenario if concurrency allows."""
+    def _pressure_allows() -> bool:
+        """Whether host pressure leaves room for another scenario.
+
+        One scenario is always allowed to run, so pressure from outside
+        pm cannot stall the loop.
+        """
+        nonlocal pressure_held
+        if not pressure_limits or not (pending or verifying):
+            return True
+        reasons = resource_monitor.admission_blocked(monitor, pressure_limits)
+        if bool(reasons) != pressure_held:
+            pressure_held = bool(reasons)
+            if reasons:
+                _log.info("Host pressure %s — holding %d queued scenario(s)",
+                          ", ".join(reasons), len(_launch_queue))
+                state.latest_output = (
+                    f"Host under pressure ({', '.join(reasons)}): "
+                    f"{len(_launch_queue)} scenario(s) waiting")
+                _notify()
+            else:
+                _log.info("Host pressure back under limits — resuming launches")
+        return not reasons
+
+    def _launch_next_queued() -> bool:
+        """Launch the next queued scenario if concurrency and pressure allow.
+
+        Returns whether a scenario was taken off the queue.
+        """
         if not _launch_queue:
-            return
-        # Count currently active (pending + verifying)
-        active = len(pending) + len(verifying)
-        if concurrency_cap > 0 and active >= concurrency_cap:
-            return
-        scenario = _launch_queue.pop(0)
+            return False
+        if not _pressure_allows():
+            return False
+        if scheduler is not None:
+            admitted = scheduler.admit(state.loop_id,
+                                       active=pending | verifying, limit=1)
+            if not admitted:
+                return False
+            scenario = next(s for s in _launch_queue if s.index == admitted[0])
+            _launch_queue.remove(scenario)
+        else:
+            # Count currently active (pending + verifying)
+            active = len(pending) + len(verifying)
+            if concurrency_cap > 0 and active >= concurrency_cap:
+                return False
+            scenario = _launch_queue.pop(0)
         _queued_indices.discard(scenario.index)
         _log.info("Launching queued scenario %d (%s), %d remain in queue",
                   scenario.index, scenario.title, len(_launch_queue))
@@ -2202,6 +2329,7 @@ def _poll_tmux_verdicts(
             state.scenarios = orig
         if scenario.window_name:
             pending.add(scenario.index)
+            hook_dirty.add(scenario.index)
         else:
             # Window creation failed — mark INPUT_REQUIRED so this
             # scenario isn't silently lost (which could cause a false
@@ -2209,6 +2337,7 @@ def _poll_tmux_verdicts(
             _log.warning("Queued scenario %d window creation failed — "
                          "marking INPUT_REQUIRED", scenario.index)
             state.scenario_verdicts[scenario.index] = VERDICT_INPUT_REQUIRED
+        return True
 
     # Fill any open slots that were freed by initial workdir failures.
     # Scenarios that fail workdir creation are marked INPUT_REQUIRED without
@@ -2218,7 +2347,14 @@ def _poll_tmux_verdicts(
         _launch_next_queued()  # returns immediately once cap is reached
 
     while (pending or verifying or _launch_queue) and not state.stop_requested:
-        time.sleep(_POLL_INTERVAL)
+        changed = watcher.wait(
+            {s.session_id for s in state.scenarios
+             if s.index in pending and s.session_id},
+            _POLL_INTERVAL)
+        hook_dirty |= {s.index for s in state.scenarios
+                       if s.session_id and s.session_id in changed}
+        # One tmux call answers liveness for every scenario pane.
+        live_panes = tmux_mod.live_pane_ids()
 
         # Refresh the resume snapshot each iteration so a TUI restart can
         # re-enter this loop with up-to-date scenario pane/session state
@@ -2229,6 +2365,21 @@ def _poll_tmux_verdicts(
         in_grace = (time.monotonic() - grace_start) < _VERDICT_GRACE_PERIOD
         verdicts_changed = False
 
+        # Slots can be freed by other loops at any time, so ask the host
+        # scheduler every iteration rather than only on our completions.
+        queue_moved = False
+        if scheduler is not None and _launch_queue:
+            while _launch_next_queued():
+                queue_moved = True
+            positions = scheduler.positions(state.loop_id)
+            if positions != queue_positions:
+                queue_positions = positions
+                queue_moved = True
+        elif pressure_limits and _launch_queue:
+            # Pressure can ease without any of our scenarios finishing.
+            while _launch_next_queued():
+                queue_moved = True
+
         # Check for completed verifications
         with verification_lock:
             completed_verifications = dict(verification_results)
@@ -2313,6 +2464,7 @@ def _poll_tmux_verdicts(
                             state.verified_scenarios.discard(scenario_idx)
                         _last_scenario_hook_ts[scenario_idx] = time.time()
                         pending.add(scenario_idx)
+                        hook_dirty.add(scenario_idx)
                         state.latest_output = (
                             f"Scenario {scenario_idx} ({scenario.title}): "
                             f"re-evaluating after verification"
@@ -2336,7 +2488,8 @@ def _poll_tmux_verdicts(
                 continue
 
             pane_id = scenario.pane_id or _get_scenario_pane(session, scenario.window_name)
-            if pane_id and not tmux_mod.pane_exists(pane_id):
+            if pane_id and not (pane_id in live_panes if live_panes is not None
+                                else tmux_mod.pane_exists(pane_id)):
                 pane_id = None
                 scenario.pane_id = None
             if pane_id is None:
@@ -2357,6 +2510,7 @@ def _poll_tmux_verdicts(
                         # Reset grace period for this retry
                         grace_start = time.monotonic()
                         _last_scenario_hook_ts.pop(scenario.index, None)
+                        hook_dirty.add(scenario.index)
                         continue
                     # Relaunch failed — will retry on next poll iteration
                     continue
@@ -2384,6 +2538,9 @@ def _poll_tmux_verdicts(
                 verdicts_changed = True
                 _launch_next_queued()
                 continue
+            if scenario.index not in hook_dirty:
+                continue
+            hook_dirty.discard(scenario.index)
             ev = _hook_events.read_event(scenario.session_id)
             ev_ts = float((ev or {}).get("timestamp") or 0)
             last_ts = _last_scenario_hook_ts.get(scenario.index, 0.0)
@@ -2471,7 +2628,7 @@ def _poll_tmux_verdicts(
         if completed_verifications:
             _launch_next_queued()
 
-        if verdicts_changed or completed_verifications:
+        if verdicts_changed or completed_verifications or queue_moved:
             with verification_lock:
                 verifying_snapshot = set(verifying)
             _write_status_file(status_path, state.pr_id, state.scenarios,
@@ -2480,7 +2637,10 @@ def _poll_tmux_verdicts(
                                verifying_scenarios=verifying_snapshot,
                                queued_scenarios=_queued_indices,
                                verification_failures=verification_failures,
-                               verdict_reasons=state.scenario_verdict_reasons)
+                               verdict_reasons=state.scenario_verdict_reasons,
+                               queue_positions=queue_positions)
+
+    watcher.close()
 
 
 # ---------------------------------------------------------------------------
@@ -3001,6 +3161,16 @@ def run_qa_sync(
     if use_containers:
         if _runtime_available():
             _log.info("Container mode enabled for QA execution")
+            # Warm the scenario container pool while the planner runs.
+            from pm_core import container as container_mod, container_pool
+            pool_repo = (Path(workdir_path) if workdir_path
+                         and Path(workdir_path).is_dir() else None)
+            pool = container_pool.get_pool(
+                container_mod.config_for_repo(
+                    container_mod.load_container_config(), pool_repo),
+                state.session_tag)
+            if pool is not None:
+                pool.fill()
         else:
             _log.warning("Container mode enabled but runtime unavailable "
                          "— falling back to host execution")
@@ -3278,9 +3448,30 @@ def run_qa_sync(
     # --- Phase 2: Execution ---
     # Determine concurrency cap (0 = launch all at once)
     concurrency_cap = max_scenarios if max_scenarios is not None else _get_max_scenarios()
-    if concurrency_cap > 0:
-        launch_scenarios = state.scenarios[:concurrency_cap]
-        queued_scenarios = state.scenarios[concurrency_cap:]
+    # A host already under pressure gets one scenario now; the poll loop
+    # admits the rest as pressure allows.
+    held = resource_monitor.admission_blocked()
+    if held:
+        _log.info("Host pressure %s — starting %s with one scenario",
+                  ", ".join(held), state.pr_id)
+    first_batch = 1 if held else concurrency_cap
+    scheduler = qa_scheduler.get_scheduler()
+    if scheduler is not None:
+        # Host-wide budget: the initial batch is whatever the shared
+        # scheduler admits now (it also applies concurrency_cap).
+        scheduler.enqueue(
+            state.loop_id, state.pr_id, [s.index for s in state.scenarios],
+            priority=qa_scheduler.dependency_priority(
+                data.get("prs") or [], state.pr_id),
+            loop_cap=concurrency_cap,
+        )
+        admitted = set(scheduler.admit(state.loop_id,
+                                       limit=1 if held else None))
+        launch_scenarios = [s for s in state.scenarios if s.index in admitted]
+        queued_scenarios = [s for s in state.scenarios if s.index not in admitted]
+    elif first_batch > 0:
+        launch_scenarios = state.scenarios[:first_batch]
+        queued_scenarios = state.scenarios[first_batch:]
     else:
         launch_scenarios = state.scenarios
         queued_scenarios = []
@@ -3401,13 +3592,18 @@ def _execute_and_finalize(
     # restart can pick the run back up.
     _write_resume_file(state, use_containers, concurrency_cap, queued_indices)
 
-    _poll_tmux_verdicts(state, data, pr_data, session, workdir_path,
-                        status_path, notify,
-                        queued_scenarios=queued_scenarios,
-                        concurrency_cap=concurrency_cap,
-                        use_containers=use_containers,
-                        repo_root=repo_root,
-                        pm_root=pm_root)
+    try:
+        _poll_tmux_verdicts(state, data, pr_data, session, workdir_path,
+                            status_path, notify,
+                            queued_scenarios=queued_scenarios,
+                            concurrency_cap=concurrency_cap,
+                            use_containers=use_containers,
+                            repo_root=repo_root,
+                            pm_root=pm_root)
+    finally:
+        # Scenario windows stay open for inspection, but they no longer
+        # count against the host-wide QA budget.
+        qa_scheduler.release_loop(state.loop_id)
 
     # --- Aggregate verdicts ---
     verdicts = list(state.scenario_verdicts.values())
@@ -3554,6 +3750,7 @@ def start_qa_background(
             run_qa_sync(state, pm_root, pr_data, on_update, max_scenarios)
         except Exception:
             _log.exception("QA background thread crashed for %s", state.pr_id)
+            qa_scheduler.release_loop(state.loop_id)
             state.running = False
             state.latest_verdict = "ERROR"
             state.latest_output = "QA thread crashed"
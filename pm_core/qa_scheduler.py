@@ -0,0 +1,240 @@
+"""Host-wide admission of QA scenarios across concurrent QA loops.
+
+Each QA loop caps its own running scenarios (``qa-max-scenarios``), but
+several PRs in QA at once each get that many, so the host can end up
+running far more scenario containers than it can hold.  With the
+``qa-host-max-scenarios`` setting above 0, every loop instead asks a
+:class:`QAScheduler` before launching a scenario, and at most that many
+scenarios run on the host at once.
+
+The scheduler has no daemon.  Its state is a JSON file
+(``~/.pm/qa-scheduler.json``) read and rewritten under an exclusive lock
+on ``qa-scheduler.lock``, so loops in any number of TUI processes share
+one budget::
+
+    {"running": {ticket: entry}, "waiting": {ticket: entry},
+     "loop_caps": {loop_id: cap}}
+
+A ticket is ``"<loop_id>:<scenario index>"`` and an entry records the PR,
+priority, request time and owning pid.  Entries whose pid has exited are
+dropped whenever the file is opened, so a crashed TUI cannot hold slots.
+
+Free slots go to waiting scenarios in rank order: highest priority first,
+where priority is the number of open PRs that depend on the scenario's PR
+(a PR that blocks others gets through QA sooner), plus one point per
+``_AGE_CREDIT`` seconds spent waiting so nothing starves; ties go to the
+oldest request.  A loop's own cap still applies: its scenarios are
+skipped while it has ``loop_cap`` of them running.
+"""
+
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from pm_core import graph
+from pm_core.paths import configure_logger, get_global_setting_value, pm_home
+
+_log = configure_logger("pm.qa_scheduler")
+
+# Seconds of waiting worth one point of priority (one dependent PR).
+_AGE_CREDIT = 120
+
+
+def host_budget() -> int:
+    """Read qa-host-max-scenarios from global settings (default 0: no limit)."""
+    val = get_global_setting_value("qa-host-max-scenarios", "")
+    try:
+        return max(0, int(val))
+    except ValueError:
+        return 0
+
+
+def dependency_priority(prs: list[dict], pr_id: str) -> int:
+    """Number of open PRs that depend on *pr_id*, directly or transitively."""
+    dependents = graph.build_adjacency(prs)
+    status = {p["id"]: p.get("status") for p in prs}
+    seen: set[str] = set()
+    stack = list(dependents.get(pr_id, []))
+    while stack:
+        dep = stack.pop()
+        if dep in seen:
+            continue
+        seen.add(dep)
+        stack.extend(dependents.get(dep, []))
+    return sum(1 for d in seen if status.get(d) not in ("merged", "closed"))
+
+
+def _ticket(loop_id: str, index: int) -> str:
+    return f"{loop_id}:{index}"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class QAScheduler:
+    """Shared admission state for QA scenarios on this host."""
+
+    def __init__(self, budget: int, path: Path | None = None):
+        self.budget = budget
+        self.path = path or pm_home() / "qa-scheduler.json"
+
+    @contextmanager
+    def _locked(self):
+        with open(self.path.with_suffix(".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                state = json.loads(self.path.read_text() or "{}")
+            except (FileNotFoundError, json.JSONDecodeError):
+                state = {}
+            for key in ("running", "waiting", "loop_caps"):
+                state.setdefault(key, {})
+            before = json.dumps(state, sort_keys=True)
+            self._drop_dead(state)
+            yield state
+            after = json.dumps(state, sort_keys=True)
+            if after != before or not self.path.exists():
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(after)
+                os.replace(tmp, self.path)
+
+    @staticmethod
+    def _drop_dead(state: dict) -> None:
+        alive: dict[int, bool] = {}
+        for table in ("running", "waiting"):
+            for ticket, entry in list(state[table].items()):
+                pid = entry.get("pid", 0)
+                if pid not in alive:
+                    alive[pid] = _pid_alive(pid)
+                if not alive[pid]:
+                    _log.info("qa scheduler: dropping %s (pid %s exited)",
+                              ticket, pid)
+                    del state[table][ticket]
+        loops = {e["loop_id"] for t in ("running", "waiting")
+                 for e in state[t].values()}
+        for loop_id in list(state["loop_caps"]):
+            if loop_id not in loops:
+                del state["loop_caps"][loop_id]
+
+    @staticmethod
+    def _ranked(state: dict, now: float) -> list[tuple[str, dict]]:
+        def key(item):
+            ticket, e = item
+            waited = max(0.0, now - e["requested_at"])
+            return (-(e["priority"] + waited / _AGE_CREDIT),
+                    e["requested_at"], e["loop_id"], e["scenario"])
+        return sorted(state["waiting"].items(), key=key)
+
+    def enqueue(self, loop_id: str, pr_id: str, waiting, running=(),
+                priority: int = 0, loop_cap: int = 0) -> None:
+        """Register a loop's scenarios: *waiting* ones queue for a slot.
+
+        Scenarios in *running* are recorded as already holding a slot (a
+        resumed loop whose scenarios kept running across a restart).  Safe
+        to repeat: queued scenarios keep their original request time.
+        """
+        now = time.time()
+        with self._locked() as state:
+            state["loop_caps"][loop_id] = loop_cap
+            for idx in running:
+                ticket = _ticket(loop_id, idx)
+                entry = (state["waiting"].pop(ticket, None)
+                         or state["running"].get(ticket)
+                         or {"requested_at": now})
+                entry.update(loop_id=loop_id, pr_id=pr_id, scenario=idx,
+                             priority=priority, pid=os.getpid())
+                state["running"][ticket] = entry
+            for idx in waiting:
+                ticket = _ticket(loop_id, idx)
+                if ticket in state["running"]:
+                    continue
+                entry = state["waiting"].get(ticket) or {"requested_at": now}
+                entry.update(loop_id=loop_id, pr_id=pr_id, scenario=idx,
+                             priority=priority, pid=os.getpid())
+                state["waiting"][ticket] = entry
+
+    def admit(self, loop_id: str, active=None,
+              limit: int | None = None) -> list[int]:
+        """Claim free slots for *loop_id*'s queued scenarios.
+
+        *active* is the set of the loop's scenarios still running; slots
+        held by any others are released first.  Returns the indices, in
+        launch order, of at most *limit* scenarios the loop may now start.
+        Scenarios of other loops that rank higher are served first, so
+        this may return nothing even with slots free.
+        """
+        now = time.time()
+        with self._locked() as state:
+            if active is not None:
+                active = set(active)
+                for ticket, e in list(state["running"].items()):
+                    if e["loop_id"] == loop_id and e["scenario"] not in active:
+                        del state["running"][ticket]
+            free = self.budget - len(state["running"])
+            per_loop: dict[str, int] = {}
+            for e in state["running"].values():
+                per_loop[e["loop_id"]] = per_loop.get(e["loop_id"], 0) + 1
+            admitted: list[int] = []
+            for ticket, e in self._ranked(state, now):
+                if free <= 0 or (limit is not None and len(admitted) >= limit):
+                    break
+                cap = state["loop_caps"].get(e["loop_id"], 0)
+                if cap and per_loop.get(e["loop_id"], 0) >= cap:
+                    continue
+                if e["loop_id"] != loop_id:
+                    # Keep the slot for the higher-ranked loop; it will
+                    # claim it on its next poll.
+                    free -= 1
+                    per_loop[e["loop_id"]] = per_loop.get(e["loop_id"], 0) + 1
+                    continue
+                del state["waiting"][ticket]
+                state["running"][ticket] = e
+                per_loop[loop_id] = per_loop.get(loop_id, 0) + 1
+                free -= 1
+                admitted.append(e["scenario"])
+            if admitted:
+                _log.info("qa scheduler: admitted %s for loop %s (%d/%d running)",
+                          admitted, loop_id, len(state["running"]), self.budget)
+            return admitted
+
+    def positions(self, loop_id: str) -> dict[int, int]:
+        """1-based position in the host-wide queue of each queued scenario."""
+        with self._locked() as state:
+            ranked = self._ranked(state, time.time())
+        return {e["scenario"]: pos for pos, (_, e) in enumerate(ranked, 1)
+                if e["loop_id"] == loop_id}
+
+    def release(self, loop_id: str) -> None:
+        """Forget every scenario of *loop_id*, running or queued."""
+        with self._locked() as state:
+            for table in ("running", "waiting"):
+                for ticket, e in list(state[table].items()):
+                    if e["loop_id"] == loop_id:
+                        del state[table][ticket]
+            state["loop_caps"].pop(loop_id, None)
+
+
+def get_scheduler() -> QAScheduler | None:
+    """Return the host scheduler, or None when qa-host-max-scenarios is 0."""
+    budget = host_budget()
+    return QAScheduler(budget) if budget else None
+
+
+def release_loop(loop_id: str) -> None:
+    """Release *loop_id*'s slots if the host scheduler is enabled."""
+    scheduler = get_scheduler()
+    if scheduler is not None:
+        try:
+            scheduler.release(loop_id)
+        except OSError:
+            _log.warning("qa scheduler: could not release loop %s", loop_id,
+                         exc_info=True)
@@ -155,6 +155,9 @@ def _render(status: dict | None, selected: int, rows: int, cols: int,
                 f"{_DIM}pending{_RESET} "
                 f"{_RED}({fails}){_RESET}"
             )
+        elif verdict == "queued" and sc.get("queue_position"):
+            # Place in the host-wide QA queue (qa-host-max-scenarios)
+            verdict_display = f"{_DIM}queued #{sc['queue_position']}{_RESET}"
         elif verdict:
             color = _VERDICT_COLORS.get(verdict, _DIM)
             verdict_display = f"{color}{verdict}{_RESET}"
@@ -0,0 +1,343 @@
+"""Per-repository QA images with the project's dependencies pre-installed.
+
+A container started from the generic base image (``pm-dev:latest``) has
+none of the project's dependencies, so every QA scenario begins by
+installing them.  This module derives an image per repository instead::
+
+    FROM pm-dev:latest
+    COPY python/ /opt/pm-deps/python/
+    RUN cd /opt/pm-deps/python && pip3 install -r requirements.txt
+    COPY node/ /opt/pm-deps/node/
+    RUN cd /opt/pm-deps/node && npm ci ...
+
+Only the dependency manifests are copied into the build context, one
+directory and layer per ecosystem, so the runtime's layer cache reuses
+the Python layer when only ``package-lock.json`` changed and vice versa.
+Manifests come from :data:`_RECIPES` — the ecosystems whose toolchains
+the base image ships:
+
+  python     ``requirements*.txt``, or ``[project.dependencies]`` (plus
+             the ``dev``/``test`` extras) from ``pyproject.toml``
+  node       ``package.json`` + ``package-lock.json``: ``npm ci`` fills an
+             npm cache at ``/opt/pm-deps/npm-cache`` (``npm_config_cache``
+             points there), so ``npm ci`` in /workspace runs offline
+
+The image is tagged ``pm-deps-<project>-<id>:<key>`` where *key* hashes
+the manifests, the recipe version and the base image ID: it is rebuilt
+only when a lockfile (or the base image) changes, and nothing is pushed
+anywhere — it is a plain local build.  *project* and *id* come from the
+project's identity (:func:`project_identity`), not from the checkout's
+directory: QA scenarios run in ``{qa_workdir}/s-N/repo`` clones, which
+must map to the image ``pm container build-deps`` builds at the project
+root.  Older images for the same project are removed once their
+replacement is built.
+
+:func:`container.create_container` calls :func:`image_for` whenever the
+configured image is the default one.  The ``container-deps-image``
+setting picks what happens when the derived image is not built yet:
+``auto`` (default) starts the build in the background and uses the base
+image meanwhile, ``wait`` builds it first, ``off`` never derives images.
+"""
+
+import hashlib
+import re
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from pm_core.paths import configure_logger, get_global_setting_value
+
+_log = configure_logger("pm.repo_image")
+
+IMAGE_PREFIX = "pm-deps-"
+_DEPS_DIR = "/opt/pm-deps"
+_NPM_CACHE = f"{_DEPS_DIR}/npm-cache"
+# Bump when the generated Dockerfile changes so existing images are rebuilt.
+_RECIPE_VERSION = "1"
+_BUILD_TIMEOUT = 1800
+
+
+def deps_image_mode() -> str:
+    """Read container-deps-image from global settings (auto/wait/off)."""
+    val = get_global_setting_value("container-deps-image", "auto")
+    return val if val in ("auto", "wait", "off") else "auto"
+
+
+# ---------------------------------------------------------------------------
+# Manifest detection
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Recipe:
+    """One ecosystem's dependency layer.
+
+    *files* maps names in the layer directory to their content; *install*
+    runs in that directory during the image build.
+    """
+    name: str
+    files: dict[str, bytes]
+    install: str
+
+
+def _pyproject_requirements(path: Path) -> str | None:
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10
+        return None
+    try:
+        project = tomllib.loads(path.read_text()).get("project", {})
+    except (OSError, ValueError):
+        return None
+    deps = list(project.get("dependencies", []))
+    extras = project.get("optional-dependencies", {})
+    for extra in ("dev", "test"):
+        deps.extend(extras.get(extra, []))
+    return "".join(f"{d}\n" for d in deps) if deps else None
+
+
+def _python_recipe(repo: Path) -> Recipe | None:
+    reqs = sorted(p for p in repo.glob("requirements*.txt") if p.is_file())
+    if reqs:
+        files = {p.name: p.read_bytes() for p in reqs}
+    else:
+        generated = _pyproject_requirements(repo / "pyproject.toml")
+        if generated is None:
+            return None
+        files = {"requirements.txt": generated.encode()}
+    args = " ".join(f"-r {name}" for name in files)
+    return Recipe("python", files,
+                  f"pip3 install --no-cache-dir {args}")
+
+
+def _node_recipe(repo: Path) -> Recipe | None:
+    lock = repo / "package-lock.json"
+    manifest = repo / "package.json"
+    if not (lock.is_file() and manifest.is_file()):
+        return None
+    return Recipe("node",
+                  {"package.json": manifest.read_bytes(),
+                   "package-lock.json": lock.read_bytes()},
+                  "npm ci --ignore-scripts --no-audit --no-fund"
+                  " && rm -rf node_modules")
+
+
+_RECIPES = (_python_recipe, _node_recipe)
+
+
+def detect_recipes(repo: Path) -> list[Recipe]:
+    """The dependency layers *repo* needs, in build order."""
+    recipes = []
+    for detect in _RECIPES:
+        try:
+            recipe = detect(repo)
+        except OSError:
+            _log.debug("%s: manifest detection failed", detect.__name__,
+                       exc_info=True)
+            continue
+        if recipe is not None:
+            recipes.append(recipe)
+    return recipes
+
+
+# ---------------------------------------------------------------------------
+# Image naming and Dockerfile
+# ---------------------------------------------------------------------------
+
+def _base_image_id(base: str) -> str:
+    from pm_core.container import _run_runtime
+    result = _run_runtime("image", "inspect", "-f", "{{.Id}}", base,
+                          check=False, timeout=10)
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def image_key(recipes: list[Recipe], base_id: str) -> str:
+    """Hash of everything the derived image is built from."""
+    h = hashlib.sha256()
+    h.update(f"{_RECIPE_VERSION}\0{base_id}\0".encode())
+    for recipe in recipes:
+        h.update(f"{recipe.name}\0{recipe.install}\0".encode())
+        for name in sorted(recipe.files):
+            h.update(f"{name}\0{len(recipe.files[name])}\0".encode())
+            h.update(recipe.files[name])
+    return h.hexdigest()[:16]
+
+
+def project_identity(repo: Path) -> str:
+    """The project *repo* is a checkout of.
+
+    Follows ``origin`` through local clones (a scenario checkout, the PR
+    workdir, ...) and returns the first non-local URL, or the path of the
+    last repository in the chain when the project is local-only.
+    """
+    from pm_core.push_proxy import _resolve_local_remote_url
+    current = str(Path(repo).resolve())
+    seen: set[str] = set()
+    while current not in seen:
+        seen.add(current)
+        try:
+            result = subprocess.run(["git", "remote", "get-url", "origin"],
+                                    cwd=current, capture_output=True,
+                                    text=True, timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            break
+        if result.returncode != 0:
+            break
+        local = _resolve_local_remote_url(current, "origin")
+        if local is None:
+            return result.stdout.strip()
+        current = local
+    return current
+
+
+def image_tag(repo: Path, key: str) -> str:
+    identity = project_identity(repo)
+    name = re.split(r"[/:]", identity.rstrip("/"))[-1]
+    name = name[:-4] if name.endswith(".git") else name
+    slug = re.sub(r"[^a-z0-9_.-]+", "-", name.lower()).strip("-.")
+    # Projects that share a name (forks, same-named local repos) must not
+    # share tags, or each build would prune the other's image.
+    digest = hashlib.sha256(identity.encode()).hexdigest()[:8]
+    return f"{IMAGE_PREFIX}{slug or 'repo'}-{digest}:{key}"
+
+
+def render_dockerfile(base: str, recipes: list[Recipe], key: str) -> str:
+    lines = [f"FROM {base}", "USER root",
+             f"ENV npm_config_cache={_NPM_CACHE}"]
+    for recipe in recipes:
+        dest = f"{_DEPS_DIR}/{recipe.name}"
+        lines.append(f"COPY {recipe.name}/ {dest}/")
+        lines.append(f"RUN cd {dest} && {recipe.install}")
+    lines += [f"RUN mkdir -p {_NPM_CACHE} && chmod -R a+rwX {_DEPS_DIR}",
+              f"LABEL pm.deps.key={key}",
+              "USER pm",
+              "WORKDIR /home/pm"]
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Build and select
+# ---------------------------------------------------------------------------
+
+_build_locks: dict[str, threading.Lock] = {}
+_background: dict[str, threading.Thread] = {}
+_failed: set[str] = set()
+_state_lock = threading.Lock()
+
+
+def _tag_lock(tag: str) -> threading.Lock:
+    with _state_lock:
+        return _build_locks.setdefault(tag, threading.Lock())
+
+
+def build(tag: str, base: str, recipes: list[Recipe], key: str) -> None:
+    """Build *tag* from *recipes* on top of *base* (a local build)."""
+    from pm_core.container import _get_runtime, _invalidate_image_exists_cache
+    with tempfile.TemporaryDirectory(prefix="pm-deps-") as tmp:
+        ctx = Path(tmp)
+        for recipe in recipes:
+            layer = ctx / recipe.name
+            layer.mkdir()
+            for name, data in recipe.files.items():
+                (layer / name).write_bytes(data)
+        (ctx / "Dockerfile").write_text(render_dockerfile(base, recipes, key))
+        cmd = [_get_runtime(), "build", "-t", tag,
+               "-f", str(ctx / "Dockerfile"), str(ctx)]
+        _log.info("Building dependency image %s (%s)", tag,
+                  ", ".join(r.name for r in recipes))
+        result = subprocess.run(cmd, capture_output=True, text=True,
+                                timeout=_BUILD_TIMEOUT)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"Dependency image build failed: {result.stderr.strip()[-500:]}")
+    _invalidate_image_exists_cache(tag)
+    _log.info("Built dependency image %s", tag)
+
+
+def ensure_image(repo: Path, base: str, wait: bool = True,
+                 recipes: list[Recipe] | None = None) -> str | None:
+    """Return the derived image tag for *repo*, building it if needed.
+
+    Returns None when *repo* declares no dependencies, when the image is
+    not built yet and *wait* is False (a background build is started),
+    or when building failed.
+    """
+    from pm_core.container import image_exists
+    if recipes is None:
+        recipes = detect_recipes(repo)
+    if not recipes:
+        return None
+    key = image_key(recipes, _base_image_id(base))
+    tag = image_tag(repo, key)
+    if image_exists(tag):
+        return tag
+    if tag in _failed:
+        return None
+
+    def _build() -> bool:
+        with _tag_lock(tag):
+            if image_exists(tag):
+                return True
+            try:
+                build(tag, base, recipes, key)
+            except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+                _log.warning("%s — using %s", e, base)
+                _failed.add(tag)
+                return False
+            stale = prune_images(repo, keep=tag)
+            if stale:
+                _log.info("Removed superseded dependency images: %s",
+                          ", ".join(stale))
+            return True
+
+    if wait:
+        return tag if _build() else None
+    with _state_lock:
+        thread = _background.get(tag)
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(target=_build, name=f"build-{tag}",
+                                      daemon=True)
+            _background[tag] = thread
+            thread.start()
+    _log.info("Dependency image %s not built yet — using %s meanwhile", tag, base)
+    return None
+
+
+def image_for(workdir: Path, base: str) -> str:
+    """Image a container for *workdir* should run: derived, else *base*."""
+    recipes = detect_recipes(Path(workdir))
+    if not recipes:
+        return base
+    mode = deps_image_mode()
+    if mode == "off":
+        return base
+    try:
+        return ensure_image(Path(workdir), base, wait=mode == "wait",
+                            recipes=recipes) or base
+    except Exception:
+        _log.warning("Could not resolve dependency image for %s", workdir,
+                     exc_info=True)
+        return base
+
+
+def wait_for_builds(timeout: float | None = None) -> None:
+    """Join background builds started by :func:`ensure_image`."""
+    with _state_lock:
+        threads = list(_background.values())
+    for thread in threads:
+        thread.join(timeout)
+
+
+def prune_images(repo: Path, keep: str | None = None) -> list[str]:
+    """Remove *repo*'s derived images other than *keep*; returns the tags."""
+    from pm_core.container import _run_runtime
+    prefix = image_tag(repo, "")
+    result = _run_runtime("images", "--format", "{{.Repository}}:{{.Tag}}",
+                          check=False, timeout=30)
+    if result.returncode != 0:
+        return []
+    stale = [t for t in result.stdout.split() if t.startswith(prefix) and t != keep]
+    if stale:
+        _run_runtime("rmi", *stale, check=False, timeout=120)
+    return stale
@@ -0,0 +1,290 @@
+"""Host pressure and per-container resource usage.
+
+``ContainerConfig`` caps each container's memory and CPU, but nothing
+caps the sum: a QA run that launches many scenarios at once can push the
+host into swap and slow every session on it.  This module reads the two
+signals the kernel already keeps:
+
+  pressure    ``/proc/pressure/{cpu,memory,io}`` (PSI): the share of wall
+              time in which some (or all) runnable tasks were stalled
+              waiting on that resource, averaged over 10/60/300 seconds
+  containers  the cgroup v2 files of each running ``pm-`` container:
+              ``memory.current``, ``memory.max`` and ``cpu.stat``'s
+              ``usage_usec``; a container's cgroup is found from its main
+              process (``/proc/<pid>/cgroup``), which works the same for
+              docker, rootful podman and rootless podman
+
+QA admission uses the first (:func:`admission_blocked`): while memory or
+CPU ``some avg10`` is above ``qa-max-memory-pressure`` /
+``qa-max-cpu-pressure`` percent, queued scenarios stay queued.  ``pm
+container stats`` shows both.
+
+Both roots are module attributes (:data:`PROC_ROOT`, :data:`CGROUP_ROOT`)
+and :class:`ResourceMonitor` arguments, so tests point them at synthetic
+files.  Hosts without PSI or cgroup v2 read as "no data": admission is
+then never held back.
+"""
+
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from pm_core.paths import configure_logger, get_global_setting_value
+
+_log = configure_logger("pm.resource_monitor")
+
+PROC_ROOT = Path("/proc")
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+# some-avg10 percentages; 0 disables the check for that resource.
+_DEFAULT_MAX_MEMORY_PRESSURE = 10
+_DEFAULT_MAX_CPU_PRESSURE = 0
+
+
+def _setting_percent(name: str, default: int) -> int:
+    val = get_global_setting_value(name, "")
+    try:
+        return max(0, int(val))
+    except ValueError:
+        return default
+
+
+def pressure_limits() -> dict[str, int]:
+    """Enabled admission thresholds, as ``{resource: max some-avg10 %}``.
+
+    Read from qa-max-memory-pressure (default 10) and qa-max-cpu-pressure
+    (default 0: off).
+    """
+    limits = {
+        "memory": _setting_percent("qa-max-memory-pressure",
+                                   _DEFAULT_MAX_MEMORY_PRESSURE),
+        "cpu": _setting_percent("qa-max-cpu-pressure", _DEFAULT_MAX_CPU_PRESSURE),
+    }
+    return {res: pct for res, pct in limits.items() if pct > 0}
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def parse_pressure(text: str) -> dict[str, dict[str, float]]:
+    """Parse a PSI file into ``{"some": {"avg10": ..., ...}, "full": ...}``.
+
+    ``total`` (microseconds stalled) is kept as a float like the averages.
+    """
+    out: dict[str, dict[str, float]] = {}
+    for line in text.splitlines():
+        kind, _, rest = line.partition(" ")
+        fields = {}
+        for item in rest.split():
+            key, sep, value = item.partition("=")
+            if sep:
+                try:
+                    fields[key] = float(value)
+                except ValueError:
+                    pass
+        if kind in ("some", "full") and fields:
+            out[kind] = fields
+    return out
+
+
+def parse_cpu_stat(text: str) -> dict[str, int]:
+    out = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(" ")
+        try:
+            out[key] = int(value)
+        except ValueError:
+            pass
+    return out
+
+
+def _read_int(path: Path) -> int | None:
+    """An integer cgroup file; None when missing or ``max``."""
+    try:
+        return int(path.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ContainerUsage:
+    """One container's usage at a sample.
+
+    *cpu_percent* is relative to one CPU over the time since the
+    monitor's previous sample of the same container (None on the first).
+    """
+    name: str
+    memory: int | None = None
+    memory_max: int | None = None
+    cpu_usec: int | None = None
+    cpu_percent: float | None = None
+
+
+class ResourceMonitor:
+    """Reads host pressure and container usage; remembers CPU counters.
+
+    Keep one instance around to get ``cpu_percent``: it is the change in
+    a container's ``usage_usec`` between two calls to :meth:`containers`.
+    """
+
+    def __init__(self, proc_root: Path | None = None,
+                 cgroup_root: Path | None = None):
+        self.proc_root = Path(proc_root or PROC_ROOT)
+        self.cgroup_root = Path(cgroup_root or CGROUP_ROOT)
+        self._last_cpu: dict[str, tuple[float, int]] = {}
+
+    def pressure(self, resource: str) -> dict[str, dict[str, float]] | None:
+        """Parsed ``/proc/pressure/<resource>``, or None without PSI."""
+        try:
+            text = (self.proc_root / "pressure" / resource).read_text()
+        except OSError:
+            return None
+        return parse_pressure(text) or None
+
+    def host_pressure(self) -> dict[str, dict[str, dict[str, float]]]:
+        """:meth:`pressure` for every resource the kernel reports."""
+        out = {}
+        for resource in PRESSURE_RESOURCES:
+            psi = self.pressure(resource)
+            if psi is not None:
+                out[resource] = psi
+        return out
+
+    def host_memory(self) -> tuple[int, int] | None:
+        """``(available, total)`` bytes from ``/proc/meminfo``."""
+        try:
+            text = (self.proc_root / "meminfo").read_text()
+        except OSError:
+            return None
+        info = {}
+        for line in text.splitlines():
+            key, _, rest = line.partition(":")
+            parts = rest.split()
+            if parts and parts[0].isdigit():
+                info[key] = int(parts[0]) * 1024
+        if "MemTotal" not in info or "MemAvailable" not in info:
+            return None
+        return info["MemAvailable"], info["MemTotal"]
+
+    def cgroup_dir(self, pid: int) -> Path | None:
+        """The cgroup v2 directory process *pid* belongs to."""
+        try:
+            text = (self.proc_root / str(pid) / "cgroup").read_text()
+        except OSError:
+            return None
+        for line in text.splitlines():
+            # v2 has a single "0::<path>" line; v1 hierarchies are ignored.
+            if line.startswith("0::"):
+                path = self.cgroup_root / line[3:].strip().lstrip("/")
+                return path if path.is_dir() else None
+        return None
+
+    def usage(self, name: str, cgroup: Path | None) -> ContainerUsage:
+        """Read *cgroup*'s counters for container *name*."""
+        usage = ContainerUsage(name)
+        if cgroup is None:
+            return usage
+        usage.memory = _read_int(cgroup / "memory.current")
+        usage.memory_max = _read_int(cgroup / "memory.max")
+        try:
+            stat = parse_cpu_stat((cgroup / "cpu.stat").read_text())
+        except OSError:
+            stat = {}
+        usage.cpu_usec = stat.get("usage_usec")
+        if usage.cpu_usec is not None:
+            now = time.monotonic()
+            last = self._last_cpu.get(name)
+            if last is not None and now > last[0]:
+                used = usage.cpu_usec - last[1]
+                usage.cpu_percent = max(0.0, used / ((now - last[0]) * 1e6) * 100)
+            self._last_cpu[name] = (now, usage.cpu_usec)
+        return usage
+
+    def containers(self, prefix: str | None = None) -> list[ContainerUsage]:
+        """Usage of each running container whose name starts with *prefix*.
+
+        Defaults to every pm container.  Two runtime calls in all: one
+        ``ps`` for the names, one ``inspect`` for their main pids.
+        """
+        pids = container_pids(prefix)
+        for gone in set(self._last_cpu) - set(pids):
+            del self._last_cpu[gone]
+        return [self.usage(name, self.cgroup_dir(pid) if pid else None)
+                for name, pid in pids.items()]
+
+
+def container_pids(prefix: str | None = None) -> dict[str, int]:
+    """Main process id of each running container named *prefix*...
+
+    A pid of 0 means the runtime did not report one.
+    """
+    from pm_core.container import CONTAINER_PREFIX, _run_runtime
+    prefix = prefix or CONTAINER_PREFIX
+    try:
+        result = _run_runtime("ps", "--filter", f"name={prefix}",
+                              "--format", "{{.Names}}", check=False, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        _log.debug("Could not list containers", exc_info=True)
+        return {}
+    if result.returncode != 0:
+        return {}
+    names = [n for n in result.stdout.split() if n.startswith(prefix)]
+    if not names:
+        return {}
+    result = _run_runtime("inspect", "-f", "{{.State.Pid}}", *names,
+                          check=False, timeout=30)
+    lines = result.stdout.split()
+    if result.returncode != 0 or len(lines) != len(names):
+        # A container exited between the two calls; ask one at a time.
+        lines = []
+        for name in names:
+            one = _run_runtime("inspect", "-f", "{{.State.Pid}}", name,
+                               check=False, timeout=10)
+            lines.append(one.stdout.strip() if one.returncode == 0 else "0")
+    return {name: int(pid) if pid.isdigit() else 0
+            for name, pid in zip(names, lines)}
+
+
+# ---------------------------------------------------------------------------
+# Admission
+# ---------------------------------------------------------------------------
+
+def admission_blocked(monitor: ResourceMonitor | None = None,
+                      limits: dict[str, int] | None = None) -> list[str]:
+    """Reasons new QA scenarios should wait, e.g. ``["memory 23.1% > 10%"]``.
+
+    Empty when every enabled threshold holds, including when the host
+    has no PSI to read.
+    """
+    if limits is None:
+        limits = pressure_limits()
+    if not limits:
+        return []
+    monitor = monitor or ResourceMonitor()
+    reasons = []
+    for resource, limit in limits.items():
+        psi = monitor.pressure(resource)
+        avg10 = ((psi or {}).get("some") or {}).get("avg10")
+        if avg10 is not None and avg10 > limit:
+            reasons.append(f"{resource} {avg10:.1f}% > {limit}%")
+    return reasons
+
+
+def format_bytes(n: int | None) -> str:
+    if n is None:
+        return "-"
+    if n < 1024:
+        return f"{n}B"
+    value = n / 1024
+    for unit in ("KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GiB"
@@ -608,6 +608,22 @@ def pane_exists(pane_id: str) -> bool:
     return result.returncode == 0
 
 
+def live_pane_ids() -> set[str] | None:
+    """Return the IDs of every pane on the server, or None if tmux fails.
+
+    One ``list-panes -a`` call answers :func:`pane_exists` for any number
+    of panes.
+    """
+    try:
+        result = _run(_tmux_cmd("list-panes", "-a", "-F", "#{pane_id}"),
+                      text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return set(result.stdout.split())
+
+
 def pane_window_id(pane_id: str) -> str | None:
     """Return the window ID (e.g. ``@1``) that contains *pane_id*, or ``None``."""
     result = _run(
@@ -37,11 +37,13 @@ def _kill_merged_pr_windows(app, merged_pr_ids: set[str]) -> None:
     if not tmux_mod.session_exists(session):
         return
 
+    # Runs on the event loop: containers are queued for background removal
+    # rather than waited for.
     for pr_id in merged_pr_ids:
         pr = store.get_pr(app._data, pr_id)
         if not pr:
             continue
-        summary = pr_cleanup.cleanup_pr_resources(session, pr)
+        summary = pr_cleanup.cleanup_pr_resources(session, pr, wait=False)
         for win_name in summary.get("windows", []):
             _log.info("Killed window '%s' for merged %s", win_name, pr_id)
         if summary.get("containers"):
@@ -0,0 +1,180 @@
+"""Ways to materialise a working checkout of a local repository.
+
+Every QA scenario gets its own checkout of the PR workdir, and a PR workdir
+recreated on a new machine is a checkout of the project repo.  On large
+repos writing out the checkout dominates, so how the copy is made is
+pluggable:
+
+  clone    ``git clone --local``: objects are hardlinked, the working tree
+           is written out with parallel checkout.  Works everywhere.
+  reflink  Copy the source's ``.git`` and its tracked files with
+           ``cp --reflink=always``, then reset to the wanted branch.  File
+           data is shared copy-on-write, so only metadata is written.
+           Needs a filesystem that can clone extents (btrfs, XFS) with the
+           source and destination on it.
+
+Both produce the same result: a standalone repo with ``origin`` pointing at
+the source, ``refs/remotes/origin/*`` matching the source's branches, and a
+clean checkout of the requested branch.  :func:`select_provider` picks
+reflink when the filesystem supports it and clone otherwise; the
+``workdir-provider`` setting (auto/clone/reflink) overrides the choice.
+
+``git worktree`` is deliberately not offered: worktrees share refs, so two
+scenarios could not both check out the PR branch, and their ``.git`` file
+points at a host path that does not exist inside a scenario container.
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+import uuid
+from pathlib import Path
+
+from pm_core import git_ops
+from pm_core.paths import configure_logger, get_global_setting_value
+
+_log = configure_logger("pm.workdir_provider")
+
+# Tracked files per ``cp`` invocation when reflinking a checkout.
+_CP_BATCH = 500
+
+
+class WorkdirProvider:
+    """Creates a checkout of *source* at *dest* on *branch*."""
+
+    name = ""
+
+    def create(self, source: Path, dest: Path, branch: str = "") -> None:
+        raise NotImplementedError
+
+
+class CloneProvider(WorkdirProvider):
+    name = "clone"
+
+    def create(self, source: Path, dest: Path, branch: str = "") -> None:
+        args = ["-c", "checkout.workers=0",
+                "clone", "--local", str(source), str(dest)]
+        if branch:
+            args.extend(["--branch", branch])
+        git_ops.run_git(*args)
+
+
+class ReflinkProvider(WorkdirProvider):
+    name = "reflink"
+
+    # ``cp --reflink`` mode; tests use "auto" to run on any filesystem.
+    reflink = "always"
+
+    def _copy(self, paths: list[str], source: Path, dest: Path) -> None:
+        for i in range(0, len(paths), _CP_BATCH):
+            subprocess.run(
+                ["cp", "-a", f"--reflink={self.reflink}", "--parents",
+                 "-t", str(dest), "--", *paths[i:i + _CP_BATCH]],
+                cwd=source, check=True, capture_output=True,
+            )
+
+    def create(self, source: Path, dest: Path, branch: str = "") -> None:
+        dest.mkdir(parents=True, exist_ok=True)
+        self._copy([".git"], source, dest)
+        git_dir = dest / ".git"
+        # The source's linked worktrees are not ours; keeping their
+        # records would make git refuse to check out their branches.
+        shutil.rmtree(git_dir / "worktrees", ignore_errors=True)
+        (git_dir / "index.lock").unlink(missing_ok=True)
+
+        # Copy only tracked files: untracked and ignored content (build
+        # output, virtualenvs) is not part of a clone either.
+        listed = git_ops.run_git("-C", str(source), "ls-files", "-z")
+        tracked = sorted({p for p in listed.stdout.split("\0")
+                          if p and os.path.lexists(source / p)})
+        self._copy(tracked, source, dest)
+
+        # Same remotes as a fresh clone: only origin, at the source.
+        remotes = git_ops.run_git("-C", str(dest), "remote").stdout.split()
+        for remote in remotes:
+            git_ops.run_git("-C", str(dest), "remote", "remove", remote)
+        git_ops.run_git("-C", str(dest), "remote", "add", "origin", str(source))
+        git_ops.run_git("-C", str(dest), "fetch", "--quiet", "origin")
+        if branch:
+            git_ops.run_git("-C", str(dest), "checkout", "--quiet", "--force",
+                            branch)
+            git_ops.run_git("-C", str(dest), "branch", "--quiet",
+                            f"--set-upstream-to=origin/{branch}")
+        git_ops.run_git("-C", str(dest), "reset", "--quiet", "--hard")
+
+    def supported(self, source: Path, dest_parent: Path) -> bool:
+        """Whether *source* can be reflinked into *dest_parent*."""
+        if not (source / ".git").is_dir():
+            return False
+        key = (source.stat().st_dev, dest_parent.stat().st_dev)
+        if key not in _reflink_support:
+            probe = dest_parent / f".reflink-probe-{uuid.uuid4().hex[:8]}"
+            result = subprocess.run(
+                ["cp", f"--reflink={self.reflink}",
+                 str(source / ".git" / "HEAD"), str(probe)],
+                capture_output=True,
+            )
+            probe.unlink(missing_ok=True)
+            _reflink_support[key] = result.returncode == 0
+        return _reflink_support[key]
+
+
+# (source st_dev, destination st_dev) -> whether cp --reflink works.
+_reflink_support: dict[tuple[int, int], bool] = {}
+
+PROVIDERS: dict[str, WorkdirProvider] = {
+    p.name: p for p in (CloneProvider(), ReflinkProvider())
+}
+
+
+def select_provider(source: Path, dest_parent: Path) -> WorkdirProvider:
+    """Pick the provider for checkouts of *source* under *dest_parent*.
+
+    Honours the ``workdir-provider`` setting; ``auto`` (the default) uses
+    reflink where the filesystem supports it.  A forced reflink that the
+    filesystem cannot do falls back to clone.
+    """
+    choice = get_global_setting_value("workdir-provider", "auto") or "auto"
+    if choice == "clone":
+        return PROVIDERS["clone"]
+    dest_parent.mkdir(parents=True, exist_ok=True)
+    reflink = PROVIDERS["reflink"]
+    if reflink.supported(source, dest_parent):
+        return reflink
+    if choice == "reflink":
+        _log.warning("workdir-provider=reflink but %s cannot be reflinked "
+                     "into %s; cloning instead", source, dest_parent)
+    return PROVIDERS["clone"]
+
+
+def discard_tree(path: Path) -> None:
+    """Remove *path* without making the caller wait for it.
+
+    The tree is renamed aside (instant) and deleted on a daemon thread,
+    along with leftovers of earlier discards in the same directory that an
+    exiting process did not get to finish.
+    """
+    trash = path.parent / f".discard-{path.name}-{uuid.uuid4().hex[:8]}"
+    try:
+        path.rename(trash)
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    with _discard_lock:
+        doomed = [t for t in path.parent.glob(".discard-*")
+                  if t not in _discarding]
+        _discarding.update(doomed)
+
+    def remove() -> None:
+        for tree in doomed:
+            shutil.rmtree(tree, ignore_errors=True)
+            with _discard_lock:
+                _discarding.discard(tree)
+
+    threading.Thread(target=remove, daemon=True, name="discard-tree").start()
+
+
+# Trees a discard thread in this process is currently deleting.
+_discarding: set[Path] = set()
+_discard_lock = threading.Lock()
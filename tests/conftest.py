@@ -1,8 +1,15 @@
 """Shared test helpers for pm_core tests."""
 
+from pathlib import Path
+from unittest import mock
+
 import pytest
 
+from pm_core.bench.exercises import Exercise
+from pm_core.bench.runner import CostMetrics, GenerationResult, RequestStats, Runner
+from pm_core.bench.solve import Candidate
 from pm_core.fake_github import FakeGitHubBackend
+from pm_core.fake_runtime import FakeRuntime
 
 
 @pytest.fixture
@@ -36,6 +43,19 @@ def fake_github_repo(tmp_path):
         yield backend
 
 
+@pytest.fixture
+def fake_runtime(tmp_path, monkeypatch):
+    """Install a FakeRuntime as the container runtime, with HOME in *tmp_path*.
+
+    Container code bind-mounts and creates paths under ``~``, so HOME is
+    redirected to keep it out of the real home directory.
+    """
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / "home").mkdir()
+    with FakeRuntime(tmp_path / "runtime.json").installed() as runtime:
+        yield runtime
+
+
 def simulate_terminal_wrap(text: str, width: int = 80) -> str:
     """Simulate how a terminal wraps long lines at a given column width.
 
@@ -50,3 +70,48 @@ def simulate_terminal_wrap(text: str, width: int = 80) -> str:
             line = line[width:]
         out.append(line)
     return "\n".join(out)
+
+
+@pytest.fixture
+def make_exercise():
+    """Factory for minimal bench exercises.
+
+    ``make_exercise("slug", description=...)`` builds a Python exercise with
+    no starter code or reference tests; keywords override any field.
+    """
+    def make(slug: str = "ex", **fields) -> Exercise:
+        fields = {"language": "python", "description": "d", "starter_code": {},
+                  "reference_tests": {}, "path": Path("/tmp/fake"), **fields}
+        return Exercise(slug=slug, **fields)
+    return make
+
+
+@pytest.fixture
+def make_candidates():
+    """Factory for ``generate_candidates`` stand-ins.
+
+    ``make_candidates(tokens)`` returns a callable accepting the real
+    signature that yields ``num_candidates`` distinct solutions ("sol_0",
+    "sol_1", ...), each reporting *tokens* total tokens.
+    """
+    def make(tokens: int = 0):
+        def candidates(*args, num_candidates: int = 1, **kwargs) -> list[Candidate]:
+            return [Candidate(code=f"sol_{i}", temperature=0.0,
+                              prompt_variant="direct", model="m",
+                              generation_result=GenerationResult(
+                                  stats=RequestStats(total_tokens=tokens)))
+                    for i in range(num_candidates)]
+        return candidates
+    return make
+
+
+@pytest.fixture
+def make_runner():
+    """Factory for bench Runner mocks serving model "m" with fresh metrics."""
+    def make() -> Runner:
+        runner = mock.MagicMock(spec=Runner)
+        runner.list_models.return_value = [{"id": "m"}]
+        runner.metrics = CostMetrics()
+        runner.pool = None
+        return runner
+    return make
@@ -0,0 +1,191 @@
+"""Tests for the persistent baseline store shared across tournament runs."""
+
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+
+from pm_core.bench.baseline_store import BaselineStore, StoredBaseline
+from pm_core.bench.executor import ScoreResult
+from pm_core.bench.orchestrator import (
+    BenchmarkRun,
+    ExerciseResult,
+    format_results_table,
+    run_benchmark,
+    run_exercise_tournament,
+)
+from pm_core.bench.solve import HyperParams
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BaselineStore(tmp_path / "baselines")
+
+
+# ---------------------------------------------------------------------------
+# BaselineStore
+# ---------------------------------------------------------------------------
+
+class TestBaselineStore:
+    def test_roundtrip(self, store, make_exercise):
+        ex = make_exercise()
+        assert store.get("m", ex) is None
+        store.put("m", ex, StoredBaseline(code="print(1)", tokens=120))
+        got = store.get("m", ex)
+        assert (got.code, got.tokens, got.temperature) == ("print(1)", 120, 0.0)
+
+    def test_keyed_by_model_and_exercise(self, store, make_exercise):
+        store.put("m", make_exercise("a"), StoredBaseline(code="a", tokens=1))
+        assert store.get("other", make_exercise("a")) is None
+        assert store.get("m", make_exercise("b")) is None
+
+    def test_prompt_change_invalidates(self, store, make_exercise):
+        store.put("m", make_exercise(), StoredBaseline(code="a", tokens=1))
+        assert store.get("m", make_exercise(description="Subtract.")) is None
+        with mock.patch.dict("pm_core.bench.solve.PROMPT_VARIANTS",
+                             {"direct": "Write it differently."}):
+            assert store.get("m", make_exercise()) is None
+
+    def test_invalidate_one_exercise(self, store, make_exercise):
+        store.put("m", make_exercise("a"), StoredBaseline(code="a", tokens=1))
+        store.put("m", make_exercise("b"), StoredBaseline(code="b", tokens=1))
+        assert store.invalidate("m", make_exercise("a")) == 1
+        assert store.invalidate("m", make_exercise("a")) == 0
+        assert store.get("m", make_exercise("b")) is not None
+
+    def test_invalidate_model_and_all(self, store, make_exercise):
+        for model in ("org/m1", "m2"):
+            store.put(model, make_exercise(), StoredBaseline(code="x", tokens=1))
+        assert store.counts() == {"org_m1": 1, "m2": 1}
+        assert store.invalidate("org/m1") == 1
+        assert store.counts() == {"m2": 1}
+        assert store.invalidate() == 1
+        assert store.counts() == {}
+
+    def test_invalidate_exercise_needs_model(self, store, make_exercise):
+        with pytest.raises(ValueError, match="requires a model"):
+            store.invalidate(exercise=make_exercise())
+
+    def test_corrupt_entry_is_a_miss(self, store, make_exercise):
+        ex = make_exercise()
+        store.put("m", ex, StoredBaseline(code="x", tokens=1))
+        next((store.root / "m").glob("*.json")).write_text("{")
+        assert store.get("m", ex) is None
+
+
+# ---------------------------------------------------------------------------
+# Tournament reuse
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def tournament(make_exercise, make_runner, make_candidates):
+    """Run a mocked two-candidate tournament against *store*."""
+    def run(store, hyper=None):
+        gen_cands = mock.Mock(side_effect=make_candidates(40))
+        with mock.patch("pm_core.bench.orchestrator.generate_tests",
+                        return_value=("def test(): pass", [])), \
+             mock.patch("pm_core.bench.orchestrator.generate_candidates", gen_cands), \
+             mock.patch("pm_core.bench.orchestrator.execute_tests",
+                        return_value=ScoreResult(passed=1, total=1, score=1.0)):
+            result = run_exercise_tournament(make_exercise(), make_runner(), "m", 2,
+                                             hyper=hyper, baseline_store=store)
+        return result, gen_cands
+    return run
+
+
+class TestTournamentReuse:
+    def test_sweep_reuses_baseline(self, store, tournament):
+        first, gen1 = tournament(store)
+        second, gen2 = tournament(store, hyper=HyperParams(chain=True))
+
+        assert not first.baseline_reused
+        assert second.baseline_reused
+        assert [c.kwargs["num_candidates"] for c in gen1.call_args_list] == [2, 1]
+        assert [c.kwargs["num_candidates"] for c in gen2.call_args_list] == [2]
+        # The reused baseline still reports what it cost to generate, but
+        # only the first run spent those tokens.
+        assert second.baseline_tokens == first.baseline_tokens == 40
+        assert first.tokens_used == first.tournament_tokens + 40
+        assert second.tokens_used == second.tournament_tokens
+        assert second.baseline_score == first.baseline_score
+
+    def test_without_store_always_generates(self, tournament):
+        _, gen = tournament(None)
+        assert [c.kwargs["num_candidates"] for c in gen.call_args_list] == [2, 1]
+
+    def test_refresh_regenerates(self, store, make_exercise, make_runner,
+                                  make_candidates, tournament):
+        tournament(store)
+        store.put("m", make_exercise(), StoredBaseline(code="stale", tokens=1))
+        gen_cands = mock.Mock(side_effect=make_candidates(40))
+        with mock.patch("pm_core.bench.orchestrator.Runner.create",
+                        return_value=make_runner()), \
+             mock.patch("pm_core.bench.orchestrator.load_exercises",
+                        return_value=[make_exercise()]), \
+             mock.patch("pm_core.bench.orchestrator.generate_tests",
+                        return_value=("def test(): pass", [])), \
+             mock.patch("pm_core.bench.orchestrator.generate_candidates", gen_cands), \
+             mock.patch("pm_core.bench.orchestrator.execute_tests",
+                        return_value=ScoreResult(passed=1, total=1, score=1.0)):
+            run = run_benchmark("m", num_candidates=2, use_score_cache=False,
+                                baseline_store=store, refresh_baselines=True)
+        assert run.baselines_reused == 0
+        assert store.get("m", make_exercise()).code == "sol_0"
+
+    def test_resumed_run_counts_reused_baseline_once(self, tmp_path, store, make_exercise,
+                                                     make_runner, make_candidates):
+        store.put("m", make_exercise(), StoredBaseline(code="x", tokens=40))
+        path = tmp_path / "run.jsonl"
+        for resume in (False, True):
+            with mock.patch("pm_core.bench.orchestrator.Runner.create",
+                            return_value=make_runner()), \
+                 mock.patch("pm_core.bench.orchestrator.load_exercises",
+                            return_value=[make_exercise()]), \
+                 mock.patch("pm_core.bench.orchestrator.generate_tests",
+                            return_value=("def test(): pass", [])), \
+                 mock.patch("pm_core.bench.orchestrator.generate_candidates",
+                            side_effect=make_candidates(40)), \
+                 mock.patch("pm_core.bench.orchestrator.execute_tests",
+                            return_value=ScoreResult(passed=1, total=1, score=1.0)):
+                run = run_benchmark("m", num_candidates=2, use_score_cache=False,
+                                    baseline_store=store, checkpoint_path=path,
+                                    resume=resume)
+        assert run.resumed_exercises == 1
+        # Two 40-token candidates; the stored baseline cost nothing this time.
+        assert run.total_tokens == 80
+
+
+class TestReporting:
+    def test_table_reports_tokens_saved(self):
+        run = BenchmarkRun(model="m", num_candidates=4, languages=["python"])
+        run.results = [
+            ExerciseResult(language="python", slug="a", baseline_tokens=300,
+                           baseline_reused=True),
+            ExerciseResult(language="python", slug="b", baseline_tokens=200),
+        ]
+        assert "Baselines reused: 1 exercises, 300 tokens saved" \
+            in format_results_table(run)
+        d = run.to_dict()
+        assert (d["baselines_reused"], d["baseline_tokens_saved"]) == (1, 300)
+        assert d["results"][0]["baseline_reused"] is True
+
+    def test_table_silent_without_reuse(self):
+        run = BenchmarkRun(model="m", num_candidates=4, languages=["python"])
+        run.results = [ExerciseResult(language="python", slug="a")]
+        assert "Baselines reused" not in format_results_table(run)
+
+
+class TestCli:
+    def test_list_and_clear(self, tmp_path, make_exercise):
+        from pm_core.cli.bench import bench
+
+        store = BaselineStore(tmp_path)
+        store.put("m", make_exercise(), StoredBaseline(code="x", tokens=1))
+        with mock.patch("pm_core.bench.baseline_store.BaselineStore",
+                        return_value=store):
+            listed = CliRunner().invoke(bench, ["baselines"])
+            cleared = CliRunner().invoke(bench, ["baselines", "--clear"])
+            empty = CliRunner().invoke(bench, ["baselines"])
+        assert "m: 1" in listed.output
+        assert "Removed 1 stored baseline(s)" in cleared.output
+        assert "No stored baselines" in empty.output
@@ -0,0 +1,246 @@
+"""Tests for JSONL checkpoints and resumable benchmark runs."""
+
+import json
+from unittest import mock
+
+import pytest
+
+from pm_core.bench.checkpoint import (
+    Checkpoint,
+    CheckpointExists,
+    CheckpointMismatch,
+    default_checkpoint_path,
+)
+from pm_core.bench.executor import ScoreResult
+from pm_core.bench.orchestrator import (
+    ExerciseResult,
+    format_results_table,
+    run_benchmark,
+    run_params,
+)
+from pm_core.bench.runner import GenerationResult, RequestStats
+from pm_core.bench.score_cache import exercise_id
+
+PARAMS = {"model": "m", "num_candidates": 2}
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint file
+# ---------------------------------------------------------------------------
+
+class TestCheckpoint:
+    def test_fresh_file_has_header(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        Checkpoint(path, PARAMS)
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert lines == [{"type": "run", "params": PARAMS}]
+
+    def test_resume_loads_results_and_stages(self, tmp_path, make_exercise):
+        path = tmp_path / "run.jsonl"
+        cp = Checkpoint(path, PARAMS)
+        ex = make_exercise("a")
+        cp.save_stage(ex, "tests", {"test_code": "t", "tokens": 30})
+        cp.save_result(ex, {"slug": "a", "error": None})
+
+        resumed = Checkpoint(path, PARAMS, resume=True)
+        assert resumed.completed() == {"polyglot/python/a": {"slug": "a", "error": None}}
+        assert resumed.get_stage(ex, "tests") == {"test_code": "t", "tokens": 30}
+        assert resumed.get_stage(ex, "candidates") is None
+        assert resumed.tokens_reused == 30
+
+    def test_errored_exercises_not_completed(self, tmp_path, make_exercise):
+        path = tmp_path / "run.jsonl"
+        cp = Checkpoint(path, PARAMS)
+        cp.save_result(make_exercise("a"), {"error": "Backend connection error"})
+        assert Checkpoint(path, PARAMS, resume=True).completed() == {}
+
+    def test_later_result_replaces_earlier(self, tmp_path, make_exercise):
+        path = tmp_path / "run.jsonl"
+        cp = Checkpoint(path, PARAMS)
+        cp.save_result(make_exercise("a"), {"error": "boom"})
+        cp.save_result(make_exercise("a"), {"error": None, "tournament_score": 1.0})
+        assert Checkpoint(path, PARAMS, resume=True).completed()[
+            "polyglot/python/a"]["tournament_score"] == 1.0
+
+    def test_torn_last_line_dropped(self, tmp_path, make_exercise):
+        path = tmp_path / "run.jsonl"
+        cp = Checkpoint(path, PARAMS)
+        cp.save_result(make_exercise("a"), {"error": None})
+        with open(path, "a") as f:
+            f.write('{"type": "result", "exercise": "polyglot/python/b", "res')
+        resumed = Checkpoint(path, PARAMS, resume=True)
+        assert list(resumed.completed()) == ["polyglot/python/a"]
+        resumed.save_result(make_exercise("b"), {"error": None})
+        assert len(Checkpoint(path, PARAMS, resume=True).completed()) == 2
+
+    def test_param_mismatch_rejected(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        Checkpoint(path, PARAMS)
+        with pytest.raises(CheckpointMismatch, match="different parameters"):
+            Checkpoint(path, {**PARAMS, "num_candidates": 8}, resume=True)
+
+    def test_progress_not_overwritten_without_resume_or_fresh(self, tmp_path,
+                                                              make_exercise):
+        path = tmp_path / "run.jsonl"
+        Checkpoint(path, PARAMS).save_result(make_exercise("a"), {"error": None})
+        before = path.read_text()
+        with pytest.raises(CheckpointExists, match="--resume.*--fresh"):
+            Checkpoint(path, PARAMS)
+        assert path.read_text() == before
+
+    def test_finished_run_started_over(self, tmp_path, make_exercise):
+        path = tmp_path / "run.jsonl"
+        done = Checkpoint(path, PARAMS)
+        done.save_result(make_exercise("a"), {"error": None})
+        done.finish()
+        assert Checkpoint(path, PARAMS).completed() == {}
+        assert len(path.read_text().splitlines()) == 1
+
+    def test_resumed_finished_run_is_unfinished_again(self, tmp_path, make_exercise):
+        path = tmp_path / "run.jsonl"
+        done = Checkpoint(path, PARAMS)
+        done.save_result(make_exercise("a"), {"error": None})
+        done.finish()
+        resumed = Checkpoint(path, PARAMS, resume=True)
+        assert set(resumed.completed()) == {exercise_id(make_exercise("a"))}
+        with pytest.raises(CheckpointExists):
+            Checkpoint(path, PARAMS)
+
+    def test_fresh_starts_over(self, tmp_path, make_exercise):
+        path = tmp_path / "run.jsonl"
+        Checkpoint(path, PARAMS).save_result(make_exercise("a"), {"error": None})
+        Checkpoint(path, PARAMS, fresh=True)
+        assert Checkpoint(path, PARAMS, resume=True).completed() == {}
+
+    def test_header_only_file_reused_silently(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        Checkpoint(path, PARAMS)
+        Checkpoint(path, {**PARAMS, "num_candidates": 8})
+
+    def test_default_path_depends_on_params(self, tmp_path):
+        with mock.patch("pm_core.paths.Path.home", return_value=tmp_path):
+            a = default_checkpoint_path(run_params("org/model", 8))
+            b = default_checkpoint_path(run_params("org/model", 4))
+        assert a != b
+        assert a.parent == tmp_path / ".cache" / "pm-bench" / "checkpoints"
+        assert a.name.startswith("org_model-")
+
+
+# ---------------------------------------------------------------------------
+# run_benchmark --resume
+# ---------------------------------------------------------------------------
+
+def _gen(tokens: int = 10) -> GenerationResult:
+    return GenerationResult(stats=RequestStats(total_tokens=tokens))
+
+
+@pytest.fixture
+def run_bench(make_runner, make_candidates):
+    """Run a mocked two-candidate benchmark checkpointed to *path*."""
+    def run(path, exercises, *, resume=False, fresh=False, gen_tests=None,
+            gen_cands=None):
+        gen_tests = gen_tests or mock.Mock(return_value=("def test(): pass", [_gen(30)]))
+        gen_cands = gen_cands or mock.Mock(side_effect=make_candidates(10))
+        with mock.patch("pm_core.bench.orchestrator.Runner.create",
+                        return_value=make_runner()), \
+             mock.patch("pm_core.bench.orchestrator.load_exercises",
+                        return_value=exercises), \
+             mock.patch("pm_core.bench.orchestrator.generate_tests", gen_tests), \
+             mock.patch("pm_core.bench.orchestrator.generate_candidates", gen_cands), \
+             mock.patch("pm_core.bench.orchestrator.execute_tests",
+                        return_value=ScoreResult(passed=1, total=1, score=1.0)):
+            bench_run = run_benchmark("m", num_candidates=2, use_score_cache=False,
+                                      checkpoint_path=path, resume=resume, fresh=fresh)
+        return bench_run, gen_tests, gen_cands
+    return run
+
+
+class TestResume:
+    def test_results_checkpointed_as_they_finish(self, tmp_path, make_exercise, run_bench):
+        path = tmp_path / "run.jsonl"
+        run_bench(path, [make_exercise("a"), make_exercise("b")])
+        kinds = [json.loads(line)["type"] for line in path.read_text().splitlines()]
+        assert kinds.count("result") == 2
+        assert kinds.count("stage") == 6  # tests, candidates, baseline x 2
+
+    def test_resume_skips_finished_and_reuses_stages(self, tmp_path, make_exercise,
+                                                     make_candidates, run_bench):
+        path = tmp_path / "run.jsonl"
+        exercises = [make_exercise("a"), make_exercise("b")]
+
+        def crash_on_b(exercise, *args, num_candidates=1, **kwargs):
+            if exercise.slug == "b" and num_candidates == 2:
+                raise ConnectionError("server restarted")
+            return make_candidates(10)(num_candidates=num_candidates)
+
+        first, _, _ = run_bench(path, exercises, gen_cands=mock.Mock(side_effect=crash_on_b))
+        assert [r.error is None for r in first.results] == [True, False]
+
+        second, gen_tests, gen_cands = run_bench(path, exercises, resume=True)
+        assert second.num_errors == 0
+        assert second.resumed_exercises == 1
+        # "a" came from the checkpoint; "b" reused its generated tests.
+        gen_tests.assert_not_called()
+        assert [c.args[0].slug for c in gen_cands.call_args_list] == ["b", "b"]
+        assert second.results[0].to_dict() == first.results[0].to_dict()
+        # a: 30 + 2*10 + 10, b: reused 30 tests tokens (fresh gens are mocked
+        # and not recorded in the runner's metrics).
+        assert second.total_tokens == 60 + 30
+        assert "Resumed from checkpoint: 1 exercises" in format_results_table(second)
+
+    def test_mismatched_run_refuses_to_resume(self, tmp_path, make_exercise, make_runner,
+                                               run_bench):
+        path = tmp_path / "run.jsonl"
+        run_bench(path, [make_exercise("a")])
+        with mock.patch("pm_core.bench.orchestrator.Runner.create", return_value=make_runner()), \
+             mock.patch("pm_core.bench.orchestrator.load_exercises",
+                        return_value=[make_exercise("a")]):
+            with pytest.raises(CheckpointMismatch):
+                run_benchmark("m", num_candidates=5, checkpoint_path=path, resume=True)
+
+    def test_rerun_of_interrupted_run_needs_resume_or_fresh(self, tmp_path,
+                                                             make_exercise, run_bench):
+        path = tmp_path / "run.jsonl"
+        interrupted = mock.Mock(side_effect=[("def test(): pass", [_gen(30)]),
+                                             KeyboardInterrupt()])
+        with pytest.raises(KeyboardInterrupt):
+            run_bench(path, [make_exercise("a"), make_exercise("b")],
+                      gen_tests=interrupted)
+        with pytest.raises(CheckpointExists):
+            run_bench(path, [make_exercise("a")])
+        run, gen_tests, _ = run_bench(path, [make_exercise("a")], fresh=True)
+        assert run.resumed_exercises == 0
+        gen_tests.assert_called_once()
+
+    def test_rerun_of_finished_run_starts_over(self, tmp_path, make_exercise, run_bench):
+        path = tmp_path / "run.jsonl"
+        run_bench(path, [make_exercise("a")])
+        assert json.loads(path.read_text().splitlines()[-1]) == {"type": "done"}
+        run, gen_tests, _ = run_bench(path, [make_exercise("a")])
+        assert run.resumed_exercises == 0
+        gen_tests.assert_called_once()
+
+    def test_cli_refuses_to_overwrite(self, tmp_path, make_exercise):
+        from click.testing import CliRunner
+
+        from pm_core.cli.bench import bench
+
+        path = tmp_path / "run.jsonl"
+        Checkpoint(path, PARAMS).save_result(make_exercise("a"), {"error": None})
+        with mock.patch("pm_core.bench.orchestrator.run_benchmark",
+                        side_effect=CheckpointExists("holds 1 entries")):
+            result = CliRunner().invoke(bench, ["run", "m", "--checkpoint", str(path)])
+        assert result.exit_code != 0
+        assert "holds 1 entries" in result.output
+        both = CliRunner().invoke(bench, ["run", "m", "--checkpoint", str(path),
+                                          "--resume", "--fresh"])
+        assert "mutually exclusive" in both.output
+
+    def test_resume_requires_path(self):
+        with pytest.raises(ValueError, match="checkpoint_path"):
+            run_benchmark("m", resume=True)
+
+    def test_exercise_result_roundtrip(self):
+        r = ExerciseResult(language="go", slug="x", tournament_score=0.5,
+                           score_cache_hits=2, error=None)
+        assert ExerciseResult.from_dict({**r.to_dict(), "unknown": 1}) == r
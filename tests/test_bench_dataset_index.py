@@ -0,0 +1,150 @@
+"""Tests for the SQLite index over cached exercise datasets."""
+
+import base64
+import json
+import pickle
+import time
+import zlib
+from unittest import mock
+
+import pytest
+
+from pm_core.bench import exercises_livecodebench as lcb
+from pm_core.bench.dataset_index import (
+    DatasetIndex,
+    IndexEntry,
+    _array_spans,
+    _jsonl_spans,
+)
+
+
+def _keyer(record):
+    if not record.get("slug"):
+        return None
+    return IndexEntry(slug=record["slug"], difficulty=record.get("difficulty"),
+                      key=record.get("id"))
+
+
+def _write_jsonl(path, records):
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Record spans
+# ---------------------------------------------------------------------------
+
+class TestSpans:
+    def test_jsonl_skips_blank_lines(self):
+        data = b'{"a": 1}\n\n{"b": 2}\n'
+        assert [data[o:o + n].strip() for o, n in _jsonl_spans(data)] == \
+            [b'{"a": 1}', b'{"b": 2}']
+
+    def test_array_offsets_are_bytes(self):
+        records = [{"t": "café ]"}, {"t": "☃", "n": [1, {"x": "]"}]}]
+        data = json.dumps(records, indent=2, ensure_ascii=False).encode()
+        assert [json.loads(data[o:o + n]) for o, n in _array_spans(data)] == records
+
+    def test_empty_array(self):
+        assert list(_array_spans(b"[\n]")) == []
+
+
+# ---------------------------------------------------------------------------
+# DatasetIndex
+# ---------------------------------------------------------------------------
+
+class TestDatasetIndex:
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        _write_jsonl(tmp_path / "a.jsonl", [
+            {"id": "1", "slug": "two-sum", "difficulty": "easy"},
+            {"id": "2", "slug": "three-sum", "difficulty": "hard"},
+            {"slug": ""},
+        ])
+        (tmp_path / "b.json").write_text(json.dumps([
+            {"id": "1", "slug": "duplicate"},
+            {"id": "3", "slug": "Two-Pointers", "difficulty": "easy"},
+        ]))
+        return DatasetIndex(tmp_path / "index.sqlite",
+                            [tmp_path / "a.jsonl", tmp_path / "b.json",
+                             tmp_path / "missing.jsonl"], _keyer)
+
+    def test_build_skips_unkeyed_and_duplicates(self, dataset):
+        assert dataset.build() == 3
+        assert [r["slug"] for r in dataset.query()] == \
+            ["two-sum", "three-sum", "Two-Pointers"]
+
+    def test_filters(self, dataset):
+        assert [r["id"] for r in dataset.query(slugs=["TWO"])] == ["1", "3"]
+        assert [r["id"] for r in dataset.query(slugs=["three", "pointers"])] == ["2", "3"]
+        assert [r["id"] for r in dataset.query(difficulty="Easy")] == ["1", "3"]
+        assert [r["id"] for r in dataset.query(files=["b.json"])] == ["3"]
+        assert dataset.query(languages=["go"]) == []
+
+    def test_rebuilt_when_a_file_changes(self, dataset, tmp_path):
+        dataset.query()
+        built = dataset.path.stat().st_mtime_ns
+        dataset.query()
+        assert dataset.path.stat().st_mtime_ns == built
+
+        _write_jsonl(tmp_path / "missing.jsonl", [{"id": "4", "slug": "late"}])
+        assert [r["id"] for r in dataset.query(slugs=["late"])] == ["4"]
+
+    def test_rebuilt_when_version_changes(self, dataset):
+        dataset.query()
+        dataset.keyer = lambda r: IndexEntry(slug="same")
+        assert len(dataset.query(slugs=["same"])) == 0
+        dataset.version = "2"
+        assert len(dataset.query(slugs=["same"])) == 5
+
+    def test_corrupt_index_rebuilt(self, dataset):
+        dataset.path.write_text("not a database")
+        assert len(dataset.query()) == 3
+
+
+# ---------------------------------------------------------------------------
+# Slicing a large dataset
+# ---------------------------------------------------------------------------
+
+def _compressed(cases):
+    return base64.b64encode(zlib.compress(pickle.dumps(json.dumps(cases)))).decode()
+
+
+class TestLargeDatasetSlice:
+    @pytest.fixture
+    def lcb_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(lcb, "_cache_dir", lambda: tmp_path)
+        cases = [{"input": "x" * 200 + f"{i}\n", "output": f"{i}\n"} for i in range(100)]
+        payload = _compressed(cases)
+        _write_jsonl(tmp_path / "test.jsonl", [
+            {"question_id": f"q{i}", "question_title": f"Problem {i}",
+             "question_content": "Echo the input.", "difficulty": "easy",
+             "platform": "leetcode",
+             "public_test_cases": json.dumps(cases[:1]),
+             "private_test_cases": payload}
+            for i in range(1200)
+        ])
+        return tmp_path
+
+    def test_slice_decodes_only_selected_problems(self, lcb_cache):
+        slugs = [f"problem-{i}" for i in (7, 70, 700)]
+        with mock.patch.object(lcb, "_parse_test_cases",
+                               wraps=lcb._parse_test_cases) as parse:
+            exercises = lcb.load_exercises(slugs=slugs)
+        # "problem-7" also matches 70-79 and 700-799.
+        assert len(exercises) == 1 + 10 + 100
+        assert parse.call_count == 2 * len(exercises)
+
+    def test_slice_startup_is_near_instant(self, lcb_cache):
+        lcb.load_exercises(slugs=["problem-1"])
+        assert (lcb_cache / "index.sqlite").is_file()
+
+        start = time.perf_counter()
+        everything = lcb.load_exercises()
+        full = time.perf_counter() - start
+        assert len(everything) == 1200
+
+        start = time.perf_counter()
+        picked = lcb.load_exercises(slugs=["problem-1000", "problem-1199"])
+        sliced = time.perf_counter() - start
+        assert [e.slug for e in picked] == ["problem-1000", "problem-1199"]
+        assert sliced < full / 5
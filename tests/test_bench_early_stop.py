@@ -0,0 +1,208 @@
+"""Tests for speculative early termination of tournament scoring."""
+
+import threading
+import time
+from unittest import mock
+
+from pm_core.bench.executor import ScoreResult
+from pm_core.bench.orchestrator import (
+    BenchmarkRun,
+    ExerciseResult,
+    _early_stop_savings,
+    _score_until,
+    format_results_table,
+    run_exercise_tournament,
+)
+from pm_core.bench.runner import GenerationResult, RequestStats, Runner, chat_completion
+from pm_core.bench.scheduler import BenchScheduler
+from pm_core.bench.solve import Candidate, HyperParams, iter_candidates
+from pm_core.bench.stub_server import StubInferenceServer
+
+MESSAGES = [{"role": "user", "content": "solve it"}]
+
+GOOD = "```\ngood\n```\n"
+# Never closes its fence, so it streams every token.
+SLOW = "```\n" + "slow " * 150
+
+
+def _reply(payload: dict) -> str:
+    """Temperature-0 requests answer quickly and correctly; others drag on."""
+    return GOOD if payload.get("temperature") == 0.0 else SLOW
+
+
+def _wait_for(pred, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred():
+            return True
+        time.sleep(0.01)
+    return pred()
+
+
+def _score(exercise, code, test_code=None, **kwargs) -> ScoreResult:
+    ok = code == "good"
+    return ScoreResult(passed=int(ok), total=1, score=1.0 if ok else 0.0)
+
+
+def _cand(code: str, *, tokens: int = 100, seconds: float = 1.0,
+          cancelled: bool = False) -> Candidate:
+    return Candidate(code=code, temperature=0.0, prompt_variant="direct", model="m",
+                     generation_result=GenerationResult(stats=RequestStats(
+                         total_tokens=tokens, completion_tokens=tokens,
+                         wall_clock_seconds=seconds, cancelled=cancelled)))
+
+
+# ---------------------------------------------------------------------------
+# Runner cancellation
+# ---------------------------------------------------------------------------
+
+class TestCancel:
+    def test_cancelled_before_send_makes_no_request(self):
+        cancel = threading.Event()
+        cancel.set()
+        with StubInferenceServer() as server:
+            r = chat_completion(server.url, model="stub", messages=MESSAGES,
+                                stream=True, cancel=cancel)
+        assert r.stats.cancelled and r.finish_reason == "cancelled"
+        assert server.requests == 0
+
+    def test_cancel_cuts_stream_short(self):
+        cancel = threading.Event()
+        with StubInferenceServer(SLOW, token_delay=0.005) as server:
+            runner = Runner.create(base_url=server.url)
+            threading.Timer(0.1, cancel.set).start()
+            r = runner.complete(model="stub", messages=MESSAGES, stream=True,
+                                cancel=cancel)
+            runner.close()
+        assert r.stats.cancelled
+        assert 0 < r.stats.completion_tokens < len(server.reply_tokens())
+        assert runner.metrics.num_cancelled == 1
+
+    def test_complete_iter_yields_in_completion_order(self):
+        with StubInferenceServer(_reply, token_delay=0.002) as server:
+            runner = Runner.create(base_url=server.url)
+            order = [i for i, _ in runner.complete_iter(
+                model="stub", stream=True,
+                requests=[(MESSAGES, 1.0), (MESSAGES, 0.0)])]
+            runner.close()
+        assert order == [1, 0]
+        assert runner.metrics.num_requests == 2
+
+    def test_iter_candidates_stops_on_cancel(self, make_exercise):
+        cancel = threading.Event()
+        seen = []
+        with StubInferenceServer(_reply, token_delay=0.01) as server:
+            runner = Runner.create(base_url=server.url)
+            for cand in iter_candidates(make_exercise(), runner, "stub",
+                                        num_candidates=4, cancel=cancel):
+                seen.append(cand)
+                cancel.set()
+            runner.close()
+        assert seen[0].code == "good"
+        assert all(c.generation_result.stats.cancelled for c in seen[1:])
+        assert server.cancelled >= 1
+
+
+# ---------------------------------------------------------------------------
+# Scoring until the threshold
+# ---------------------------------------------------------------------------
+
+class TestScoreUntil:
+    def test_queued_test_runs_dropped(self, make_exercise):
+        calls = []
+
+        def slow_score(exercise, code):
+            calls.append(code)
+            time.sleep(0.05)
+            return ScoreResult(score=0.6 if code == "a" else 0.0)
+
+        with BenchScheduler(mock.Mock(), max_test_workers=1) as scheduler:
+            outcome = _score_until(
+                scheduler, slow_score, make_exercise(),
+                lambda cancel: iter([_cand("a"), _cand("b"), _cand("c")]),
+                3, 0.5)
+        assert outcome.stopped
+        assert calls == ["a"]
+        assert [c.code for c, _ in outcome.scored] == ["a"]
+
+    def test_no_stop_below_threshold(self, make_exercise):
+        with BenchScheduler(mock.Mock()) as scheduler:
+            outcome = _score_until(
+                scheduler, lambda ex, code: ScoreResult(score=0.4), make_exercise(),
+                lambda cancel: iter([_cand("a"), _cand("b"), _cand("a")]),
+                3, 1.0)
+        assert not outcome.stopped
+        assert len(outcome.scored) == 3
+        assert outcome.duplicates == 1
+        assert (outcome.tokens_saved, outcome.seconds_saved) == (0, 0.0)
+
+    def test_savings_estimate(self):
+        generated = [
+            _cand("a", tokens=100, seconds=1.0),
+            _cand("b", tokens=25, seconds=0.5, cancelled=True),
+        ]
+        # "b" projects to the mean (100): 75 more tokens, 0.5 * 100/25 = 2s.
+        # The one never started costs the mean of the projections (100).
+        tokens, seconds = _early_stop_savings(generated, 3, gen_seconds=1.0)
+        assert tokens == 175
+        assert seconds == 1.0
+
+    def test_long_straggler_assumed_half_done(self):
+        generated = [
+            _cand("a", tokens=10, seconds=0.1),
+            _cand("b", tokens=40, seconds=1.0, cancelled=True),
+        ]
+        # "b" already outran the winner: projected at 80 tokens and 2s.
+        tokens, seconds = _early_stop_savings(generated, 2, gen_seconds=1.0)
+        assert tokens == 40
+        assert seconds == 1.0
+
+
+# ---------------------------------------------------------------------------
+# Tournament
+# ---------------------------------------------------------------------------
+
+class TestTournament:
+    def _run(self, exercise, server, hyper):
+        runner = Runner.create(base_url=server.url)
+        try:
+            with mock.patch("pm_core.bench.orchestrator.generate_tests",
+                            return_value=("def test(): pass", [])), \
+                 mock.patch("pm_core.bench.orchestrator.execute_tests", _score):
+                return run_exercise_tournament(exercise, runner, "stub", 4,
+                                               hyper=hyper)
+        finally:
+            runner.close()
+
+    def test_perfect_candidate_stops_the_rest(self, make_exercise):
+        with StubInferenceServer(_reply, token_delay=0.005) as server:
+            exhaustive = self._run(make_exercise(), server, None)
+        with StubInferenceServer(_reply, token_delay=0.005) as server:
+            early = self._run(make_exercise(), server, HyperParams(early_stop=1.0))
+            # The server sees the hang-up on its next write.
+            cancelled = _wait_for(lambda: server.cancelled >= 1)
+
+        assert exhaustive.error is None and early.error is None
+        assert early.tournament_score == exhaustive.tournament_score == 1.0
+        assert early.early_stopped and not exhaustive.early_stopped
+        assert early.candidates_skipped == 3
+        assert cancelled
+        assert early.tournament_tokens < exhaustive.tournament_tokens
+        assert early.early_stop_tokens_saved > 0
+        assert early.early_stop_seconds_saved > 0
+
+    def test_reporting(self):
+        run = BenchmarkRun(model="m", num_candidates=4, languages=["python"],
+                           hyper=HyperParams(early_stop=0.9))
+        run.results = [
+            ExerciseResult(language="python", slug="a", early_stopped=True,
+                           candidates_skipped=3, early_stop_tokens_saved=1200,
+                           early_stop_seconds_saved=4.5),
+            ExerciseResult(language="python", slug="b"),
+        ]
+        assert ("Early stop: 1 exercises, ~1,200 tokens and ~4.5s saved "
+                "vs exhaustive") in format_results_table(run)
+        d = run.to_dict()
+        assert d["hyperparams"]["early_stop"] == 0.9
+        assert (d["early_stopped"], d["early_stop_tokens_saved"]) == (1, 1200)
+        assert d["results"][0]["candidates_skipped"] == 3
@@ -2,6 +2,7 @@
 
 import json
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
@@ -150,6 +151,14 @@ class TestLoadExercises:
         assert len(exercises) == 1
         assert exercises[0].slug == "hello-world"
 
+    def test_filter_by_languages_and_slugs(self, exercise_tree, monkeypatch):
+        monkeypatch.setattr("pm_core.bench.exercises._repo_dir", lambda: exercise_tree)
+        with mock.patch("pm_core.bench.exercises._parse_exercise",
+                        wraps=_parse_exercise) as parse:
+            exercises = load_exercises(languages=["go", "python"], slugs=["LEAP", "two"])
+        assert [e.id for e in exercises] == ["go/leap", "python/two-fer"]
+        assert parse.call_count == 2
+
     def test_no_cache_raises(self, tmp_path, monkeypatch):
         monkeypatch.setattr("pm_core.bench.exercises._repo_dir", lambda: tmp_path / "nonexistent")
         with pytest.raises(FileNotFoundError):
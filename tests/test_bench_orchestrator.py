@@ -75,6 +75,7 @@ class TestBenchmarkRun:
             "temperature": 0.7,
             "chain": True,
             "test_subset_size": 3,
+            "early_stop": None,
         }
 
 
@@ -93,6 +94,16 @@ class TestFormatResultsTable:
         assert "hello-world" in table
         assert "AGGREGATE" in table
         assert "Total tokens: 5,000" in table
+        assert "Token budget not used" not in table
+
+    def test_streaming_summary(self):
+        run = BenchmarkRun(model="m", num_candidates=8, languages=["python"],
+                           total_budget_unused=12345,
+                           mean_time_to_first_token=0.25)
+        table = format_results_table(run)
+        assert "Token budget not used (stopped at code fence): 12,345" in table
+        assert "Mean TTFT:    0.25s" in table
+        assert run.to_dict()["total_budget_unused"] == 12345
 
     def test_error_exercise(self):
         run = BenchmarkRun(model="m", num_candidates=8, languages=["python"])
@@ -0,0 +1,153 @@
+"""Tests for the bench runner's keep-alive connection pool.
+
+Runs against ``StubInferenceServer`` — a real localhost HTTP server — so
+connection reuse and in-flight limits are observed on actual sockets.
+"""
+
+import time
+import urllib.error
+
+import pytest
+
+from pm_core.bench.runner import (
+    ConnectionPool,
+    Runner,
+    batch_complete,
+    chat_completion,
+)
+from pm_core.bench.stub_server import StubInferenceServer
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+@pytest.fixture
+def server():
+    with StubInferenceServer(reply="pooled reply") as s:
+        yield s
+
+
+# ---------------------------------------------------------------------------
+# ConnectionPool
+# ---------------------------------------------------------------------------
+
+class TestConnectionPool:
+    def test_sequential_requests_reuse_one_connection(self, server):
+        pool = ConnectionPool(server.url, max_in_flight=4)
+        try:
+            for _ in range(20):
+                r = chat_completion(server.url, model="stub",
+                                    messages=MESSAGES, pool=pool)
+                assert r.content == "pooled reply"
+        finally:
+            pool.close()
+        assert server.requests == 20
+        assert server.connections == 1
+        assert pool.connections_opened == 1
+
+    def test_batch_bounded_by_max_in_flight(self):
+        with StubInferenceServer(delay=0.05) as server:
+            pool = ConnectionPool(server.url, max_in_flight=3)
+            try:
+                results = batch_complete(
+                    server.url, model="stub",
+                    requests=[(MESSAGES, 0.5)] * 12,
+                    pool=pool,
+                )
+            finally:
+                pool.close()
+        assert len(results) == 12
+        assert server.max_concurrent <= 3
+        assert server.connections <= 3
+
+    def test_http_error_raised_and_connection_kept(self, server):
+        pool = ConnectionPool(server.url, max_in_flight=2)
+        server.fail_next(500)
+        try:
+            with pytest.raises(urllib.error.HTTPError) as exc:
+                chat_completion(server.url, model="stub",
+                                messages=MESSAGES, pool=pool)
+            assert exc.value.code == 500
+            r = chat_completion(server.url, model="stub",
+                                messages=MESSAGES, pool=pool)
+        finally:
+            pool.close()
+        assert r.content == "pooled reply"
+        assert server.connections == 1
+
+    def test_reconnects_after_server_drops_idle_connection(self, server):
+        pool = ConnectionPool(server.url, max_in_flight=1)
+        try:
+            chat_completion(server.url, model="stub", messages=MESSAGES, pool=pool)
+            server.drop_connections()
+            time.sleep(0.05)
+            r = chat_completion(server.url, model="stub", messages=MESSAGES, pool=pool)
+        finally:
+            pool.close()
+        assert r.content == "pooled reply"
+        assert pool.connections_opened == 2
+
+    def test_rejects_zero_in_flight(self):
+        with pytest.raises(ValueError, match="max_in_flight"):
+            ConnectionPool("http://localhost:1", max_in_flight=0)
+
+    def test_base_path_prefix_preserved(self, server):
+        pool = ConnectionPool(server.url + "/", max_in_flight=1)
+        try:
+            data = pool.request("GET", "v1/models")
+        finally:
+            pool.close()
+        assert b"stub" in data
+
+
+# ---------------------------------------------------------------------------
+# Runner integration
+# ---------------------------------------------------------------------------
+
+class TestRunnerPool:
+    def test_create_owns_pool(self, server):
+        runner = Runner.create(base_url=server.url, max_in_flight=5)
+        try:
+            assert runner.pool is not None
+            assert runner.pool.max_in_flight == 5
+            runner.complete(model="stub", messages=MESSAGES)
+            runner.generate(model="stub", messages=MESSAGES,
+                            temperatures=[0.1, 0.5, 0.9])
+        finally:
+            runner.close()
+        assert runner.metrics.num_requests == 4
+        assert server.connections <= 3
+
+
+# ---------------------------------------------------------------------------
+# Throughput benchmark
+# ---------------------------------------------------------------------------
+
+def _requests_per_second(url: str, n: int, pool: ConnectionPool | None) -> float:
+    t0 = time.perf_counter()
+    batch_complete(url, model="stub", requests=[(MESSAGES, 0.5)] * n,
+                   pool=pool)
+    return n / (time.perf_counter() - t0)
+
+
+class TestThroughput:
+    def test_pooled_beats_urllib(self, server):
+        n = 200
+        # Warm up both paths so import / thread start-up is not measured.
+        _requests_per_second(server.url, 8, None)
+        pool = ConnectionPool(server.url, max_in_flight=8)
+        try:
+            _requests_per_second(server.url, 8, pool)
+            start = server.connections
+            before = _requests_per_second(server.url, n, None)
+            unpooled = server.connections - start
+            start = server.connections
+            after = _requests_per_second(server.url, n, pool)
+            pooled = server.connections - start
+        finally:
+            pool.close()
+        # urllib opens a socket per request; the pool reuses its warm ones.
+        assert unpooled == n
+        assert pooled <= 8
+        # The stub answers instantly, so the gap is pure connection and
+        # thread overhead (about 2x locally); 1.2x leaves room for noisy CI.
+        assert after > before * 1.2
@@ -0,0 +1,199 @@
+"""Tests for the pre-forked sandbox pool used by stdin/stdout scoring."""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from pm_core.bench.exercises import Exercise
+from pm_core.bench.executor import execute_stdin_stdout
+from pm_core.bench.sandbox import SandboxPool, sandbox_supported
+
+pytestmark = pytest.mark.skipif(not sandbox_supported(),
+                                reason="fork-based sandbox needs POSIX")
+
+
+@pytest.fixture
+def pool():
+    with SandboxPool(2) as p:
+        yield p
+
+
+def _script(tmp_path: Path, source: str, name: str = "solution.py") -> Path:
+    path = tmp_path / name
+    path.write_text(source)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# SandboxPool — per-case isolation semantics
+# ---------------------------------------------------------------------------
+
+class TestSandboxPool:
+    def test_stdin_to_stdout(self, pool, tmp_path):
+        path = _script(tmp_path, "n = int(input())\nprint(n * 2)\n")
+        r = pool.run(path, "21\n", timeout=5)
+        assert (r.stdout, r.returncode, r.timed_out) == ("42\n", 0, False)
+
+    def test_reads_all_of_stdin(self, pool, tmp_path):
+        path = _script(tmp_path, "import sys\nprint(sum(map(int, sys.stdin.read().split())))\n")
+        data = "\n".join(str(i) for i in range(10000)) + "\n"
+        assert pool.run(path, data, timeout=5).stdout == f"{sum(range(10000))}\n"
+
+    def test_exit_status(self, pool, tmp_path):
+        path = _script(tmp_path, "import sys\nprint('partial')\nsys.exit(3)\n")
+        r = pool.run(path, "", timeout=5)
+        assert (r.stdout, r.returncode) == ("partial\n", 3)
+
+    def test_uncaught_exception(self, pool, tmp_path):
+        path = _script(tmp_path, "raise ValueError('boom')\n")
+        r = pool.run(path, "", timeout=5)
+        assert r.returncode == 1
+        assert r.stderr.startswith("Traceback")
+        assert "ValueError: boom" in r.stderr
+        assert "_sandbox_worker" not in r.stderr
+
+    def test_syntax_error(self, pool, tmp_path):
+        path = _script(tmp_path, "def broken(\n")
+        r = pool.run(path, "", timeout=5)
+        assert r.returncode == 1
+        assert "SyntaxError" in r.stderr
+
+    def test_crash_only_affects_the_case(self, pool, tmp_path):
+        crash = _script(tmp_path, "import os, signal\nos.kill(os.getpid(), signal.SIGSEGV)\n",
+                        name="crash.py")
+        ok = _script(tmp_path, "print('fine')\n", name="ok.py")
+        assert pool.run(crash, "", timeout=5).returncode == -11
+        assert pool.run(ok, "", timeout=5).stdout == "fine\n"
+
+    def test_timeout_kills_process_group(self, pool, tmp_path):
+        marker = tmp_path / "grandchild-alive"
+        grandchild = _script(
+            tmp_path, f"import time\ntime.sleep(1.5)\nopen({str(marker)!r}, 'w')\n",
+            name="grandchild.py",
+        )
+        path = _script(tmp_path, (
+            "import subprocess, sys, time\n"
+            f"subprocess.Popen([sys.executable, {str(grandchild)!r}])\n"
+            "time.sleep(60)\n"
+        ))
+        start = time.monotonic()
+        r = pool.run(path, "", timeout=0.5)
+        assert r.timed_out
+        assert time.monotonic() - start < 5
+        time.sleep(2)
+        assert not marker.exists()
+
+    def test_busy_loop_times_out(self, pool, tmp_path):
+        path = _script(tmp_path, "while True:\n    pass\n")
+        r = pool.run(path, "", timeout=1)
+        assert r.timed_out
+
+    def test_memory_limit(self, tmp_path):
+        path = _script(tmp_path, "x = bytearray(512 * 1024 * 1024)\nprint('allocated')\n")
+        with SandboxPool(1, memory_mb=256) as limited:
+            r = limited.run(path, "", timeout=5)
+        assert r.returncode != 0
+        assert "MemoryError" in r.stderr
+
+    def test_script_dir_on_sys_path(self, pool, tmp_path):
+        (tmp_path / "helper.py").write_text("VALUE = 7\n")
+        path = _script(tmp_path, "import helper, sys\nprint(helper.VALUE, sys.argv[0] == __file__)\n")
+        assert pool.run(path, "", timeout=5).stdout == "7 True\n"
+
+    def test_state_does_not_leak_between_cases(self, pool, tmp_path):
+        path = _script(tmp_path, (
+            "import builtins\n"
+            "print(getattr(builtins, 'leaked', 0))\n"
+            "builtins.leaked = 1\n"
+        ))
+        assert pool.run(path, "", timeout=5).stdout == "0\n"
+        assert pool.run(path, "", timeout=5).stdout == "0\n"
+
+    def test_edited_script_recompiled(self, pool, tmp_path):
+        path = _script(tmp_path, "print(1)\n")
+        assert pool.run(path, "", timeout=5).stdout == "1\n"
+        time.sleep(0.01)
+        path.write_text("print(2)\n")
+        assert pool.run(path, "", timeout=5).stdout == "2\n"
+
+    def test_dead_fork_server_replaced(self, pool, tmp_path):
+        path = _script(tmp_path, "print('ok')\n")
+        pool.run(path, "", timeout=5)
+        server = pool._idle.get_nowait()
+        server.proc.kill()
+        server.proc.wait()
+        pool._idle.put(server)
+        assert pool.run(path, "", timeout=5).stdout == "ok\n"
+
+    def test_concurrent_cases_bounded_by_size(self, tmp_path):
+        path = _script(tmp_path, "import time\ntime.sleep(0.1)\nprint('done')\n")
+        results = []
+        with SandboxPool(2) as p:
+            threads = [
+                threading.Thread(target=lambda: results.append(
+                    p.run(path, "", timeout=5)))
+                for _ in range(6)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert p._started <= 2
+        assert [r.stdout for r in results] == ["done\n"] * 6
+
+
+# ---------------------------------------------------------------------------
+# execute_stdin_stdout on the pool
+# ---------------------------------------------------------------------------
+
+def _exercise(cases) -> Exercise:
+    return Exercise(
+        language="python", slug="p", description="d", starter_code={},
+        reference_tests={"_stdin_stdout_tests.json": json.dumps(cases)},
+        path=Path("/tmp"), source="livecodebench",
+    )
+
+
+class TestExecuteStdinStdout:
+    CASES = [{"input": f"{i}\n", "output": f"{i + 1}\n"} for i in range(30)]
+    CODE = "print(int(input()) + 1)\n"
+
+    def test_pool_matches_subprocess(self, pool):
+        ex = _exercise(self.CASES[:5] + [{"input": "x\n", "output": "1\n"}])
+        pooled = execute_stdin_stdout(ex, self.CODE, sandbox=pool)
+        with mock.patch("pm_core.bench.executor.sandbox_supported",
+                        return_value=False):
+            spawned = execute_stdin_stdout(ex, self.CODE)
+        assert (pooled.passed, pooled.total) == (spawned.passed, spawned.total) == (5, 6)
+        assert pooled.raw_output.split("--- stderr ---")[0] == \
+            spawned.raw_output.split("--- stderr ---")[0]
+
+    def test_timeout_reported(self, pool):
+        ex = _exercise([{"input": "", "output": "1\n"}])
+        r = execute_stdin_stdout(ex, "import time\ntime.sleep(30)\n",
+                                 timeout=1, sandbox=pool)
+        assert r.timed_out
+        assert r.error == "timeout"
+
+    def test_throughput_vs_subprocess(self, pool):
+        ex = _exercise(self.CASES)
+        execute_stdin_stdout(ex, self.CODE, sandbox=pool)  # warm up
+
+        t0 = time.perf_counter()
+        pooled = execute_stdin_stdout(ex, self.CODE, sandbox=pool)
+        pooled_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for case in self.CASES:
+            subprocess.run([sys.executable, "-c", self.CODE], input=case["input"],
+                           capture_output=True, text=True, timeout=30)
+        spawned_s = time.perf_counter() - t0
+
+        assert pooled.score == 1.0
+        assert pooled_s < spawned_s
@@ -0,0 +1,148 @@
+"""Tests for the benchmark-wide scheduler (shared LLM and test budgets)."""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from pm_core.bench.executor import ScoreResult
+from pm_core.bench.orchestrator import format_results_table, run_benchmark
+from pm_core.bench.runner import ConnectionPool, batch_complete
+from pm_core.bench.scheduler import BenchScheduler, default_test_workers
+from pm_core.bench.stub_server import StubInferenceServer
+
+
+class _ConcurrencyProbe:
+    """Callable that records how many invocations overlap."""
+
+    def __init__(self, delay: float = 0.02, result=None):
+        self.delay = delay
+        self.result = result
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return self.result
+
+
+# ---------------------------------------------------------------------------
+# BenchScheduler
+# ---------------------------------------------------------------------------
+
+class TestBenchScheduler:
+    def test_test_budget_shared_across_threads(self, make_runner):
+        probe = _ConcurrencyProbe()
+        with BenchScheduler(make_runner(), max_test_workers=2) as sched:
+            threads = [
+                threading.Thread(target=sched.map_tests,
+                                 args=(probe, [()] * 4))
+                for _ in range(5)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert probe.calls == 20
+        assert probe.peak <= 2
+        assert sched.stats.tests_run == 20
+        assert sched.stats.peak_concurrent_tests == probe.peak
+        assert sched.stats.total_queue_seconds > 0
+
+    def test_map_tests_preserves_order(self, make_runner):
+        with BenchScheduler(make_runner(), max_test_workers=3) as sched:
+            assert sched.map_tests(lambda x: x * 2, [(i,) for i in range(10)]) \
+                == [i * 2 for i in range(10)]
+
+    def test_run_test_propagates_errors(self, make_runner):
+        def boom():
+            raise RuntimeError("compile failed")
+
+        with BenchScheduler(make_runner(), max_test_workers=1) as sched:
+            with pytest.raises(RuntimeError, match="compile failed"):
+                sched.run_test(boom)
+        assert sched.stats.tests_run == 1
+
+    def test_defaults(self, make_runner):
+        sched = BenchScheduler(make_runner())
+        try:
+            assert sched.max_test_workers == default_test_workers()
+            assert sched.max_in_flight is None
+        finally:
+            sched.close()
+
+    def test_llm_budget_from_runner_pool(self, make_runner):
+        runner = make_runner()
+        runner.pool = ConnectionPool("http://localhost:1", max_in_flight=7)
+        with BenchScheduler(runner) as sched:
+            assert sched.max_in_flight == 7
+
+    def test_rejects_zero_workers(self, make_runner):
+        with pytest.raises(ValueError, match="max_test_workers"):
+            BenchScheduler(make_runner(), max_test_workers=0)
+
+
+# ---------------------------------------------------------------------------
+# Shared budgets across a benchmark run
+# ---------------------------------------------------------------------------
+
+class TestRunBenchmarkBudgets:
+    def test_parallel_exercises_share_test_budget(self, make_exercise, make_runner,
+                                                    make_candidates):
+        probe = _ConcurrencyProbe(result=ScoreResult(passed=1, total=1, score=1.0))
+        exercises = [make_exercise(f"ex-{i}") for i in range(6)]
+        with mock.patch("pm_core.bench.orchestrator.Runner.create",
+                        return_value=make_runner()), \
+             mock.patch("pm_core.bench.orchestrator.load_exercises",
+                        return_value=exercises), \
+             mock.patch("pm_core.bench.orchestrator.generate_tests",
+                        return_value=("def test(): pass", [])), \
+             mock.patch("pm_core.bench.orchestrator.generate_candidates",
+                        side_effect=make_candidates()), \
+             mock.patch("pm_core.bench.orchestrator.execute_tests", probe):
+            run = run_benchmark("m", num_candidates=4, parallel=6,
+                                max_test_workers=3)
+        assert run.num_errors == 0
+        # 4 candidates + reference + baseline per exercise
+        assert probe.calls == 6 * 6
+        assert probe.peak <= 3
+        # Queue wait and overlap are reported with the results
+        stats = run.test_stats
+        assert (stats.tests_run, stats.max_test_workers) == (36, 3)
+        assert stats.peak_concurrent_tests == probe.peak
+        assert stats.mean_queue_seconds > 0
+        assert 1.0 < stats.overlap(run.total_wall_clock_seconds) <= 3.0
+        d = run.to_dict()["test_scheduling"]
+        assert d["tests_run"] == 36 and d["overlap"] > 1.0
+        assert (f"Test runs: 36, peak {probe.peak}/3 concurrent, mean queue wait"
+                in format_results_table(run))
+
+    def test_batch_complete_shares_pool_budget(self):
+        with StubInferenceServer(delay=0.02) as server:
+            pool = ConnectionPool(server.url, max_in_flight=3)
+            msgs = [{"role": "user", "content": "hi"}]
+            try:
+                threads = [
+                    threading.Thread(target=batch_complete, args=(server.url,),
+                                     kwargs={"model": "stub", "pool": pool,
+                                             "requests": [(msgs, 0.5)] * 4})
+                    for _ in range(4)
+                ]
+                with mock.patch("asyncio.run", side_effect=AssertionError):
+                    for t in threads:
+                        t.start()
+                    for t in threads:
+                        t.join()
+            finally:
+                pool.close()
+        assert server.requests == 16
+        assert server.max_concurrent <= 3
@@ -0,0 +1,256 @@
+"""Tests for the content-addressed score cache and tournament deduplication."""
+
+import json
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from pm_core.bench import score_cache as score_cache_mod
+from pm_core.bench.exercises import Exercise
+from pm_core.bench.executor import ScoreResult, execute_stdin_stdout, execute_tests
+from pm_core.bench.orchestrator import (
+    BenchmarkRun,
+    ExerciseResult,
+    format_results_table,
+    run_exercise_tournament,
+)
+from pm_core.bench.runner import GenerationResult
+from pm_core.bench.score_cache import ScoreCache
+from pm_core.bench.solve import Candidate
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ScoreCache(tmp_path / "scores")
+
+
+# ---------------------------------------------------------------------------
+# Keys
+# ---------------------------------------------------------------------------
+
+class TestKey:
+    def test_stable(self, make_exercise):
+        ex = make_exercise()
+        assert ScoreCache.key("tests", ex, "code", "tests") == \
+            ScoreCache.key("tests", ex, "code", "tests")
+
+    @pytest.mark.parametrize("change", [
+        lambda ex: ("tests", ex(), "other code", "tests"),
+        lambda ex: ("tests", ex(), "code", "other tests"),
+        lambda ex: ("tests", ex("other"), "code", "tests"),
+        lambda ex: ("tests", ex(source="evalplus"), "code", "tests"),
+        lambda ex: ("stdin", ex(), "code", "tests"),
+    ])
+    def test_every_input_matters(self, change, make_exercise):
+        base = ScoreCache.key("tests", make_exercise(), "code", "tests")
+        assert ScoreCache.key(*change(make_exercise)) != base
+
+    def test_timeout_and_limits_matter(self, make_exercise):
+        ex = make_exercise()
+        base = ScoreCache.key("stdin", ex, "code", timeout=30,
+                              limits={"memory_mb": None})
+        assert ScoreCache.key("stdin", ex, "code", timeout=5,
+                              limits={"memory_mb": None}) != base
+        assert ScoreCache.key("stdin", ex, "code", timeout=30,
+                              limits={"memory_mb": 256}) != base
+
+    def test_reference_tests_hashed_when_no_test_code(self, make_exercise):
+        a = make_exercise(reference_tests={"t.py": "v1"})
+        b = make_exercise(reference_tests={"t.py": "v2"})
+        assert ScoreCache.key("tests", a, "code") != ScoreCache.key("tests", b, "code")
+
+    def test_scorer_version_invalidates(self, make_exercise):
+        ex = make_exercise()
+        before = ScoreCache.key("tests", ex, "code")
+        with mock.patch.object(score_cache_mod, "SCORER_VERSION", "999"):
+            assert ScoreCache.key("tests", ex, "code") != before
+
+
+# ---------------------------------------------------------------------------
+# ScoreCache
+# ---------------------------------------------------------------------------
+
+class TestScoreCache:
+    def test_hit_skips_run(self, cache):
+        run = mock.Mock(return_value=ScoreResult(passed=2, total=3, score=2 / 3))
+        first = cache.get_or_run("k", run)
+        second = cache.get_or_run("k", run)
+        assert run.call_count == 1
+        assert (first.cached, second.cached) == (False, True)
+        assert (second.passed, second.total) == (2, 3)
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        ScoreCache(tmp_path).get_or_run("k", lambda: ScoreResult(passed=1, total=1, score=1.0))
+        fresh = ScoreCache(tmp_path)
+        result = fresh.get_or_run("k", mock.Mock(side_effect=AssertionError))
+        assert result.cached and result.score == 1.0
+
+    def test_memory_only(self, tmp_path):
+        cache = ScoreCache(tmp_path, persist=False)
+        cache.get_or_run("k", lambda: ScoreResult(score=1.0))
+        assert cache.get("k") is not None
+        assert not any(tmp_path.iterdir())
+
+    def test_corrupt_entry_is_a_miss(self, cache):
+        cache.get_or_run("ab" + "0" * 62, lambda: ScoreResult(score=1.0))
+        path = cache.root / "ab" / ("ab" + "0" * 62 + ".json")
+        path.write_text("{not json")
+        assert ScoreCache(cache.root).get("ab" + "0" * 62) is None
+
+    @pytest.mark.parametrize("result", [
+        ScoreResult(error="timeout", timed_out=True),
+        ScoreResult(error="Test runner not found: go"),
+        ScoreResult(error="Execution error: [Errno 12]"),
+        ScoreResult(total=3, error="execution_error", cases_incomplete=3),
+        # One of three stdin cases timed out: timed_out stays False
+        ScoreResult(passed=2, total=3, score=2 / 3, cases_incomplete=1),
+    ])
+    def test_machine_dependent_results_not_cached(self, cache, result):
+        run = mock.Mock(return_value=result)
+        cache.get_or_run("k", run)
+        cache.get_or_run("k", run)
+        assert run.call_count == 2
+
+    def test_compile_errors_cached(self, cache):
+        run = mock.Mock(return_value=ScoreResult(error="compilation_or_parse_error"))
+        cache.get_or_run("k", run)
+        cache.get_or_run("k", run)
+        assert run.call_count == 1
+
+    def test_concurrent_misses_run_once(self, cache):
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return ScoreResult(score=1.0)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            cache.get_or_run("k", slow))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+        assert sorted(r.cached for r in results) == [False] + [True] * 4
+
+    def test_failed_run_not_cached(self, cache):
+        with pytest.raises(RuntimeError):
+            cache.get_or_run("k", mock.Mock(side_effect=RuntimeError("boom")))
+        assert cache.get_or_run("k", lambda: ScoreResult(score=1.0)).cached is False
+
+
+# ---------------------------------------------------------------------------
+# Executors
+# ---------------------------------------------------------------------------
+
+class TestExecutors:
+    def test_execute_tests_served_from_cache(self, tmp_path, cache):
+        ex_dir = tmp_path / "exercise"
+        ex_dir.mkdir()
+        test_code = "from hello import f\n\ndef test_f():\n    assert f() == 1\n"
+        (ex_dir / "hello_test.py").write_text(test_code)
+        ex = Exercise(language="python", slug="hello", description="d",
+                      starter_code={"hello.py": ""},
+                      reference_tests={"hello_test.py": test_code}, path=ex_dir)
+        code = "def f():\n    return 1\n"
+
+        first = execute_tests(ex, code, score_cache=cache)
+        with mock.patch("pm_core.bench.executor._run_test_cmd",
+                        side_effect=AssertionError("ran again")):
+            second = execute_tests(ex, code, score_cache=cache)
+        assert (first.score, first.cached) == (1.0, False)
+        assert (second.score, second.cached) == (1.0, True)
+        assert second.raw_output == first.raw_output
+
+    def test_execute_stdin_stdout_served_from_cache(self, cache, make_exercise):
+        cases = [{"input": "1\n", "output": "2\n"}]
+        ex = make_exercise(source="livecodebench", reference_tests={
+            "_stdin_stdout_tests.json": json.dumps(cases)})
+        code = "print(int(input()) + 1)\n"
+        first = execute_stdin_stdout(ex, code, score_cache=cache)
+        with mock.patch("pm_core.bench.executor.sandbox_supported",
+                        side_effect=AssertionError("ran again")):
+            second = execute_stdin_stdout(ex, code, score_cache=cache)
+        assert (first.score, second.score, second.cached) == (1.0, 1.0, True)
+
+    def test_partial_stdin_timeout_not_cached(self, cache, make_exercise):
+        cases = [{"input": "1\n", "output": "1\n"}, {"input": "2\n", "output": "2\n"}]
+        ex = make_exercise(source="livecodebench", reference_tests={
+            "_stdin_stdout_tests.json": json.dumps(cases)})
+        code = "import time\nn = input()\nif n == '2':\n    time.sleep(30)\nprint(n)\n"
+        first = execute_stdin_stdout(ex, code, timeout=1, score_cache=cache)
+        assert (first.passed, first.timed_out, first.cases_incomplete) == (1, False, 1)
+        second = execute_stdin_stdout(ex, code, timeout=1, score_cache=cache)
+        assert not second.cached
+
+
+# ---------------------------------------------------------------------------
+# Tournament deduplication and reporting
+# ---------------------------------------------------------------------------
+
+def _cand(code: str) -> Candidate:
+    return Candidate(code=code, temperature=0.0, prompt_variant="direct",
+                     model="m", generation_result=GenerationResult())
+
+
+class TestTournament:
+    def test_identical_candidates_scored_once(self, make_exercise, make_runner):
+        calls = []
+
+        def fake_execute(exercise, code, test_code=None, **kwargs):
+            calls.append((code, test_code))
+            return ScoreResult(passed=1, total=1, score=1.0)
+
+        with mock.patch("pm_core.bench.orchestrator.generate_tests",
+                        return_value=("gen", [])), \
+             mock.patch("pm_core.bench.orchestrator.generate_candidates",
+                        side_effect=[[_cand("a"), _cand("b"), _cand("a"), _cand("a")],
+                                     [_cand("base")]]), \
+             mock.patch("pm_core.bench.orchestrator.execute_tests", fake_execute):
+            result = run_exercise_tournament(make_exercise(), make_runner(), "m", 4)
+
+        assert result.error is None
+        assert sorted(c for c in calls if c[1] == "gen") == [("a", "gen"), ("b", "gen")]
+        assert result.duplicate_candidates == 2
+
+    def test_cache_hits_reported(self, tmp_path, make_exercise, make_runner):
+        cache = ScoreCache(tmp_path, persist=False)
+        ex = make_exercise()
+
+        def fake_execute(exercise, code, test_code=None, *, score_cache=None):
+            return score_cache.get_or_run(
+                ScoreCache.key("tests", exercise, code, test_code),
+                lambda: ScoreResult(passed=1, total=1, score=1.0))
+
+        def tournament():
+            with mock.patch("pm_core.bench.orchestrator.generate_tests",
+                            return_value=("gen", [])), \
+                 mock.patch("pm_core.bench.orchestrator.generate_candidates",
+                            side_effect=[[_cand("a"), _cand("b")], [_cand("a")]]), \
+                 mock.patch("pm_core.bench.orchestrator.execute_tests", fake_execute):
+                return run_exercise_tournament(ex, make_runner(), "m", 2,
+                                               score_cache=cache)
+
+        first = tournament()
+        # Best ("a") vs reference, then baseline "a" vs reference: one hit.
+        assert first.score_cache_hits == 1
+        second = tournament()
+        assert second.score_cache_hits == 4
+
+    def test_table_and_json_report_skipped_runs(self):
+        run = BenchmarkRun(model="m", num_candidates=4, languages=["python"])
+        run.results = [
+            ExerciseResult(language="python", slug="a", score_cache_hits=3,
+                           duplicate_candidates=1),
+            ExerciseResult(language="python", slug="b", score_cache_hits=2),
+        ]
+        assert "Scoring runs skipped: 5 cache hits, 1 duplicate candidates" \
+            in format_results_table(run)
+        d = run.to_dict()
+        assert (d["score_cache_hits"], d["duplicate_candidates"]) == (5, 1)
+        assert d["results"][0]["score_cache_hits"] == 3
@@ -0,0 +1,247 @@
+"""Tests for streamed chat completions with early stop at the code block."""
+
+import io
+import json
+import time
+
+import pytest
+
+from pm_core.bench._utils import CodeBlockWatcher, extract_code
+from pm_core.bench.runner import (
+    ConnectionPool,
+    CostMetrics,
+    Runner,
+    _read_stream,
+    chat_completion,
+)
+from pm_core.bench.stub_server import StubInferenceServer
+
+MESSAGES = [{"role": "user", "content": "solve it"}]
+
+CODE = "def add(a, b):\n    return a + b"
+EXPLANATION = " ".join(["This function adds two numbers together."] * 40)
+FENCED_REPLY = f"```python\n{CODE}\n```\n{EXPLANATION}"
+
+
+def _sse(*events: dict) -> io.BytesIO:
+    lines = [f"data: {json.dumps(e)}\n\n" for e in events]
+    return io.BytesIO("".join(lines + ["data: [DONE]\n\n"]).encode())
+
+
+def _wait_for(pred, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred():
+            return True
+        time.sleep(0.01)
+    return pred()
+
+
+# ---------------------------------------------------------------------------
+# CodeBlockWatcher
+# ---------------------------------------------------------------------------
+
+class TestCodeBlockWatcher:
+    def _feed_chars(self, text: str) -> CodeBlockWatcher:
+        w = CodeBlockWatcher()
+        for ch in text:
+            if w.feed(ch):
+                break
+        return w
+
+    def test_closes_after_fence_line(self):
+        w = self._feed_chars(FENCED_REPLY)
+        assert w.closed
+        assert w.text == f"```python\n{CODE}\n```\n"
+        assert extract_code(w.text) == CODE
+
+    def test_fence_needs_complete_line(self):
+        w = CodeBlockWatcher()
+        assert not w.feed("```\nx = 1\n```")
+        assert w.feed("\n")
+
+    def test_leading_blank_lines_allowed(self):
+        w = self._feed_chars(f"\n\n  ```py\n{CODE}\n```\ntrailing")
+        assert w.closed
+        assert extract_code(w.text) == CODE
+
+    def test_unfenced_response_never_closes(self):
+        w = self._feed_chars(f"Here it is:\n```\n{CODE}\n```\nmore")
+        assert not w.closed
+        assert w.text.endswith("more")
+
+    def test_fence_with_language_tag_is_not_a_close(self):
+        w = self._feed_chars("```python\nx = 1\n```python\ny = 2\n")
+        assert not w.closed
+
+    def test_received_keeps_everything(self):
+        w = CodeBlockWatcher()
+        for part in ["```\n", "a\n", "```\n", "tail"]:
+            w.feed(part)
+        assert w.received == "```\na\n```\ntail"
+        assert w.text == "```\na\n```\n"
+
+    def test_matches_extract_code_on_single_block(self):
+        reply = f"```go\n{CODE}\n```\n"
+        assert extract_code(self._feed_chars(reply).text) == extract_code(reply)
+
+    def test_bare_fence_inside_docstring_is_code(self):
+        code = 'def usage():\n    """Example:\n\n```\nrun()\n```\n    """\n    return 1'
+        reply = f"```python\n{code}\n```\nExplanation follows.\n"
+        w = self._feed_chars(reply)
+        assert w.closed
+        assert extract_code(w.text) == extract_code(reply) == code
+
+    def test_bare_fence_inside_text_block_is_code(self):
+        code = 'String md = """\n```\nx\n```\n""";'
+        reply = f"```java\n{code}\n```\n"
+        assert extract_code(self._feed_chars(reply).text) == code
+
+
+# ---------------------------------------------------------------------------
+# Streaming against the stub server
+# ---------------------------------------------------------------------------
+
+class TestStreaming:
+    def test_stream_without_early_stop_returns_everything(self):
+        with StubInferenceServer(reply=FENCED_REPLY) as server:
+            r = chat_completion(server.url, model="stub", messages=MESSAGES,
+                                stream=True)
+        assert r.content == FENCED_REPLY
+        assert r.finish_reason == "stop"
+        assert r.stats.time_to_first_token is not None
+        assert not r.stats.stopped_early
+        assert r.stats.completion_tokens == len(server.reply_tokens())
+        assert r.stats.prompt_tokens == 2
+
+    @pytest.mark.parametrize("pooled", [False, True])
+    def test_stop_after_code_cancels_request(self, pooled):
+        with StubInferenceServer(reply=FENCED_REPLY, token_delay=0.002) as server:
+            pool = ConnectionPool(server.url) if pooled else None
+            try:
+                r = chat_completion(server.url, model="stub", messages=MESSAGES,
+                                    max_tokens=1000, stop_after_code=True,
+                                    pool=pool)
+                assert _wait_for(lambda: server.cancelled == 1)
+            finally:
+                if pool is not None:
+                    pool.close()
+        total = len(server.reply_tokens())
+        assert r.finish_reason == "code_block"
+        assert extract_code(r.content) == CODE
+        assert "adds two numbers" not in r.content
+        assert r.stats.stopped_early
+        assert r.stats.completion_tokens < 15
+        assert r.stats.budget_unused == 1000 - r.stats.completion_tokens
+        assert server.tokens_streamed < total // 2
+
+    def test_budget_unused_uses_max_completion_tokens(self):
+        with StubInferenceServer(reply=FENCED_REPLY) as server:
+            r = chat_completion(
+                server.url, model="stub", messages=MESSAGES,
+                stop_after_code=True,
+                extra_body={"max_completion_tokens": 500},
+            )
+        assert r.stats.budget_unused == 500 - r.stats.completion_tokens
+
+    def test_unfenced_reply_streams_to_end(self):
+        reply = "x = 1\nprint(x)\n```\ntrailing"
+        with StubInferenceServer(reply=reply) as server:
+            r = chat_completion(server.url, model="stub", messages=MESSAGES,
+                                stop_after_code=True)
+        assert r.content == reply
+        assert not r.stats.stopped_early
+
+    def test_pooled_connection_reused_after_full_stream(self):
+        with StubInferenceServer(reply="hello world") as server:
+            pool = ConnectionPool(server.url, max_in_flight=1)
+            try:
+                for _ in range(3):
+                    chat_completion(server.url, model="stub",
+                                    messages=MESSAGES, stream=True, pool=pool)
+            finally:
+                pool.close()
+        assert server.connections == 1
+
+    def test_server_usage_counts_for_stopped_stream(self):
+        # Servers that report usage on every chunk keep their count
+        # authoritative even when the stream is cut short.
+        events = [
+            {"choices": [{"delta": {"content": part}}],
+             "usage": {"prompt_tokens": 5, "completion_tokens": 3 * (i + 1)}}
+            for i, part in enumerate(["```py\n", "x = 1\n", "```\n", "tail"])
+        ]
+        r = _read_stream(_sse(*events), time.monotonic(), "stub", 0.0,
+                         stop_after_code=True)
+        assert r.stats.stopped_early
+        assert r.stats.completion_tokens == 9
+        assert r.stats.total_tokens == 14
+
+    def test_delta_count_without_usage(self):
+        events = [{"choices": [{"delta": {"content": part}}]}
+                  for part in ["```py\n", "x = 1\n", "```\n", "tail"]]
+        r = _read_stream(_sse(*events), time.monotonic(), "stub", 0.0,
+                         stop_after_code=True)
+        assert r.stats.completion_tokens == 3
+
+    def test_pool_recovers_after_cancelled_stream(self):
+        with StubInferenceServer(reply=FENCED_REPLY) as server:
+            pool = ConnectionPool(server.url, max_in_flight=1)
+            try:
+                chat_completion(server.url, model="stub", messages=MESSAGES,
+                                stop_after_code=True, pool=pool)
+                r = chat_completion(server.url, model="stub",
+                                    messages=MESSAGES, pool=pool)
+            finally:
+                pool.close()
+        assert r.content == FENCED_REPLY
+        assert pool.connections_opened == 2
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+class TestStreamingMetrics:
+    def test_runner_accumulates_ttft_and_savings(self):
+        with StubInferenceServer(reply=FENCED_REPLY) as server:
+            runner = Runner.create(base_url=server.url)
+            try:
+                runner.complete_batch(
+                    model="stub", requests=[(MESSAGES, 0.2), (MESSAGES, 0.8)],
+                    max_tokens=200, stop_after_code=True,
+                )
+                runner.complete(model="stub", messages=MESSAGES)
+            finally:
+                runner.close()
+        m = runner.metrics
+        assert m.num_requests == 3
+        assert m.num_streamed == 2
+        assert m.num_stopped_early == 2
+        assert m.total_budget_unused > 0
+        assert m.mean_time_to_first_token is not None
+
+    def test_runner_does_not_stop_early_by_default(self):
+        with StubInferenceServer(reply=FENCED_REPLY) as server:
+            runner = Runner.create(base_url=server.url)
+            try:
+                r = runner.complete(model="stub", messages=MESSAGES)
+            finally:
+                runner.close()
+        assert r.content == FENCED_REPLY
+        assert runner.metrics.num_streamed == 0
+
+    def test_runner_stop_after_code_option(self):
+        with StubInferenceServer(reply=FENCED_REPLY) as server:
+            runner = Runner.create(base_url=server.url, stop_after_code=True)
+            try:
+                stopped = runner.complete(model="stub", messages=MESSAGES)
+                full = runner.complete(model="stub", messages=MESSAGES,
+                                       stop_after_code=False)
+            finally:
+                runner.close()
+        assert stopped.stats.stopped_early
+        assert full.content == FENCED_REPLY
+
+    def test_mean_ttft_none_without_streams(self):
+        assert CostMetrics().mean_time_to_first_token is None
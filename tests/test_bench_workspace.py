@@ -0,0 +1,404 @@
+"""Tests for linked scaffolds and persistent build workspaces."""
+
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from click.testing import CliRunner
+
+from pm_core.bench.exercises import Exercise
+from pm_core.bench.executor import _LANG_CONFIG, execute_tests
+from pm_core.bench.workspace import WorkspacePool, materialize
+from pm_core.cli.bench import bench
+
+
+def _exercise(path: Path, language: str, slug: str, *, reference_tests=None,
+              starter_code=None) -> Exercise:
+    return Exercise(
+        language=language, slug=slug, description="d",
+        starter_code=starter_code or {},
+        reference_tests=reference_tests or {},
+        path=path,
+    )
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return WorkspacePool(tmp_path / "workspaces")
+
+
+# ---------------------------------------------------------------------------
+# materialize
+# ---------------------------------------------------------------------------
+
+class TestMaterialize:
+    def test_hardlinks_sources_and_copies_manifests(self, tmp_path):
+        src = tmp_path / "src"
+        (src / "pkg").mkdir(parents=True)
+        (src / "pkg" / "mod.py").write_text("x = 1\n")
+        (src / "pkg" / "mod.py").chmod(0o444)
+        (src / "Cargo.lock").write_text("# lock\n")
+        (src / "Cargo.lock").chmod(0o444)
+        dst = tmp_path / "dst"
+        materialize(src, dst)
+        assert os.path.samefile(src / "pkg" / "mod.py", dst / "pkg" / "mod.py")
+        assert not os.path.samefile(src / "Cargo.lock", dst / "Cargo.lock")
+        assert (dst / "Cargo.lock").read_text() == "# lock\n"
+
+    def test_writable_files_copied_and_scaffold_mode_kept(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "mod.py").write_text("x = 1\n")
+        before = os.stat(src / "mod.py").st_mode
+        materialize(src, tmp_path / "dst")
+        assert not os.path.samefile(src / "mod.py", tmp_path / "dst" / "mod.py")
+        assert os.stat(src / "mod.py").st_mode == before
+        assert before & stat.S_IWUSR
+
+    def test_copies_without_link(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "mod.py").write_text("x = 1\n")
+        materialize(src, tmp_path / "dst", link=False)
+        (tmp_path / "dst" / "mod.py").write_text("edited in place\n")
+        assert (src / "mod.py").read_text() == "x = 1\n"
+
+    def test_skips_build_output(self, tmp_path):
+        src = tmp_path / "src"
+        for d in ("build", "target", "__pycache__", "nested/build"):
+            (src / d).mkdir(parents=True)
+            (src / d / "f").write_text("")
+        dst = tmp_path / "dst"
+        materialize(src, dst)
+        assert not (dst / "build").exists()
+        assert not (dst / "target").exists()
+        assert not (dst / "__pycache__").exists()
+        assert (dst / "nested" / "build" / "f").exists()
+
+    def test_preserves_symlinks(self, tmp_path):
+        src = tmp_path / "src"
+        (src / "real").mkdir(parents=True)
+        (src / "real" / "f").write_text("data")
+        (src / "alias").symlink_to("real")
+        dst = tmp_path / "dst"
+        materialize(src, dst)
+        assert os.readlink(dst / "alias") == "real"
+        assert (dst / "alias" / "f").read_text() == "data"
+
+
+# ---------------------------------------------------------------------------
+# WorkspacePool
+# ---------------------------------------------------------------------------
+
+def _go_scaffold(tmp_path: Path) -> Path:
+    ex = tmp_path / "scaffold"
+    ex.mkdir()
+    (ex / "go.mod").write_text("module demo\n\ngo 1.18\n")
+    (ex / "demo.go").write_text("package demo\n")
+    (ex / "demo_test.go").write_text("package demo\n")
+    return ex
+
+
+class TestWorkspacePool:
+    def test_writes_never_touch_scaffold(self, tmp_path, pool):
+        ex = _exercise(_go_scaffold(tmp_path), "go", "demo")
+        with pool.lease(ex) as ws:
+            ws.write("demo.go", "package demo\n// candidate\n")
+            assert (ws.path / "demo.go").read_text().endswith("// candidate\n")
+        assert (ex.path / "demo.go").read_text() == "package demo\n"
+
+    def test_slot_reused_and_written_files_restored(self, tmp_path, pool):
+        ex = _exercise(_go_scaffold(tmp_path), "go", "demo")
+        with pool.lease(ex) as ws:
+            first = ws.path
+            ws.write("demo_test.go", "package demo\n// generated\n")
+            ws.write("extra_test.go", "package demo\n")
+            (ws.path / "build").mkdir()
+            (ws.path / "build" / "out").write_text("kept")
+        with pool.lease(ex) as ws:
+            assert ws.path == first
+            assert ws.reused
+            assert (ws.path / "demo_test.go").read_text() == "package demo\n"
+            assert not (ws.path / "extra_test.go").exists()
+            assert (ws.path / "build" / "out").read_text() == "kept"
+
+    def test_untracked_changes_reset_against_scaffold(self, tmp_path, pool):
+        ex = _exercise(_go_scaffold(tmp_path), "go", "demo")
+        with pool.lease(ex) as ws:
+            # Edits that bypass Workspace.write
+            with open(ws.path / "demo.go", "a") as f:
+                f.write("// edited in place\n")
+            (ws.path / "go.mod").unlink()
+            (ws.path / "stray.go").write_text("package demo\n")
+            (ws.path / "gen").mkdir()
+            (ws.path / "gen" / "x.go").write_text("package gen\n")
+        assert (ex.path / "demo.go").read_text() == "package demo\n"
+        with pool.lease(ex) as ws:
+            assert ws.reused
+            assert (ws.path / "demo.go").read_text() == "package demo\n"
+            assert (ws.path / "go.mod").read_text().startswith("module demo")
+            assert sorted(os.listdir(ws.path)) == ["demo.go", "demo_test.go", "go.mod"]
+
+    def test_scaffold_change_rebuilds_slot(self, tmp_path, pool):
+        ex = _exercise(_go_scaffold(tmp_path), "go", "demo")
+        with pool.lease(ex) as ws:
+            (ws.path / "build").mkdir()
+            (ws.path / "build" / "out").write_text("stale")
+        time.sleep(0.01)
+        (ex.path / "demo.go").write_text("package demo\n// v2\n")
+        with pool.lease(ex) as ws:
+            assert not ws.reused
+            assert not (ws.path / "build").exists()
+            assert (ws.path / "demo.go").read_text().endswith("// v2\n")
+
+    def test_discard_wipes_slot(self, tmp_path, pool):
+        ex = _exercise(_go_scaffold(tmp_path), "go", "demo")
+        with pool.lease(ex) as ws:
+            (ws.path / "build").mkdir()
+            (ws.path / "build" / "out").write_text("half-written")
+            ws.discard()
+        with pool.lease(ex) as ws:
+            assert not ws.reused
+            assert not (ws.path / "build").exists()
+
+    def test_exception_wipes_slot(self, tmp_path, pool):
+        ex = _exercise(_go_scaffold(tmp_path), "go", "demo")
+        with pytest.raises(RuntimeError):
+            with pool.lease(ex) as ws:
+                raise RuntimeError("boom")
+        with pool.lease(ex) as ws:
+            assert not ws.reused
+
+    def test_concurrent_leases_get_distinct_slots(self, tmp_path, pool):
+        ex = _exercise(_go_scaffold(tmp_path), "go", "demo")
+        barrier = threading.Barrier(3)
+        paths = []
+
+        def hold():
+            with pool.lease(ex) as ws:
+                paths.append(ws.path)
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=hold) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(set(paths)) == 3
+
+    def test_interpreted_languages_use_temp_dirs(self, tmp_path, pool):
+        src = tmp_path / "scaffold"
+        src.mkdir()
+        (src / "demo.py").write_text("")
+        (src / "demo.py").chmod(0o444)
+        ex = _exercise(src, "python", "demo")
+        with pool.lease(ex) as ws:
+            work = ws.path
+            assert os.path.samefile(work / "demo.py", src / "demo.py")
+        assert not work.exists()
+        assert not pool.root.exists()
+
+
+# ---------------------------------------------------------------------------
+# Eviction
+# ---------------------------------------------------------------------------
+
+def _age(slot: Path, days: float) -> None:
+    t = time.time() - days * 86400
+    os.utime(slot / "state.json", (t, t))
+
+
+class TestPrune:
+    def _slots(self, tmp_path, pool, n: int) -> list[Path]:
+        slots = []
+        for i in range(n):
+            (tmp_path / f"ex{i}").mkdir()
+            ex = _exercise(_go_scaffold(tmp_path / f"ex{i}"), "go", f"demo{i}")
+            with pool.lease(ex) as ws:
+                (ws.path / "build").mkdir()
+                (ws.path / "build" / "out").write_bytes(b"x" * 100_000)
+                slots.append(ws.path.parent)
+        return slots
+
+    def test_evicts_by_age(self, tmp_path, pool):
+        old, fresh = self._slots(tmp_path, pool, 2)
+        _age(old, 30)
+        result = pool.prune(max_age_days=14)
+        assert result.slots_removed == 1 and result.bytes_freed >= 100_000
+        assert not old.exists() and not old.parent.exists()
+        assert fresh.exists()
+
+    def test_evicts_least_recently_used_to_fit_size(self, tmp_path, pool):
+        slots = self._slots(tmp_path, pool, 3)
+        for days, slot in zip((3, 1, 2), slots):
+            _age(slot, days)
+        assert pool.prune(max_bytes=150_000).slots_removed == 2
+        assert [s.exists() for s in slots] == [False, True, False]
+
+    def test_leased_slot_is_kept(self, tmp_path, pool):
+        slot, = self._slots(tmp_path, pool, 1)
+        ex = _exercise(tmp_path / "ex0" / "scaffold", "go", "demo0")
+        with pool.lease(ex):
+            assert pool.clear().slots_removed == 0
+        assert slot.exists()
+
+    def test_clean_command(self, tmp_path, pool, monkeypatch):
+        slot, = self._slots(tmp_path, pool, 1)
+        assert (pool.root / ".caches" / "go-build").is_dir()
+        monkeypatch.setattr("pm_core.bench.workspace.WorkspacePool",
+                            lambda: pool)
+        kept = CliRunner().invoke(bench, ["clean"])
+        assert "Removed 0 workspace(s)" in kept.output and slot.exists()
+        cleared = CliRunner().invoke(bench, ["clean", "--all"])
+        assert "Removed 1 workspace(s)" in cleared.output
+        assert not slot.exists() and not (pool.root / ".caches").exists()
+
+
+# ---------------------------------------------------------------------------
+# execute_tests on persistent workspaces — real toolchains
+# ---------------------------------------------------------------------------
+
+_GO_TEST = """package demo
+
+import "testing"
+
+func TestAdd(t *testing.T) {
+	if Add(2, 3) != 5 {
+		t.Fatal("wrong")
+	}
+}
+"""
+
+_RUST_TEST = """use demo::add;
+
+#[test]
+fn adds() {
+    assert_eq!(add(2, 3), 5);
+}
+"""
+
+_CPP_TEST = """#include "demo.h"
+#include <cstdio>
+
+int main() {
+    if (add(2, 3) != 5) { std::puts("FAIL"); return 1; }
+    std::puts("PASS");
+    return 0;
+}
+"""
+
+_CPP_CMAKE = """cmake_minimum_required(VERSION 3.10)
+project(demo CXX)
+enable_testing()
+add_executable(demo_test demo.cpp demo_test.cpp)
+add_test(NAME demo_test COMMAND demo_test)
+"""
+
+
+def _toolchain_exercise(tmp_path: Path, language: str) -> tuple[Exercise, str, str]:
+    """A one-function exercise plus a correct and a wrong candidate."""
+    ex = tmp_path / f"{language}-demo"
+    ex.mkdir()
+    if language == "go":
+        (ex / "go.mod").write_text("module demo\n\ngo 1.18\n")
+        (ex / "demo.go").write_text("package demo\n")
+        (ex / "demo_test.go").write_text(_GO_TEST)
+        tests = {"demo_test.go": _GO_TEST}
+        good = "package demo\n\nfunc Add(a, b int) int { return a + b }\n"
+        bad = "package demo\n\nfunc Add(a, b int) int { return a - b }\n"
+    elif language == "rust":
+        (ex / "Cargo.toml").write_text(
+            '[package]\nname = "demo"\nversion = "0.1.0"\nedition = "2021"\n')
+        (ex / "src").mkdir()
+        (ex / "src" / "lib.rs").write_text("")
+        (ex / "tests").mkdir()
+        (ex / "tests" / "demo.rs").write_text(_RUST_TEST)
+        tests = {"tests/demo.rs": _RUST_TEST}
+        good = "pub fn add(a: i32, b: i32) -> i32 { a + b }\n"
+        bad = "pub fn add(a: i32, b: i32) -> i32 { a - b }\n"
+    else:
+        (ex / "CMakeLists.txt").write_text(_CPP_CMAKE)
+        (ex / "demo.h").write_text("int add(int a, int b);\n")
+        (ex / "demo.cpp").write_text("")
+        (ex / "demo_test.cpp").write_text(_CPP_TEST)
+        tests = {"demo_test.cpp": _CPP_TEST}
+        good = '#include "demo.h"\nint add(int a, int b) { return a + b; }\n'
+        bad = '#include "demo.h"\nint add(int a, int b) { return a - b; }\n'
+    return _exercise(ex, language, "demo", reference_tests=tests), good, bad
+
+
+_TOOLS = {"go": "go", "rust": "cargo", "cpp": "cmake"}
+# Required warm-over-fresh speedup; locally go ~1.45x, rust ~1.3x, cpp ~2.2x.
+# Go's fresh runs already share the host build cache, and these one-file
+# crates leave cargo little to reuse, so their margins are smaller.
+_MIN_SPEEDUP = {"go": 1.15, "rust": 1.1, "cpp": 1.5}
+
+
+@pytest.fixture(scope="module")
+def build_pool(tmp_path_factory):
+    """One pool for all toolchain tests so the Go build cache warms once."""
+    return WorkspacePool(tmp_path_factory.mktemp("workspaces"))
+
+
+def _copytree_run(ex: Exercise, code: str) -> None:
+    """The previous behaviour: a full scaffold copy and a from-scratch build."""
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp) / "work"
+        shutil.copytree(ex.path, work)
+        config = _LANG_CONFIG[ex.language]
+        rel = config["solution_file"](ex.slug)
+        (work / rel).write_text(code)
+        subprocess.run(config["test_cmd"], cwd=work, capture_output=True,
+                       timeout=300)
+
+
+@pytest.mark.parametrize("language", ["go", "rust", "cpp"])
+class TestCompiledLanguages:
+    def _skip_without_toolchain(self, language):
+        if shutil.which(_TOOLS[language]) is None:
+            pytest.skip(f"{_TOOLS[language]} not installed")
+
+    def test_rebuild_picks_up_each_candidate(self, tmp_path, build_pool, language):
+        self._skip_without_toolchain(language)
+        ex, good, bad = _toolchain_exercise(tmp_path, language)
+        assert execute_tests(ex, good, workspaces=build_pool, timeout=300).score == 1.0
+        assert execute_tests(ex, bad, workspaces=build_pool, timeout=300).score < 1.0
+        assert execute_tests(ex, good, workspaces=build_pool, timeout=300).score == 1.0
+        (test_file, test_src), = ex.reference_tests.items()
+        assert (ex.path / test_file).read_text() == test_src
+
+    def test_generated_tests_do_not_leak_into_next_run(self, tmp_path, build_pool,
+                                                       language):
+        self._skip_without_toolchain(language)
+        ex, good, _ = _toolchain_exercise(tmp_path, language)
+        broken_test = {"go": "package demo\n\nfunc Broken( {\n",
+                       "rust": "fn broken( {\n",
+                       "cpp": "int main( {\n"}[language]
+        assert execute_tests(ex, good, broken_test, workspaces=build_pool,
+                             timeout=300).score < 1.0
+        assert execute_tests(ex, good, workspaces=build_pool, timeout=300).score == 1.0
+
+    def test_warm_runs_faster_than_fresh_copies(self, tmp_path, build_pool, language):
+        self._skip_without_toolchain(language)
+        ex, good, bad = _toolchain_exercise(tmp_path, language)
+        execute_tests(ex, good, workspaces=build_pool, timeout=300)  # warm up
+
+        runs = 4
+        t0 = time.perf_counter()
+        for i in range(runs):
+            execute_tests(ex, bad if i % 2 else good, workspaces=build_pool, timeout=300)
+        warm_s = (time.perf_counter() - t0) / runs
+
+        t0 = time.perf_counter()
+        for i in range(runs):
+            _copytree_run(ex, bad if i % 2 else good)
+        cold_s = (time.perf_counter() - t0) / runs
+
+        assert warm_s < cold_s / _MIN_SPEEDUP[language]
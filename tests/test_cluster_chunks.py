@@ -0,0 +1,108 @@
+"""Tests for pm_core.cluster.chunks — extraction and compact token storage."""
+
+import subprocess
+import tracemalloc
+from pathlib import Path
+
+from pm_core.cluster.chunks import (
+    Chunk,
+    TokenSet,
+    TokenUnion,
+    build_directory_chunks,
+    extract_chunks,
+)
+
+
+class TestTokenSet:
+    def test_behaves_like_a_set(self):
+        ts = TokenSet(["beta", "alpha", "beta"])
+        assert len(ts) == 2
+        assert "alpha" in ts and "gamma" not in ts
+        assert 42 not in ts
+        assert set(ts) == {"alpha", "beta"}
+        assert ts == {"alpha", "beta"}
+        assert ts - {"alpha"} == {"beta"}
+        assert ts & {"beta", "zeta"} == {"beta"}
+        assert isinstance(ts | {"x"}, TokenSet)
+
+    def test_ids_sorted_and_unique(self):
+        ts = TokenSet(["zzz_token", "aaa_token", "zzz_token"])
+        assert list(ts.ids) == sorted(set(ts.ids))
+        assert ts.ids.itemsize == 4
+
+    def test_hashable(self):
+        assert hash(TokenSet(["a", "b"])) == hash(TokenSet(["b", "a"]))
+
+
+class TestTokenUnion:
+    def test_union_by_reference(self):
+        a = TokenSet(["one", "two"])
+        b = TokenSet(["two", "three"])
+        u = TokenUnion([a, b])
+        assert u.parts[0] is a and u.parts[1] is b
+        assert u == {"one", "two", "three"}
+        assert len(u) == 3
+        assert "three" in u and "four" not in u
+
+
+class TestChunk:
+    def test_compact_fields(self):
+        c = Chunk(id="a.py::f", kind="function", path=Path("a.py"), name="f",
+                  tokens={"foo", "bar"}, imports={"os"}, calls={"print"})
+        assert isinstance(c.tokens, TokenSet)
+        assert c.imports == frozenset({"os"})
+        assert c.calls == frozenset({"print"})
+        assert not hasattr(c, "__dict__")
+
+    def test_directory_chunks_reference_file_tokens(self):
+        files = [
+            Chunk(id="pkg/a.py", kind="file", path=Path("pkg/a.py"), name="a.py",
+                  tokens={"alpha"}),
+            Chunk(id="pkg/b.py", kind="file", path=Path("pkg/b.py"), name="b.py",
+                  tokens={"beta"}),
+            Chunk(id="top.py", kind="file", path=Path("top.py"), name="top.py"),
+        ]
+        (d,) = build_directory_chunks(files)
+        assert d.id == "pkg/"
+        assert d.children == ["pkg/a.py", "pkg/b.py"]
+        assert d.tokens.parts[0] is files[0].tokens
+        assert d.tokens == {"alpha", "beta"}
+
+    def test_compact_tokens_use_less_memory(self):
+        words = [f"identifier_{i}" for i in range(2000)]
+        tracemalloc.start()
+        plain = [set(words[i:i + 200]) for i in range(0, 1800, 9)]
+        _, plain_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del plain
+
+        TokenSet(words)  # intern the vocabulary outside the measurement
+        tracemalloc.start()
+        compact = [TokenSet(words[i:i + 200]) for i in range(0, 1800, 9)]
+        _, compact_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(compact) == 200
+        assert compact_peak * 3 < plain_peak
+
+
+class TestExtractChunks:
+    def test_python_and_generic_files(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text(
+            "import os\n\ndef helper():\n    return os.getcwd()\n\n"
+            "class Thing:\n    def run(self):\n        return helper()\n")
+        (tmp_path / "pkg" / "notes.txt").write_text("some notes about things\n")
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(["git", "add", "-A"], cwd=tmp_path, check=True)
+
+        chunks = {c.id: c for c in extract_chunks(tmp_path)}
+        assert set(chunks) == {
+            "pkg/mod.py", "pkg/mod.py::helper", "pkg/mod.py::Thing",
+            "pkg/notes.txt", "pkg/",
+        }
+        helper = chunks["pkg/mod.py::helper"]
+        assert helper.kind == "function"
+        assert "getcwd" in helper.calls
+        # All chunks of a file share one imports frozenset
+        assert helper.imports is chunks["pkg/mod.py::Thing"].imports
+        assert chunks["pkg/"].tokens >= {"notes", "things"}
@@ -0,0 +1,120 @@
+"""Tests for pm_core.cluster.cluster_graph — agglomerative clustering."""
+
+import heapq
+import random
+import time
+from pathlib import Path
+
+from pm_core.cluster.chunks import Chunk
+from pm_core.cluster.cluster_graph import Edge, _UnionFind, agglomerative_cluster
+
+
+def _chunks(n: int) -> list[Chunk]:
+    return [Chunk(id=f"c{i}", kind="function", path=Path(f"m{i // 10}.py"),
+                  name=f"c{i}") for i in range(n)]
+
+
+def _random_edges(n: int, degree: int, seed: int) -> list[Edge]:
+    rng = random.Random(seed)
+    edges = []
+    for i in range(n):
+        for _ in range(degree):
+            j = rng.randrange(n)
+            if j != i:
+                edges.append(Edge(a=f"c{i}", b=f"c{j}",
+                                  weight=round(rng.uniform(0.05, 0.9), 3)))
+    return edges
+
+
+def _reference_cluster(chunks, edges, threshold=0.15):
+    """The original pairwise-rescan implementation, kept as an oracle."""
+    active = {c.id for c in chunks if c.kind in ("function", "class", "file")}
+    uf = _UnionFind()
+    for cid in active:
+        uf.make_set(cid)
+    members = {cid: {cid} for cid in active}
+    ew = {}
+    for e in edges:
+        if e.a in active and e.b in active:
+            ew[tuple(sorted((e.a, e.b)))] = e.weight
+
+    def avg(ga, gb):
+        total = sum(ew.get(tuple(sorted((a, b))), 0.0) for a in ga for b in gb)
+        return total / (len(ga) * len(gb))
+
+    heap = [(-w, a, b) for (a, b), w in ew.items()]
+    heapq.heapify(heap)
+    while heap:
+        neg_w, a, b = heapq.heappop(heap)
+        w = -neg_w
+        if w < threshold:
+            break
+        ra, rb = uf.find(a), uf.find(b)
+        if ra == rb:
+            continue
+        actual = avg(members[ra], members[rb])
+        if actual < threshold:
+            continue
+        if abs(actual - w) > 0.01:
+            heapq.heappush(heap, (-actual, a, b))
+            continue
+        root = uf.union(ra, rb)
+        merged = members[ra] | members[rb]
+        del members[rb if root == ra else ra]
+        members[root] = merged
+        for other, om in members.items():
+            if other != root:
+                x = avg(merged, om)
+                if x >= threshold:
+                    heapq.heappush(heap, (-x, root, other))
+    return sorted(sorted(m) for m in members.values())
+
+
+def _partition(clusters):
+    return sorted(sorted(c.chunk_ids) for c in clusters)
+
+
+class TestAgglomerativeCluster:
+    def test_empty(self):
+        assert agglomerative_cluster([], []) == []
+
+    def test_no_edges_gives_singletons(self):
+        clusters = agglomerative_cluster(_chunks(3), [])
+        assert _partition(clusters) == [["c0"], ["c1"], ["c2"]]
+
+    def test_two_groups(self):
+        edges = [
+            Edge("c0", "c1", 0.9), Edge("c1", "c2", 0.8), Edge("c0", "c2", 0.7),
+            Edge("c3", "c4", 0.9), Edge("c2", "c3", 0.05),
+        ]
+        clusters = agglomerative_cluster(_chunks(5), edges)
+        assert _partition(clusters) == [["c0", "c1", "c2"], ["c3", "c4"]]
+        assert len(clusters[0].chunk_ids) == 3
+
+    def test_average_linkage_blocks_weak_chain(self):
+        # c2 links strongly to c1 only; averaged over {c0, c1} it drops
+        # below the threshold.
+        edges = [Edge("c0", "c1", 0.9), Edge("c1", "c2", 0.25)]
+        clusters = agglomerative_cluster(_chunks(3), edges, threshold=0.15)
+        assert _partition(clusters) == [["c0", "c1"], ["c2"]]
+
+    def test_self_edges_ignored(self):
+        edges = [Edge("c0", "c0", 0.9), Edge("c0", "c1", 0.5)]
+        assert _partition(agglomerative_cluster(_chunks(2), edges)) == [["c0", "c1"]]
+
+    def test_matches_reference_implementation(self):
+        for seed in range(5):
+            chunks = _chunks(120)
+            edges = _random_edges(120, 3, seed)
+            for threshold in (0.1, 0.15, 0.3):
+                got = _partition(agglomerative_cluster(chunks, edges, threshold))
+                assert got == _reference_cluster(chunks, edges, threshold)
+
+    def test_scales_to_thousands_of_chunks(self):
+        chunks = _chunks(4000)
+        edges = _random_edges(4000, 4, seed=7)
+        t0 = time.perf_counter()
+        clusters = agglomerative_cluster(chunks, edges)
+        elapsed = time.perf_counter() - t0
+        assert sum(len(c.chunk_ids) for c in clusters) == 4000
+        assert elapsed < 10.0
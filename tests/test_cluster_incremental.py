@@ -0,0 +1,224 @@
+"""Tests for pm_core.cluster.incremental — cached, incremental re-clustering."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from pm_core.cluster.chunks import extract_chunks, list_source_files
+from pm_core.cluster.cluster_graph import Cluster, agglomerative_cluster
+from pm_core.cluster.incremental import (
+    ClusterDiff,
+    ClusterSnapshot,
+    diff_clusterings,
+    file_hashes,
+    load_snapshot,
+    make_params,
+    recluster,
+    save_snapshot,
+)
+from pm_core.cluster.metrics import compute_edges
+from pm_core.cluster.partition import pre_partition
+
+WEIGHTS = {"structural": 0.2, "semantic": 0.5, "cochange": 0.0, "callgraph": 0.3}
+
+
+def _write(repo: Path, rel: str, text: str):
+    p = repo / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    _write(root, "app/auth.py",
+           "def login(user, password):\n    return check_password(user, password)\n\n"
+           "def check_password(user, password):\n    return user.password_hash == password\n")
+    _write(root, "app/session.py",
+           "def open_session(user):\n    return login(user, 'token_value')\n")
+    _write(root, "app/billing.py",
+           "def invoice_total(invoice_lines):\n    return sum(invoice_lines)\n\n"
+           "def invoice_tax(invoice_lines):\n    return invoice_total(invoice_lines) * 0.2\n")
+    _write(root, "app/report.py",
+           "def render_report(rows):\n    return '\\n'.join(rows)\n")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+    return root
+
+
+def _full_snapshot(repo: Path) -> ClusterSnapshot:
+    chunks = extract_chunks(repo)
+    clusters, edges = [], []
+    next_id = 0
+    for name, part in pre_partition(chunks).items():
+        part_edges = compute_edges(part, weights=WEIGHTS)
+        edges.extend(part_edges)
+        for cl in agglomerative_cluster(part, part_edges):
+            next_id += 1
+            cl.id = str(next_id)
+            clusters.append(cl)
+    return ClusterSnapshot(
+        params=make_params(WEIGHTS, 0.15, 500),
+        file_hashes=file_hashes(repo, list_source_files(repo)),
+        chunks=chunks, edges=edges, clusters=clusters,
+    )
+
+
+class TestSnapshotPersistence:
+    def test_round_trip(self, repo, tmp_path):
+        snap = _full_snapshot(repo)
+        path = tmp_path / "cache" / "snap.json"
+        save_snapshot(path, snap)
+        loaded = load_snapshot(path)
+        assert loaded is not None
+        assert loaded.params == snap.params
+        assert loaded.file_hashes == snap.file_hashes
+        assert {c.id: c.tokens for c in loaded.chunks} == {c.id: c.tokens for c in snap.chunks}
+        assert [(e.a, e.b) for e in loaded.edges] == [(e.a, e.b) for e in snap.edges]
+        assert [c.chunk_ids for c in loaded.clusters] == [c.chunk_ids for c in snap.clusters]
+
+    def test_missing_or_corrupt(self, tmp_path):
+        assert load_snapshot(tmp_path / "nope.json") is None
+        bad = tmp_path / "bad.json"
+        bad.write_text("{not json")
+        assert load_snapshot(bad) is None
+
+    def test_version_mismatch(self, repo, tmp_path):
+        snap = _full_snapshot(repo)
+        snap.params["version"] = -1
+        path = tmp_path / "snap.json"
+        save_snapshot(path, snap)
+        assert load_snapshot(path) is None
+
+
+class TestDiff:
+    def test_summary_lines(self):
+        old = [Cluster(id="4", chunk_ids={"a", "b", "c", "x"})]
+        new = [Cluster(id="7", chunk_ids={"a", "b", "c", "y"})]
+        diff = diff_clusterings(old, new)
+        assert diff.summary_lines() == [
+            "3 chunks moved from cluster 4 to 7",
+            "1 chunk removed from cluster 4",
+            "1 chunk added to cluster 7",
+        ]
+
+    def test_empty(self):
+        assert ClusterDiff().summary_lines() == []
+
+
+class TestRecluster:
+    def test_no_changes(self, repo):
+        snap = _full_snapshot(repo)
+        new, diff = recluster(repo, snap)
+        assert new is snap
+        assert diff.changed_files == []
+        assert diff.moves == []
+
+    def test_changed_file_only_touches_its_neighbourhood(self, repo):
+        snap = _full_snapshot(repo)
+        untouched = {c.id: c.chunk_ids for c in snap.clusters
+                     if not any(cid.startswith("app/report.py") for cid in c.chunk_ids)}
+
+        _write(repo, "app/report.py",
+               "def render_report(rows):\n    return '\\n'.join(rows)\n\n"
+               "def report_footer(rows):\n    return len(rows)\n")
+        new, diff = recluster(repo, snap)
+
+        assert diff.changed_files == ["app/report.py"]
+        assert ("app/report.py::report_footer", None,
+                new_cluster_of(new, "app/report.py::report_footer")) in diff.moves
+        ids = {c.id: c.chunk_ids for c in new.clusters}
+        for cid, members in untouched.items():
+            if members.isdisjoint({"app/report.py", "app/report.py::render_report"}):
+                assert ids.get(cid) == members
+        all_ids = [cid for c in new.clusters for cid in c.chunk_ids]
+        assert len(all_ids) == len(set(all_ids))
+        assert "app/report.py::report_footer" in all_ids
+        assert new.file_hashes != snap.file_hashes
+
+    def test_removed_file(self, repo):
+        snap = _full_snapshot(repo)
+        (repo / "app/billing.py").unlink()
+        subprocess.run(["git", "rm", "-q", "--cached", "app/billing.py"],
+                       cwd=repo, check=True)
+        new, diff = recluster(repo, snap)
+        assert diff.changed_files == ["app/billing.py"]
+        remaining = {cid for c in new.clusters for cid in c.chunk_ids}
+        assert not any(cid.startswith("app/billing.py") for cid in remaining)
+        assert all(new_ is None for cid, _, new_ in diff.moves
+                   if cid.startswith("app/billing.py"))
+        assert not any(e.a.startswith("app/billing.py") or e.b.startswith("app/billing.py")
+                       for e in new.edges)
+
+    def test_cluster_ids_stay_unique(self, repo):
+        snap = _full_snapshot(repo)
+        _write(repo, "app/auth.py",
+               "def login(user, password):\n    return invoice_total([password])\n")
+        new, _ = recluster(repo, snap)
+        ids = [c.id for c in new.clusters]
+        assert len(ids) == len(set(ids))
+
+    def test_merged_partitions_score_unchanged_chunks(self, tmp_path):
+        root = tmp_path / "repo"
+        words = ["alpha", "bravo", "charlie", "delta"]
+        for tld in ("lib", "svc"):
+            for i, word in enumerate(words):
+                _write(root, f"{tld}/m{i}.py",
+                       f"def {tld}_{word}(value):\n    return {word}_{tld}(value)\n")
+        # Unchanged on both sides, and only related across the two.
+        _write(root, "lib/m2.py",
+               "def ledger_balance(ledger_rows):\n"
+               "    return currency_rounding(ledger_rows)\n")
+        _write(root, "svc/m3.py",
+               "def ledger_report(ledger_rows):\n"
+               "    return currency_rounding(ledger_rows)\n")
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+        snap = _full_snapshot(root)
+        assert {"code/lib", "code/svc"} <= set(pre_partition(snap.chunks))
+
+        # An import from svc into lib merges the two partitions; the
+        # unchanged chunks of each now need edges to the other's.
+        _write(root, "svc/m0.py",
+               "from lib.m1 import lib_bravo\n\n"
+               "def svc_alpha(value):\n    return lib_bravo(value)\n")
+        new, _ = recluster(root, snap)
+
+        def pairs(edges):
+            return {frozenset((e.a, e.b)) for e in edges}
+
+        full = _full_snapshot(root)
+        assert "code/lib+svc" in pre_partition(full.chunks)
+        assert pairs(new.edges) == pairs(full.edges)
+        assert frozenset(("lib/m2.py::ledger_balance",
+                          "svc/m3.py::ledger_report")) in pairs(new.edges)
+
+
+def new_cluster_of(snapshot: ClusterSnapshot, chunk_id: str) -> str | None:
+    for c in snapshot.clusters:
+        if chunk_id in c.chunk_ids:
+            return c.id
+    return None
+
+
+class TestSnapshotWrites:
+    def _run(self, repo, incremental):
+        from pm_core.cli.cluster import _run_incremental_clustering
+        return _run_incremental_clustering(repo, WEIGHTS, incremental=incremental)
+
+    def test_plain_run_writes_no_snapshot(self, repo, tmp_path, monkeypatch):
+        monkeypatch.setattr("pm_core.paths.cluster_cache_dir", lambda: tmp_path / "cache")
+        self._run(repo, incremental=False)
+        assert not list((tmp_path / "cache").glob("*.json"))
+
+    def test_incremental_run_keeps_snapshot_fresh(self, repo, tmp_path, monkeypatch):
+        monkeypatch.setattr("pm_core.paths.cluster_cache_dir", lambda: tmp_path / "cache")
+        self._run(repo, incremental=True)
+        path, = (tmp_path / "cache").glob("*.json")
+        _write(repo, "app/report.py", "def render_report(rows):\n    return rows\n")
+        # A plain run refreshes an existing snapshot.
+        self._run(repo, incremental=False)
+        assert load_snapshot(path).file_hashes == file_hashes(
+            repo, list_source_files(repo))
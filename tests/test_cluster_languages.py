@@ -0,0 +1,269 @@
+"""Tests for pm_core.cluster.languages — brace-language extractors."""
+
+from pathlib import Path
+
+import pytest
+
+from pm_core.cluster import chunks as chunks_mod
+from pm_core.cluster import languages as languages_mod
+from pm_core.cluster.chunks import Chunk, extract_file_chunks, get_extractor, register_extractor
+
+TS_SOURCE = '''\
+import { foo, bar } from "./util";
+import * as path from 'path';
+const fs = require("fs");
+// function commented() { }
+export async function loadUser(id: string): Promise<User> {
+  const s = "function fake() {";
+  return fetchUser(id).then(u => normalize(u));
+}
+export const handler = async (req) => {
+  return loadUser(req.id);
+};
+export default class UserStore extends Base {
+  get(id) { return this.cache.lookup(id); }
+  constructor() { super(); init(); }
+}
+interface User { id: string }
+'''
+
+GO_SOURCE = '''\
+package main
+
+import (
+\t"fmt"
+\tlog "github.com/x/logger"
+)
+
+type Server struct {
+\tname string
+}
+
+func (s *Server) Start(port int) error {
+\tfmt.Println("{")
+\treturn s.listen(port)
+}
+
+func main() {
+\ts := &Server{}
+\ts.Start(8080)
+\thelper(func() { doIt() })
+}
+'''
+
+RUST_SOURCE = '''\
+use std::collections::{HashMap, HashSet};
+use crate::config::Config;
+mod util;
+
+pub struct Cache<'a> { map: HashMap<&'a str, u32> }
+
+impl<'a> Cache<'a> {
+    pub fn new() -> Self { Cache { map: HashMap::new() } }
+    fn get(&self, k: &'a str) -> Option<&u32> { self.map.get(k) }
+}
+
+pub fn run(c: &Config) -> Result<(), String> {
+    let s = r#"fn fake() {"#;
+    let ch = '{';
+    let v = compute::<u32>(c.size);
+    Ok(())
+}
+'''
+
+JAVA_SOURCE = '''\
+package com.example;
+
+import java.util.List;
+import static org.junit.Assert.assertEquals;
+
+public class UserService {
+    private final Repo repo = Repo.open();
+    UserService() { this(null); }
+    @Override
+    public List<User> findAll(String q) throws IOException {
+        String s = "class Fake {";
+        return repo.query(q).stream().map(User::of).collect(toList());
+    }
+    abstract void reset();
+}
+'''
+
+SOURCES = {
+    "src/store.ts": TS_SOURCE,
+    "cmd/main.go": GO_SOURCE,
+    "src/cache.rs": RUST_SOURCE,
+    "src/UserService.java": JAVA_SOURCE,
+}
+
+# Scanning regexes whose matches are counted by the linearity tests.
+_SCAN_PATTERNS = ("_SCOPE_RE", "_CALL_RE", "_PAREN_RE")
+
+
+def _extract(tmp_path: Path, rel: str, text: str) -> dict[str, Chunk]:
+    p = tmp_path / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text)
+    return {c.id: c for c in extract_file_chunks(tmp_path, rel)}
+
+
+class TestTypeScript:
+    def test_chunks(self, tmp_path):
+        chunks = _extract(tmp_path, "src/store.ts", TS_SOURCE)
+        assert list(chunks) == [
+            "src/store.ts", "src/store.ts::loadUser", "src/store.ts::handler",
+            "src/store.ts::UserStore", "src/store.ts::User",
+        ]
+        load = chunks["src/store.ts::loadUser"]
+        assert load.kind == "function"
+        assert (load.start_line, load.end_line) == (5, 8)
+        assert load.calls == {"fetchUser", "then", "normalize"}
+        assert "fake" not in load.tokens  # string contents are ignored
+        assert chunks["src/store.ts::handler"].calls == {"loadUser"}
+        # Method declarations are not calls
+        assert chunks["src/store.ts::UserStore"].calls == {"lookup", "init"}
+        assert chunks["src/store.ts::UserStore"].kind == "class"
+
+    def test_imports_and_comments(self, tmp_path):
+        chunks = _extract(tmp_path, "src/store.ts", TS_SOURCE)
+        file_chunk = chunks["src/store.ts"]
+        assert {"./util", "path", "fs"} <= file_chunk.imports
+        assert "commented" not in file_chunk.tokens
+        assert file_chunk.children == list(chunks)[1:]
+
+
+class TestGo:
+    def test_chunks(self, tmp_path):
+        chunks = _extract(tmp_path, "cmd/main.go", GO_SOURCE)
+        assert list(chunks) == [
+            "cmd/main.go", "cmd/main.go::Server", "cmd/main.go::Server.Start",
+            "cmd/main.go::main",
+        ]
+        assert chunks["cmd/main.go::Server.Start"].calls == {"Println", "listen"}
+        assert chunks["cmd/main.go::main"].calls == {"Start", "helper", "doIt"}
+        assert {"fmt", "github.com/x/logger"} <= chunks["cmd/main.go"].imports
+
+
+class TestRust:
+    def test_chunks(self, tmp_path):
+        chunks = _extract(tmp_path, "src/cache.rs", RUST_SOURCE)
+        assert list(chunks) == [
+            "src/cache.rs", "src/cache.rs::Cache", "src/cache.rs::Cache@7",
+            "src/cache.rs::run",
+        ]
+        impl = chunks["src/cache.rs::Cache@7"]
+        assert impl.name == "Cache"
+        assert (impl.start_line, impl.end_line) == (7, 10)
+        assert impl.calls == {"new", "get"}
+        # Raw strings and char literals containing braces don't break bodies
+        run = chunks["src/cache.rs::run"]
+        assert (run.start_line, run.end_line) == (12, 17)
+        assert run.calls == {"compute"}
+        assert {"std::collections", "HashMap", "HashSet",
+                "crate::config::Config", "Config", "util"} <= run.imports
+
+
+class TestJava:
+    def test_chunks(self, tmp_path):
+        chunks = _extract(tmp_path, "src/UserService.java", JAVA_SOURCE)
+        assert list(chunks) == [
+            "src/UserService.java", "src/UserService.java::UserService",
+            "src/UserService.java::UserService.UserService",
+            "src/UserService.java::UserService.findAll",
+            "src/UserService.java::UserService.reset",
+        ]
+        cls = chunks["src/UserService.java::UserService"]
+        assert cls.kind == "class"
+        assert (cls.start_line, cls.end_line) == (6, 15)
+        # Method bodies belong to their own chunks, not the class's
+        assert cls.calls == {"open"}
+        assert {"java.util.List", "List", "org.junit.Assert.assertEquals"} <= cls.imports
+        find = chunks["src/UserService.java::UserService.findAll"]
+        assert find.kind == "function"
+        assert (find.start_line, find.end_line) == (9, 13)  # from @Override
+        assert find.calls == {"query", "stream", "map", "collect", "toList"}
+        assert chunks["src/UserService.java::UserService.reset"].calls == set()
+
+
+class TestCallsVsDeclarations:
+    def test_call_after_parenthesized_condition(self, tmp_path):
+        text = "function f(x) {\n  if (x) handle(x);\n  while (x) step(x);\n}\n"
+        assert _extract(tmp_path, "a.js", text)["a.js::f"].calls == {"handle", "step"}
+
+    def test_ternary_branches_are_calls(self, tmp_path):
+        text = "public class A {\n  int f(boolean c) {\n    return c ? alpha(1) : beta(2);\n  }\n}\n"
+        assert _extract(tmp_path, "A.java", text)["A.java::A.f"].calls == {"alpha", "beta"}
+
+    def test_typed_and_method_declarations(self, tmp_path):
+        text = ("class S {\n  async load(id: string): Promise<User> { fetch(id); }\n"
+                "  get(id) { return lookup(id); }\n}\n")
+        assert _extract(tmp_path, "s.ts", text)["s.ts::S"].calls == {"fetch", "lookup"}
+
+
+class TestRegistry:
+    def test_builtin_extensions(self):
+        for ext in (".py", ".js", ".tsx", ".go", ".rs", ".java"):
+            assert get_extractor(f"x{ext}") is not chunks_mod._extract_generic_chunk
+        assert get_extractor("x.md") is chunks_mod._extract_generic_chunk
+
+    def test_register_custom(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(chunks_mod, "_EXTRACTORS", dict(chunks_mod._EXTRACTORS))
+
+        def extract(rel_path, full_path):
+            return [Chunk(id=rel_path, kind="file", path=Path(rel_path), name="custom")]
+
+        register_extractor([".CUSTOM"], extract)
+        (tmp_path / "a.custom").write_text("x")
+        assert extract_file_chunks(tmp_path, "a.custom")[0].name == "custom"
+
+
+class _CountingPattern:
+    """A compiled regex that counts the matches its ``finditer`` yields."""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.matches = 0
+
+    def finditer(self, *args):
+        for m in self.pattern.finditer(*args):
+            self.matches += 1
+            yield m
+
+    def __getattr__(self, name):
+        return getattr(self.pattern, name)
+
+
+def _scanned(tmp_path: Path, monkeypatch, rel: str, text: str) -> tuple[int, int]:
+    """``(chunks, regex matches visited)`` for extracting *text* as *rel*."""
+    counters = [_CountingPattern(getattr(languages_mod, name))
+                for name in _SCAN_PATTERNS]
+    with monkeypatch.context() as m:
+        for name, counter in zip(_SCAN_PATTERNS, counters):
+            m.setattr(languages_mod, name, counter)
+        chunks = _extract(tmp_path / str(len(text)), rel, text)
+    return len(chunks), sum(c.matches for c in counters)
+
+
+@pytest.mark.parametrize("rel", list(SOURCES))
+def test_scanning_is_linear(tmp_path, monkeypatch, rel):
+    """Doubling the source at most doubles the scanning work.
+
+    A declaration whose body is rescanned to the end of the file would
+    make the count grow about fourfold instead.
+    """
+    monkeypatch.setattr(chunks_mod, "_MAX_FILE_SIZE", 1 << 30)
+    text = SOURCES[rel]
+    n_chunks, work = _scanned(tmp_path, monkeypatch, rel, "\n".join([text] * 100))
+    n_chunks2, work2 = _scanned(tmp_path, monkeypatch, rel, "\n".join([text] * 200))
+    assert n_chunks > 100 and n_chunks2 > n_chunks
+    assert work2 <= 2 * work
+
+
+def test_unterminated_literals_stay_linear(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunks_mod, "_MAX_FILE_SIZE", 1 << 30)
+    line = 'fn f() { let s = r"; }\n'
+    _, work = _scanned(tmp_path, monkeypatch, "bad.rs",
+                       line * 1000 + "/* never closed\n")
+    _, work2 = _scanned(tmp_path, monkeypatch, "bad.rs",
+                        line * 2000 + "/* never closed\n")
+    assert work2 <= 2 * work
@@ -0,0 +1,174 @@
+"""Tests for pm_core.cluster.metrics — call-graph distances and edges."""
+
+import random
+import tracemalloc
+from pathlib import Path
+
+from pm_core.cluster.chunks import Chunk
+from pm_core.cluster.metrics import (
+    CallGraph,
+    build_call_graph,
+    call_graph_score,
+    compute_call_distances,
+    compute_edges,
+)
+
+
+def _fn(path: str, name: str, calls=(), tokens=()) -> Chunk:
+    return Chunk(id=f"{path}::{name}", kind="function", path=Path(path),
+                 name=name, calls=set(calls), tokens=set(tokens))
+
+
+def _naive_distances(adjacency, max_depth=5):
+    """Reference all-pairs BFS used to check the CSR implementation."""
+    out = {}
+    for src in adjacency:
+        seen = {src}
+        frontier = [src]
+        depth = 0
+        while frontier and depth < max_depth:
+            depth += 1
+            nxt = []
+            for node in frontier:
+                for nb in adjacency.get(node, ()):
+                    if nb not in seen:
+                        seen.add(nb)
+                        out[(src, nb)] = depth
+                        nxt.append(nb)
+            frontier = nxt
+    return out
+
+
+def _synthetic_adjacency(n: int, fanout: int, seed: int = 0):
+    rng = random.Random(seed)
+    return {f"m{i // 50}.py::f{i}": {f"m{j // 50}.py::f{j}"
+                                     for j in rng.sample(range(n), fanout) if j != i}
+            for i in range(n)}
+
+
+# ---------------------------------------------------------------------------
+# build_call_graph
+# ---------------------------------------------------------------------------
+
+class TestBuildCallGraph:
+    def test_local_resolution_wins(self):
+        chunks = [
+            _fn("a.py", "helper"),
+            _fn("a.py", "main", calls=["helper"]),
+            _fn("b.py", "helper"),
+        ]
+        adj = build_call_graph(chunks)
+        assert adj == {"a.py::main": {"a.py::helper"}}
+
+    def test_global_resolution(self):
+        chunks = [_fn("a.py", "main", calls=["helper"]), _fn("b.py", "helper")]
+        assert build_call_graph(chunks) == {"a.py::main": {"b.py::helper"}}
+
+    def test_ambiguous_names_are_capped(self):
+        chunks = [_fn(f"m{i}.py", "get") for i in range(4)]
+        chunks.append(_fn("main.py", "main", calls=["get"]))
+        assert build_call_graph(chunks, max_targets=3) == {}
+        assert len(build_call_graph(chunks, max_targets=4)["main.py::main"]) == 4
+
+
+# ---------------------------------------------------------------------------
+# CallGraph
+# ---------------------------------------------------------------------------
+
+class TestCallGraph:
+    def test_chain_distances(self):
+        adj = {"a": {"b"}, "b": {"c"}, "c": {"d"}}
+        g = CallGraph(adj)
+        assert len(g) == 4
+        assert g.edge_count == 3
+        assert g.distances_from("a") == {"b": 1, "c": 2, "d": 3}
+        assert g.distance("a", "d") == 3
+        # Reverse direction is found through the reverse CSR
+        assert g.distance("d", "a") == 3
+        assert g.distance("a", "zzz") is None
+
+    def test_max_depth(self):
+        adj = {str(i): {str(i + 1)} for i in range(10)}
+        g = CallGraph(adj, max_depth=5)
+        assert g.distance("0", "5") == 5
+        assert g.distance("0", "6") is None
+
+    def test_matches_naive_bfs(self):
+        adj = _synthetic_adjacency(300, 3, seed=1)
+        g = CallGraph(adj)
+        expected = _naive_distances(adj)
+        assert dict.fromkeys(g.reachable_pairs()).keys() == expected.keys()
+        for (a, b), d in expected.items():
+            rev = expected.get((b, a))
+            assert g.distance(a, b) == (d if rev is None else min(d, rev))
+
+    def test_compute_call_distances_matches_naive(self):
+        adj = _synthetic_adjacency(200, 2, seed=2)
+        chunks = [Chunk(id=cid, kind="function", path=Path("x.py"), name=cid,
+                        calls={"x"}) for cid in adj]
+        assert compute_call_distances(chunks, adj) == _naive_distances(adj)
+
+    def test_score_accepts_graph_or_dict(self):
+        adj = {"a": {"b"}}
+        g = CallGraph(adj)
+        dists = compute_call_distances(
+            [Chunk(id="a", kind="function", path=Path("x"), name="a", calls={"b"})],
+            adj)
+        assert call_graph_score("b", "a", g) == call_graph_score("b", "a", dists) == 0.5
+        assert call_graph_score("a", "c", g) == 0.0
+
+
+# ---------------------------------------------------------------------------
+# compute_edges
+# ---------------------------------------------------------------------------
+
+class TestComputeEdges:
+    def test_call_edges(self):
+        chunks = [
+            _fn("pkg/a.py", "alpha", calls=["beta"], tokens=["alpha"]),
+            _fn("other/b.py", "beta", tokens=["beta"]),
+        ]
+        edges = compute_edges(chunks, weights={"callgraph": 1.0})
+        assert len(edges) == 1
+        assert edges[0].breakdown == {"callgraph": 0.5}
+
+    def test_large_synthetic_graph_peak_memory(self):
+        """compute_edges never holds the set of all reachable pairs."""
+        rng = random.Random(3)
+        n = 800
+        chunks = [Chunk(id=f"d{i // 50}/m.py::f{i}", kind="function",
+                        path=Path(f"d{i // 50}/m.py"), name=f"f{i}",
+                        calls={f"f{j}" for j in rng.sample(range(n), 3)})
+                  for i in range(n)]
+
+        # What collecting candidate pairs globally costs on this graph.
+        tracemalloc.start()
+        graph = CallGraph(build_call_graph(chunks))
+        pairs = {(a, b) if a < b else (b, a) for a, b in graph.reachable_pairs()}
+        _, global_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del graph
+
+        tracemalloc.start()
+        edges = compute_edges(chunks, weights={"callgraph": 1.0}, min_weight=0.45)
+        _, edges_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert len(pairs) > 50 * len(chunks)
+        # Only direct calls pass min_weight=0.45.
+        assert 0 < len(edges) < len(pairs) // 10
+        assert edges_peak * 10 < global_peak
+
+    def test_only_matches_filtered_full_run(self):
+        rng = random.Random(4)
+        words = [f"word{i}" for i in range(40)]
+        chunks = [
+            _fn(f"pkg/sub{i % 3}/m{i % 7}.py", f"f{i}",
+                calls=[f"f{rng.randrange(60)}"], tokens=rng.sample(words, 5))
+            for i in range(60)
+        ]
+        only = {c.id for c in chunks[:6]}
+        full = {(e.a, e.b): e.weight for e in compute_edges(chunks)
+                if e.a in only or e.b in only}
+        part = {(e.a, e.b): e.weight for e in compute_edges(chunks, only=only)}
+        assert part == full
@@ -0,0 +1,125 @@
+"""Tests for pm_core.cluster.stream — partition-at-a-time clustering."""
+
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from pm_core.cluster.chunks import Chunk
+from pm_core.cluster.cluster_graph import Edge
+from pm_core.cluster.stream import EdgeSpill, cluster_partitions
+
+
+def _fn(path: str, name: str, tokens=()) -> Chunk:
+    return Chunk(id=f"{path}::{name}", kind="function", path=Path(path),
+                 name=name, tokens=set(tokens))
+
+
+class TestEdgeSpill:
+    def test_round_trip(self, tmp_path):
+        with EdgeSpill(tmp_path) as spill:
+            spill.write([Edge("a", "b", 0.5), Edge("b", "c", 0.25)])
+            spill.write([])
+            spill.write([Edge("c", "a", 0.125)])
+            assert len(spill) == 3
+            got = [(e.a, e.b, e.weight) for e in spill]
+            assert got == [("a", "b", 0.5), ("b", "c", 0.25), ("c", "a", 0.125)]
+            # Iteration can be repeated
+            assert len(list(spill)) == 3
+
+
+class TestClusterPartitions:
+    def test_small_and_large_partitions(self):
+        chunks = [_fn("docs/readme.md", "readme")]
+        chunks += [_fn(f"src/m{i}.py", f"f{i}", tokens=["shared_token", f"own{i % 2}"])
+                   for i in range(6)]
+        lines = []
+        with EdgeSpill() as spill:
+            clusters = cluster_partitions(
+                chunks, weights={"structural": 0.5, "semantic": 0.5},
+                spill=spill, log=lines.append)
+            assert len(spill) > 0
+        assert [c.id for c in clusters] == [str(i + 1) for i in range(len(clusters))]
+        assert clusters[0].name == "docs"
+        assert all(c.name.startswith("code/src") for c in clusters[1:])
+        assert sum(len(c.chunk_ids) for c in clusters) == 7
+        assert any("small partition" in line for line in lines)
+
+
+_RSS_SCRIPT = textwrap.dedent("""
+    import json, resource, sys
+    from pathlib import Path
+    from pm_core.cluster.chunks import extract_chunks
+    from pm_core.cluster.incremental import ClusterSnapshot, save_snapshot
+    from pm_core.cluster.stream import EdgeSpill, cluster_partitions
+
+    root, mode, out = Path(sys.argv[1]), sys.argv[2], Path(sys.argv[3])
+    weights = {"structural": 0.2, "semantic": 0.5, "cochange": 0.0, "callgraph": 0.3}
+    chunks = extract_chunks(root)
+
+    class KeepAll(list):
+        write = list.extend
+
+    if mode == "inmemory":
+        # The pipeline before spilling: every edge kept in a list and the
+        # snapshot serialized as one JSON document.
+        edges = KeepAll()
+        clusters = cluster_partitions(chunks, weights=weights, spill=edges)
+        index = {c.id: i for i, c in enumerate(chunks)}
+        out.write_text(json.dumps({"edges": {"a": [index[e.a] for e in edges],
+                                             "b": [index[e.b] for e in edges],
+                                             "w": [e.weight for e in edges]}}))
+        n = len(edges)
+    else:
+        with EdgeSpill() as spill:
+            clusters = cluster_partitions(chunks, weights=weights, spill=spill)
+            if mode == "snapshot":
+                save_snapshot(out, ClusterSnapshot(
+                    params={}, file_hashes={}, chunks=chunks, edges=spill,
+                    clusters=clusters))
+            n = len(spill)
+    print(json.dumps({
+        "chunks": len(chunks), "edges": n, "clusters": len(clusters),
+        "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }))
+""")
+
+
+def test_peak_rss_regression(tmp_path):
+    """Cluster a synthetic multi-package repo and compare peak RSS.
+
+    The spilled pipeline is measured with and without writing the
+    snapshot, and against keeping every edge in memory.
+    """
+    repo = tmp_path / "repo"
+    for pkg in range(4):
+        d = repo / f"pkg{pkg}"
+        d.mkdir(parents=True)
+        for mod in range(25):
+            funcs = "\n".join(
+                f"def func_{mod}_{i}(value_{i % 7}):\n"
+                f"    return helper_{(i + 1) % 20}(value_{i % 7}) + token_{pkg}_{i % 13}\n"
+                for i in range(20))
+            (d / f"mod{mod}.py").write_text(funcs)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=repo, check=True)
+
+    stats = {}
+    for mode in ("stream", "snapshot", "inmemory"):
+        out = subprocess.run(
+            [sys.executable, "-c", _RSS_SCRIPT, str(repo), mode,
+             str(tmp_path / f"{mode}.json")],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+        stats[mode] = json.loads(out.stdout)
+
+    assert stats["stream"]["chunks"] == 4 * 25 * 21 + 4
+    assert stats["stream"]["edges"] == stats["inmemory"]["edges"] > 100_000
+    rss = {mode: s["maxrss_kb"] for mode, s in stats.items()}
+    # Writing the snapshot streams the spill instead of loading it back.
+    assert rss["snapshot"] < rss["stream"] + 16 * 1024
+    assert rss["snapshot"] < rss["inmemory"] * 0.6
+    saved = json.loads((tmp_path / "snapshot.json").read_text())
+    assert len(saved["edges"]["w"]) == stats["snapshot"]["edges"]
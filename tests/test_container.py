@@ -987,7 +987,7 @@ class TestRemoveContainer:
 
 
 class TestCleanupContainers:
-    @patch("pm_core.container.remove_container")
+    @patch("pm_core.container.remove_containers", side_effect=list)
     @patch("pm_core.container._run_runtime")
     def test_cleans_up_qa_containers(self, mock_docker, mock_rm):
         mock_docker.return_value = MagicMock(
@@ -997,11 +997,22 @@ class TestCleanupContainers:
 
         count = cleanup_qa_containers("pr1", "loop1")
         assert count == 2
-        assert mock_rm.call_count == 2
-        mock_rm.assert_any_call("pm-qa-pr1-loop1-s1")
-        mock_rm.assert_any_call("pm-qa-pr1-loop1-s2")
+        mock_rm.assert_called_once_with(
+            ["pm-qa-pr1-loop1-s1", "pm-qa-pr1-loop1-s2"])
 
-    @patch("pm_core.container.remove_container")
+    @patch("pm_core.container.remove_containers", side_effect=list)
+    @patch("pm_core.container._run_runtime")
+    def test_excludes_names(self, mock_docker, mock_rm):
+        mock_docker.return_value = MagicMock(
+            returncode=0,
+            stdout="pm-qa-pr1-loop1-s0\npm-qa-pr1-loop1-s1\n",
+        )
+        count = cleanup_qa_containers("pr1", "loop1",
+                                      exclude={"pm-qa-pr1-loop1-s0"})
+        assert count == 1
+        mock_rm.assert_called_once_with(["pm-qa-pr1-loop1-s1"])
+
+    @patch("pm_core.container.remove_containers", side_effect=list)
     @patch("pm_core.container._run_runtime")
     def test_cleans_up_session_tagged_qa_containers(self, mock_docker, mock_rm):
         """Cleanup finds session-tagged containers."""
@@ -1025,7 +1036,7 @@ class TestCleanupContainers:
         count = cleanup_qa_containers("pr1", "loop1")
         assert count == 0
 
-    @patch("pm_core.container.remove_container")
+    @patch("pm_core.container.remove_containers", side_effect=list)
     @patch("pm_core.container._run_runtime")
     def test_cleanup_session(self, mock_docker, mock_rm):
         mock_docker.return_value = MagicMock(
@@ -1034,9 +1045,10 @@ class TestCleanupContainers:
         )
         count = cleanup_session_containers("repo-abc")
         assert count == 2
-        mock_rm.assert_any_call("pm-repo-abc-impl-pr1")
+        mock_rm.assert_called_once_with(
+            ["pm-repo-abc-impl-pr1", "pm-repo-abc-qa-pr1-loop1-s1"])
 
-    @patch("pm_core.container.remove_container")
+    @patch("pm_core.container.remove_containers", side_effect=list)
     @patch("pm_core.container._run_runtime")
     def test_cleanup_all(self, mock_docker, mock_rm):
         mock_docker.return_value = MagicMock(
@@ -1046,7 +1058,7 @@ class TestCleanupContainers:
 
         count = cleanup_all_containers()
         assert count == 3
-        assert mock_rm.call_count == 3
+        assert mock_rm.call_count == 1
 
 
 class TestIntegration:
@@ -0,0 +1,183 @@
+"""Tests for batched and background container removal.
+
+Runs against ``bin/fake-runtime`` and counts its ``rm`` invocations.
+Concurrency is checked with barriers and events rather than wall time.
+"""
+
+import contextlib
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from pm_core import container as container_mod
+from pm_core.container import (
+    cleanup_pr_containers,
+    cleanup_session_containers,
+    remove_container,
+    remove_containers,
+    remove_containers_async,
+    wait_for_cleanup,
+)
+from pm_core.fake_runtime import run_fake_runtime
+
+
+def _start(fake_runtime, *names: str) -> None:
+    for name in names:
+        rc, _, err = run_fake_runtime(
+            ["run", "-d", "--name", name, "pm-dev:latest", "sleep", "infinity"],
+            fake_runtime.state_path)
+        assert rc == 0, err
+
+
+@contextlib.contextmanager
+def _gated_removal():
+    """Hold background removals until the yielded event is set.
+
+    Also yields an event set once the worker has taken its first batch.
+    """
+    real = container_mod.remove_containers
+    taken = threading.Event()
+    release = threading.Event()
+
+    def gated(names):
+        taken.set()
+        assert release.wait(timeout=10)
+        return real(names)
+
+    with patch.object(container_mod, "remove_containers", side_effect=gated):
+        try:
+            yield taken, release
+        finally:
+            release.set()
+
+
+@pytest.fixture(autouse=True)
+def _drain_queue(fake_runtime):
+    # Queued removals must not outlive the fake runtime.
+    yield
+    assert wait_for_cleanup(timeout=30)
+
+
+# ---------------------------------------------------------------------------
+# Batched removal
+# ---------------------------------------------------------------------------
+
+class TestRemoveContainers:
+    def test_removes_in_batches(self, fake_runtime):
+        names = [f"pm-sess-qa-pr-1-l-s{i}" for i in range(70)]
+        _start(fake_runtime, *names, "pm-other")
+        removed = remove_containers(names)
+        assert removed == names
+        assert list(fake_runtime.containers) == ["pm-other"]
+        rm_calls = fake_runtime.calls_to("rm")
+        assert len(rm_calls) == 3
+        assert all(len(c) - 2 <= container_mod._RM_BATCH for c in rm_calls)
+        # Waiting for removal lists containers once, not once per name.
+        assert len(fake_runtime.calls_to("inspect")) == 0
+        assert len(fake_runtime.calls_to("ps")) == 1
+
+    def test_missing_and_duplicate_names(self, fake_runtime):
+        _start(fake_runtime, "pm-a")
+        assert remove_containers(["pm-a", "pm-gone", "pm-a", ""]) == ["pm-a", "pm-gone"]
+        assert remove_containers([]) == []
+        assert fake_runtime.containers == {}
+
+    def test_stops_proxies_in_parallel(self, fake_runtime):
+        names = [f"pm-p{i}" for i in range(8)]
+        _start(fake_runtime, *names)
+        stopped = []
+        # Every stop waits for all the others to start: a serial shutdown
+        # breaks the barrier instead of finishing.
+        all_started = threading.Barrier(len(names), timeout=10)
+
+        def stop(name):
+            all_started.wait()
+            stopped.append(name)
+
+        with patch("pm_core.push_proxy.stop_push_proxy", side_effect=stop):
+            remove_containers(names)
+        assert sorted(stopped) == sorted(names)
+        assert fake_runtime.containers == {}
+
+    def test_one_rm_call_instead_of_one_per_name(self, fake_runtime):
+        names = [f"pm-sess-impl-{i}" for i in range(10)]
+        _start(fake_runtime, *names)
+        for name in names[:5]:
+            remove_container(name)
+        assert len(fake_runtime.calls_to("rm")) == 5
+        count = cleanup_session_containers("sess")
+        assert count == 5
+        assert fake_runtime.containers == {}
+        assert len(fake_runtime.calls_to("rm")) == 6
+
+
+# ---------------------------------------------------------------------------
+# Background queue
+# ---------------------------------------------------------------------------
+
+class TestCleanupQueue:
+    def test_fire_and_forget(self, fake_runtime):
+        _start(fake_runtime, "pm-sess-qa-pr-1-l-s1", "pm-sess-qa-pr-1-l-s2")
+        with _gated_removal() as (_taken, release):
+            # Returns while the removal is still held back.
+            queued = cleanup_pr_containers("pr-1", session_tag="sess", wait=False)
+            assert sorted(queued) == ["pm-sess-qa-pr-1-l-s1", "pm-sess-qa-pr-1-l-s2"]
+            assert len(fake_runtime.containers) == 2
+            release.set()
+            assert wait_for_cleanup(timeout=10)
+        assert fake_runtime.containers == {}
+
+    def test_names_queued_meanwhile_share_a_batch(self, fake_runtime):
+        _start(fake_runtime, *(f"pm-q{i}" for i in range(6)))
+        with _gated_removal() as (taken, release):
+            remove_containers_async(["pm-q0"])
+            assert taken.wait(timeout=10)  # the worker has taken pm-q0
+            for i in range(1, 6):
+                remove_containers_async([f"pm-q{i}"])
+            release.set()
+            assert wait_for_cleanup(timeout=10)
+        assert fake_runtime.containers == {}
+        assert [c[2:] for c in fake_runtime.calls_to("rm")] == [
+            ["pm-q0"], [f"pm-q{i}" for i in range(1, 6)]]
+
+    def test_wait_times_out(self, fake_runtime):
+        _start(fake_runtime, "pm-slow")
+        with _gated_removal() as (_taken, release):
+            remove_containers_async(["pm-slow"])
+            assert not wait_for_cleanup(timeout=0.1)
+            release.set()
+            assert wait_for_cleanup(timeout=10)
+
+    def test_recreated_name_survives_queued_removal(self, fake_runtime):
+        """remove_container (run before reusing a name) settles queued work."""
+        _start(fake_runtime, "pm-busy", "pm-reused")
+        with _gated_removal() as (taken, release):
+            # Keep the worker busy so pm-reused stays queued.
+            remove_containers_async(["pm-busy"])
+            assert taken.wait(timeout=10)
+            remove_containers_async(["pm-reused"])
+            remove_container("pm-reused")
+            _start(fake_runtime, "pm-reused")
+            release.set()
+            assert wait_for_cleanup(timeout=10)
+        assert list(fake_runtime.containers) == ["pm-reused"]
+
+    def test_failure_does_not_stop_worker(self, fake_runtime):
+        calls = []
+        real = container_mod.remove_containers
+
+        def flaky(names):
+            calls.append(list(names))
+            if len(calls) == 1:
+                raise RuntimeError("daemon went away")
+            return real(names)
+
+        _start(fake_runtime, "pm-x", "pm-y")
+        with patch.object(container_mod, "remove_containers", side_effect=flaky):
+            remove_containers_async(["pm-x"])
+            assert wait_for_cleanup(timeout=10)
+            remove_containers_async(["pm-y"])
+            assert wait_for_cleanup(timeout=10)
+        assert calls == [["pm-x"], ["pm-y"]]
+        assert list(fake_runtime.containers) == ["pm-x"]
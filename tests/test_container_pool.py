@@ -0,0 +1,434 @@
+"""Tests for the warm QA container pool (pm_core/container_pool.py).
+
+Runs against the fake container runtime (bin/fake-runtime) rather than
+mocking individual runtime calls, so renames, removals and cleanup-by-name
+interact the way they would against docker/podman.
+"""
+
+import errno
+import subprocess
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pm_core import container as container_mod
+from pm_core import container_pool
+from pm_core.container import ContainerConfig, cleanup_qa_containers, qa_container_name
+from pm_core.container_pool import ContainerPool, get_pool
+from pm_core.fake_runtime import run_fake_runtime
+from pm_core.qa_loop import (
+    QALoopState,
+    QAScenario,
+    _launch_scenarios_in_containers,
+    _write_status_file,
+    create_scenario_workdir,
+)
+
+
+@pytest.fixture(autouse=True)
+def _private_tmp(tmp_path, monkeypatch):
+    """Keep push proxy socket directories out of the real /tmp."""
+    (tmp_path / "tmp").mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "tmp"))
+
+
+@pytest.fixture
+def pool(fake_runtime, tmp_path):
+    p = ContainerPool(ContainerConfig(), session_tag="tag", size=2,
+                      root=tmp_path / "pool")
+    yield p
+    p.close()
+
+
+@pytest.fixture
+def no_proxy():
+    """Record push proxy starts instead of spawning proxy processes."""
+    with patch("pm_core.push_proxy.start_push_proxy",
+               return_value="/tmp/sock") as start:
+        yield start
+
+
+def _mount(container: dict, target: str) -> str:
+    return next(m.split(":")[0] for m in container["mounts"]
+                if m.split(":")[1] == target)
+
+
+def _git_repo(path: Path) -> Path:
+    path.mkdir(parents=True)
+    for args in (["init", "-q", "-b", "main"],
+                 ["-c", "user.name=t", "-c", "user.email=t@t",
+                  "commit", "-q", "--allow-empty", "-m", "init"]):
+        subprocess.run(["git", *args], cwd=path, check=True)
+    (path / "file.txt").write_text("hello\n")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Filling
+# ---------------------------------------------------------------------------
+
+class TestFill:
+    def test_starts_generic_containers(self, pool, fake_runtime):
+        pool.fill(wait=True)
+        assert pool.idle == 2
+        names = sorted(fake_runtime.containers)
+        assert all(n.startswith("pm-tag-pool-") for n in names)
+        c = fake_runtime.containers[names[0]]
+        slot = pool.root / names[0]
+        assert _mount(c, "/workspace") == str(slot / "repo")
+        assert _mount(c, "/scratch") == str(slot / "scratch")
+        assert _mount(c, "/run/pm-push-proxy").endswith(f"pm-push-proxy-{names[0]}")
+        assert _mount(c, "/pm-session-captures").endswith("sessions/tag/captures")
+        # Generic: no git wrapper until a scenario's branch is known.
+        assert ".local/bin/git" not in c["command"][-1]
+
+    def test_fill_is_idempotent(self, pool, fake_runtime):
+        pool.fill()
+        pool.fill(wait=True)
+        assert len(fake_runtime.calls_to("run")) == 2
+
+    def test_failed_start_not_pooled(self, pool, fake_runtime):
+        with patch.object(container_mod, "create_container",
+                          side_effect=container_mod.ContainerError("boom")):
+            pool.fill(wait=True)
+        assert pool.idle == 0
+        assert list(pool.root.iterdir()) == []
+
+    def test_close_removes_idle(self, pool, fake_runtime):
+        pool.fill(wait=True)
+        pool.close()
+        pool.fill(wait=True)
+        assert fake_runtime.containers == {}
+        assert pool.idle == 0
+
+
+# ---------------------------------------------------------------------------
+# Acquire / attach
+# ---------------------------------------------------------------------------
+
+class TestAcquire:
+    def test_moves_mounted_dirs_into_scenario(self, pool, fake_runtime, tmp_path):
+        pool.fill(wait=True)
+        lease = pool.acquire(tmp_path / "qa" / "s-1")
+        mounted = Path(_mount(fake_runtime.containers[lease.name], "/workspace"))
+        assert lease.repo == tmp_path / "qa" / "s-1" / "repo"
+        assert lease.repo.is_dir() and not mounted.exists()
+        assert lease.scratch == tmp_path / "qa" / "s-1" / "scratch"
+        assert not mounted.parent.exists()
+        pool.fill(wait=True)
+        assert pool.idle == 2
+
+    def test_scenario_clone_lands_in_mounted_dir(self, pool, fake_runtime, tmp_path):
+        pool.fill(wait=True)
+        repo = _git_repo(tmp_path / "src")
+        subprocess.run(["git", "add", "."], cwd=repo, check=True)
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t",
+                        "commit", "-qm", "file"], cwd=repo, check=True)
+        lease = pool.acquire(tmp_path / "qa" / "s-1")
+        inode = lease.repo.stat().st_ino
+        clone, _ = create_scenario_workdir(tmp_path / "qa", 1, repo_root=repo)
+        assert clone == lease.repo
+        assert clone.stat().st_ino == inode
+        assert (clone / "file.txt").read_text() == "hello\n"
+
+    def test_empty_pool_returns_none_and_refills(self, pool, fake_runtime, tmp_path):
+        assert pool.acquire(tmp_path / "s-1") is None
+        pool.fill(wait=True)
+        assert pool.idle == 2
+
+    def test_dead_container_discarded(self, pool, fake_runtime, tmp_path):
+        pool.fill(wait=True)
+        first = pool._idle[0].name
+        run_fake_runtime(["rm", "-f", first], fake_runtime.state_path)
+        lease = pool.acquire(tmp_path / "s-1")
+        assert lease.name != first
+        assert not (pool.root / first).exists()
+
+    def test_cross_device_falls_back(self, pool, fake_runtime, tmp_path):
+        pool.fill(wait=True)
+        with patch("pm_core.container_pool.os.rename",
+                   side_effect=OSError(errno.EXDEV, "cross-device")):
+            assert pool.acquire(tmp_path / "s-1") is None
+        assert pool.idle == 2
+
+
+class TestAttach:
+    def test_becomes_scenario_container(self, pool, fake_runtime, tmp_path, no_proxy):
+        pool.fill(wait=True)
+        lease = pool.acquire(tmp_path / "s-1")
+        pooled = lease.name
+        cname = qa_container_name("pr-1", "loop", 1, session_tag="tag")
+        cid = pool.attach(lease, cname, workdir=lease.repo,
+                          allowed_push_branch="pm/pr-1", pr_id="pr-1")
+
+        assert cid == fake_runtime.containers[cname]["id"]
+        assert pooled not in fake_runtime.containers
+        assert lease.sock_dir.name == f"pm-push-proxy-{cname}"
+        no_proxy.assert_called_once_with(cname, str(lease.repo), "pm/pr-1")
+        scripts = [c[-1] for c in fake_runtime.calls_to("exec") if c[1] == cname]
+        assert any(".local/bin/git" in s and str(lease.repo) in s for s in scripts)
+        assert ["exec", "--user", "0", cname, "ln", "-sfn",
+                "/pm-session-captures/pr-1", "/pm-captures"] in fake_runtime.calls
+        # Existing per-loop cleanup finds it by its scenario name.
+        assert cleanup_qa_containers("pr-1", "loop", session_tag="tag") == 1
+
+    def test_without_branch_skips_proxy(self, pool, fake_runtime, tmp_path, no_proxy):
+        pool.fill(wait=True)
+        lease = pool.acquire(tmp_path / "s-1")
+        pool.attach(lease, "pm-tag-qa-pr-1-loop-s1", workdir=lease.repo)
+        no_proxy.assert_not_called()
+
+    def test_replaces_stale_container_of_same_name(self, pool, fake_runtime,
+                                                   tmp_path, no_proxy):
+        cname = "pm-tag-qa-pr-1-loop-s1"
+        run_fake_runtime(["run", "-d", "--name", cname, "img"], fake_runtime.state_path)
+        stale = fake_runtime.containers[cname]["id"]
+        pool.fill(wait=True)
+        lease = pool.acquire(tmp_path / "s-1")
+        assert pool.attach(lease, cname, workdir=lease.repo) != stale
+        assert fake_runtime.containers[cname]["image"] == "pm-dev:latest"
+
+    def test_failure_destroys_container(self, pool, fake_runtime, tmp_path, no_proxy):
+        pool.fill(wait=True)
+        lease = pool.acquire(tmp_path / "s-1")
+        run_fake_runtime(["stop", lease.name], fake_runtime.state_path)
+        with pytest.raises(subprocess.CalledProcessError):
+            pool.attach(lease, "pm-tag-qa-pr-1-loop-s1", workdir=lease.repo,
+                        allowed_push_branch="b")
+        assert "pm-tag-qa-pr-1-loop-s1" not in fake_runtime.containers
+
+
+class TestRelease:
+    def test_destroy_keeps_scenario_dirs(self, pool, fake_runtime, tmp_path, no_proxy):
+        pool.fill(wait=True)
+        lease = pool.acquire(tmp_path / "s-1")
+        pool.attach(lease, "pm-tag-qa-pr-1-loop-s1", workdir=lease.repo)
+        (lease.repo / "kept").write_text("x")
+        pool.release(lease)
+        assert "pm-tag-qa-pr-1-loop-s1" not in fake_runtime.containers
+        assert (lease.repo / "kept").exists()
+
+    def test_recycle_returns_emptied_container(self, pool, fake_runtime, tmp_path,
+                                               no_proxy):
+        pool.fill(wait=True)
+        lease = pool.acquire(tmp_path / "s-1")
+        scenario_repo = lease.repo
+        pool.attach(lease, "pm-tag-qa-pr-1-loop-s1", workdir=lease.repo,
+                    allowed_push_branch="b")
+        (lease.repo / "junk").write_text("x")
+        pool.fill(wait=True)
+        pool.size = 3
+        pool.release(lease, recycle=True)
+
+        assert lease.name.startswith("pm-tag-pool-")
+        assert lease in pool._idle
+        assert list(lease.repo.iterdir()) == []
+        assert not scenario_repo.exists()
+        assert lease.sock_dir.name == f"pm-push-proxy-{lease.name}"
+        assert ["exec", "--user", "0", "pm-tag-qa-pr-1-loop-s1", "rm", "-f",
+                "/pm-captures", "/home/pm/.local/bin/git"] in fake_runtime.calls
+
+    def test_recycle_into_full_pool_destroys(self, pool, fake_runtime, tmp_path,
+                                             no_proxy):
+        pool.fill(wait=True)
+        lease = pool.acquire(tmp_path / "s-1")
+        pool.attach(lease, "pm-tag-qa-pr-1-loop-s1", workdir=lease.repo)
+        pool.fill(wait=True)
+        pool.release(lease, recycle=True)
+        assert lease.name not in fake_runtime.containers
+        assert pool.idle == 2
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+class TestGetPool:
+    @pytest.fixture(autouse=True)
+    def _clean_registry(self):
+        yield
+        container_pool.close_pools()
+
+    def test_disabled_by_default(self, fake_runtime):
+        assert get_pool(ContainerConfig(), "tag") is None
+
+    def test_shared_per_image_and_session(self, fake_runtime):
+        with patch("pm_core.container_pool.pool_size", return_value=3):
+            a = get_pool(ContainerConfig(), "tag")
+            assert get_pool(ContainerConfig(), "tag") is a
+            assert get_pool(ContainerConfig(), "other") is not a
+            assert a.size == 3
+
+    def test_config_change_replaces_pool(self, fake_runtime):
+        with patch("pm_core.container_pool.pool_size", return_value=1):
+            a = get_pool(ContainerConfig(), "tag")
+            a.fill(wait=True)
+            b = get_pool(ContainerConfig(memory_limit="1g"), "tag")
+        assert b is not a
+        assert fake_runtime.containers == {}
+
+    def test_new_image_replaces_session_pool(self, fake_runtime):
+        """A pool on the base image goes once the dependency image is used."""
+        with patch("pm_core.container_pool.pool_size", return_value=1):
+            base = get_pool(ContainerConfig(), "tag")
+            base.fill(wait=True)
+            other = get_pool(ContainerConfig(), "other")
+            deps = get_pool(ContainerConfig(image="pm-deps-app-1234:k"), "tag")
+        assert deps is not base
+        assert base._closed and not other._closed
+        assert fake_runtime.containers == {}
+
+    def test_session_slots_removed(self, fake_runtime, tmp_path):
+        pool = ContainerPool(ContainerConfig(), session_tag="tag", size=1)
+        pool.fill(wait=True)
+        container_pool.remove_session_slots("tag")
+        assert not any(container_pool._pool_root().iterdir())
+        assert not pool._idle[0].sock_dir.exists()
+
+
+# ---------------------------------------------------------------------------
+# Launch failures
+# ---------------------------------------------------------------------------
+
+class TestLaunchFailures:
+    """A lease whose attach fails goes back to the pool, cold path or not."""
+
+    def _launch(self, tmp_path, pool, create_fails: bool):
+        state = QALoopState(pr_id="pr-1", loop_id="loop", session_tag="tag",
+                            qa_workdir=str(tmp_path / "qa"))
+        state.scenarios = [QAScenario(index=1, title="s1", focus="f")]
+        repo = _git_repo(tmp_path / "src")
+        create = patch("pm_core.container.create_qa_container",
+                       side_effect=RuntimeError("no space") if create_fails else None)
+        with patch("pm_core.container_pool.get_pool", return_value=pool), \
+             patch.object(pool, "attach", side_effect=RuntimeError("rename failed")), \
+             patch.object(pool, "release", wraps=pool.release) as release, \
+             create, \
+             patch("pm_core.qa_loop._resolve_qa_model"), \
+             patch("pm_core.qa_loop._build_concretize_cmd", return_value="true"), \
+             patch("pm_core.qa_loop._concretize_scenario", return_value=(None, None)), \
+             patch("pm_core.qa_loop._build_scenario_run_cmd", return_value=("run", "/")), \
+             patch("pm_core.tmux.new_window_get_pane", return_value="%1"), \
+             patch("pm_core.tmux.split_pane_at", return_value="%2"), \
+             patch("pm_core.tmux.pane_window_id", return_value=None):
+            _launch_scenarios_in_containers(
+                state, {}, {"id": "pr-1", "branch": ""}, "sess", repo, str(repo))
+        return state, release
+
+    @pytest.mark.parametrize("create_fails", [False, True])
+    def test_attach_failure_releases_lease(self, pool, fake_runtime, tmp_path,
+                                           create_fails):
+        pool.size = 1
+        pool.fill(wait=True)
+        (warm,) = fake_runtime.containers
+        state, release = self._launch(tmp_path, pool, create_fails)
+        release.assert_called_once()
+        assert release.call_args.args[0].name == warm
+        assert warm not in fake_runtime.containers
+        assert not release.call_args.args[0].sock_dir.exists()
+        assert bool(state.scenarios[0].container_name) is not create_fails
+
+
+# ---------------------------------------------------------------------------
+# Dependency images
+# ---------------------------------------------------------------------------
+
+class TestDependencyImage:
+    """Pooled containers start on the repo's dependency image."""
+
+    @pytest.fixture
+    def repo(self, fake_runtime, tmp_path):
+        from pm_core import repo_image
+        repo = _git_repo(tmp_path / "src")
+        (repo / "requirements.txt").write_text("requests\n")
+        with patch.object(repo_image, "get_global_setting_value",
+                          return_value="wait"):
+            yield repo
+        repo_image.wait_for_builds(timeout=30)
+
+    def test_config_for_repo(self, repo, tmp_path):
+        config = container_mod.config_for_repo(ContainerConfig(), repo)
+        assert config.image.startswith("pm-deps-src-")
+        assert container_mod.config_for_repo(ContainerConfig(), None).image == \
+            container_mod.DEFAULT_IMAGE
+        custom = ContainerConfig(image="custom:1")
+        assert container_mod.config_for_repo(custom, repo) is custom
+
+    def test_pool_containers_use_it(self, repo, fake_runtime, tmp_path):
+        config = container_mod.config_for_repo(ContainerConfig(), repo)
+        pool = ContainerPool(config, session_tag="tag", size=1, root=tmp_path / "pool")
+        pool.fill(wait=True)
+        try:
+            (name,) = fake_runtime.containers
+            assert fake_runtime.containers[name]["image"] == config.image
+        finally:
+            pool.close()
+
+    def test_launch_resolves_it_from_repo(self, repo, tmp_path):
+        seen = []
+
+        def get_pool_spy(config, session_tag=None):
+            seen.append(config.image)
+            return None
+
+        state = QALoopState(pr_id="pr-1", loop_id="loop", session_tag="tag",
+                            qa_workdir=str(tmp_path / "qa"))
+        with patch("pm_core.container_pool.get_pool", get_pool_spy), \
+             patch("pm_core.qa_loop._resolve_qa_model"):
+            _launch_scenarios_in_containers(
+                state, {}, {"id": "pr-1", "branch": ""}, "sess", repo, str(repo))
+        assert len(seen) == 1 and seen[0].startswith("pm-deps-src-")
+
+
+# ---------------------------------------------------------------------------
+# Scenario time-to-first-prompt
+# ---------------------------------------------------------------------------
+
+class TestTimeToFirstPrompt:
+    def _launch(self, tmp_path, pool, n=2):
+        state = QALoopState(pr_id="pr-1", loop_id="loop", session_tag="tag",
+                            qa_workdir=str(tmp_path / "qa"))
+        state.scenarios = [QAScenario(index=i, title=f"s{i}", focus="f")
+                           for i in range(1, n + 1)]
+        repo = _git_repo(tmp_path / "src")
+        with patch("pm_core.container_pool.get_pool", return_value=pool), \
+             patch("pm_core.qa_loop._resolve_qa_model"), \
+             patch("pm_core.qa_loop._build_concretize_cmd", return_value="true"), \
+             patch("pm_core.qa_loop._concretize_scenario", return_value=(None, None)), \
+             patch("pm_core.qa_loop._build_scenario_run_cmd", return_value=("run", "/")), \
+             patch("pm_core.tmux.new_window_get_pane", return_value="%1"), \
+             patch("pm_core.tmux.split_pane_at", return_value="%2"), \
+             patch("pm_core.tmux.pane_window_id", return_value=None):
+            _launch_scenarios_in_containers(
+                state, {}, {"id": "pr-1", "branch": ""}, "sess", repo, str(repo))
+        return state
+
+    def test_pooled_scenarios_skip_container_startup(self, fake_runtime, tmp_path):
+        cold = self._launch(tmp_path / "cold", None)
+        cold_runs = [c for c in fake_runtime.calls_to("run") if "-qa-" in c[3]]
+        pool = ContainerPool(ContainerConfig(), session_tag="tag", size=2,
+                             root=tmp_path / "pool")
+        pool.fill(wait=True)
+        warm = self._launch(tmp_path / "warm", pool)
+        pool.close()
+
+        for state in (cold, warm):
+            assert all(s.container_name for s in state.scenarios)
+            assert all(s.time_to_first_prompt is not None for s in state.scenarios)
+        # The cold launch started each scenario's container on the critical
+        # path; the warm one only renamed already-running pool containers.
+        assert len(cold_runs) == 2
+        assert len([c for c in fake_runtime.calls_to("run") if "-qa-" in c[3]]) == 2
+        renamed = [c[-1] for c in fake_runtime.calls_to("rename")]
+        assert sorted(renamed) == sorted(s.container_name for s in warm.scenarios)
+
+    def test_written_to_status_file(self, tmp_path):
+        scenario = QAScenario(index=1, title="t", focus="f", time_to_first_prompt=1.234)
+        path = tmp_path / "qa_status.json"
+        _write_status_file(path, "pr-1", [scenario, QAScenario(2, "u", "f")], {})
+        import json
+        entries = json.loads(path.read_text())["scenarios"]
+        assert entries[0]["time_to_first_prompt"] == 1.23
+        assert "time_to_first_prompt" not in entries[1]
@@ -0,0 +1,230 @@
+"""Tests for the push proxy's shared upstream mirror and request coalescing.
+
+Every upstream here is a local bare repository reached through a
+``file://`` URL, which the proxy treats like any network remote.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from pm_core import git_mirror
+from pm_core.push_proxy import PushProxy
+
+
+def _git(*args, cwd=None) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.email=t@t.com", "-c", "user.name=T", *args],
+        cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _send(sock_path: str, request: dict) -> dict:
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.connect(sock_path)
+    s.sendall((json.dumps(request) + "\n").encode())
+    data = b""
+    while chunk := s.recv(4096):
+        data += chunk
+    s.close()
+    return json.loads(data)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("PATH", f"/usr/bin:{os.environ.get('PATH', '')}")
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    """A bare upstream with one commit, plus a working clone to advance it."""
+    bare = tmp_path / "upstream.git"
+    _git("init", "--bare", "-b", "master", str(bare))
+    work = tmp_path / "work"
+    _git("clone", str(bare), str(work))
+    _git("commit", "--allow-empty", "-m", "one", cwd=str(work))
+    _git("push", "origin", "master", cwd=str(work))
+    return {"url": f"file://{bare}", "bare": bare, "work": work}
+
+
+def _advance(upstream, message: str) -> str:
+    _git("commit", "--allow-empty", "-m", message, cwd=str(upstream["work"]))
+    _git("push", "origin", "master", cwd=str(upstream["work"]))
+    return _git("rev-parse", "HEAD", cwd=str(upstream["work"]))
+
+
+def _clone(upstream, path) -> str:
+    _git("clone", upstream["url"], str(path))
+    return str(path)
+
+
+@pytest.fixture
+def count_refreshes():
+    """Count upstream fetches made by the mirror."""
+    calls = []
+    real = git_mirror._git
+
+    def counting(*args, **kwargs):
+        if "fetch" in args:
+            calls.append(args)
+        return real(*args, **kwargs)
+
+    with patch.object(git_mirror, "_git", counting):
+        yield calls
+
+
+# ---------------------------------------------------------------------------
+# Mirror
+# ---------------------------------------------------------------------------
+
+class TestMirror:
+    def test_created_on_first_refresh(self, upstream):
+        path = git_mirror.refresh_mirror(upstream["url"], 30)
+        assert path == git_mirror.mirror_path(upstream["url"])
+        assert _git("--git-dir", str(path), "rev-parse", "refs/heads/master") == \
+            _git("rev-parse", "HEAD", cwd=str(upstream["work"]))
+
+    def test_refreshed_at_most_once_per_interval(self, upstream, count_refreshes):
+        path = git_mirror.refresh_mirror(upstream["url"], 30)
+        head = _advance(upstream, "two")
+        git_mirror.refresh_mirror(upstream["url"], 30)
+        assert len(count_refreshes) == 1
+        assert _git("--git-dir", str(path), "rev-parse", "master") != head
+
+        git_mirror.refresh_mirror(upstream["url"], 0)
+        assert len(count_refreshes) == 2
+        assert _git("--git-dir", str(path), "rev-parse", "master") == head
+
+    def test_invalidate_forces_refresh(self, upstream, count_refreshes):
+        git_mirror.refresh_mirror(upstream["url"], 30)
+        git_mirror.invalidate_mirror(upstream["url"])
+        git_mirror.refresh_mirror(upstream["url"], 30)
+        assert len(count_refreshes) == 2
+
+    def test_unreachable_upstream(self, tmp_path):
+        assert git_mirror.refresh_mirror(f"file://{tmp_path}/gone.git", 30) is None
+
+    def test_interval_setting(self):
+        with patch.object(git_mirror, "get_global_setting_value", return_value=""):
+            assert git_mirror.mirror_interval() == git_mirror.DEFAULT_INTERVAL
+        with patch.object(git_mirror, "get_global_setting_value", return_value="0"):
+            assert git_mirror.mirror_interval() == 0
+
+
+class TestMirrorCanServe:
+    @pytest.mark.parametrize("args, ok", [
+        ([], True),
+        (["origin"], True),
+        (["--prune", "origin", "master"], True),
+        (["origin", "+refs/heads/a:refs/remotes/origin/a"], True),
+        (["origin", "refs/tags/v1"], True),
+        (["origin", "refs/pull/12/head"], False),
+        (["origin", "deadbeef"], False),
+    ])
+    def test_refspecs(self, args, ok):
+        assert PushProxy._mirror_can_serve(args) is ok
+
+
+# ---------------------------------------------------------------------------
+# Through the proxy
+# ---------------------------------------------------------------------------
+
+class TestProxyFetch:
+    BRANCH = "pm/pr-mirror"
+
+    @pytest.fixture
+    def proxy(self, tmp_path, upstream):
+        sock = str(tmp_path / "proxy.sock")
+        p = PushProxy(sock, str(upstream["work"]), self.BRANCH)
+        p.start()
+        yield p
+        p.stop()
+
+    def test_scenario_fetches_share_one_upstream_fetch(
+            self, proxy, upstream, tmp_path, count_refreshes):
+        clones = [_clone(upstream, tmp_path / f"s{i}") for i in range(8)]
+        head = _advance(upstream, "two")
+
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            results = list(ex.map(lambda c: _send(proxy.socket_path, {
+                "cmd": "fetch", "args": ["origin"], "workdir": c}), clones))
+
+        assert [r["exit_code"] for r in results] == [0] * 8, results
+        assert len(count_refreshes) == 1
+        for clone in clones:
+            assert _git("rev-parse", "origin/master", cwd=clone) == head
+            # The caller's own remote config is untouched.
+            assert _git("remote", "get-url", "origin", cwd=clone) == upstream["url"]
+
+    def test_pull_served_from_mirror(self, proxy, upstream, tmp_path, count_refreshes):
+        clone = _clone(upstream, tmp_path / "s")
+        head = _advance(upstream, "two")
+        resp = _send(proxy.socket_path, {"cmd": "pull",
+                                         "args": ["origin", "master"],
+                                         "workdir": clone})
+        assert resp["exit_code"] == 0, resp["stderr"]
+        assert _git("rev-parse", "HEAD", cwd=clone) == head
+        assert len(count_refreshes) == 1
+
+    def test_push_makes_next_fetch_see_upstream(
+            self, proxy, upstream, tmp_path, count_refreshes):
+        pusher = _clone(upstream, tmp_path / "pusher")
+        reader = _clone(upstream, tmp_path / "reader")
+        assert _send(proxy.socket_path, {"cmd": "fetch", "args": ["origin"],
+                                         "workdir": reader})["exit_code"] == 0
+
+        _git("checkout", "-b", self.BRANCH, cwd=pusher)
+        _git("commit", "--allow-empty", "-m", "pushed", cwd=pusher)
+        resp = _send(proxy.socket_path, {"cmd": "push",
+                                         "args": ["origin", self.BRANCH],
+                                         "workdir": pusher})
+        assert resp["exit_code"] == 0, resp["stderr"]
+
+        assert _send(proxy.socket_path, {"cmd": "fetch", "args": ["origin"],
+                                         "workdir": reader})["exit_code"] == 0
+        assert _git("rev-parse", f"origin/{self.BRANCH}", cwd=reader) == \
+            _git("rev-parse", "HEAD", cwd=pusher)
+        assert len(count_refreshes) == 2
+
+    def test_interval_zero_fetches_upstream_directly(
+            self, proxy, upstream, tmp_path, count_refreshes):
+        clone = _clone(upstream, tmp_path / "s")
+        with patch.object(git_mirror, "mirror_interval", return_value=0):
+            resp = _send(proxy.socket_path, {"cmd": "fetch", "args": ["origin"],
+                                             "workdir": clone})
+        assert resp["exit_code"] == 0
+        assert count_refreshes == []
+        assert not git_mirror.mirror_path(upstream["url"]).exists()
+
+    def test_identical_ls_remotes_run_once(self, proxy, upstream, tmp_path):
+        clones = [_clone(upstream, tmp_path / f"s{i}") for i in range(6)]
+        runs = []
+        real = PushProxy._run_git
+
+        def slow_run(cmd, cwd, what, emit=None):
+            runs.append(cmd)
+            time.sleep(0.5)
+            return real(cmd, cwd, what, emit)
+
+        barrier = threading.Barrier(len(clones))
+
+        def ask(clone):
+            barrier.wait()
+            return _send(proxy.socket_path, {"cmd": "ls-remote",
+                                             "args": ["origin"],
+                                             "workdir": clone})
+
+        with patch.object(PushProxy, "_run_git", staticmethod(slow_run)), \
+                ThreadPoolExecutor(max_workers=len(clones)) as ex:
+            results = list(ex.map(ask, clones))
+
+        assert len(runs) == 1
+        assert all(r["exit_code"] == 0 and "refs/heads/master" in r["stdout"]
+                   for r in results)
@@ -363,3 +363,53 @@ def test_session_id_from_transcript(tmp_path):
 def test_session_id_from_transcript_missing(tmp_path):
     from pm_core.claude_launcher import session_id_from_transcript
     assert session_id_from_transcript(tmp_path / "nope.jsonl") is None
+
+
+@pytest.fixture
+def watcher(tmp_hooks_home, monkeypatch):
+    from pm_core import hook_events
+    monkeypatch.setattr(hook_events, "_HOOKS_BASE",
+                        tmp_hooks_home / ".pm" / "hooks")
+    w = hook_events.HookWatcher(tick=0.05)
+    yield w
+    w.close()
+
+
+def _later(delay: float, fn, *args) -> threading.Timer:
+    t = threading.Timer(delay, fn, args)
+    t.start()
+    return t
+
+
+def test_hook_watcher_reports_written_session(tmp_hooks_home, watcher):
+    _later(0.1, _write_event, tmp_hooks_home, "sid-a", "idle_prompt")
+    start = time.monotonic()
+    assert watcher.wait({"sid-a", "sid-b"}, timeout=5) == {"sid-a"}
+    assert time.monotonic() - start < 2
+
+
+def test_hook_watcher_ignores_unwatched_sessions(tmp_hooks_home, watcher):
+    _later(0.05, _write_event, tmp_hooks_home, "other", "idle_prompt")
+    start = time.monotonic()
+    assert watcher.wait({"sid-a"}, timeout=0.4) == set()
+    assert time.monotonic() - start >= 0.35
+
+
+def test_hook_watcher_wake(watcher):
+    _later(0.1, watcher.wake)
+    start = time.monotonic()
+    assert watcher.wait({"sid-a"}, timeout=5) == set()
+    assert time.monotonic() - start < 2
+
+
+def test_hook_watcher_mtime_fallback(tmp_hooks_home, monkeypatch):
+    from pm_core import hook_events
+    monkeypatch.setattr(hook_events, "_HOOKS_BASE",
+                        tmp_hooks_home / ".pm" / "hooks")
+    monkeypatch.setattr(hook_events, "_inotify_watch", lambda d: None)
+    with hook_events.HookWatcher(tick=0.05) as w:
+        assert not w.uses_inotify
+        w.wait({"sid-a"}, timeout=0)  # records the (missing) baseline
+        _later(0.1, _write_event, tmp_hooks_home, "sid-a", "idle_prompt")
+        assert w.wait({"sid-a"}, timeout=5) == {"sid-a"}
+        assert w.wait({"sid-a"}, timeout=0.1) == set()
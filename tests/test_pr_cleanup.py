@@ -1,7 +1,6 @@
 """Tests for the PR resource cleanup primitives."""
 
 import threading
-import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,7 +10,7 @@ from pm_core import pane_registry, pr_cleanup, runtime_state
 
 
 class TestCleanupPrContainers:
-    @patch("pm_core.container.remove_container")
+    @patch("pm_core.container.remove_containers", side_effect=list)
     @patch("pm_core.container._run_runtime")
     def test_legacy_prefix(self, mock_runtime, mock_remove):
         mock_runtime.return_value = MagicMock(
@@ -20,9 +19,9 @@ class TestCleanupPrContainers:
         )
         removed = container_mod.cleanup_pr_containers("pr-001")
         assert removed == ["pm-qa-pr-001-loop1-s0", "pm-qa-pr-001-loop1-s1"]
-        assert mock_remove.call_count == 2
+        mock_remove.assert_called_once_with(removed)
 
-    @patch("pm_core.container.remove_container")
+    @patch("pm_core.container.remove_containers", side_effect=list)
     @patch("pm_core.container._run_runtime")
     def test_session_tagged_and_legacy_dedup(self, mock_runtime, mock_remove):
         # Two prefix queries — one for tagged, one for legacy. Same container
@@ -33,9 +32,9 @@ class TestCleanupPrContainers:
         ]
         removed = container_mod.cleanup_pr_containers("pr-001", session_tag="mysess")
         assert removed == ["pm-mysess-qa-pr-001-l1-s0", "pm-qa-pr-001-l2-s0"]
-        assert mock_remove.call_count == 2
+        mock_remove.assert_called_once_with(removed)
 
-    @patch("pm_core.container.remove_container")
+    @patch("pm_core.container.remove_containers", side_effect=list)
     @patch("pm_core.container._run_runtime")
     def test_no_containers(self, mock_runtime, mock_remove):
         mock_runtime.return_value = MagicMock(returncode=0, stdout="")
@@ -43,25 +42,47 @@ class TestCleanupPrContainers:
         assert removed == []
         mock_remove.assert_not_called()
 
+    @patch("pm_core.container._stop_proxies")
     @patch("pm_core.container._run_runtime")
-    def test_parallel_removal(self, mock_runtime):
-        # Simulate four containers each taking 0.5s to remove. Sequential
-        # would be ~2s; parallel must finish closer to 0.5s.
-        names = [f"pm-qa-pr-001-l1-s{i}" for i in range(4)]
-        mock_runtime.return_value = MagicMock(
-            returncode=0, stdout="\n".join(names) + "\n")
-
-        def slow_remove(name):
-            time.sleep(0.5)
-
-        with patch("pm_core.container.remove_container", side_effect=slow_remove):
-            t0 = time.monotonic()
-            removed = container_mod.cleanup_pr_containers("pr-001")
-            elapsed = time.monotonic() - t0
+    def test_parallel_removal(self, mock_runtime, _mock_proxies):
+        # Two rm batches; each rm blocks until the other has started, so
+        # the removal only completes if the batches run concurrently.
+        names = [f"pm-qa-pr-001-l1-s{i}"
+                 for i in range(2 * container_mod._RM_BATCH)]
+        existing = set(names)
+        lock = threading.Lock()
+        both_started = threading.Barrier(2, timeout=10)
+        rm_calls = []
+
+        def runtime(*args, **kwargs):
+            if args[0] == "rm":
+                batch = args[2:]
+                both_started.wait()
+                with lock:
+                    rm_calls.append(batch)
+                    existing.difference_update(batch)
+                return MagicMock(returncode=0, stdout="")
+            with lock:
+                listed = sorted(existing)
+            return MagicMock(returncode=0, stdout="\n".join(listed) + "\n")
+
+        mock_runtime.side_effect = runtime
+        removed = container_mod.cleanup_pr_containers("pr-001")
 
         assert sorted(removed) == sorted(names)
-        # Generous bound — sequential would be 2.0s; parallel ~0.5s.
-        assert elapsed < 1.5, f"removal not parallel: {elapsed:.2f}s"
+        assert len(rm_calls) == 2
+        assert sorted(n for batch in rm_calls for n in batch) == sorted(names)
+
+    @patch("pm_core.container.remove_containers_async")
+    @patch("pm_core.container.remove_containers")
+    @patch("pm_core.container._run_runtime")
+    def test_no_wait_queues(self, mock_runtime, mock_remove, mock_async):
+        mock_runtime.return_value = MagicMock(
+            returncode=0, stdout="pm-qa-pr-001-l1-s0\n")
+        removed = container_mod.cleanup_pr_containers("pr-001", wait=False)
+        assert removed == ["pm-qa-pr-001-l1-s0"]
+        mock_async.assert_called_once_with(removed)
+        mock_remove.assert_not_called()
 
 
 class TestUnregisterWindows:
@@ -99,7 +120,7 @@ class TestCleanupPrResources:
         assert summary["registry_windows"] == ["pr-001"]
         # Session tag should strip the pm- prefix
         mock_container.cleanup_pr_containers.assert_called_once_with(
-            "pr-001", session_tag="mysess")
+            "pr-001", session_tag="mysess", wait=True)
 
     def test_clears_runtime_state_file(self, tmp_path, monkeypatch):
         # Reproducer for the stale-state bug: after cleanup, a fresh
@@ -22,6 +22,12 @@ from pm_core.push_proxy import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _isolated_home(tmp_path, monkeypatch):
+    """Keep upstream mirrors made by real-git tests out of the real ~/.pm."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+
 @pytest.fixture
 def sock_path(tmp_path):
     return str(tmp_path / "test.sock")
@@ -730,3 +736,181 @@ class TestIntegrationFetchPull:
 
         finally:
             proxy.stop()
+
+
+# ---------------------------------------------------------------------------
+# Streaming and concurrency
+# ---------------------------------------------------------------------------
+
+def _send_streaming(sock_path: str, request: dict) -> tuple[list[dict], dict]:
+    """Send a ``"stream": true`` request; return (output frames, final frame)."""
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.connect(sock_path)
+    s.sendall((json.dumps({**request, "stream": True}) + "\n").encode())
+    frames = [json.loads(line) for line in s.makefile("rb")]
+    s.close()
+    assert frames and "exit_code" in frames[-1]
+    return frames[:-1], frames[-1]
+
+
+def _git(*args, cwd=None):
+    subprocess.run(["git", "-c", "user.email=t@t.com", "-c", "user.name=T",
+                    *args], cwd=cwd, check=True, capture_output=True)
+
+
+class TestStreaming:
+    def test_output_forwarded_before_command_exits(self):
+        import sys
+        import time
+        seen: list[tuple[float, str, str]] = []
+        script = ("import sys, time\n"
+                  "print('first', flush=True)\n"
+                  "sys.stderr.write('progress\\n'); sys.stderr.flush()\n"
+                  "time.sleep(0.5)\n"
+                  "print('last')\n")
+        resp = PushProxy._run_git(
+            [sys.executable, "-c", script], None, "test",
+            lambda stream, data: seen.append((time.monotonic(), stream, data)))
+        done = time.monotonic()
+        assert resp == {"exit_code": 0, "stdout": "", "stderr": ""}
+        assert "".join(d for _, s, d in seen if s == "stdout") == "first\nlast\n"
+        assert "".join(d for _, s, d in seen if s == "stderr") == "progress\n"
+        assert done - seen[0][0] >= 0.4
+
+    def test_rejection_arrives_as_final_frame(self, proxy, sock_path):
+        frames, final = _send_streaming(sock_path,
+                                        {"args": ["origin", "main"]})
+        assert frames == []
+        assert final["exit_code"] == 1
+        assert "not allowed" in final["stderr"]
+
+    def test_buffered_request_unchanged(self, proxy, sock_path):
+        resp = _send_request(sock_path, {"cmd": "bogus"})
+        assert set(resp) == {"exit_code", "stdout", "stderr"}
+
+
+class TestConcurrentClients:
+    """Load tests against real bare repos: many clients, one proxy."""
+
+    BRANCH = "pm/pr-load"
+
+    @pytest.fixture
+    def repos(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PATH", f"/usr/bin:{os.environ.get('PATH', '')}")
+        bare = tmp_path / "bare.git"
+        _git("init", "--bare", "-b", "master", str(bare))
+        seed = tmp_path / "seed"
+        _git("clone", str(bare), str(seed))
+        for i in range(20):
+            (seed / f"f{i}.txt").write_text(f"{i}\n" * 2000)
+        _git("add", ".", cwd=str(seed))
+        _git("commit", "-m", "seed", cwd=str(seed))
+        _git("push", "origin", "master", cwd=str(seed))
+        clones = []
+        for i in range(8):
+            clone = tmp_path / f"clone{i}"
+            _git("clone", str(bare), str(clone))
+            # A URL origin, as scenario clones have; local paths are refused.
+            _git("remote", "set-url", "origin", f"file://{bare}", cwd=str(clone))
+            _git("checkout", "-b", self.BRANCH, cwd=str(clone))
+            _git("commit", "--allow-empty", "-m", f"c{i}", cwd=str(clone))
+            clones.append(clone)
+        return bare, clones
+
+    @pytest.fixture
+    def load_proxy(self, sock_path, repos):
+        p = PushProxy(sock_path, str(repos[1][0]), self.BRANCH)
+        p.start()
+        yield p
+        p.stop()
+
+    def test_idle_client_does_not_block_others(self, load_proxy, sock_path, repos):
+        import time
+        idle = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        idle.connect(sock_path)
+        try:
+            start = time.monotonic()
+            resp = _send_request(sock_path, {"cmd": "ls-remote",
+                                             "args": ["origin"],
+                                             "workdir": str(repos[1][1])})
+            assert resp["exit_code"] == 0, resp["stderr"]
+            assert "refs/heads/master" in resp["stdout"]
+            assert time.monotonic() - start < 10
+        finally:
+            idle.close()
+
+    def test_many_clients_fetch_and_push(self, load_proxy, sock_path, repos):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        _, clones = repos
+        active = 0
+        peak = 0
+        guard = threading.Lock()
+        real_push = PushProxy._local_push
+
+        def counting_push(self, *args, **kwargs):
+            nonlocal active, peak
+            with guard:
+                active += 1
+                peak = max(peak, active)
+            try:
+                return real_push(self, *args, **kwargs)
+            finally:
+                with guard:
+                    active -= 1
+
+        def client(i):
+            clone = str(clones[i % len(clones)])
+            if i % 4 == 0:
+                return _send_streaming(sock_path, {
+                    "cmd": "push", "workdir": clone,
+                    "args": ["--force", "origin", self.BRANCH]})[1]
+            frames, final = _send_streaming(sock_path, {
+                "cmd": "fetch", "workdir": clone, "args": ["origin"]})
+            return {**final, "frames": frames}
+
+        with patch.object(PushProxy, "_local_push", counting_push), \
+                ThreadPoolExecutor(max_workers=32) as ex:
+            results = list(ex.map(client, range(32)))
+
+        assert [r["exit_code"] for r in results] == [0] * 32, \
+            [r for r in results if r["exit_code"]]
+        assert peak == 1, "pushes to one branch must not overlap"
+        assert subprocess.check_output(
+            ["git", "-C", str(repos[0]), "rev-parse", "--verify",
+             f"refs/heads/{self.BRANCH}"]).strip()
+
+
+class TestWrapperClient:
+    """The in-container git wrapper talks to a real proxy end to end."""
+
+    def test_streamed_reply_reaches_stdout(self, tmp_path, sock_path, monkeypatch):
+        from pm_core.container import _build_git_setup_script
+        monkeypatch.setenv("PATH", f"/usr/bin:{os.environ.get('PATH', '')}")
+        bare = tmp_path / "bare.git"
+        _git("init", "--bare", "-b", "master", str(bare))
+        clone = tmp_path / "clone"
+        _git("clone", str(bare), str(clone))
+        _git("commit", "--allow-empty", "-m", "c", cwd=str(clone))
+        _git("push", "origin", "master", cwd=str(clone))
+
+        script = _build_git_setup_script(has_push_proxy=True,
+                                         host_workdir=str(clone))
+        body = script.split("<< 'WRAPEOF'\n", 1)[1].split("WRAPEOF\n", 1)[0]
+        wrapper = tmp_path / "git"
+        wrapper.write_text(body.replace(_CONTAINER_SOCKET_PATH, sock_path))
+
+        proxy = PushProxy(sock_path, str(clone), "pm/pr-x")
+        proxy.start()
+        try:
+            ok = subprocess.run(["sh", str(wrapper), "ls-remote", "origin"],
+                                capture_output=True, text=True, timeout=30)
+            rejected = subprocess.run(
+                ["sh", str(wrapper), "push", "origin", "master"],
+                capture_output=True, text=True, timeout=30)
+        finally:
+            proxy.stop()
+        assert ok.returncode == 0, ok.stderr
+        assert "refs/heads/master" in ok.stdout
+        assert rejected.returncode == 1
+        assert "not allowed" in rejected.stderr
@@ -0,0 +1,178 @@
+"""Tests for the scenario concretization stage of QA launch.
+
+Refiners are real ``bin/fake-claude`` processes (``--verdict
+REFINED_STEPS`` with a per-scenario ``--delay``) started when their tmux
+window would be created; tmux itself and workdir cloning are stubbed, the
+latter with a per-scenario delay.  Times are measured from the start of
+the launch to each scenario's worker pane being split.
+"""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pm_core.loop_shared import extract_between_markers
+from pm_core.qa_loop import QALoopState, QAScenario, _launch_scenarios_in_tmux
+
+FAKE_CLAUDE = Path(__file__).resolve().parent.parent / "bin" / "fake-claude"
+
+
+class _Launch:
+    """Run _launch_scenarios_in_tmux with fake refiners; record timings."""
+
+    def __init__(self, tmp_path: Path, prep: dict[int, float],
+                 refine: dict[int, float], parallel: int = 0):
+        self.tmp_path = tmp_path
+        self.prep = prep
+        self.refine = refine
+        self.parallel = parallel
+        self.lock = threading.Lock()
+        self.procs: dict[str, subprocess.Popen] = {}
+        self.pane_scenario: dict[str, int] = {}
+        self.running = 0
+        self.peak = 0
+        self.launched: dict[int, float] = {}
+        self.start = 0.0
+
+    def _workdir(self, qa_workdir, index, **kwargs):
+        time.sleep(self.prep[index])
+        clone = qa_workdir / f"s-{index}" / "repo"
+        scratch = qa_workdir / f"s-{index}" / "scratch"
+        clone.mkdir(parents=True)
+        scratch.mkdir(parents=True)
+        return clone, scratch
+
+    def _concretize_cmd(self, scenario, *args, **kwargs):
+        return (f"{sys.executable} {FAKE_CLAUDE} --verdict REFINED_STEPS "
+                f"--preamble 0 --delay {self.refine[scenario.index]} "
+                f"--body 'steps for {scenario.index}'")
+
+    def _new_window(self, session, name, cmd, cwd, switch=False):
+        proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True)
+        with self.lock:
+            pane = f"%{len(self.procs) + 1}"
+            self.procs[pane] = proc
+            self.pane_scenario[pane] = int(name.rsplit("s", 1)[1])
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        return pane
+
+    def _concretize(self, scenario, pr_data, data, pane_id, **kwargs):
+        out, _ = self.procs[pane_id].communicate(timeout=60)
+        with self.lock:
+            self.running -= 1
+        return extract_between_markers(
+            out, "REFINED_STEPS_START", "REFINED_STEPS_END"), None
+
+    def _split(self, pane_id, direction, cmd, background=False, cwd=None):
+        with self.lock:
+            self.launched[self.pane_scenario[pane_id]] = (
+                time.monotonic() - self.start)
+        return pane_id + "-worker"
+
+    def run(self) -> QALoopState:
+        state = QALoopState(pr_id="pr-1", loop_id="loop",
+                            qa_workdir=str(self.tmp_path / "qa"))
+        state.scenarios = [QAScenario(index=i, title=f"s{i}", focus="f")
+                           for i in sorted(self.prep)]
+        with patch("pm_core.qa_loop.create_scenario_workdir", self._workdir), \
+             patch("pm_core.qa_loop._resolve_qa_model"), \
+             patch("pm_core.qa_loop._build_concretize_cmd", self._concretize_cmd), \
+             patch("pm_core.qa_loop._concretize_scenario", self._concretize), \
+             patch("pm_core.qa_loop._build_scenario_run_cmd",
+                   return_value=("run", "/")), \
+             patch("pm_core.qa_loop._get_concretize_parallel",
+                   return_value=self.parallel), \
+             patch("pm_core.tmux.new_window_get_pane", self._new_window), \
+             patch("pm_core.tmux.split_pane_at", self._split), \
+             patch("pm_core.tmux.pane_window_id", return_value=None):
+            self.start = time.monotonic()
+            _launch_scenarios_in_tmux(
+                state, {}, {"id": "pr-1", "branch": "b"}, "sess", None,
+                str(self.tmp_path))
+        return state
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _warm_fake_claude():
+    # The first interpreter start pays for cold caches; keep that out of
+    # the timings.
+    subprocess.run([sys.executable, str(FAKE_CLAUDE), "--verdict", "PASS",
+                    "--preamble", "0"], capture_output=True, check=True)
+
+
+class TestLaunchOrder:
+    def test_workers_launch_in_refinement_order(self, tmp_path):
+        n = 5
+        launch = _Launch(tmp_path, prep={i: 0 for i in range(1, n + 1)},
+                         refine={i: 0.3 * (n - i + 1) for i in range(1, n + 1)})
+        state = launch.run()
+        order = sorted(launch.launched, key=launch.launched.get)
+        assert order == list(range(n, 0, -1))
+        assert [s.steps for s in state.scenarios] == [
+            f"steps for {i}" for i in range(1, n + 1)]
+
+    def test_slow_preparation_does_not_hold_back_others(self, tmp_path):
+        prep = {1: 2.5, 2: 0, 3: 0, 4: 0}
+        launch = _Launch(tmp_path, prep=prep, refine={i: 0.1 for i in prep})
+        launch.run()
+        assert max(launch.launched[i] for i in (2, 3, 4)) < 2.0
+        assert launch.launched[1] >= 2.5
+
+    def test_rejected_scenario_not_launched(self, tmp_path):
+        launch = _Launch(tmp_path, prep={1: 0, 2: 0}, refine={1: 0, 2: 0})
+        real = launch._concretize
+
+        def concretize(scenario, *args, **kwargs):
+            refined, _ = real(scenario, *args, **kwargs)
+            return (None, "no such feature") if scenario.index == 1 else (refined, None)
+
+        launch._concretize = concretize
+        state = launch.run()
+        assert set(launch.launched) == {2}
+        assert state.scenario_verdicts[1] == "INPUT_REQUIRED"
+
+
+class TestParallelism:
+    def test_refiners_bounded(self, tmp_path):
+        launch = _Launch(tmp_path, prep={i: 0 for i in range(1, 7)},
+                         refine={i: 0.4 for i in range(1, 7)}, parallel=2)
+        launch.run()
+        assert len(launch.launched) == 6
+        assert launch.peak == 2
+
+    def test_unbounded_when_zero(self, tmp_path):
+        launch = _Launch(tmp_path, prep={i: 0 for i in range(1, 5)},
+                         refine={i: 1.0 for i in range(1, 5)}, parallel=0)
+        launch.run()
+        assert launch.peak == 4
+
+
+class TestTimeToRunning:
+    def test_plan_to_scenarios_running(self, tmp_path):
+        """Eight scenarios with uneven clone and refinement times.
+
+        Each worker should start about when its own clone + refinement
+        is done.  Waiting for every clone before collecting refiners
+        would put every start after the slowest clone.
+        """
+        prep = {i: (2.0 if i == 1 else 0.1 * (i % 3)) for i in range(1, 9)}
+        refine = {i: 0.2 + 0.15 * (i % 4) for i in range(1, 9)}
+        launch = _Launch(tmp_path, prep=prep, refine=refine)
+        launch.run()
+
+        times = launch.launched
+        barrier = max(prep.values())
+        mean = sum(times.values()) / len(times)
+        print(f"\nplan -> all running {max(times.values()):.2f}s, "
+              f"mean per scenario {mean:.2f}s "
+              f"(slowest clone alone {barrier:.2f}s)")
+        assert len(times) == 8
+        assert sum(1 for i, t in times.items() if t < barrier) >= 6
+        assert mean < barrier
@@ -0,0 +1,212 @@
+"""Harness for the cost of QA verdict polling while scenarios are busy.
+
+Runs ``_poll_tmux_verdicts`` against 32 fake scenarios (tmux, transcripts
+and verification are stubbed; hook event files are real) and measures,
+per minute of idle waiting at the real ``_POLL_INTERVAL``:
+
+  * CPU time used by the polling thread,
+  * state-file writes (qa_status.json / qa_resume.json),
+  * hook-file and transcript reads, and tmux calls.
+
+The loop runs with a shortened interval so a few seconds of wall time
+cover several simulated minutes of idle ticks.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pm_core import hook_events, qa_loop
+from pm_core.qa_loop import QALoopState, QAScenario, _poll_tmux_verdicts
+
+N_SCENARIOS = 32
+_TICK = 0.02
+# The interval a real run waits between liveness checks.
+_REAL_INTERVAL = qa_loop._POLL_INTERVAL
+
+
+def _write_event(hooks: Path, session_id: str, ts: float) -> None:
+    tmp = hooks / f".{session_id}.tmp"
+    tmp.write_text(json.dumps({"event_type": "idle_prompt", "timestamp": ts,
+                               "session_id": session_id}))
+    tmp.rename(hooks / f"{session_id}.json")
+
+
+class _Harness:
+    """32 busy scenarios plus counters for everything the loop touches."""
+
+    def __init__(self, tmp_path: Path, poll_interval: float):
+        self.hooks = tmp_path / "hooks"
+        self.hooks.mkdir()
+        self.workdir = tmp_path / "qa"
+        self.workdir.mkdir()
+        self.poll_interval = poll_interval
+        self.state = QALoopState(pr_id="pr-001")
+        self.state.qa_workdir = str(self.workdir)
+        for i in range(1, N_SCENARIOS + 1):
+            s = QAScenario(index=i, title=f"Scenario {i}", focus="f")
+            s.window_name = f"qa-pr-001-s{i}"
+            s.pane_id = f"%{i}"
+            s.session_id = f"sid-{i}"
+            s.transcript_path = str(tmp_path / f"t{i}.jsonl")
+            self.state.scenarios.append(s)
+            # Each agent has finished an earlier turn without a verdict.
+            _write_event(self.hooks, s.session_id, time.time() - 60)
+        self.verdicts: dict[str, str] = {}
+        self.counts = {"writes": 0, "hook_reads": 0, "transcript_reads": 0,
+                       "tmux_calls": 0, "ticks": 0}
+        self.thread: threading.Thread | None = None
+        self.error: BaseException | None = None
+
+    def snapshot(self) -> dict:
+        counts = dict(self.counts)
+        counts["cpu"] = time.clock_gettime(
+            time.pthread_getcpuclockid(self.thread.ident))
+        return counts
+
+    def start(self) -> None:
+        real_write = qa_loop._write_json_if_changed
+        real_read = hook_events.read_event
+        panes = {s.pane_id for s in self.state.scenarios}
+
+        def write(path, data):
+            wrote = real_write(path, data)
+            self.counts["writes"] += wrote
+            return wrote
+
+        def read_event(sid):
+            self.counts["hook_reads"] += 1
+            return real_read(sid)
+
+        def extract(path, verdicts):
+            self.counts["transcript_reads"] += 1
+            return self.verdicts.get(path)
+
+        def live_panes():
+            self.counts["tmux_calls"] += 1
+            self.counts["ticks"] += 1
+            return panes
+
+        def pane_exists(pane_id):
+            self.counts["tmux_calls"] += 1
+            return True
+
+        def run():
+            with patch.object(hook_events, "_HOOKS_BASE", self.hooks), \
+                    patch.object(qa_loop, "_POLL_INTERVAL", self.poll_interval), \
+                    patch.object(qa_loop, "_VERDICT_GRACE_PERIOD", 0), \
+                    patch.object(qa_loop, "_write_json_if_changed", write), \
+                    patch.object(hook_events, "read_event", read_event), \
+                    patch.object(qa_loop, "extract_verdict_from_transcript", extract), \
+                    patch("pm_core.tmux.live_pane_ids", live_panes), \
+                    patch("pm_core.tmux.pane_exists", pane_exists), \
+                    patch("pm_core.qa_scheduler.get_scheduler", return_value=None), \
+                    patch.object(qa_loop, "_get_verdict_reminder_timeout",
+                                 return_value=None), \
+                    patch.object(qa_loop, "_is_verification_enabled",
+                                 return_value=False):
+                try:
+                    _poll_tmux_verdicts(
+                        self.state, {}, {}, "sess", str(self.workdir),
+                        self.workdir / "qa_status.json", lambda *a: None)
+                except BaseException as exc:  # surfaced by the test
+                    self.error = exc
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.state.stop_requested = True
+        self.thread.join(timeout=10)
+        assert not self.thread.is_alive()
+        assert self.error is None
+
+
+@pytest.fixture
+def idle_run(tmp_path):
+    harness = _Harness(tmp_path, poll_interval=_TICK)
+    harness.start()
+    yield harness
+    if harness.thread.is_alive():
+        harness.stop()
+
+
+class TestIdleCost:
+    def _idle_window(self, harness: _Harness, seconds: float = 1.5) -> dict:
+        time.sleep(0.5)  # first pass: existing hook events are examined
+        before = harness.snapshot()
+        time.sleep(seconds)
+        after = harness.snapshot()
+        delta = {k: after[k] - before[k] for k in before}
+        # Scale per-tick costs to a minute of ticks at the real interval.
+        per_minute = 60 / _REAL_INTERVAL / max(1, delta["ticks"])
+        return {k: v * per_minute for k, v in delta.items() if k != "ticks"} | {
+            "ticks": delta["ticks"]}
+
+    def test_idle_loop_reads_and_writes_nothing(self, idle_run):
+        cost = self._idle_window(idle_run)
+        assert cost["ticks"] >= 10
+        assert cost["writes"] == 0
+        assert cost["hook_reads"] == 0
+        assert cost["transcript_reads"] == 0
+        # One batched liveness query per tick, not one per scenario.
+        assert cost["tmux_calls"] == pytest.approx(60 / _REAL_INTERVAL)
+
+    def test_idle_cpu_per_minute(self, idle_run):
+        cost = self._idle_window(idle_run)
+        print(f"\n32 idle scenarios: {cost['cpu'] * 1000:.1f} ms CPU, "
+              f"{cost['writes']:.0f} writes per minute")
+        assert cost["cpu"] < 0.25
+
+    def test_initial_pass_examines_every_scenario_once(self, idle_run):
+        time.sleep(0.5)
+        assert idle_run.counts["hook_reads"] == N_SCENARIOS
+        assert idle_run.counts["transcript_reads"] == N_SCENARIOS
+        # Status file is not rewritten, resume snapshot written once.
+        assert idle_run.counts["writes"] == 1
+
+
+class TestEventWakeup:
+    def test_verdicts_arrive_without_waiting_for_interval(self, tmp_path):
+        """With a 30s interval, hook events still wake the loop at once."""
+        real_wait = hook_events.HookWatcher.wait
+        woken_by = []
+
+        def wait(watcher, session_ids, timeout):
+            changed = real_wait(watcher, session_ids, timeout)
+            woken_by.append(changed)
+            return changed
+
+        harness = _Harness(tmp_path, poll_interval=30)
+        with patch.object(hook_events.HookWatcher, "wait", wait):
+            harness.start()
+            time.sleep(0.3)
+            for s in harness.state.scenarios:
+                harness.verdicts[s.transcript_path] = "PASS"
+                _write_event(harness.hooks, s.session_id, time.time())
+            harness.thread.join(timeout=60)
+        assert not harness.thread.is_alive()
+        assert harness.error is None
+        # Every wait ended on hook activity; none ran out its interval.
+        assert woken_by and all(woken_by)
+        assert set(harness.state.scenario_verdicts.values()) == {"PASS"}
+        assert len(harness.state.scenario_verdicts) == N_SCENARIOS
+
+    def test_other_sessions_do_not_trigger_reads(self, idle_run):
+        time.sleep(0.5)
+        reads = idle_run.counts["hook_reads"]
+        for i in range(20):
+            _write_event(idle_run.hooks, f"unrelated-{i}", time.time())
+        time.sleep(0.3)
+        assert idle_run.counts["hook_reads"] == reads
+
+    def test_event_reads_only_that_scenario(self, idle_run):
+        time.sleep(0.5)
+        reads = idle_run.counts["hook_reads"]
+        _write_event(idle_run.hooks, "sid-7", time.time())
+        time.sleep(0.3)
+        assert idle_run.counts["hook_reads"] == reads + 1
@@ -1650,6 +1650,8 @@ class TestScenarioRetryLogic:
         with patch("pm_core.qa_loop._get_scenario_pane", side_effect=pane_side_effect), \
              patch("pm_core.qa_loop._relaunch_scenario_window", return_value=True) as mock_relaunch, \
              patch("pm_core.qa_loop.time.sleep"), \
+             patch("pm_core.hook_events.HookWatcher.wait", return_value=set()), \
+             patch("pm_core.tmux.live_pane_ids", return_value=None), \
              patch("pm_core.qa_loop.time.monotonic", side_effect=[
                  0,    # grace_start
                  100,  # 1st poll: past grace
@@ -1696,6 +1698,8 @@ class TestScenarioRetryLogic:
         with patch("pm_core.qa_loop._get_scenario_pane", return_value=None), \
              patch("pm_core.qa_loop._relaunch_scenario_window", return_value=True) as mock_relaunch, \
              patch("pm_core.qa_loop.time.sleep"), \
+             patch("pm_core.hook_events.HookWatcher.wait", return_value=set()), \
+             patch("pm_core.tmux.live_pane_ids", return_value=None), \
              patch("pm_core.qa_loop.time.monotonic", side_effect=monotonic_values), \
              patch("pm_core.qa_loop._write_status_file"):
 
@@ -1741,6 +1745,8 @@ class TestScenarioRetryLogic:
         with patch("pm_core.qa_loop._get_scenario_pane", side_effect=pane_results), \
              patch("pm_core.qa_loop._relaunch_scenario_window", side_effect=relaunch_results) as mock_relaunch, \
              patch("pm_core.qa_loop.time.sleep"), \
+             patch("pm_core.hook_events.HookWatcher.wait", return_value=set()), \
+             patch("pm_core.tmux.live_pane_ids", return_value=None), \
              patch("pm_core.qa_loop.time.monotonic", side_effect=monotonic_vals), \
              patch("pm_core.hook_events.read_event", return_value=fake_event), \
              patch("pm_core.qa_loop.extract_verdict_from_transcript", return_value="PASS"), \
@@ -377,6 +377,8 @@ def test_resumed_pass_skips_reverification(tmp_path):
 
     with patch("pm_core.qa_loop._get_scenario_pane", return_value="%1"), \
          patch("pm_core.qa_loop.time.sleep"), \
+         patch("pm_core.hook_events.HookWatcher.wait", return_value=set()), \
+         patch("pm_core.tmux.live_pane_ids", return_value=None), \
          patch("pm_core.qa_loop.time.monotonic", side_effect=[0, 100]), \
          patch("pm_core.hook_events.read_event", return_value=fake_event), \
          patch("pm_core.qa_loop.extract_verdict_from_transcript",
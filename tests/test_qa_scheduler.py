@@ -0,0 +1,270 @@
+"""Tests for the host-wide QA scenario scheduler.
+
+Loops are simulated: each is just a loop id with scenario indices, and a
+"running" scenario is one the test has not yet reported finished via
+``admit(active=...)``.
+"""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pm_core import qa_scheduler
+from pm_core.qa_loop import QAScenario, _write_status_file
+from pm_core.qa_scheduler import QAScheduler, dependency_priority
+
+
+@pytest.fixture
+def sched_path(tmp_path) -> Path:
+    return tmp_path / "qa-scheduler.json"
+
+
+def _state(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+# ---------------------------------------------------------------------------
+# Settings
+# ---------------------------------------------------------------------------
+
+class TestGetScheduler:
+    def test_disabled_by_default(self):
+        with patch("pm_core.qa_scheduler.get_global_setting_value",
+                   return_value=""):
+            assert qa_scheduler.get_scheduler() is None
+
+    def test_enabled_with_budget(self):
+        with patch("pm_core.qa_scheduler.get_global_setting_value",
+                   return_value="6"):
+            sched = qa_scheduler.get_scheduler()
+        assert sched is not None and sched.budget == 6
+
+    def test_garbage_is_disabled(self):
+        with patch("pm_core.qa_scheduler.get_global_setting_value",
+                   return_value="lots"):
+            assert qa_scheduler.get_scheduler() is None
+
+    def test_release_loop_noop_when_disabled(self):
+        with patch("pm_core.qa_scheduler.get_global_setting_value",
+                   return_value="0"), \
+                patch.object(QAScheduler, "release") as release:
+            qa_scheduler.release_loop("abc")
+        release.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Dependency priority
+# ---------------------------------------------------------------------------
+
+class TestDependencyPriority:
+    PRS = [
+        {"id": "pr-a", "status": "qa"},
+        {"id": "pr-b", "status": "pending", "depends_on": ["pr-a"]},
+        {"id": "pr-c", "status": "pending", "depends_on": ["pr-b"]},
+        {"id": "pr-d", "status": "merged", "depends_on": ["pr-a"]},
+        {"id": "pr-e", "status": "qa"},
+    ]
+
+    def test_counts_transitive_open_dependents(self):
+        assert dependency_priority(self.PRS, "pr-a") == 2
+        assert dependency_priority(self.PRS, "pr-b") == 1
+
+    def test_leaf_has_zero(self):
+        assert dependency_priority(self.PRS, "pr-e") == 0
+        assert dependency_priority(self.PRS, "pr-missing") == 0
+
+    def test_cycle_terminates(self):
+        prs = [{"id": "x", "depends_on": ["y"]}, {"id": "y", "depends_on": ["x"]}]
+        assert dependency_priority(prs, "x") == 2
+
+
+# ---------------------------------------------------------------------------
+# Admission
+# ---------------------------------------------------------------------------
+
+class TestAdmission:
+    def test_budget_shared_across_loops(self, sched_path):
+        sched = QAScheduler(4, sched_path)
+        sched.enqueue("L1", "pr-1", range(1, 5))
+        sched.enqueue("L2", "pr-2", range(1, 5))
+        first = sched.admit("L1")
+        second = sched.admit("L2")
+        assert len(first) + len(second) == 4
+        assert len(_state(sched_path)["running"]) == 4
+
+    def test_older_request_served_first(self, sched_path):
+        sched = QAScheduler(2, sched_path)
+        sched.enqueue("L1", "pr-1", [1, 2])
+        time.sleep(0.01)
+        sched.enqueue("L2", "pr-2", [1, 2])
+        # L2 asks first but L1's requests are older: its slots are held
+        # for L1 rather than handed to L2.
+        assert sched.admit("L2") == []
+        assert sched.admit("L1") == [1, 2]
+
+    def test_priority_beats_age(self, sched_path):
+        sched = QAScheduler(1, sched_path)
+        sched.enqueue("leaf", "pr-leaf", [1])
+        time.sleep(0.01)
+        sched.enqueue("root", "pr-root", [1], priority=3)
+        assert sched.admit("leaf") == []
+        assert sched.admit("root") == [1]
+
+    def test_waiting_earns_priority(self, sched_path):
+        sched = QAScheduler(1, sched_path)
+        sched.enqueue("old", "pr-old", [1])
+        later = time.time() + 3 * qa_scheduler._AGE_CREDIT
+        with patch("pm_core.qa_scheduler.time.time", return_value=later):
+            sched.enqueue("new", "pr-new", [1], priority=2)
+            assert sched.positions("old") == {1: 1}
+            assert sched.admit("old") == [1]
+
+    def test_loop_cap_respected(self, sched_path):
+        sched = QAScheduler(8, sched_path)
+        sched.enqueue("L1", "pr-1", range(1, 6), loop_cap=2)
+        assert sched.admit("L1") == [1, 2]
+        assert sched.admit("L1") == []
+        # A capped loop does not hold back others.
+        sched.enqueue("L2", "pr-2", [1])
+        assert sched.admit("L2") == [1]
+
+    def test_finished_scenarios_free_slots(self, sched_path):
+        sched = QAScheduler(2, sched_path)
+        sched.enqueue("L1", "pr-1", [1, 2, 3])
+        assert sched.admit("L1") == [1, 2]
+        assert sched.admit("L1", active={1, 2}) == []
+        assert sched.admit("L1", active={2}, limit=1) == [3]
+
+    def test_limit(self, sched_path):
+        sched = QAScheduler(5, sched_path)
+        sched.enqueue("L1", "pr-1", [1, 2, 3])
+        assert sched.admit("L1", limit=1) == [1]
+        assert sched.admit("L1", limit=1) == [2]
+
+    def test_enqueue_is_idempotent(self, sched_path):
+        sched = QAScheduler(1, sched_path)
+        sched.enqueue("L1", "pr-1", [1, 2])
+        requested = _state(sched_path)["waiting"]["L1:2"]["requested_at"]
+        sched.admit("L1")
+        sched.enqueue("L1", "pr-1", [2])
+        state = _state(sched_path)
+        assert list(state["running"]) == ["L1:1"]
+        assert state["waiting"]["L1:2"]["requested_at"] == requested
+
+    def test_resumed_loop_holds_running_slots(self, sched_path):
+        sched = QAScheduler(2, sched_path)
+        sched.enqueue("L1", "pr-1", [3], running=[1, 2])
+        sched.enqueue("L2", "pr-2", [1])
+        assert sched.admit("L2") == []
+
+    def test_release(self, sched_path):
+        sched = QAScheduler(1, sched_path)
+        sched.enqueue("L1", "pr-1", [1, 2])
+        sched.enqueue("L2", "pr-2", [1])
+        sched.admit("L1")
+        sched.release("L1")
+        assert sched.admit("L2") == [1]
+        assert "L1" not in _state(sched_path)["loop_caps"]
+
+    def test_positions(self, sched_path):
+        sched = QAScheduler(1, sched_path)
+        sched.enqueue("L1", "pr-1", [1, 2])
+        time.sleep(0.01)
+        sched.enqueue("L2", "pr-2", [1])
+        sched.admit("L1")
+        assert sched.positions("L1") == {2: 1}
+        assert sched.positions("L2") == {1: 2}
+
+    def test_dead_owner_dropped(self, sched_path):
+        sched = QAScheduler(1, sched_path)
+        dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                              capture_output=True, text=True).stdout.strip()
+        sched.enqueue("L1", "pr-1", [1])
+        sched.admit("L1")
+        state = _state(sched_path)
+        state["running"]["L1:1"]["pid"] = int(dead)
+        sched_path.write_text(json.dumps(state))
+        sched.enqueue("L2", "pr-2", [1])
+        assert sched.admit("L2") == [1]
+        assert list(_state(sched_path)["running"]) == ["L2:1"]
+
+    def test_unchanged_state_not_rewritten(self, sched_path):
+        sched = QAScheduler(1, sched_path)
+        sched.enqueue("L1", "pr-1", [1, 2])
+        sched.admit("L1")
+        mtime = sched_path.stat().st_mtime_ns
+        time.sleep(0.01)
+        sched.admit("L1", active={1})
+        sched.positions("L1")
+        assert sched_path.stat().st_mtime_ns == mtime
+
+
+# ---------------------------------------------------------------------------
+# Concurrent loops
+# ---------------------------------------------------------------------------
+
+class TestConcurrentLoops:
+    def test_budget_never_exceeded(self, sched_path):
+        """Six loops of five scenarios each share a budget of four."""
+        budget = 4
+        lock = threading.Lock()
+        running: set[tuple[str, int]] = set()
+        peak = [0]
+        done: list[tuple[str, int]] = []
+
+        def loop(loop_id: str, priority: int) -> None:
+            sched = QAScheduler(budget, sched_path)
+            queue = list(range(1, 6))
+            sched.enqueue(loop_id, f"pr-{loop_id}", queue, priority=priority,
+                          loop_cap=3)
+            active: set[int] = set()
+            while queue or active:
+                for idx in sched.admit(loop_id, active=active):
+                    queue.remove(idx)
+                    active.add(idx)
+                    with lock:
+                        running.add((loop_id, idx))
+                        peak[0] = max(peak[0], len(running))
+                time.sleep(0.002)
+                if active:
+                    idx = min(active)
+                    with lock:
+                        running.discard((loop_id, idx))
+                        done.append((loop_id, idx))
+                    active.discard(idx)
+            sched.release(loop_id)
+
+        threads = [threading.Thread(target=loop, args=(f"L{i}", i % 3))
+                   for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+        assert len(done) == 30
+        assert peak[0] <= budget
+        assert _state(sched_path)["running"] == {}
+
+
+# ---------------------------------------------------------------------------
+# Status file
+# ---------------------------------------------------------------------------
+
+class TestStatusFile:
+    def test_queue_position_written(self, tmp_path):
+        status = tmp_path / "qa_status.json"
+        scenarios = [QAScenario(index=i, title=f"s{i}", focus="")
+                     for i in (1, 2, 3)]
+        _write_status_file(status, "pr-1", scenarios, {},
+                           queued_scenarios={2, 3},
+                           queue_positions={2: 4, 3: 7})
+        rows = {r["index"]: r for r in json.loads(status.read_text())["scenarios"]}
+        assert "queue_position" not in rows[1]
+        assert rows[2]["verdict"] == "queued"
+        assert rows[2]["queue_position"] == 4
+        assert rows[3]["queue_position"] == 7
@@ -0,0 +1,286 @@
+"""Tests for per-repository dependency images.
+
+Builds run against ``bin/fake-runtime`` in strict-image mode: only the
+base image and images actually built exist, and ``build_delay`` stands
+in for the time the dependency install steps take.
+"""
+
+import json
+import re
+import subprocess
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pm_core import repo_image
+from pm_core.container import DEFAULT_IMAGE, ContainerConfig, create_container
+from pm_core.repo_image import (
+    detect_recipes,
+    ensure_image,
+    image_for,
+    image_key,
+    image_tag,
+    render_dockerfile,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    yield
+    repo_image.wait_for_builds(timeout=30)
+    repo_image._background.clear()
+    repo_image._failed.clear()
+
+
+@pytest.fixture
+def runtime(fake_runtime):
+    """Strict fake runtime that has only the base image."""
+    fake_runtime.strict_images = True
+    with fake_runtime.installed():
+        fake_runtime.add_image(DEFAULT_IMAGE)
+        yield fake_runtime
+
+
+@pytest.fixture
+def repo(tmp_path) -> Path:
+    path = tmp_path / "My Repo"
+    path.mkdir()
+    (path / "requirements.txt").write_text("requests==2.31.0\n")
+    (path / "package.json").write_text(json.dumps({"name": "app"}))
+    (path / "package-lock.json").write_text(json.dumps({"lockfileVersion": 3}))
+    (path / "README.md").write_text("hello\n")
+    return path
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _git_project(path: Path) -> Path:
+    """A committed repository with a requirements.txt."""
+    path.mkdir(parents=True)
+    (path / "requirements.txt").write_text(f"{path.name}==1.0\n")
+    _git(path, "init", "-q")
+    _git(path, "add", ".")
+    _git(path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    return path
+
+
+def _scenario_clone(project: Path, qa_workdir: Path, index: int = 0) -> Path:
+    """A QA scenario checkout: ``{qa_workdir}/s-N/repo`` cloned from *project*."""
+    clone = qa_workdir / f"s-{index}" / "repo"
+    clone.parent.mkdir(parents=True)
+    _git(clone.parent, "clone", "-q", "--local", str(project), str(clone))
+    return clone
+
+
+def _mode(mode: str):
+    return patch("pm_core.repo_image.get_global_setting_value", return_value=mode)
+
+
+def _builds(runtime) -> list[list[str]]:
+    return runtime.calls_to("build")
+
+
+# ---------------------------------------------------------------------------
+# Manifest detection and keys
+# ---------------------------------------------------------------------------
+
+class TestDetect:
+    def test_python_and_node(self, repo):
+        (repo / "requirements-dev.txt").write_text("-r requirements.txt\npytest\n")
+        recipes = detect_recipes(repo)
+        assert [r.name for r in recipes] == ["python", "node"]
+        python = recipes[0]
+        assert set(python.files) == {"requirements.txt", "requirements-dev.txt"}
+        assert "-r requirements-dev.txt -r requirements.txt" in python.install
+
+    def test_pyproject_dependencies(self, tmp_path):
+        pytest.importorskip("tomllib")
+        (tmp_path / "pyproject.toml").write_text(
+            '[project]\nname = "x"\nversion = "1"\ndependencies = ["click>=8"]\n'
+            '[project.optional-dependencies]\ntest = ["pytest"]\ndocs = ["sphinx"]\n')
+        (recipe,) = detect_recipes(tmp_path)
+        assert recipe.files == {"requirements.txt": b"click>=8\npytest\n"}
+
+    def test_node_needs_lockfile(self, tmp_path):
+        (tmp_path / "package.json").write_text("{}")
+        assert detect_recipes(tmp_path) == []
+
+    def test_nothing_declared(self, tmp_path):
+        assert detect_recipes(tmp_path) == []
+
+
+class TestKey:
+    def test_stable(self, repo):
+        assert image_key(detect_recipes(repo), "base") == image_key(
+            detect_recipes(repo), "base")
+
+    def test_lockfile_change_changes_key(self, repo):
+        before = image_key(detect_recipes(repo), "base")
+        (repo / "package-lock.json").write_text(json.dumps({"lockfileVersion": 4}))
+        assert image_key(detect_recipes(repo), "base") != before
+
+    def test_unrelated_change_keeps_key(self, repo):
+        before = image_key(detect_recipes(repo), "base")
+        (repo / "README.md").write_text("changed\n")
+        (repo / "main.py").write_text("print()\n")
+        assert image_key(detect_recipes(repo), "base") == before
+
+    def test_base_rebuild_changes_key(self, repo):
+        recipes = detect_recipes(repo)
+        assert image_key(recipes, "sha256:a") != image_key(recipes, "sha256:b")
+
+    def test_tag(self, repo):
+        assert re.fullmatch(r"pm-deps-my-repo-[0-9a-f]{8}:abc", image_tag(repo, "abc"))
+
+    def test_tag_follows_upstream_url(self, tmp_path):
+        repo = _git_project(tmp_path / "checkout")
+        _git(repo, "remote", "add", "origin", "git@github.com:org/Widget.git")
+        assert image_tag(repo, "k").startswith("pm-deps-widget-")
+
+
+class TestDockerfile:
+    def test_one_layer_per_ecosystem(self, repo):
+        text = render_dockerfile("pm-dev:latest", detect_recipes(repo), "k")
+        lines = text.splitlines()
+        assert lines[0] == "FROM pm-dev:latest"
+        copies = [line for line in lines if line.startswith("COPY ")]
+        assert copies == ["COPY python/ /opt/pm-deps/python/",
+                          "COPY node/ /opt/pm-deps/node/"]
+        # Each layer installs right after its own manifests are copied.
+        py = lines.index(copies[0])
+        assert lines[py + 1].startswith("RUN cd /opt/pm-deps/python && pip3 install")
+        assert lines[-2:] == ["USER pm", "WORKDIR /home/pm"]
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+class TestEnsureImage:
+    def test_builds_once(self, runtime, repo):
+        tag = ensure_image(repo, DEFAULT_IMAGE)
+        assert tag.startswith("pm-deps-my-repo-")
+        assert tag in runtime.images
+        assert ensure_image(repo, DEFAULT_IMAGE) == tag
+        assert len(_builds(runtime)) == 1
+
+    def test_build_context_has_only_manifests(self, runtime, repo):
+        seen = {}
+        real = repo_image.build
+
+        def spy(tag, base, recipes, key):
+            seen["files"] = {r.name: sorted(r.files) for r in recipes}
+            real(tag, base, recipes, key)
+
+        with patch.object(repo_image, "build", side_effect=spy):
+            ensure_image(repo, DEFAULT_IMAGE)
+        assert seen["files"] == {"python": ["requirements.txt"],
+                                 "node": ["package-lock.json", "package.json"]}
+
+    def test_lockfile_change_rebuilds_and_prunes(self, runtime, repo):
+        first = ensure_image(repo, DEFAULT_IMAGE)
+        (repo / "requirements.txt").write_text("requests==2.32.0\n")
+        second = ensure_image(repo, DEFAULT_IMAGE)
+        assert second != first
+        assert len(_builds(runtime)) == 2
+        assert second in runtime.images
+        assert first not in runtime.images
+        assert DEFAULT_IMAGE in runtime.images
+
+    def test_no_manifests(self, runtime, tmp_path):
+        assert ensure_image(tmp_path, DEFAULT_IMAGE) is None
+        assert _builds(runtime) == []
+
+    def test_scenario_checkouts_use_project_image(self, runtime, tmp_path):
+        """Scenario clones map to their project; projects don't collide."""
+        projects = [_git_project(tmp_path / "a" / "app"),
+                    _git_project(tmp_path / "b" / "app")]
+        scenarios = [_scenario_clone(p, tmp_path / f"qa-{i}")
+                     for i, p in enumerate(projects)]
+        assert image_tag(scenarios[0], "k") == image_tag(projects[0], "k")
+        assert image_tag(scenarios[0], "k") != image_tag(scenarios[1], "k")
+        assert image_tag(scenarios[0], "k").startswith("pm-deps-app-")
+
+        # What build-deps builds at the project root is what scenarios use.
+        built = ensure_image(projects[0], DEFAULT_IMAGE)
+        assert ensure_image(scenarios[0], DEFAULT_IMAGE) == built
+        # Building the other project's image does not prune the first.
+        other = ensure_image(scenarios[1], DEFAULT_IMAGE)
+        assert {built, other} <= set(runtime.images)
+        assert len(_builds(runtime)) == 2
+
+    def test_failed_build_not_retried(self, runtime, repo):
+        assert ensure_image(repo, "missing-base:latest") is None
+        assert ensure_image(repo, "missing-base:latest") is None
+        assert len(_builds(runtime)) == 1
+
+
+class TestImageFor:
+    def test_auto_builds_in_background(self, runtime, repo):
+        runtime.build_delay = 0.5
+        with runtime.installed(), _mode("auto"):
+            t0 = time.monotonic()
+            assert image_for(repo, DEFAULT_IMAGE) == DEFAULT_IMAGE
+            assert time.monotonic() - t0 < 0.4
+            # A second caller does not start a second build.
+            assert image_for(repo, DEFAULT_IMAGE) == DEFAULT_IMAGE
+            repo_image.wait_for_builds(timeout=10)
+            assert image_for(repo, DEFAULT_IMAGE).startswith("pm-deps-")
+        assert len(_builds(runtime)) == 1
+
+    def test_wait(self, runtime, repo):
+        with _mode("wait"):
+            assert image_for(repo, DEFAULT_IMAGE).startswith("pm-deps-")
+
+    def test_off(self, runtime, repo):
+        with _mode("off"):
+            assert image_for(repo, DEFAULT_IMAGE) == DEFAULT_IMAGE
+        assert _builds(runtime) == []
+
+
+# ---------------------------------------------------------------------------
+# Container startup
+# ---------------------------------------------------------------------------
+
+class TestCreateContainer:
+    def _create(self, runtime, repo, name: str, image: str = DEFAULT_IMAGE) -> float:
+        t0 = time.monotonic()
+        create_container(name=name, config=ContainerConfig(image=image),
+                         workdir=repo)
+        return time.monotonic() - t0
+
+    def test_selects_derived_image(self, runtime, repo):
+        with _mode("wait"):
+            self._create(runtime, repo, "pm-qa-1")
+        assert runtime.containers["pm-qa-1"]["image"].startswith("pm-deps-my-repo-")
+
+    def test_custom_image_untouched(self, runtime, repo):
+        runtime.add_image("custom:1")
+        with _mode("wait"):
+            self._create(runtime, repo, "pm-qa-1", image="custom:1")
+        assert runtime.containers["pm-qa-1"]["image"] == "custom:1"
+        assert _builds(runtime) == []
+
+    def test_warm_versus_cold_startup(self, runtime, repo):
+        """Startup with a dependency install (cold) vs. a built image (warm).
+
+        The fake build sleeps for the install time a scenario would
+        otherwise spend in a base-image container.
+        """
+        install = 1.5
+        runtime.build_delay = install
+        with runtime.installed(), _mode("wait"):
+            cold = self._create(runtime, repo, "pm-qa-cold")
+            warm = [self._create(runtime, repo, f"pm-qa-warm-{i}") for i in range(3)]
+            (repo / "package-lock.json").write_text(json.dumps({"lockfileVersion": 9}))
+            changed = self._create(runtime, repo, "pm-qa-changed")
+        print(f"\nscenario container startup: cold {cold:.2f}s, "
+              f"warm {max(warm):.2f}s, after lockfile change {changed:.2f}s")
+        assert cold >= install
+        assert changed >= install
+        assert max(warm) < install
+        assert len(_builds(runtime)) == 2
@@ -0,0 +1,297 @@
+"""Tests for host pressure / container usage sampling and QA admission.
+
+Everything reads synthetic files: a fake ``/proc`` (``pressure/*``,
+``meminfo``, ``<pid>/cgroup``) and a fake cgroup v2 tree, with container
+pids coming from ``bin/fake-runtime``.
+"""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from pm_core import hook_events, qa_loop, resource_monitor
+from pm_core.cli import cli
+from pm_core.fake_runtime import run_fake_runtime
+from pm_core.qa_loop import QALoopState, QAScenario, _poll_tmux_verdicts
+from pm_core.resource_monitor import (
+    ResourceMonitor,
+    admission_blocked,
+    format_bytes,
+    parse_pressure,
+    pressure_limits,
+)
+
+_PSI = ("some avg10={some:.2f} avg60=1.50 avg300=0.75 total=123456\n"
+        "full avg10={full:.2f} avg60=0.50 avg300=0.25 total=654\n")
+
+
+def _set_pressure(proc: Path, resource: str, some: float, full: float = 0.0) -> None:
+    (proc / "pressure").mkdir(parents=True, exist_ok=True)
+    (proc / "pressure" / resource).write_text(_PSI.format(some=some, full=full))
+
+
+@pytest.fixture
+def proc(tmp_path) -> Path:
+    path = tmp_path / "proc"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def cgroup(tmp_path) -> Path:
+    path = tmp_path / "cgroup"
+    path.mkdir()
+    return path
+
+
+def _start(fake_runtime, name: str) -> int:
+    rc, _, err = run_fake_runtime(
+        ["run", "-d", "--name", name, "pm-dev:latest", "sleep", "infinity"],
+        fake_runtime.state_path)
+    assert rc == 0, err
+    return fake_runtime.containers[name]["pid"]
+
+
+def _lay_out_cgroup(proc: Path, cgroup: Path, pid: int, rel: str, memory: int,
+                    usage_usec: int, memory_max: str = "max") -> Path:
+    (proc / str(pid)).mkdir()
+    (proc / str(pid) / "cgroup").write_text(f"0::/{rel}\n")
+    cg = cgroup / rel
+    cg.mkdir(parents=True)
+    (cg / "memory.current").write_text(f"{memory}\n")
+    (cg / "memory.max").write_text(f"{memory_max}\n")
+    (cg / "cpu.stat").write_text(
+        f"usage_usec {usage_usec}\nuser_usec {usage_usec}\nsystem_usec 0\n")
+    return cg
+
+
+# ---------------------------------------------------------------------------
+# Host pressure
+# ---------------------------------------------------------------------------
+
+class TestPressure:
+    def test_parse(self):
+        psi = parse_pressure(_PSI.format(some=12.5, full=3.0))
+        assert psi["some"] == {"avg10": 12.5, "avg60": 1.5, "avg300": 0.75,
+                               "total": 123456.0}
+        assert psi["full"]["avg10"] == 3.0
+
+    def test_cpu_has_no_full_line_on_older_kernels(self):
+        psi = parse_pressure("some avg10=4.00 avg60=0.00 avg300=0.00 total=1\n")
+        assert set(psi) == {"some"}
+
+    def test_host_pressure(self, proc):
+        _set_pressure(proc, "cpu", 4)
+        _set_pressure(proc, "memory", 22)
+        host = ResourceMonitor(proc_root=proc).host_pressure()
+        assert set(host) == {"cpu", "memory"}
+        assert host["memory"]["some"]["avg10"] == 22
+
+    def test_no_psi(self, proc):
+        assert ResourceMonitor(proc_root=proc).pressure("memory") is None
+
+    def test_host_memory(self, proc):
+        (proc / "meminfo").write_text(
+            "MemTotal:       16000000 kB\nMemFree:  100 kB\n"
+            "MemAvailable:    4000000 kB\n")
+        assert ResourceMonitor(proc_root=proc).host_memory() == (
+            4000000 * 1024, 16000000 * 1024)
+
+
+class TestAdmission:
+    def test_blocked_over_limit(self, proc):
+        _set_pressure(proc, "memory", 23.14)
+        _set_pressure(proc, "cpu", 95)
+        monitor = ResourceMonitor(proc_root=proc)
+        assert admission_blocked(monitor, {"memory": 10}) == ["memory 23.1% > 10%"]
+        assert admission_blocked(monitor, {"memory": 10, "cpu": 90}) == [
+            "memory 23.1% > 10%", "cpu 95.0% > 90%"]
+
+    def test_open_under_limit(self, proc):
+        _set_pressure(proc, "memory", 9.9)
+        assert admission_blocked(ResourceMonitor(proc_root=proc), {"memory": 10}) == []
+
+    def test_open_without_psi(self, proc):
+        assert admission_blocked(ResourceMonitor(proc_root=proc), {"memory": 10}) == []
+
+    def test_no_limits_reads_nothing(self, proc):
+        with patch.object(ResourceMonitor, "pressure") as pressure:
+            assert admission_blocked(ResourceMonitor(proc_root=proc), {}) == []
+        pressure.assert_not_called()
+
+    @pytest.mark.parametrize("memory,cpu,expected", [
+        ("", "", {"memory": 10}),
+        ("0", "80", {"cpu": 80}),
+        ("junk", "-5", {"memory": 10}),
+    ])
+    def test_limits_from_settings(self, memory, cpu, expected):
+        values = {"qa-max-memory-pressure": memory, "qa-max-cpu-pressure": cpu}
+        with patch.object(resource_monitor, "get_global_setting_value",
+                          side_effect=lambda name, default: values[name]):
+            assert pressure_limits() == expected
+
+
+# ---------------------------------------------------------------------------
+# Container usage
+# ---------------------------------------------------------------------------
+
+class TestContainers:
+    def test_docker_and_rootless_podman_layouts(self, fake_runtime, proc, cgroup):
+        pid_a = _start(fake_runtime, "pm-qa-a")
+        pid_b = _start(fake_runtime, "pm-qa-b")
+        _start(fake_runtime, "other")
+        cid = fake_runtime.containers["pm-qa-a"]["id"]
+        _lay_out_cgroup(proc, cgroup, pid_a, f"system.slice/docker-{cid}.scope",
+                        memory=512 << 20, usage_usec=1_000_000,
+                        memory_max=str(4 << 30))
+        _lay_out_cgroup(
+            proc, cgroup, pid_b,
+            "user.slice/user-1000.slice/user@1000.service/user.slice/"
+            f"libpod-{cid}.scope/container",
+            memory=64 << 20, usage_usec=5)
+        usages = ResourceMonitor(proc_root=proc, cgroup_root=cgroup).containers()
+        assert [u.name for u in usages] == ["pm-qa-a", "pm-qa-b"]
+        a, b = usages
+        assert (a.memory, a.memory_max, a.cpu_usec) == (512 << 20, 4 << 30, 1_000_000)
+        assert (b.memory, b.memory_max) == (64 << 20, None)
+        assert a.cpu_percent is None
+        # One ps and one inspect for all containers.
+        assert len(fake_runtime.calls_to("ps")) == 1
+        assert len(fake_runtime.calls_to("inspect")) == 1
+
+    def test_cpu_percent_between_samples(self, fake_runtime, proc, cgroup):
+        pid = _start(fake_runtime, "pm-qa-a")
+        cg = _lay_out_cgroup(proc, cgroup, pid, "docker/a", memory=1,
+                             usage_usec=1_000_000)
+        monitor = ResourceMonitor(proc_root=proc, cgroup_root=cgroup)
+        with patch.object(resource_monitor, "time") as clock:
+            clock.monotonic.side_effect = [100.0, 102.0]
+            monitor.containers()
+            (cg / "cpu.stat").write_text("usage_usec 4000000\n")
+            (usage,) = monitor.containers()
+        assert usage.cpu_percent == pytest.approx(150.0)
+
+    def test_stopped_container_forgotten(self, fake_runtime, proc, cgroup):
+        pid = _start(fake_runtime, "pm-qa-a")
+        _lay_out_cgroup(proc, cgroup, pid, "docker/a", memory=1, usage_usec=1)
+        monitor = ResourceMonitor(proc_root=proc, cgroup_root=cgroup)
+        monitor.containers()
+        run_fake_runtime(["stop", "pm-qa-a"], fake_runtime.state_path)
+        assert monitor.containers() == []
+        assert monitor._last_cpu == {}
+
+    def test_missing_cgroup_reads_as_unknown(self, fake_runtime, proc, cgroup):
+        _start(fake_runtime, "pm-qa-a")
+        (usage,) = ResourceMonitor(proc_root=proc, cgroup_root=cgroup).containers()
+        assert (usage.memory, usage.cpu_usec, usage.cpu_percent) == (None, None, None)
+
+    def test_cgroup_v1_ignored(self, proc, cgroup):
+        (proc / "7").mkdir()
+        (proc / "7" / "cgroup").write_text("4:memory:/docker/abc\n1:cpu:/docker/abc\n")
+        assert ResourceMonitor(proc_root=proc, cgroup_root=cgroup).cgroup_dir(7) is None
+
+
+class TestStatsCommand:
+    def test_renders_host_and_containers(self, fake_runtime, proc, cgroup):
+        _set_pressure(proc, "memory", 23.5)
+        _set_pressure(proc, "cpu", 1)
+        (proc / "meminfo").write_text("MemTotal: 8388608 kB\n"
+                                      "MemAvailable: 2097152 kB\n")
+        pid = _start(fake_runtime, "pm-sess-qa-pr-1-s1")
+        _lay_out_cgroup(proc, cgroup, pid, "docker/s1", memory=300 << 20,
+                        usage_usec=10, memory_max=str(4 << 30))
+        with patch.object(resource_monitor, "PROC_ROOT", proc), \
+                patch.object(resource_monitor, "CGROUP_ROOT", cgroup), \
+                patch.object(resource_monitor, "pressure_limits",
+                             return_value={"memory": 10}):
+            result = CliRunner().invoke(cli, ["container", "stats",
+                                              "--interval", "0"])
+        assert result.exit_code == 0, result.output
+        out = result.output
+        assert "memory    23.5% /   1.5%   limit 10%" in out
+        assert "Host memory: 2.0GiB available of 8.0GiB" in out
+        assert "QA admission: held (memory 23.5% > 10%)" in out
+        row = next(line for line in out.splitlines()
+                   if line.startswith("pm-sess-qa-pr-1-s1"))
+        assert row.split()[1:4] == ["300.0MiB", "4.0GiB", "0.0%"]
+
+
+@pytest.mark.parametrize("n,text", [
+    (None, "-"), (512, "512B"), (1536, "1.5KiB"), (300 << 20, "300.0MiB"),
+    (5 << 30, "5.0GiB"),
+])
+def test_format_bytes(n, text):
+    assert format_bytes(n) == text
+
+
+# ---------------------------------------------------------------------------
+# QA loop admission
+# ---------------------------------------------------------------------------
+
+class TestQueuedLaunches:
+    """Queued scenarios of a running ``_poll_tmux_verdicts`` loop."""
+
+    def _run_loop(self, tmp_path, proc, state, queued, launched):
+        def launch(st, *args, **kwargs):
+            for s in st.scenarios:
+                s.window_name = f"qa-pr-1-s{s.index}"
+                s.pane_id = f"%{s.index}"
+                s.session_id = f"sid-{s.index}"
+                launched.append(s.index)
+
+        hooks = tmp_path / "hooks"
+        hooks.mkdir()
+        errors = []
+
+        def run():
+            with patch.object(resource_monitor, "PROC_ROOT", proc), \
+                    patch.object(resource_monitor, "pressure_limits",
+                                 return_value={"memory": 10}), \
+                    patch.object(hook_events, "_HOOKS_BASE", hooks), \
+                    patch.object(qa_loop, "_POLL_INTERVAL", 0.02), \
+                    patch.object(qa_loop, "_launch_scenarios_in_tmux", launch), \
+                    patch("pm_core.tmux.live_pane_ids",
+                          return_value={"%1", "%2", "%3"}), \
+                    patch("pm_core.qa_scheduler.get_scheduler", return_value=None), \
+                    patch.object(qa_loop, "_get_verdict_reminder_timeout",
+                                 return_value=None), \
+                    patch.object(qa_loop, "_is_verification_enabled",
+                                 return_value=False):
+                try:
+                    _poll_tmux_verdicts(
+                        state, {}, {}, "sess", str(tmp_path),
+                        tmp_path / "qa_status.json", lambda *a: None,
+                        queued_scenarios=queued)
+                except BaseException as exc:
+                    errors.append(exc)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread, errors
+
+    def test_held_until_pressure_drops(self, tmp_path, proc):
+        _set_pressure(proc, "memory", 40)
+        state = QALoopState(pr_id="pr-1", qa_workdir=str(tmp_path))
+        state.scenarios = [QAScenario(index=i, title=f"s{i}", focus="f")
+                           for i in (1, 2, 3)]
+        launched: list[int] = []
+        thread, errors = self._run_loop(tmp_path, proc, state,
+                                        list(state.scenarios), launched)
+        try:
+            time.sleep(0.5)
+            # One scenario always runs; the rest wait for the host.
+            assert launched == [1]
+            assert "Host under pressure" in state.latest_output
+            _set_pressure(proc, "memory", 2)
+            deadline = time.monotonic() + 5
+            while len(launched) < 3 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert launched == [1, 2, 3]
+        finally:
+            state.stop_requested = True
+            thread.join(timeout=10)
+        assert not errors
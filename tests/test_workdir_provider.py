@@ -0,0 +1,221 @@
+"""Tests for scenario/PR workdir providers (clone and reflink copies)."""
+
+import os
+import subprocess
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pm_core import workdir_provider
+from pm_core.qa_loop import create_scenario_workdir
+from pm_core.workdir_provider import (
+    PROVIDERS,
+    ReflinkProvider,
+    discard_tree,
+    select_provider,
+)
+
+BRANCH = "pm/pr-1"
+
+
+def _git(*args, cwd) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.email=t@t.com", "-c", "user.name=T", *args],
+        cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _make_repo(path: Path, files: int = 3, size: int = 16) -> Path:
+    """A PR workdir: on BRANCH, with origin set and some local mess."""
+    path.mkdir(parents=True)
+    _git("init", "-q", "-b", "master", cwd=path)
+    (path / ".gitignore").write_text("build/\n")
+    for i in range(files):
+        sub = path / f"d{i % 10}"
+        sub.mkdir(exist_ok=True)
+        (sub / f"f{i}.txt").write_text(f"{i}\n" * size)
+    _git("add", ".", cwd=path)
+    _git("commit", "-q", "-m", "base", cwd=path)
+    _git("checkout", "-q", "-b", BRANCH, cwd=path)
+    (path / "pr.txt").write_text("change\n")
+    _git("add", "pr.txt", cwd=path)
+    _git("commit", "-q", "-m", "pr", cwd=path)
+    _git("remote", "add", "origin", "https://example.com/repo.git", cwd=path)
+    _git("remote", "add", "fork", "https://example.com/fork.git", cwd=path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _fresh_probe_cache():
+    workdir_provider._reflink_support.clear()
+    yield
+    workdir_provider._reflink_support.clear()
+
+
+@pytest.fixture
+def copying_reflink(monkeypatch):
+    """Run the reflink provider on any filesystem (cp falls back to a copy)."""
+    monkeypatch.setattr(PROVIDERS["reflink"], "reflink", "auto")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = _make_repo(tmp_path / "src")
+    # Local state a fresh clone would not carry over.
+    (repo / "pr.txt").write_text("uncommitted edit\n")
+    (repo / "untracked.txt").write_text("scratch\n")
+    (repo / "build").mkdir()
+    (repo / "build" / "out.bin").write_text("artifact\n")
+    _git("worktree", "add", "-q", str(tmp_path / "wt"), "master", cwd=repo)
+    return repo
+
+
+# ---------------------------------------------------------------------------
+# Providers
+# ---------------------------------------------------------------------------
+
+class TestProviders:
+    @pytest.mark.parametrize("name", ["clone", "reflink"])
+    def test_checkout_matches_a_fresh_clone(self, name, repo, tmp_path,
+                                            copying_reflink):
+        dest = tmp_path / "dest"
+        PROVIDERS[name].create(repo, dest, branch=BRANCH)
+
+        assert _git("rev-parse", "--abbrev-ref", "HEAD", cwd=dest) == BRANCH
+        assert _git("status", "--porcelain", "--ignored", cwd=dest) == ""
+        assert (dest / "pr.txt").read_text() == "change\n"
+        assert not (dest / "untracked.txt").exists()
+        assert not (dest / "build").exists()
+        assert _git("remote", cwd=dest) == "origin"
+        assert _git("remote", "get-url", "origin", cwd=dest) == str(repo)
+        assert _git("rev-parse", "--abbrev-ref", "@{upstream}", cwd=dest) == \
+            f"origin/{BRANCH}"
+        assert _git("rev-parse", "origin/master", cwd=dest) == \
+            _git("rev-parse", "master", cwd=repo)
+        assert (dest / ".git").is_dir()
+        # The source's linked worktree holds master; the copy can use it.
+        _git("checkout", "-q", "master", cwd=dest)
+
+    @pytest.mark.parametrize("name", ["clone", "reflink"])
+    def test_fills_an_empty_directory(self, name, repo, tmp_path, copying_reflink):
+        dest = tmp_path / "dest"
+        dest.mkdir()
+        PROVIDERS[name].create(repo, dest, branch=BRANCH)
+        assert (dest / "pr.txt").exists()
+
+    def test_reflink_missing_branch_raises(self, repo, tmp_path, copying_reflink):
+        with pytest.raises(subprocess.CalledProcessError):
+            PROVIDERS["reflink"].create(repo, tmp_path / "dest", branch="nope")
+
+
+class TestSelectProvider:
+    def _setting(self, value):
+        return patch.object(workdir_provider, "get_global_setting_value",
+                            return_value=value)
+
+    def test_auto_uses_reflink_when_supported(self, repo, tmp_path, copying_reflink):
+        with self._setting("auto"):
+            assert select_provider(repo, tmp_path / "qa").name == "reflink"
+
+    def test_auto_clones_without_reflink(self, repo, tmp_path):
+        with self._setting("auto"), \
+                patch.object(ReflinkProvider, "supported", return_value=False):
+            assert select_provider(repo, tmp_path / "qa").name == "clone"
+
+    def test_forced_clone(self, repo, tmp_path, copying_reflink):
+        with self._setting("clone"):
+            assert select_provider(repo, tmp_path / "qa").name == "clone"
+
+    def test_forced_reflink_falls_back(self, repo, tmp_path):
+        with self._setting("reflink"), \
+                patch.object(ReflinkProvider, "supported", return_value=False):
+            assert select_provider(repo, tmp_path / "qa").name == "clone"
+
+    def test_worktree_source_not_reflinked(self, repo, tmp_path, copying_reflink):
+        assert not PROVIDERS["reflink"].supported(tmp_path / "wt", tmp_path)
+
+    def test_probe_cached_per_filesystem(self, repo, tmp_path, copying_reflink):
+        reflink = PROVIDERS["reflink"]
+        with patch.object(workdir_provider.subprocess, "run",
+                          wraps=subprocess.run) as run:
+            assert reflink.supported(repo, tmp_path)
+            assert reflink.supported(repo, tmp_path)
+        assert run.call_count == 1
+        assert not list(tmp_path.glob(".reflink-probe-*"))
+
+
+class TestDiscardTree:
+    def test_removed_in_background(self, tmp_path):
+        tree = tmp_path / "repo"
+        (tree / "a").mkdir(parents=True)
+        (tmp_path / ".discard-repo-old").mkdir()
+        discard_tree(tree)
+        assert not tree.exists()
+        deadline = time.monotonic() + 10
+        while list(tmp_path.glob(".discard-*")) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestScenarioWorkdir:
+    def test_reused_slot_gets_fresh_checkout(self, repo, tmp_path, copying_reflink):
+        qa = tmp_path / "qa"
+        clone, _ = create_scenario_workdir(qa, 1, repo_root=repo, branch=BRANCH)
+        (clone / "leftover.txt").write_text("from last run\n")
+        clone, _ = create_scenario_workdir(qa, 1, repo_root=repo, branch=BRANCH)
+        assert not (clone / "leftover.txt").exists()
+        assert _git("rev-parse", "--abbrev-ref", "HEAD", cwd=clone) == BRANCH
+
+
+# ---------------------------------------------------------------------------
+# Benchmark: 16 scenarios on a large synthetic repo
+# ---------------------------------------------------------------------------
+
+def _real_reflink(path: Path) -> bool:
+    return ReflinkProvider().supported(path, path.parent)
+
+
+@pytest.fixture(scope="module")
+def big_repo(tmp_path_factory):
+    return _make_repo(tmp_path_factory.mktemp("bench") / "src",
+                      files=2000, size=400)
+
+
+class TestBenchmark:
+    SCENARIOS = 16
+
+    def _run(self, repo, qa_dir, provider) -> float:
+        with patch.object(workdir_provider, "select_provider",
+                          return_value=provider):
+            start = time.perf_counter()
+            for i in range(self.SCENARIOS):
+                create_scenario_workdir(qa_dir, i, repo_root=repo, branch=BRANCH)
+            elapsed = time.perf_counter() - start
+        for i in range(self.SCENARIOS):
+            clone = qa_dir / f"s-{i}" / "repo"
+            assert _git("status", "--porcelain", cwd=clone) == ""
+        return elapsed
+
+    def test_sixteen_scenarios(self, big_repo, tmp_path):
+        timings = {"clone": self._run(big_repo, tmp_path / "clone",
+                                      PROVIDERS["clone"])}
+        if _real_reflink(big_repo):
+            timings["reflink"] = self._run(big_repo, tmp_path / "reflink",
+                                           PROVIDERS["reflink"])
+        print("\nworkdir setup for %d scenarios: %s" % (
+            self.SCENARIOS,
+            ", ".join(f"{k} {v:.2f}s" for k, v in timings.items())))
+        if "reflink" in timings:
+            assert timings["reflink"] < timings["clone"]
+
+    def test_checkout_data_is_shared(self, big_repo, tmp_path):
+        """On a reflink filesystem the copies add (almost) no used space."""
+        if not _real_reflink(big_repo):
+            pytest.skip("filesystem cannot reflink")
+        before = os.statvfs(tmp_path)
+        self._run(big_repo, tmp_path / "reflink", PROVIDERS["reflink"])
+        after = os.statvfs(tmp_path)
+        used = (before.f_bfree - after.f_bfree) * before.f_frsize
+        checkout = sum(f.stat().st_size for f in big_repo.rglob("*.txt"))
+        assert used < checkout * self.SCENARIOS / 4